@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\benchmarks\bench_indicators.py
+"""Benchmark: NumPy indicator kernels (strategies/utils/np_indicators.py) vs pandas.
+
+Usage:
+    python benchmarks/bench_indicators.py [--sizes 10000 100000 1000000] [--period 14] [--repeats 3]
+                                          [--wma-sample 20000]
+
+For every indicator and size it times the NumPy kernel and the pandas expression it
+reproduces (the references of benchmarks/indicator_reference.py, best of --repeats), and prints
+the throughput of the kernel in million candles per second, the speedup and the largest
+deviation from pandas relative to the indicator's magnitude. The pandas WMA
+(rolling.apply) is far slower than the rest, so it is timed on at most --wma-sample
+candles and extrapolated (marked "est.").
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from benchmarks.indicator_reference import PANDAS_REFERENCE, build_candles
+
+
+def best_time(call, df, period, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = call(df, period)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def deviation(actual, expected):
+    actual = actual if isinstance(actual, tuple) else (actual,)
+    expected = expected if isinstance(expected, tuple) else (expected,)
+    worst = 0.0
+    for a, e in zip(actual, expected):
+        e = np.asarray(e, dtype=np.float64)
+        # Relative to the column's magnitude: MACD and DI lines cross zero, where per-value ratios say nothing.
+        scale = max(float(np.nanmax(np.abs(e), initial=0.0)), 1e-12)
+        worst = max(worst, float(np.nanmax(np.abs(a - e), initial=0.0)) / scale)
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--period", type=int, default=14)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--wma-sample", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'indicator':<14}{'candles':>10}{'numpy [s]':>12}{'Mcandles/s':>12}{'pandas [s]':>16}{'speedup':>10}{'max dev':>13}")
+    for name, (numpy_call, reference) in PANDAS_REFERENCE.items():
+        for size in args.sizes:
+            df = build_candles(size)
+            numpy_time, result = best_time(numpy_call, df, args.period, args.repeats)
+            sample = df
+            if name == "wma" and size > args.wma_sample:
+                sample = df.iloc[:args.wma_sample]
+            pandas_time, expected = best_time(reference, sample, args.period, 1 if sample is not df else args.repeats)
+            estimated = sample is not df
+            if estimated:
+                pandas_time *= size / len(sample)
+                result = tuple(a[:len(sample)] for a in result) if isinstance(result, tuple) else result[:len(sample)]
+            pandas_label = f"{pandas_time:.4f}{' est.' if estimated else ''}"
+            print(f"{name:<14}{size:>10}{numpy_time:>12.4f}{size / numpy_time / 1e6:>12.1f}{pandas_label:>16}"
+                  f"{pandas_time / numpy_time:>9.1f}x{deviation(result, expected):>13.1e}")
+
+
+if __name__ == "__main__":
+    main()
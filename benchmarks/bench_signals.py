@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\benchmarks\bench_signals.py
+"""Benchmark: per-row get_signal vs batch get_signals.
+
+Usage:
+    python benchmarks/bench_signals.py [--sizes 10000 100000 1000000] [--legacy-sample 20000]
+
+The per-row path costs the same for every row, so for sizes above --legacy-sample it is
+timed on the first --legacy-sample rows and extrapolated (marked "est.").
+Pass --legacy-sample 0 to time the per-row path on every row.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from strategies.strategy_dual_ma import Strategy as DualMaStrategy
+from strategies.strategy_test import Strategy as TestStrategy
+
+
+def build_frame(size, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, size))
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=size, freq="min"),
+        "open": close,
+        "high": close + rng.uniform(0, 2, size),
+        "low": close - rng.uniform(0, 2, size),
+        "close": close,
+        "volume": rng.uniform(1, 100, size)
+    })
+    df["ma_short"] = df["close"].rolling(window=10).mean()
+    df["ma_long"] = df["close"].rolling(window=20).mean()
+    df["ema_short"] = df["close"].ewm(span=10, adjust=False).mean()
+    df["ema_long"] = df["close"].ewm(span=20, adjust=False).mean()
+    df["adx"] = rng.uniform(0, 50, size)
+    return df
+
+
+def time_per_row(strategy, df, sample):
+    rows = len(df) if not sample else min(sample, len(df))
+    start = time.perf_counter()
+    for i in range(rows):
+        strategy.get_signal(df.iloc[[i]])
+    elapsed = time.perf_counter() - start
+    return elapsed * len(df) / rows, rows < len(df)
+
+
+def time_batch(strategy, df, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        strategy.get_signals(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-sample", type=int, default=20_000)
+    args = parser.parse_args()
+
+    # Both strategies log every generated signal; keep the measurement about signal generation.
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'strategy':<18}{'candles':>10}{'per-row [s]':>18}{'batch [s]':>12}{'speedup':>12}")
+    for name, strategy_class in [("strategy_dual_ma", DualMaStrategy), ("strategy_test", TestStrategy)]:
+        strategy = strategy_class()
+        for size in args.sizes:
+            df = build_frame(size)
+            legacy, estimated = time_per_row(strategy, df, args.legacy_sample)
+            batch = time_batch(strategy, df)
+            legacy_label = f"{legacy:.3f}{' est.' if estimated else ''}"
+            print(f"{name:<18}{size:>10}{legacy_label:>18}{batch:>12.4f}{legacy / batch:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\benchmarks\indicator_reference.py
+"""Pandas references of the NumPy indicator kernels and a random candles builder.
+
+Shared by tests/test_np_indicators.py (correctness) and benchmarks/bench_indicators.py
+(speed and deviation).
+"""
+import numpy as np
+import pandas as pd
+from strategies.utils import np_indicators
+
+
+def _wilder(series, period):
+    return series.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def _true_range(df):
+    previous_close = df["close"].shift()
+    return pd.concat([df["high"] - df["low"], (df["high"] - previous_close).abs(), (df["low"] - previous_close).abs()], axis=1).max(axis=1)
+
+
+def _pandas_adx(df, period):
+    up, down = df["high"].diff(), -df["low"].diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0).where(up.notna() & down.notna())
+    minus_dm = down.where((down > up) & (down > 0), 0.0).where(up.notna() & down.notna())
+    atr = _wilder(_true_range(df), period)
+    plus_di, minus_di = 100 * _wilder(plus_dm, period) / atr, 100 * _wilder(minus_dm, period) / atr
+    return _wilder(100 * (plus_di - minus_di).abs() / (plus_di + minus_di), period), plus_di, minus_di
+
+
+def _pandas_rsi(close, period):
+    delta = close.diff()
+    return 100 - 100 / (1 + _wilder(delta.clip(lower=0), period) / _wilder(-delta.clip(upper=0), period))
+
+
+def _pandas_macd(close, fast, slow, signal):
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False, min_periods=slow).mean()
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return line, signal_line, line - signal_line
+
+
+def _pandas_bollinger(close, period):
+    middle, std = close.rolling(window=period).mean(), close.rolling(window=period).std(ddof=0)
+    return middle + 2 * std, middle, middle - 2 * std
+
+
+def _pandas_donchian(df, period):
+    upper, lower = df["high"].rolling(window=period).max(), df["low"].rolling(window=period).min()
+    return upper, (upper + lower) / 2, lower
+
+
+def _pandas_vwap(df, period):
+    weighted = (df["high"] + df["low"] + df["close"]) / 3 * df["volume"]
+    volume = df["volume"].where(weighted.notna())
+    if period is None:
+        return (weighted.cumsum() / volume.cumsum()).where(weighted.notna())
+    return weighted.rolling(period).sum() / volume.rolling(period).sum()
+
+
+def _pandas_wma(close, period):
+    weights = np.arange(1, period + 1)
+    return close.rolling(window=period).apply(lambda w: (w * weights).sum() / weights.sum(), raw=True)
+
+
+# name -> (numpy call, pandas reference); both take the candles frame and a period.
+PANDAS_REFERENCE = {
+    "sma": (lambda df, n: np_indicators.sma(df["close"], n), lambda df, n: df["close"].rolling(window=n).mean()),
+    "ema": (lambda df, n: np_indicators.ema(df["close"], n), lambda df, n: df["close"].ewm(span=n, adjust=False).mean()),
+    "wma": (lambda df, n: np_indicators.wma(df["close"], n), lambda df, n: _pandas_wma(df["close"], n)),
+    "rsi": (lambda df, n: np_indicators.rsi(df["close"], n), lambda df, n: _pandas_rsi(df["close"], n)),
+    "atr": (lambda df, n: np_indicators.atr(df["high"], df["low"], df["close"], n), lambda df, n: _wilder(_true_range(df), n)),
+    "adx": (lambda df, n: np_indicators.adx(df["high"], df["low"], df["close"], n), _pandas_adx),
+    "macd": (lambda df, n: np_indicators.macd(df["close"], n, 2 * n, 9), lambda df, n: _pandas_macd(df["close"], n, 2 * n, 9)),
+    "bollinger": (lambda df, n: np_indicators.bollinger(df["close"], n), lambda df, n: _pandas_bollinger(df["close"], n)),
+    "donchian": (lambda df, n: np_indicators.donchian(df["high"], df["low"], n), _pandas_donchian),
+    "vwap": (lambda df, n: np_indicators.vwap(df["high"], df["low"], df["close"], df["volume"]), lambda df, n: _pandas_vwap(df, None)),
+    "rolling_vwap": (lambda df, n: np_indicators.vwap(df["high"], df["low"], df["close"], df["volume"], n), _pandas_vwap)
+}
+
+
+def build_candles(size, seed=0, gaps=False, dtype=np.float64):
+    """Returns random OHLCV candles, optionally with missing values and a constant stretch."""
+    rng = np.random.default_rng(seed)
+    close = 30_000 + np.cumsum(rng.normal(0, 25, size))
+    df = pd.DataFrame({
+        "high": close + rng.uniform(0, 40, size),
+        "low": close - rng.uniform(0, 40, size),
+        "close": close,
+        "volume": rng.uniform(0.1, 50, size)
+    })
+    if gaps:
+        df.iloc[size // 3:size // 3 + 40] = df.iloc[size // 3].to_numpy()
+        for column, rows in (("close", [5, 700, 701, 1500]), ("high", [900]), ("low", [901, 2200]), ("volume", [1200])):
+            df.loc[rows, column] = np.nan
+    return df.astype(dtype)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\benchmarks\load_test.py
+"""Load test: many concurrent runners against the local mock exchange, no network.
+
+Usage:
+    python benchmarks/load_test.py [--runners 1000] [--markets 20] [--ticks 10] [--latency-ms 20]
+                                   [--error-rate 0.01] [--rate-limit 0] [--remote]
+
+Each runner ticks every --tick-interval seconds (randomly staggered): it takes the
+pooled "mock" client, fetches a --window candle window of its market, computes the
+strategy's indicators and signals, and records the tick latency. --remote starts the
+exchange in its own process (python -m src.core.mock_exchange) and talks to it over a
+socket; otherwise it runs in this process. Reports latency percentiles, throughput,
+errors and the exchange's call counts.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import ccxt.async_support as ccxt
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.core.candle_store import candles_to_dataframe, to_candle_array
+from src.core.exchange_pool import get_exchange_pool
+from src.core.mock_exchange import MOCK_EXCHANGE
+from strategies.strategy_contract import apply_indicators, generate_signals
+from strategies.strategy_test import Strategy as TestStrategy
+
+
+def start_remote_exchange(args, symbols):
+    command = [
+        sys.executable, "-m", "src.core.mock_exchange", "--port", "0", "--symbols", *symbols,
+        "--latency-ms", str(args.latency_ms), "--latency-jitter-ms", str(args.latency_ms / 2),
+        "--error-rate", str(args.error_rate), "--rate-limit", str(args.rate_limit)
+    ]
+    process = subprocess.Popen(command, cwd=Path(__file__).resolve().parents[1], stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()
+    if not line.startswith("listening "):
+        process.kill()
+        raise RuntimeError(f"Mock exchange did not start: {line!r}")
+    return process, line.split(" ", 1)[1]
+
+
+async def runner(index, symbol, api_key_data, args, latencies, failures):
+    strategy = TestStrategy()
+    pool = get_exchange_pool()
+    await asyncio.sleep(random.uniform(0, args.tick_interval))
+    for _ in range(args.ticks):
+        started = time.perf_counter()
+        try:
+            async with pool.lease(MOCK_EXCHANGE, api_key_data) as exchange:
+                ohlcv = await exchange.fetch_ohlcv(symbol, args.interval, limit=args.window)
+            df, _ = apply_indicators(strategy, candles_to_dataframe(to_candle_array(ohlcv)))
+            generate_signals(strategy, df.tail(1))
+            latencies.append(time.perf_counter() - started)
+        except ccxt.BaseError as e:
+            failures[type(e).__name__] = failures.get(type(e).__name__, 0) + 1
+        await asyncio.sleep(max(args.tick_interval - (time.perf_counter() - started), 0))
+
+
+async def run(args):
+    symbols = [f"SYM{i}/USDT" for i in range(args.markets)]
+    process = None
+    api_key_data = {"exchange": MOCK_EXCHANGE, "api_key": "load-test", "rate_limit_requests": args.client_rate}
+    if args.remote:
+        process, address = start_remote_exchange(args, symbols)
+        api_key_data["mock_address"] = address
+    else:
+        api_key_data["mock"] = {
+            "symbols": symbols, "latency_ms": args.latency_ms, "latency_jitter_ms": args.latency_ms / 2,
+            "error_rate": args.error_rate, "rate_limit_per_minute": args.rate_limit
+        }
+    latencies, failures = [], {}
+    try:
+        pool = get_exchange_pool()
+        async with pool.lease(MOCK_EXCHANGE, api_key_data) as exchange:
+            await exchange.load_markets()
+            started = time.perf_counter()
+            await asyncio.gather(*(runner(i, symbols[i % len(symbols)], api_key_data, args, latencies, failures) for i in range(args.runners)))
+            elapsed = time.perf_counter() - started
+            stats = exchange.stats()
+            stats = await stats if asyncio.iscoroutine(stats) else stats
+        await pool.close_all()
+    finally:
+        if process is not None:
+            process.kill()
+    return latencies, failures, elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runners", type=int, default=1000)
+    parser.add_argument("--markets", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--tick-interval", type=float, default=5.0, help="seconds between ticks of one runner")
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--window", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="exchange-side requests/min before 429 (0: unlimited)")
+    parser.add_argument("--client-rate", type=int, default=1_000_000, help="client token bucket, requests/min")
+    parser.add_argument("--remote", action="store_true", help="run the mock exchange in a separate process")
+    args = parser.parse_args()
+
+    # Strategies and the pool log per tick; keep the output to the report.
+    logging.disable(logging.CRITICAL)
+
+    latencies, failures, elapsed, stats = asyncio.run(run(args))
+    ticks = np.array(latencies) * 1000
+    print(f"runners {args.runners}, markets {args.markets}, {'remote' if args.remote else 'in-process'} exchange, {elapsed:.1f} s")
+    print(f"ticks ok {len(ticks)}, failed {sum(failures.values())} {failures or ''}, {len(ticks) / elapsed:.0f} ticks/s")
+    if len(ticks):
+        p50, p95, p99 = np.percentile(ticks, [50, 95, 99])
+        print(f"tick latency [ms]  p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {ticks.max():.1f}")
+    print(f"exchange {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\auto_promotion.py
+import json
+import logging
+from pathlib import Path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Used when promotion.json has no auto_settings (or cannot be read).
+DEFAULT_AUTO_DAYS = 30.0
+DEFAULT_REQUIRED_PROFIT = 20.0
+# Smallest close-to-close move (%) for which a strategy's signal is acted on, unless the strategy sets min_volatility.
+DEFAULT_MIN_VOLATILITY = 0.1
+
+
+def load_auto_settings(promotion_file: Path) -> tuple:
+    """Returns (auto_days, required_profit) from the auto_settings of promotion.json."""
+    try:
+        with open(promotion_file, "r", encoding="utf-8") as f:
+            auto_settings = json.load(f).get("auto_settings", {})
+        return float(auto_settings.get("auto_days", DEFAULT_AUTO_DAYS)), float(auto_settings.get("required_profit", DEFAULT_REQUIRED_PROFIT))
+    except Exception as e:
+        logging.error(f"Error loading auto settings from {promotion_file}: {str(e)}")
+        return DEFAULT_AUTO_DAYS, DEFAULT_REQUIRED_PROFIT
+
+
+def should_promote(days_elapsed: float, profit_percentage: float, auto_days: float, required_profit: float) -> bool:
+    """Auto mode moves a strategy to Live after auto_days with at least required_profit % profit."""
+    return days_elapsed >= auto_days and profit_percentage >= required_profit
+
+
+def filter_signal(signal, prev_close, close, min_volatility: float = DEFAULT_MIN_VOLATILITY):
+    """Drops a buy/sell signal when the close moved less than min_volatility % since the previous close."""
+    if signal not in ("buy", "sell") or not prev_close:
+        return signal
+    volatility = abs((close - prev_close) / prev_close * 100)
+    if volatility < min_volatility:
+        logging.info(f"Filtered {signal} signal: volatility {volatility:.2f}% < {min_volatility}%")
+        return None
+    return signal
+
+
+def filter_signals_by_volatility(signals: list, closes: list, min_volatility: float = DEFAULT_MIN_VOLATILITY) -> list:
+    """filter_signal applied along a list of signals and their closes."""
+    return [filter_signal(signal, closes[i - 1] if i else None, closes[i], min_volatility) for i, signal in enumerate(signals)]
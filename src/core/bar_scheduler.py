@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\bar_scheduler.py
+import logging
+import threading
+from src.core.clock import get_clock
+from src.core.candle_resampler import bucket_end, bucket_starts
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Seconds after a bar closes before it is fetched, so the exchange has finalized it.
+DEFAULT_GRACE_DELAY = 2.0
+# Signal latency (bar close -> signal) above this many seconds is logged as a warning.
+DEFAULT_LATENCY_BOUND = 30.0
+
+
+class LatencyStats:
+    """Running count/mean/max of bar-close-to-signal latency for one market, in ms."""
+
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        self.count += 1
+        self.total += latency_ms
+        self.max = max(self.max, latency_ms)
+        self.last = latency_ms
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "mean_ms": self.total / self.count if self.count else 0.0, "max_ms": self.max, "last_ms": self.last}
+
+
+class BarScheduler:
+    """Wakes runners just after their interval's bar closes, on the exchange's clock.
+
+    Bar boundaries are those of the candle resampler (UTC epoch multiples, weekly bars
+    from Monday 00:00, calendar months) on the exchange server's clock; the offset
+    measured by synchronize_time (server - local) is applied per exchange, and a grace
+    delay gives the exchange time to finalize the bar. Runners
+    report when they produced a signal for a bar so the bar-close-to-signal latency is
+    tracked per market.
+    """
+
+    def __init__(self, grace_delay: float = DEFAULT_GRACE_DELAY, latency_bound: float = DEFAULT_LATENCY_BOUND):
+        self.grace_delay = grace_delay
+        self.latency_bound = latency_bound
+        self._offsets = {}
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def set_time_offset(self, exchange_name: str, offset_ms: int) -> None:
+        """Stores server time minus local time (ms) measured for an exchange."""
+        with self._lock:
+            self._offsets[exchange_name.lower()] = int(offset_ms)
+
+    def time_offset(self, exchange_name: str = None) -> int:
+        with self._lock:
+            return self._offsets.get(exchange_name.lower(), 0) if exchange_name else 0
+
+    def server_now_ms(self, exchange_name: str = None) -> int:
+        """Current time on the exchange's clock in ms."""
+        return int(get_clock().time() * 1000) + self.time_offset(exchange_name)
+
+    @staticmethod
+    def last_bar_close(interval: str, now_ms: int) -> int:
+        """Close time (= open time of the forming bar) of the most recent completed bar."""
+        return int(bucket_starts([now_ms], interval)[0])
+
+    @staticmethod
+    def next_bar_close(interval: str, now_ms: int) -> int:
+        """Close time of the bar forming at now_ms."""
+        return bucket_end(BarScheduler.last_bar_close(interval, now_ms), interval)
+
+    def seconds_until_next_bar(self, interval: str, exchange_name: str = None) -> float:
+        """Seconds to sleep until grace_delay after the next bar close."""
+        now_ms = self.server_now_ms(exchange_name)
+        return (self.next_bar_close(interval, now_ms) - now_ms) / 1000 + self.grace_delay
+
+    async def wait_for_bar_close(self, interval: str, exchange_name: str = None) -> int:
+        """Sleeps until just after the next bar close and returns that close time (ms)."""
+        now_ms = self.server_now_ms(exchange_name)
+        bar_close = self.next_bar_close(interval, now_ms)
+        await get_clock().sleep((bar_close - now_ms) / 1000 + self.grace_delay)
+        return bar_close
+
+    def record_latency(self, exchange_name: str, symbol: str, interval: str, bar_close_ms: int) -> float:
+        """Records the time from bar close to now (a signal was produced) and returns it in ms."""
+        latency_ms = float(self.server_now_ms(exchange_name) - bar_close_ms)
+        key = (exchange_name.lower(), symbol, interval)
+        with self._lock:
+            self._latency.setdefault(key, LatencyStats()).add(latency_ms)
+        if latency_ms > self.latency_bound * 1000:
+            logging.warning(f"Signal latency for {symbol} {interval} on {exchange_name} is {latency_ms / 1000:.1f}s after bar close (bound {self.latency_bound:.0f}s)")
+        else:
+            logging.debug(f"Signal latency for {symbol} {interval} on {exchange_name}: {latency_ms:.0f}ms")
+        return latency_ms
+
+    def latency_stats(self) -> dict:
+        """Returns {(exchange, symbol, interval): {count, mean_ms, max_ms, last_ms}}."""
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._latency.items()}
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_bar_scheduler() -> BarScheduler:
+    """Returns the process-wide bar scheduler."""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = BarScheduler()
+        return _default_scheduler
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\candle_buffer.py
+import logging
+import numpy as np
+import pandas as pd
+from src.core.candle_store import CANDLE_DTYPE, candles_to_dataframe, to_candle_array
+from strategies.strategy_contract import get_lookback
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# EMA/ADX-style indicators need several lookbacks of history before they settle.
+WARMUP_FACTOR = 3
+MIN_CAPACITY = 50
+
+
+def buffer_capacity(strategy_instance) -> int:
+    """Returns the ring buffer size for a strategy: its largest lookback times WARMUP_FACTOR."""
+    return max(get_lookback(strategy_instance) * WARMUP_FACTOR, MIN_CAPACITY)
+
+
+class CandleRingBuffer:
+    """Fixed-capacity, time-ordered window of the most recent candles of one (symbol, interval).
+
+    Candles live in a preallocated CANDLE_DTYPE array used as a ring: extending costs
+    O(new candles), and once full the oldest candles are overwritten. A candle with the
+    timestamp of the newest stored candle replaces it (the still-forming bar).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Capacity must be greater than 0, got {capacity}")
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=CANDLE_DTYPE)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self):
+        """Timestamp (ms) of the newest candle, or None when the buffer is empty."""
+        if self._size == 0:
+            return None
+        return int(self._data["timestamp"][(self._start + self._size - 1) % self.capacity])
+
+    def extend(self, ohlcv) -> int:
+        """Adds candles newer than the stored ones.
+
+        Args:
+            ohlcv: ccxt-style rows ([ts, o, h, l, c, v], ...) or a CANDLE_DTYPE array.
+
+        Returns:
+            int: Number of candles that were not in the buffer before.
+        """
+        candles = to_candle_array(ohlcv)
+        if len(candles) == 0:
+            return 0
+        if len(candles) > 1 and (np.diff(candles["timestamp"]) <= 0).any():
+            candles = candles[np.argsort(candles["timestamp"], kind="stable")]
+            candles = candles[np.append(candles["timestamp"][1:] != candles["timestamp"][:-1], True)]
+        last_ts = self.last_timestamp
+        if last_ts is not None:
+            candles = candles[candles["timestamp"] >= last_ts]
+            if len(candles) and candles["timestamp"][0] == last_ts:
+                self._data[(self._start + self._size - 1) % self.capacity] = candles[0]
+                candles = candles[1:]
+        candles = candles[-self.capacity:]
+        added = len(candles)
+        if added == 0:
+            return 0
+        end = (self._start + self._size) % self.capacity
+        first = min(added, self.capacity - end)
+        self._data[end:end + first] = candles[:first]
+        self._data[:added - first] = candles[first:]
+        overflow = max(self._size + added - self.capacity, 0)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self._size + added, self.capacity)
+        return added
+
+    def to_array(self) -> np.ndarray:
+        """Returns the buffered candles, oldest first, as a CANDLE_DTYPE array (copy)."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start:end].copy()
+        return np.concatenate([self._data[self._start:], self._data[:end - self.capacity]])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the buffered candles in the app's OHLCV DataFrame layout."""
+        return candles_to_dataframe(self.to_array())
+
+    async def sync(self, exchange, symbol: str, interval: str) -> int:
+        """Warms the buffer with a full window on first use, later fetches only candles since the newest one.
+
+        Returns:
+            int: Number of new candles.
+        """
+        if self._size == 0:
+            ohlcv = await exchange.fetch_ohlcv(symbol, interval, limit=self.capacity)
+            added = self.extend(ohlcv or [])
+            logging.info(f"Warmed candle buffer for {symbol} on {interval} with {added} of {self.capacity} candles")
+            return added
+        ohlcv = await exchange.fetch_ohlcv(symbol, interval, since=self.last_timestamp)
+        return self.extend(ohlcv or [])
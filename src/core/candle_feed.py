@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\candle_feed.py
+import asyncio
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from src.core.bar_scheduler import BarScheduler, get_bar_scheduler
+from src.core.candle_buffer import CandleRingBuffer
+from src.core.candle_store import candles_to_dataframe
+from src.core.clock import get_clock
+from src.core.exchange_pool import get_exchange_pool
+from utils.normalization import normalize_symbol, normalize_interval
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Seconds between retries when the new bar is not there yet after the scheduled wake-up.
+RETRY_DELAY = 5.0
+MAX_RETRIES = 3
+
+
+class CandleUpdate:
+    """Snapshot of one market's candle window, broadcast to every subscriber."""
+
+    __slots__ = ("symbol", "interval", "candles", "new_candles", "bar_close")
+
+    def __init__(self, symbol: str, interval: str, candles: np.ndarray, new_candles: int, bar_close: int):
+        self.symbol = symbol
+        self.interval = interval
+        self.candles = candles
+        self.new_candles = new_candles
+        self.bar_close = bar_close
+
+    @property
+    def last_timestamp(self):
+        return int(self.candles["timestamp"][-1]) if len(self.candles) else None
+
+    def to_dataframe(self, limit: int = None) -> pd.DataFrame:
+        candles = self.candles[-limit:] if limit else self.candles
+        df = candles_to_dataframe(candles)
+        # Lets the indicator cache key series by market; the contents still decide whether an entry matches.
+        df.attrs["market"] = self.symbol
+        df.attrs["interval"] = self.interval
+        return df
+
+
+class Subscription:
+    """A subscriber's view of a market feed; updates arrive through an asyncio queue.
+
+    The queue keeps only the newest updates: every update carries the full window, so
+    a slow subscriber that skips one loses nothing.
+    """
+
+    def __init__(self, feed, key: tuple, capacity: int, maxsize: int = 1):
+        self.feed = feed
+        self.key = key
+        self.capacity = capacity
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.latest = None
+        self.error = None
+
+    def _deliver(self, update: CandleUpdate) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(update)
+
+    def _fail(self, error: Exception) -> None:
+        # None wakes a waiting next(), which then raises the error.
+        self.error = error
+        self._deliver(None)
+
+    async def next(self, timeout: float = None):
+        """Waits for the next update; returns None when timeout (seconds on get_clock()) expires first.
+
+        Raises:
+            RuntimeError: The market's poller stopped (e.g. no exchange client could be created).
+        """
+        if self.error is not None:
+            raise self.error
+        if timeout:
+            # The timeout runs on the process clock, so a replay under a VirtualClock waits in virtual time.
+            getter = asyncio.ensure_future(self.queue.get())
+            timer = asyncio.ensure_future(get_clock().sleep(timeout))
+            try:
+                await asyncio.wait((getter, timer), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                timer.cancel()
+                if not getter.done():
+                    getter.cancel()
+            if not getter.done() or getter.cancelled():
+                return None
+            update = getter.result()
+        else:
+            update = await self.queue.get()
+        if update is None and self.error is not None:
+            raise self.error
+        self.latest = update
+        return update
+
+    def close(self) -> None:
+        self.feed.unsubscribe(self)
+
+
+class _MarketPoller:
+    __slots__ = ("key", "exchange_name", "api_key_data", "symbol", "interval", "buffer", "subscribers", "task", "latest", "rewarm")
+
+    def __init__(self, key, exchange_name, api_key_data, symbol, interval, capacity):
+        self.key = key
+        self.exchange_name = exchange_name
+        self.api_key_data = api_key_data
+        self.symbol = symbol
+        self.interval = interval
+        self.buffer = CandleRingBuffer(capacity)
+        self.subscribers = []
+        self.task = None
+        self.latest = None
+        # Set when a subscriber needs a longer window than the buffer holds: the next pass fetches a full window.
+        self.rewarm = False
+
+
+class CandleFeed:
+    """Polls every distinct (exchange, symbol, interval) once per bar and fans the candles out.
+
+    Paper and live runners subscribe instead of calling fetch_ohlcv themselves, so the
+    request volume depends on the number of distinct markets, not on the number of
+    strategies. Each market has one poller task (per event loop) keeping a candle ring
+    buffer as large as its most demanding subscriber; the poller wakes up through the
+    BarScheduler just after each bar close, and stops and releases its pooled client
+    when the last subscriber leaves. A subscriber needing a longer window grows the
+    buffer, which is re-warmed with a full window on the next pass. If the poller
+    fails for good (no client after MAX_RETRIES attempts), it is dropped and its
+    subscribers' next() raises.
+    """
+
+    def __init__(self, scheduler: BarScheduler = None, retry_delay: float = RETRY_DELAY):
+        self.scheduler = scheduler or get_bar_scheduler()
+        self.retry_delay = retry_delay
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(exchange_name: str, api_key_data: dict, symbol: str, interval: str, loop) -> tuple:
+        return (exchange_name.lower(), api_key_data.get("api_key", ""), normalize_symbol(symbol), normalize_interval(interval), id(loop))
+
+    def subscribe(self, exchange_name: str, api_key_data: dict, symbol: str, interval: str, capacity: int) -> Subscription:
+        """Subscribes the calling runner to a market, starting its poller if needed.
+
+        Args:
+            exchange_name (str): Exchange name.
+            api_key_data (dict): Entry from api_keys.json used for the pooled client.
+            symbol (str): Trading symbol.
+            interval (str): Time interval.
+            capacity (int): Number of candles the subscriber needs (see buffer_capacity).
+
+        Returns:
+            Subscription: Receives a CandleUpdate for every new bar.
+        """
+        loop = asyncio.get_running_loop()
+        key = self.make_key(exchange_name, api_key_data, symbol, interval, loop)
+        subscription = Subscription(self, key, capacity)
+        with self._lock:
+            poller = self._pollers.get(key)
+            if poller is None:
+                poller = _MarketPoller(key, exchange_name, api_key_data, symbol, normalize_interval(interval), capacity)
+                self._pollers[key] = poller
+                poller.task = loop.create_task(self._poll(poller))
+                logging.info(f"Started candle feed for {symbol} {interval} on {exchange_name} ({len(self._pollers)} markets)")
+            elif capacity > poller.buffer.capacity:
+                grown = CandleRingBuffer(capacity)
+                grown.extend(poller.buffer.to_array())
+                poller.rewarm = poller.rewarm or len(grown) > 0
+                poller.buffer = grown
+            poller.subscribers.append(subscription)
+            # Until the re-warm the latest window is shorter than the new subscriber needs.
+            if poller.latest is not None and not poller.rewarm:
+                subscription._deliver(poller.latest)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            poller = self._pollers.get(subscription.key)
+            if poller is None or subscription not in poller.subscribers:
+                return
+            poller.subscribers.remove(subscription)
+            if not poller.subscribers:
+                self._pollers.pop(subscription.key)
+                poller.task.cancel()
+                logging.info(f"Stopped candle feed for {poller.symbol} {poller.interval} on {poller.exchange_name}")
+
+    def stats(self) -> dict:
+        """Returns {(exchange, symbol, interval): number of subscribers}."""
+        with self._lock:
+            return {key[:1] + key[2:4]: len(poller.subscribers) for key, poller in self._pollers.items()}
+
+    def _publish(self, poller: _MarketPoller, new_candles: int, bar_close: int) -> None:
+        update = CandleUpdate(poller.symbol, poller.interval, poller.buffer.to_array(), new_candles, bar_close)
+        with self._lock:
+            poller.latest = update
+            subscribers = list(poller.subscribers)
+        for subscription in subscribers:
+            subscription._deliver(update)
+
+    def _fail(self, poller: _MarketPoller, error: Exception) -> None:
+        """Drops a poller that cannot continue and raises error in its subscribers' next()."""
+        logging.error(f"Candle feed for {poller.symbol} {poller.interval} on {poller.exchange_name} stopped: {str(error)}")
+        with self._lock:
+            if self._pollers.get(poller.key) is poller:
+                self._pollers.pop(poller.key)
+            subscribers = list(poller.subscribers)
+            poller.subscribers.clear()
+        failure = RuntimeError(f"Candle feed for {poller.symbol} {poller.interval} on {poller.exchange_name} stopped: {str(error)}")
+        for subscription in subscribers:
+            subscription._fail(failure)
+
+    async def _acquire(self, pool, poller: _MarketPoller):
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return await pool.acquire(poller.exchange_name, poller.api_key_data)
+            except Exception as e:
+                logging.warning(f"Candle feed could not get a client for {poller.exchange_name} (attempt {attempt + 1}): {str(e)}")
+                if attempt == MAX_RETRIES:
+                    raise
+            await get_clock().sleep(self.retry_delay)
+
+    async def _sync(self, poller: _MarketPoller, exchange) -> int:
+        if not poller.rewarm:
+            return await poller.buffer.sync(exchange, poller.symbol, poller.interval)
+        # The buffer grew: fetch a full window (limit=capacity) instead of only the candles since the newest one.
+        fresh = CandleRingBuffer(poller.buffer.capacity)
+        added = await fresh.sync(exchange, poller.symbol, poller.interval)
+        # Only candles older than the fetched window are kept from the old buffer; the fetched bars are newer.
+        candles = fresh.to_array()
+        old = poller.buffer.to_array()
+        if len(candles):
+            old = old[old["timestamp"] < candles["timestamp"][0]]
+        buffer = CandleRingBuffer(fresh.capacity)
+        buffer.extend(np.concatenate([old, candles]))
+        if buffer.capacity == poller.buffer.capacity:
+            poller.buffer = buffer
+            poller.rewarm = False
+        return added
+
+    async def _poll(self, poller: _MarketPoller) -> None:
+        pool = get_exchange_pool()
+        try:
+            exchange = await self._acquire(pool, poller)
+        except Exception as e:
+            self._fail(poller, e)
+            return
+        try:
+            bar_close = self.scheduler.last_bar_close(poller.interval, self.scheduler.server_now_ms(poller.exchange_name))
+            while True:
+                last_ts = poller.buffer.last_timestamp
+                rewarm = poller.rewarm
+                for attempt in range(MAX_RETRIES + 1):
+                    try:
+                        added = await self._sync(poller, exchange)
+                    except Exception as e:
+                        logging.warning(f"Candle feed fetch failed for {poller.symbol} {poller.interval} on {poller.exchange_name}: {str(e)}")
+                        added = 0
+                    # The bar that opened at bar_close must be there, otherwise the closed bar may not be final yet.
+                    if (poller.buffer.last_timestamp or 0) >= bar_close or attempt == MAX_RETRIES:
+                        break
+                    await get_clock().sleep(self.retry_delay)
+                if poller.buffer.last_timestamp != last_ts or (rewarm and not poller.rewarm):
+                    self._publish(poller, added, bar_close)
+                bar_close = await self.scheduler.wait_for_bar_close(poller.interval, poller.exchange_name)
+        except Exception as e:
+            self._fail(poller, e)
+        finally:
+            pool.release(exchange)
+
+
+class _RemoteMarket:
+    __slots__ = ("capacity", "subscribers", "latest")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.subscribers = []
+        self.latest = None
+
+
+class RemoteCandleFeed:
+    """Candle feed of a sharded engine worker, fed by the supervisor instead of polling.
+
+    Same subscribe()/unsubscribe() interface as CandleFeed. The first subscriber of a
+    market (or one needing a larger window) sends {"type": "feed_subscribe", ...}
+    through send; the supervisor polls the market once for all workers and hands each
+    update back to deliver(). The last subscriber leaving sends "feed_unsubscribe". A
+    market whose poller failed in the supervisor is dropped through fail().
+    """
+
+    def __init__(self, send):
+        self._send = send
+        self._markets = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, exchange_name: str, api_key_data: dict, symbol: str, interval: str, capacity: int) -> Subscription:
+        key = CandleFeed.make_key(exchange_name, api_key_data, symbol, interval, None)[:4]
+        subscription = Subscription(self, key, capacity)
+        with self._lock:
+            market = self._markets.get(key)
+            request = market is None or capacity > market.capacity
+            if market is None:
+                market = self._markets[key] = _RemoteMarket(capacity)
+            market.capacity = max(market.capacity, capacity)
+            market.subscribers.append(subscription)
+            if market.latest is not None:
+                subscription._deliver(market.latest)
+        if request:
+            self._send({
+                "type": "feed_subscribe", "key": key, "exchange": exchange_name, "api_key_data": api_key_data,
+                "symbol": symbol, "interval": interval, "capacity": market.capacity
+            })
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            market = self._markets.get(subscription.key)
+            if market is None or subscription not in market.subscribers:
+                return
+            market.subscribers.remove(subscription)
+            if market.subscribers:
+                return
+            self._markets.pop(subscription.key)
+        self._send({"type": "feed_unsubscribe", "key": subscription.key})
+
+    def deliver(self, key: tuple, update: CandleUpdate) -> None:
+        """Hands an update received from the supervisor to the market's subscribers."""
+        with self._lock:
+            market = self._markets.get(tuple(key))
+            if market is None:
+                return
+            market.latest = update
+            subscribers = list(market.subscribers)
+        for subscription in subscribers:
+            subscription._deliver(update)
+
+    def fail(self, key: tuple, error: str) -> None:
+        """Drops a market whose poller stopped in the supervisor; its subscribers' next() raises."""
+        with self._lock:
+            market = self._markets.pop(tuple(key), None)
+            subscribers = list(market.subscribers) if market is not None else []
+        for subscription in subscribers:
+            subscription._fail(RuntimeError(error))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {(key[0],) + key[2:4]: len(market.subscribers) for key, market in self._markets.items()}
+
+
+_default_feed = None
+_default_feed_lock = threading.Lock()
+
+
+def get_candle_feed() -> CandleFeed:
+    """Returns the process-wide candle feed."""
+    global _default_feed
+    with _default_feed_lock:
+        if _default_feed is None:
+            _default_feed = CandleFeed()
+        return _default_feed
+
+
+def set_candle_feed(feed) -> None:
+    """Replaces the process-wide candle feed (a sharded engine worker installs a RemoteCandleFeed)."""
+    global _default_feed
+    with _default_feed_lock:
+        _default_feed = feed
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\candle_gaps.py
+import asyncio
+import json
+import logging
+import os
+import threading
+import numpy as np
+from src.core.candle_store import CandleStore, get_candle_store
+from src.core.ohlcv_downloader import PAGE_LIMITS, DEFAULT_PAGE_LIMIT, plan_pages
+from src.core.rate_limiter import PRIORITY_BACKGROUND, request_priority
+from utils.normalization import normalize_interval, interval_to_milliseconds
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+GAPS_FILE = "gaps.json"
+# Calendar months differ in length; consecutive monthly bars may be up to 31 days apart.
+MONTH_MAX_STEP_MS = 31 * 86_400_000
+
+
+def max_step_ms(interval: str) -> int:
+    """Largest distance between two consecutive bars that is not a gap."""
+    interval = normalize_interval(interval)
+    return MONTH_MAX_STEP_MS if interval.endswith("mo") else interval_to_milliseconds(interval)
+
+
+def find_gaps(timestamps: np.ndarray, interval: str) -> np.ndarray:
+    """Returns the missing [start, end) ranges between sorted bar timestamps (ms).
+
+    Args:
+        timestamps (np.ndarray): Sorted, de-duplicated bar open times.
+        interval (str): Bar interval.
+
+    Returns:
+        np.ndarray: int64 array of shape (n, 2); start is the first missing bar, end the
+        next stored bar.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if len(timestamps) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    idx = np.flatnonzero(np.diff(timestamps) > max_step_ms(interval))
+    step = interval_to_milliseconds(interval)
+    return np.column_stack((timestamps[idx] + step, timestamps[idx + 1])).astype(np.int64)
+
+
+def missing_bars(gaps, interval: str) -> int:
+    """Number of bars inside the gap ranges."""
+    gaps = np.asarray(gaps, dtype=np.int64).reshape(-1, 2)
+    if len(gaps) == 0:
+        return 0
+    return int(np.sum(np.ceil((gaps[:, 1] - gaps[:, 0]) / interval_to_milliseconds(interval))))
+
+
+def _overlapping(gaps: list, since: int = None, until: int = None) -> list:
+    return [gap for gap in gaps if (since is None or gap[1] > since) and (until is None or gap[0] < until)]
+
+
+class GapScanner:
+    """Finds missing bars in stored candle series and remembers the result.
+
+    Every series keeps a gaps.json next to its partitions with the known gaps, the
+    gaps the exchange could not fill (no trading, maintenance), and a watermark: the
+    timestamp up to which the series was scanned and the number of candles before it.
+    A later scan only looks at candles after the watermark; if the candle count before
+    it changed (an out-of-band backfill), the series is rescanned in full.
+    """
+
+    def __init__(self, store: CandleStore = None):
+        self.store = store or get_candle_store()
+        self._lock = threading.Lock()
+
+    def _meta_file(self, exchange: str, symbol: str, interval: str):
+        return self.store.series_dir(exchange, symbol, interval) / GAPS_FILE
+
+    def _load_meta(self, exchange: str, symbol: str, interval: str):
+        meta_file = self._meta_file(exchange, symbol, interval)
+        if not meta_file.exists():
+            return None
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable gap metadata {meta_file}: {str(e)}")
+            return None
+
+    def _save_meta(self, exchange: str, symbol: str, interval: str, meta: dict) -> None:
+        meta_file = self._meta_file(exchange, symbol, interval)
+        tmp_file = meta_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, meta_file)
+
+    def scan(self, exchange: str, symbol: str, interval: str, full: bool = False) -> dict:
+        """Brings the gap metadata of a series up to date and returns it.
+
+        Returns:
+            dict: {"gaps": [[start, end], ...], "unfillable": [[start, end], ...],
+            "verified_until": ts, "verified_count": n} (empty gap lists for an empty series).
+        """
+        interval = normalize_interval(interval)
+        with self._lock:
+            meta = None if full else self._load_meta(exchange, symbol, interval)
+            total = self.store.count(exchange, symbol, interval)
+            if meta is not None:
+                tail = self.store.read(exchange, symbol, interval, since=meta["verified_until"])
+                if total - len(tail) != meta["verified_count"]:
+                    logging.info(f"Candles before the gap watermark of {exchange} {symbol} {interval} changed, rescanning")
+                    meta = None
+            if meta is None:
+                candles = self.store.read(exchange, symbol, interval)
+                if len(candles) == 0:
+                    return {"gaps": [], "unfillable": [], "verified_until": None, "verified_count": 0}
+                gaps = find_gaps(candles["timestamp"], interval).tolist()
+                previous = self._load_meta(exchange, symbol, interval) or {}
+                unfillable = [gap for gap in previous.get("unfillable", []) if gap in gaps]
+                meta = {"gaps": [gap for gap in gaps if gap not in unfillable], "unfillable": unfillable}
+            else:
+                # The tail starts at the last verified candle, so a gap right after it is found too.
+                if len(tail) <= 1:
+                    return meta
+                meta["gaps"] += find_gaps(tail["timestamp"], interval).tolist()
+                candles = tail
+            last_ts = int(candles["timestamp"][-1])
+            meta["verified_until"] = last_ts
+            meta["verified_count"] = total - len(self.store.read(exchange, symbol, interval, since=last_ts))
+            self._save_meta(exchange, symbol, interval, meta)
+            return meta
+
+    def gaps(self, exchange: str, symbol: str, interval: str, since: int = None, until: int = None,
+             include_unfillable: bool = False) -> list:
+        """Returns the gaps overlapping [since, until), from the incremental scan."""
+        meta = self.scan(exchange, symbol, interval)
+        gaps = meta["gaps"] + (meta["unfillable"] if include_unfillable else [])
+        return sorted(_overlapping(gaps, since, until))
+
+    def mark_unfillable(self, exchange: str, symbol: str, interval: str, gap: list) -> None:
+        """Records that the exchange has no candles for a gap so it is not fetched again."""
+        with self._lock:
+            meta = self._load_meta(exchange, symbol, interval)
+            if meta is None or list(gap) not in meta["gaps"]:
+                return
+            meta["gaps"].remove(list(gap))
+            meta["unfillable"].append(list(gap))
+            self._save_meta(exchange, symbol, interval, meta)
+
+    def report(self, exchange: str = None) -> list:
+        """Lists gap statistics for every stored series (optionally of one exchange).
+
+        Returns:
+            list: Dicts with exchange, symbol, interval, candles, gaps, missing_bars and
+            unfillable, sorted by missing bars (worst first).
+        """
+        rows = []
+        base_dir = self.store.base_dir
+        if not base_dir.exists():
+            return rows
+        exchange_dirs = [base_dir / exchange.lower()] if exchange else [path for path in base_dir.iterdir() if path.is_dir()]
+        for exchange_dir in exchange_dirs:
+            for symbol_dir in sorted(path for path in exchange_dir.glob("*") if path.is_dir()):
+                for interval_dir in sorted(path for path in symbol_dir.glob("*") if path.is_dir()):
+                    name, symbol, interval = exchange_dir.name, symbol_dir.name, interval_dir.name
+                    meta = self.scan(name, symbol, interval)
+                    rows.append({
+                        "exchange": name,
+                        "symbol": symbol,
+                        "interval": interval,
+                        "candles": self.store.count(name, symbol, interval),
+                        "gaps": len(meta["gaps"]),
+                        "missing_bars": missing_bars(meta["gaps"], interval),
+                        "unfillable": len(meta["unfillable"])
+                    })
+        return sorted(rows, key=lambda row: -row["missing_bars"])
+
+
+class GapBackfiller:
+    """Fetches only the missing ranges of a stored series and writes them in place.
+
+    Requests run in the rate limiter's background lane. A gap for which the exchange
+    returns no candles is marked unfillable and skipped by later runs.
+    """
+
+    def __init__(self, scanner: GapScanner = None, max_retries: int = 3):
+        self.scanner = scanner or GapScanner()
+        self.store = self.scanner.store
+        self.max_retries = max_retries
+
+    async def _fetch_range(self, exchange, symbol: str, interval: str, start: int, end: int, page_limit: int) -> list:
+        rows = []
+        for page_start, page_end in plan_pages(start, end, interval_to_milliseconds(interval), page_limit):
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    with request_priority(PRIORITY_BACKGROUND):
+                        ohlcv = await exchange.fetch_ohlcv(symbol, interval, since=page_start, limit=page_limit)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    logging.warning(f"Backfill page {page_start}-{page_end} for {symbol} {interval} failed (attempt {attempt}/{self.max_retries}): {str(e)}")
+                    await asyncio.sleep(2 ** attempt)
+            rows.extend(row for row in ohlcv or [] if page_start <= row[0] < page_end)
+        return rows
+
+    async def backfill(self, exchange, exchange_name: str, symbol: str, interval: str, since: int = None, until: int = None) -> dict:
+        """Fills the known gaps of a series that overlap [since, until).
+
+        Args:
+            exchange: ccxt async client (ideally from the exchange pool).
+            exchange_name (str): Exchange name used in the store.
+            symbol (str): Trading symbol.
+            interval (str): Time interval.
+            since (int): Only gaps ending after this time (ms).
+            until (int): Only gaps starting before this time (ms).
+
+        Returns:
+            dict: {"gaps": gaps attempted, "filled": candles written, "unfillable": gaps the exchange could not fill}.
+        """
+        interval = normalize_interval(interval)
+        page_limit = PAGE_LIMITS.get(exchange_name.lower(), DEFAULT_PAGE_LIMIT)
+        gaps = self.scanner.gaps(exchange_name, symbol, interval, since, until)
+        filled = 0
+        unfillable = 0
+        for start, end in gaps:
+            try:
+                rows = await self._fetch_range(exchange, symbol, interval, start, end, page_limit)
+            except Exception as e:
+                logging.error(f"Backfill of {symbol} {interval} on {exchange_name} for {start}-{end} failed: {str(e)}")
+                continue
+            if not rows:
+                self.scanner.mark_unfillable(exchange_name, symbol, interval, [start, end])
+                unfillable += 1
+                continue
+            filled += self.store.append(exchange_name, symbol, interval, rows)
+        if gaps:
+            # Appending older candles changed the count before the watermark: rescan.
+            self.scanner.scan(exchange_name, symbol, interval)
+            logging.info(f"Backfilled {filled} candles into {len(gaps)} gaps of {symbol} {interval} on {exchange_name} ({unfillable} unfillable)")
+        return {"gaps": len(gaps), "filled": filled, "unfillable": unfillable}
+
+    def start(self, exchange, exchange_name: str, symbol: str, interval: str, since: int = None, until: int = None) -> asyncio.Task:
+        """Runs backfill() as a background task on the running event loop."""
+        return asyncio.get_running_loop().create_task(self.backfill(exchange, exchange_name, symbol, interval, since, until))
+
+
+_default_scanner = None
+_default_scanner_lock = threading.Lock()
+
+
+def get_gap_scanner() -> GapScanner:
+    """Returns the process-wide gap scanner over the default candle store."""
+    global _default_scanner
+    with _default_scanner_lock:
+        if _default_scanner is None:
+            _default_scanner = GapScanner()
+        return _default_scanner
+
+
+if __name__ == "__main__":
+    # Report mode: python -m src.core.candle_gaps [exchange]
+    import sys
+    for row in get_gap_scanner().report(sys.argv[1] if len(sys.argv) > 1 else None):
+        print(f"{row['exchange']:<10} {row['symbol']:<14} {row['interval']:<5} candles={row['candles']:<8} gaps={row['gaps']:<5} missing={row['missing_bars']:<7} unfillable={row['unfillable']}")
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\candle_resampler.py
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.core.candle_store import CANDLE_DTYPE, CandleStore, candles_to_dataframe, get_candle_store
+from utils.normalization import normalize_symbol, normalize_interval, interval_to_milliseconds
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+DAY_MS = 86_400_000
+WEEK_MS = 7 * DAY_MS
+# 1970-01-05 was the first Monday after the epoch; weekly bars open on Monday 00:00 UTC.
+MONDAY_EPOCH_MS = 4 * DAY_MS
+
+
+def bucket_starts(timestamps: np.ndarray, interval: str, offset_ms: int = 0) -> np.ndarray:
+    """Returns the open time of the target bar for every source timestamp (ms).
+
+    Minute/hour/day bars are aligned to UTC epoch multiples shifted by offset_ms (for
+    exchanges whose daily bars open at another hour), weekly bars to Monday 00:00 and
+    monthly bars to the first day of the calendar month.
+    """
+    interval = normalize_interval(interval)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if interval.endswith("mo"):
+        months = int(interval[:-2])
+        month_index = (timestamps - offset_ms).astype("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+        month_index -= month_index % months
+        return month_index.astype("datetime64[M]").astype("datetime64[ms]").astype(np.int64) + offset_ms
+    interval_ms = interval_to_milliseconds(interval)
+    anchor = offset_ms + (MONDAY_EPOCH_MS if interval.endswith("w") else 0)
+    return timestamps - (timestamps - anchor) % interval_ms
+
+
+def bucket_end(start: int, interval: str, offset_ms: int = 0) -> int:
+    """Returns the close time (exclusive) of the target bar opening at start."""
+    interval = normalize_interval(interval)
+    if interval.endswith("mo"):
+        month = np.datetime64(int(start - offset_ms), "ms").astype("datetime64[M]") + int(interval[:-2])
+        return int(month.astype("datetime64[ms]").astype(np.int64)) + offset_ms
+    return start + interval_to_milliseconds(interval)
+
+
+def resample_candles(candles: np.ndarray, interval: str, source_interval: str = "1m", include_partial: bool = False, offset_ms: int = 0) -> np.ndarray:
+    """Aggregates sorted CANDLE_DTYPE candles into a higher timeframe.
+
+    open = first, high = max, low = min, close = last, volume = sum, computed with
+    np.*.reduceat over bar boundaries. A bar is partial when the source data does not
+    cover it from its open to its close (history starts inside it, or it is still
+    forming); partial bars are dropped unless include_partial is True.
+
+    Args:
+        candles (np.ndarray): Source candles sorted by timestamp, without duplicates.
+        interval (str): Target interval (e.g. '5m', '4h', '1w', '1mo').
+        source_interval (str): Interval of the source candles.
+        include_partial (bool): Keep the incomplete first/last bars.
+        offset_ms (int): Shift of the bar boundaries relative to UTC.
+
+    Returns:
+        np.ndarray: CANDLE_DTYPE array of target bars.
+    """
+    if len(candles) == 0:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+    timestamps = candles["timestamp"]
+    keys = bucket_starts(timestamps, interval, offset_ms)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.append(starts[1:], len(candles)) - 1
+
+    bars = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    bars["timestamp"] = keys[starts]
+    bars["open"] = candles["open"][starts]
+    bars["high"] = np.maximum.reduceat(candles["high"], starts)
+    bars["low"] = np.minimum.reduceat(candles["low"], starts)
+    bars["close"] = candles["close"][ends]
+    bars["volume"] = np.add.reduceat(candles["volume"], starts)
+
+    if not include_partial:
+        source_ms = interval_to_milliseconds(source_interval)
+        keep = np.ones(len(bars), dtype=bool)
+        keep[0] = timestamps[0] == bars["timestamp"][0]
+        keep[-1] &= timestamps[-1] + source_ms >= bucket_end(int(bars["timestamp"][-1]), interval, offset_ms)
+        bars = bars[keep]
+    return bars
+
+
+class CandleResampler:
+    """Serves higher-timeframe views of 1m candles from the candle store.
+
+    Complete bars are cached in memory (LRU) per (exchange, symbol, interval, offset)
+    together with the close time of the last cached bar; later requests only resample
+    the source candles after that point.
+    """
+
+    def __init__(self, store: CandleStore = None, source_interval: str = "1m", max_entries: int = 64):
+        self.store = store or get_candle_store()
+        self.source_interval = normalize_interval(source_interval)
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def covers(self, exchange: str, symbol: str, since: int, until: int) -> bool:
+        """Checks whether stored source candles span [since, until)."""
+        first_ts = self.store.first_timestamp(exchange, symbol, self.source_interval)
+        last_ts = self.store.last_timestamp(exchange, symbol, self.source_interval)
+        if first_ts is None or last_ts is None:
+            return False
+        return first_ts <= since and last_ts + interval_to_milliseconds(self.source_interval) >= until
+
+    def _complete_bars(self, exchange: str, symbol: str, interval: str, offset_ms: int) -> np.ndarray:
+        key = (exchange.lower(), normalize_symbol(symbol), interval, offset_ms)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        total = self.store.count(exchange, symbol, self.source_interval)
+        if cached is not None:
+            bars, resume_from, aggregated = cached
+            source = self.store.read(exchange, symbol, self.source_interval, since=resume_from)
+            if total - len(source) != aggregated:
+                # Older candles were added (backfill) since the bars were cached: rebuild.
+                cached = None
+        if cached is None:
+            bars, resume_from = np.empty(0, dtype=CANDLE_DTYPE), None
+            source = self.store.read(exchange, symbol, self.source_interval)
+            new_bars = resample_candles(source, interval, self.source_interval, offset_ms=offset_ms)
+        else:
+            new_bars = resample_candles(source, interval, self.source_interval, include_partial=True, offset_ms=offset_ms)
+            # Data before resume_from is already aggregated, so only the tail can be partial.
+            if len(new_bars) and source["timestamp"][-1] + interval_to_milliseconds(self.source_interval) < bucket_end(int(new_bars["timestamp"][-1]), interval, offset_ms):
+                new_bars = new_bars[:-1]
+        if len(new_bars):
+            bars = np.concatenate([bars, new_bars]) if len(bars) else new_bars
+            resume_from = bucket_end(int(bars["timestamp"][-1]), interval, offset_ms)
+            aggregated = total - len(self.store.read(exchange, symbol, self.source_interval, since=resume_from))
+            with self._lock:
+                self._cache[key] = (bars, resume_from, aggregated)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return bars
+
+    def resample(self, exchange: str, symbol: str, interval: str, since: int = None, until: int = None,
+                 include_partial: bool = False, offset_ms: int = 0) -> np.ndarray:
+        """Returns interval bars opening in [since, until) built from stored source candles.
+
+        Args:
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            interval (str): Target interval.
+            since (int): Earliest bar open time (ms), inclusive.
+            until (int): Latest bar open time (ms), exclusive.
+            include_partial (bool): Append the still-forming last bar.
+            offset_ms (int): Shift of the bar boundaries relative to UTC.
+
+        Returns:
+            np.ndarray: CANDLE_DTYPE array of bars.
+        """
+        interval = normalize_interval(interval)
+        if interval == self.source_interval:
+            return self.store.read(exchange, symbol, interval, since=since, until=until)
+        bars = self._complete_bars(exchange, symbol, interval, offset_ms)
+        if include_partial:
+            tail_from = bucket_end(int(bars["timestamp"][-1]), interval, offset_ms) if len(bars) else None
+            tail = self.store.read(exchange, symbol, self.source_interval, since=tail_from)
+            partial = resample_candles(tail, interval, self.source_interval, include_partial=True, offset_ms=offset_ms)
+            if len(partial):
+                bars = np.concatenate([bars, partial[-1:]]) if len(bars) else partial[-1:]
+        timestamps = bars["timestamp"]
+        start = 0 if since is None else int(np.searchsorted(timestamps, since, side="left"))
+        end = len(bars) if until is None else int(np.searchsorted(timestamps, until, side="left"))
+        return bars[start:end]
+
+    def load_dataframe(self, exchange: str, symbol: str, interval: str, since: int = None, until: int = None,
+                       include_partial: bool = False, offset_ms: int = 0):
+        """Like resample(), as an OHLCV DataFrame (None when empty)."""
+        bars = self.resample(exchange, symbol, interval, since, until, include_partial, offset_ms)
+        return candles_to_dataframe(bars) if len(bars) else None
+
+
+_default_resampler = None
+_default_resampler_lock = threading.Lock()
+
+
+def get_candle_resampler() -> CandleResampler:
+    """Returns the process-wide resampler over the default candle store."""
+    global _default_resampler
+    with _default_resampler_lock:
+        if _default_resampler is None:
+            _default_resampler = CandleResampler()
+        return _default_resampler
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\candle_store.py
+import logging
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from utils.normalization import normalize_symbol, normalize_interval
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# One candle = int64 timestamp (ms, UTC) + 5 x float64, 48 bytes, little-endian.
+CANDLE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8")
+])
+OHLCV_COLUMNS = list(CANDLE_DTYPE.names)
+FALLBACK_EXCHANGE = "fallback"
+# Partitions kept mapped between reads; least recently used maps beyond this are dropped.
+MAX_OPEN_PARTITIONS = 64
+
+
+def to_candle_array(ohlcv) -> np.ndarray:
+    """Converts ccxt-style OHLCV rows ([ts, o, h, l, c, v], ...) or a structured array to CANDLE_DTYPE."""
+    if isinstance(ohlcv, np.ndarray) and ohlcv.dtype == CANDLE_DTYPE:
+        return ohlcv
+    rows = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+    candles = np.empty(len(rows), dtype=CANDLE_DTYPE)
+    candles["timestamp"] = rows[:, 0].astype(np.int64)
+    for i, name in enumerate(OHLCV_COLUMNS[1:], start=1):
+        candles[name] = rows[:, i]
+    return candles
+
+
+def candles_to_dataframe(candles: np.ndarray) -> pd.DataFrame:
+    """Builds the DataFrame layout used across the app (timestamp as datetime, OHLCV floats)."""
+    df = pd.DataFrame({name: candles[name] for name in OHLCV_COLUMNS})
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def _month_keys(timestamps: np.ndarray) -> np.ndarray:
+    """Returns UTC month numbers (months since 1970-01) for ms timestamps."""
+    return timestamps.astype("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+
+
+def _month_label(month_number: int) -> str:
+    return str(np.datetime64(int(month_number), "M")).replace("-", "")
+
+
+class CandleStore:
+    """Local OHLCV store kept as fixed-width binary partitions.
+
+    Layout: <base_dir>/<exchange>/<SYMBOL>/<interval>/<YYYYMM>.bin, every file an array of
+    CANDLE_DTYPE records sorted by timestamp without duplicates. Partitions are read with
+    np.memmap, so a range query touching one month returns a zero-copy view of the file.
+    The store keeps the maps of recently read partitions open and drops a partition's map
+    before rewriting it (Windows refuses to replace a file that is still mapped).
+    """
+
+    def __init__(self, base_dir: Path = None):
+        self.base_dir = Path(base_dir) if base_dir else Path(__file__).resolve().parents[2] / "data" / "candles"
+        self._lock = threading.RLock()
+        self._maps = OrderedDict()
+
+    def series_dir(self, exchange: str, symbol: str, interval: str) -> Path:
+        return self.base_dir / exchange.lower() / normalize_symbol(symbol) / normalize_interval(interval)
+
+    def partitions(self, exchange: str, symbol: str, interval: str) -> list:
+        """Returns sorted (YYYYMM, path) pairs for one series."""
+        series_dir = self.series_dir(exchange, symbol, interval)
+        if not series_dir.exists():
+            return []
+        return sorted((path.stem, path) for path in series_dir.glob("*.bin") if path.stat().st_size > 0)
+
+    def exchanges(self, symbol: str, interval: str) -> list:
+        """Returns the exchanges that have stored candles for symbol/interval."""
+        if not self.base_dir.exists():
+            return []
+        return sorted(path.name for path in self.base_dir.iterdir() if path.is_dir() and self.partitions(path.name, symbol, interval))
+
+    def _map(self, path: Path) -> np.ndarray:
+        size = path.stat().st_size
+        with self._lock:
+            cached = self._maps.get(path)
+            # An append grows the file beyond the mapped length: map it again.
+            if cached is not None and cached[0] == size:
+                self._maps.move_to_end(path)
+                return cached[1]
+            candles = np.memmap(path, dtype=CANDLE_DTYPE, mode="r")
+            self._maps[path] = (size, candles)
+            self._maps.move_to_end(path)
+            while len(self._maps) > MAX_OPEN_PARTITIONS:
+                self._maps.popitem(last=False)
+            return candles
+
+    def _release(self, path: Path) -> None:
+        """Drops the store's map of a partition; the file is unmapped once no view of it is left."""
+        with self._lock:
+            self._maps.pop(path, None)
+
+    def _replace(self, tmp_path: Path, path: Path, merged: np.ndarray) -> None:
+        self._release(path)
+        try:
+            os.replace(tmp_path, path)
+        except PermissionError as e:
+            # A caller still holds a view of the old file (Windows). The merged partition only grows,
+            # so write it over the existing file instead; those views then see the merged contents.
+            logging.warning(f"Partition {path} is still mapped ({str(e)}), rewriting it in place")
+            with open(path, "r+b") as f:
+                f.write(merged.tobytes())
+            os.remove(tmp_path)
+
+    def read(self, exchange: str, symbol: str, interval: str, since: int = None, until: int = None) -> np.ndarray:
+        """Returns candles with since <= timestamp < until (ms) as a CANDLE_DTYPE array.
+
+        A query served by a single partition returns a read-only memmap view (no copy).
+        """
+        parts = self.partitions(exchange, symbol, interval)
+        if since is not None:
+            first_month = _month_label(_month_keys(np.array([since], dtype=np.int64))[0])
+            parts = [p for p in parts if p[0] >= first_month]
+        if until is not None:
+            last_month = _month_label(_month_keys(np.array([until - 1], dtype=np.int64))[0])
+            parts = [p for p in parts if p[0] <= last_month]
+        chunks = []
+        for _, path in parts:
+            candles = self._map(path)
+            start = 0 if since is None else int(np.searchsorted(candles["timestamp"], since, side="left"))
+            end = len(candles) if until is None else int(np.searchsorted(candles["timestamp"], until, side="left"))
+            if end > start:
+                chunks.append(candles[start:end])
+        if not chunks:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks)
+
+    def load_dataframe(self, exchange: str, symbol: str, interval: str, since: int = None, until: int = None, limit: int = None) -> pd.DataFrame:
+        """Reads a range as a DataFrame; limit keeps only the newest candles. Returns None when empty."""
+        candles = self.read(exchange, symbol, interval, since=since, until=until)
+        if limit is not None:
+            candles = candles[-limit:]
+        if len(candles) == 0:
+            return None
+        return candles_to_dataframe(candles)
+
+    def first_timestamp(self, exchange: str, symbol: str, interval: str):
+        parts = self.partitions(exchange, symbol, interval)
+        return int(self._map(parts[0][1])["timestamp"][0]) if parts else None
+
+    def last_timestamp(self, exchange: str, symbol: str, interval: str):
+        parts = self.partitions(exchange, symbol, interval)
+        return int(self._map(parts[-1][1])["timestamp"][-1]) if parts else None
+
+    def count(self, exchange: str, symbol: str, interval: str) -> int:
+        return sum(path.stat().st_size // CANDLE_DTYPE.itemsize for _, path in self.partitions(exchange, symbol, interval))
+
+    def append(self, exchange: str, symbol: str, interval: str, ohlcv) -> int:
+        """Writes candles into their monthly partitions, de-duplicated by timestamp.
+
+        Candles newer than the stored tail are appended to the file. A candle with the
+        timestamp of the stored last candle (the still-forming bar) overwrites it in place.
+        Only older, out-of-order candles trigger a rewrite of the affected partition.
+
+        Args:
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            interval (str): Time interval.
+            ohlcv: ccxt-style rows or a CANDLE_DTYPE array.
+
+        Returns:
+            int: Number of candles that were not stored before.
+        """
+        candles = to_candle_array(ohlcv)
+        if len(candles) == 0:
+            return 0
+        # Sort and keep the last occurrence of every timestamp in the incoming batch.
+        candles = candles[np.argsort(candles["timestamp"], kind="stable")]
+        keep = np.append(candles["timestamp"][1:] != candles["timestamp"][:-1], True)
+        candles = candles[keep]
+
+        series_dir = self.series_dir(exchange, symbol, interval)
+        months = _month_keys(candles["timestamp"])
+        boundaries = np.flatnonzero(np.diff(months)) + 1
+        added = 0
+        with self._lock:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            for chunk in np.split(candles, boundaries):
+                path = series_dir / f"{_month_label(_month_keys(chunk['timestamp'][:1])[0])}.bin"
+                added += self._write_partition(path, chunk)
+        logging.debug(f"Stored {added} new candles for {exchange} {symbol} {interval}")
+        return added
+
+    def _write_partition(self, path: Path, chunk: np.ndarray) -> int:
+        existing_size = path.stat().st_size if path.exists() else 0
+        if existing_size == 0:
+            with open(path, "wb") as f:
+                f.write(chunk.tobytes())
+            return len(chunk)
+
+        stored = self._map(path)
+        last_ts = int(stored["timestamp"][-1])
+        first_new = int(chunk["timestamp"][0])
+        del stored
+        if first_new >= last_ts:
+            with open(path, "r+b") as f:
+                if first_new == last_ts:
+                    f.seek(existing_size - CANDLE_DTYPE.itemsize)
+                    f.write(chunk[:1].tobytes())
+                    chunk = chunk[1:]
+                f.seek(0, os.SEEK_END)
+                f.write(chunk.tobytes())
+            return len(chunk)
+
+        stored = np.fromfile(path, dtype=CANDLE_DTYPE)
+        merged = np.concatenate([stored, chunk])
+        merged = merged[np.argsort(merged["timestamp"], kind="stable")]
+        keep = np.append(merged["timestamp"][1:] != merged["timestamp"][:-1], True)
+        merged = merged[keep]
+        tmp_path = path.with_suffix(".tmp")
+        merged.tofile(tmp_path)
+        self._replace(tmp_path, path, merged)
+        return len(merged) - len(stored)
+
+    def import_fallback_json(self, json_file: Path, exchange: str = FALLBACK_EXCHANGE) -> int:
+        """Imports the legacy fallback_ohlcv.json ({symbol: {interval: [[ts, o, h, l, c, v], ...]}})."""
+        with open(json_file, "r", encoding="utf-8") as f:
+            ohlcv_data = json.load(f)
+        imported = 0
+        for symbol, intervals in ohlcv_data.items():
+            for interval, rows in intervals.items():
+                if rows:
+                    imported += self.append(exchange, symbol.replace("_", "/"), interval, rows)
+        logging.info(f"Imported {imported} candles from {json_file} into candle store {self.base_dir}")
+        return imported
+
+    def ensure_fallback_imported(self, json_file: Path = None) -> None:
+        """Imports fallback_ohlcv.json once (again only if the file changes)."""
+        json_file = Path(json_file) if json_file else self.base_dir.parent / "fallback_ohlcv.json"
+        if not json_file.exists():
+            return
+        marker = self.base_dir / ".fallback_imported"
+        stamp = str(json_file.stat().st_mtime_ns)
+        with self._lock:
+            if marker.exists() and marker.read_text(encoding="utf-8") == stamp:
+                return
+            self.import_fallback_json(json_file)
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(stamp, encoding="utf-8")
+
+    def load_fallback(self, symbol: str, interval: str, limit: int = None) -> pd.DataFrame:
+        """Loads fallback candles for symbol/interval from whichever exchange has the newest data."""
+        self.ensure_fallback_imported()
+        exchanges = self.exchanges(symbol, interval)
+        if not exchanges:
+            return None
+        exchange = max(exchanges, key=lambda name: self.last_timestamp(name, symbol, interval))
+        return self.load_dataframe(exchange, symbol, interval, limit=limit)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_candle_store() -> CandleStore:
+    """Returns the process-wide candle store rooted at data/candles."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CandleStore()
+        return _default_store
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\clock.py
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Event loop iterations a VirtualClock lets pass without any ready callback before it moves time forward.
+SETTLE_ROUNDS = 2
+
+
+class WallClock:
+    """Real time: what the runtime uses outside of a replay."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self, tz=None) -> datetime:
+        return datetime.now(tz=tz)
+
+    async def sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+
+class VirtualClock:
+    """Simulated time for replaying the paper runtime from stored candles.
+
+    sleep() registers a wake-up time instead of waiting. run_until() (a task on the
+    same loop) waits until the loop has nothing left to do at the current instant,
+    moves time to the earliest wake-up and wakes that one sleeper, then settles the
+    loop again before waking the next one - also when several sleepers wake at the same
+    instant. Every bar of every market is thus processed to the end (fetch, signal,
+    journal, results) before the next one starts, in the order the sleeps were
+    registered, so a replay is deterministic and runs as fast as the CPU allows. With
+    speed the replay is paced at speed x real time instead.
+
+    Args:
+        start (float): Initial time, epoch seconds.
+        speed (float): Virtual seconds per real second; None or 0 = as fast as possible.
+    """
+
+    def __init__(self, start: float, speed: float = None):
+        self._now = float(start)
+        self.speed = speed
+        self._sleepers = []
+        self._order = itertools.count()
+        self.wakeups = 0
+
+    def time(self) -> float:
+        return self._now
+
+    def now(self, tz=None) -> datetime:
+        return datetime.fromtimestamp(self._now, tz=tz)
+
+    async def sleep(self, delay: float) -> None:
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + delay, next(self._order), future))
+        await future
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for _, _, future in self._sleepers if not future.done())
+
+    async def _settle(self) -> None:
+        loop = asyncio.get_running_loop()
+        # BaseEventLoop keeps its runnable callbacks in _ready; other loops get a fixed number of rounds.
+        ready = getattr(loop, "_ready", None)
+        idle = 0
+        rounds = 0
+        while idle < SETTLE_ROUNDS:
+            await asyncio.sleep(0)
+            rounds += 1
+            if ready is None:
+                idle = SETTLE_ROUNDS if rounds >= 50 else 0
+            else:
+                idle = idle + 1 if not ready else 0
+
+    async def advance(self, end: float = None) -> bool:
+        """Settles the loop and wakes the next sleeper; returns False when nobody sleeps (before end)."""
+        await self._settle()
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)  # cancelled sleep
+        if not self._sleepers or (end is not None and self._sleepers[0][0] > end):
+            return False
+        wake_at, _, future = heapq.heappop(self._sleepers)
+        if self.speed and wake_at > self._now:
+            await asyncio.sleep((wake_at - self._now) / self.speed)
+        self._now = max(self._now, wake_at)
+        future.set_result(None)
+        self.wakeups += 1
+        return True
+
+    async def run_until(self, end: float) -> None:
+        """Advances time until end (epoch seconds) or until no task sleeps any more."""
+        while await self.advance(end):
+            pass
+        if self.pending:
+            self._now = max(self._now, end)
+
+
+_default_clock = None
+_default_clock_lock = threading.Lock()
+
+
+def get_clock():
+    """Returns the process-wide clock (WallClock unless a replay installed a VirtualClock)."""
+    global _default_clock
+    with _default_clock_lock:
+        if _default_clock is None:
+            _default_clock = WallClock()
+        return _default_clock
+
+
+def set_clock(clock) -> None:
+    """Installs clock as the process-wide clock; None restores the wall clock."""
+    global _default_clock
+    with _default_clock_lock:
+        _default_clock = clock
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\engine.py
+"""Headless trading engine.
+
+Runs every paper/live runner and backtest on one asyncio loop in its own process and
+serves a JSON-lines protocol on a localhost TCP socket. The Tk GUI is a client of
+this process (EngineClient), so runners keep their pace however busy the GUI is.
+
+Run it with: python -m src.core.engine [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import numbers
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from src.core.exchange_pool import get_exchange_pool
+from src.core.results_writer import get_results_writer
+from src.core.trade_manager_live import TradeManagerLive
+from src.core.trade_manager_simulation import TradeManagerSimulation
+from src.tabs.strategies.strategies_backtest import run_backtest
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+RUNNER_KINDS = ("paper", "live", "backtest")
+# Seconds the GUI waits for a freshly spawned engine to accept connections.
+SPAWN_TIMEOUT = 15.0
+
+
+def encode_message(message: dict) -> bytes:
+    return (json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def result_summary(result):
+    """Returns the scalar fields of a runner result (figures and results_dir); candles, signals and trades stay on disk."""
+    if not isinstance(result, dict):
+        return result
+    return {k: v for k, v in result.items() if v is None or isinstance(v, (str, bool, numbers.Number))}
+
+
+def runner_key(kind: str, strategy_name: str, symbol: str) -> str:
+    return f"{kind}:{strategy_name}:{symbol}"
+
+
+class _Runner:
+    __slots__ = ("key", "kind", "strategy", "symbol", "interval", "params", "task", "status", "started_at", "finished_at", "error")
+
+    def __init__(self, key, kind, strategy, symbol, interval, params):
+        self.key = key
+        self.kind = kind
+        self.strategy = strategy
+        self.symbol = symbol
+        self.interval = interval
+        self.params = params
+        self.task = None
+        self.status = "starting"
+        self.started_at = datetime.now(tz=ZoneInfo("Europe/Warsaw")).isoformat()
+        self.finished_at = None
+        self.error = None
+
+    def info(self) -> dict:
+        return {
+            "key": self.key, "kind": self.kind, "strategy": self.strategy, "symbol": self.symbol, "interval": self.interval,
+            "status": self.status, "started_at": self.started_at, "finished_at": self.finished_at, "error": self.error
+        }
+
+
+class TradingEngine:
+    """Owns all runners of the process and publishes their lifecycle events.
+
+    start() schedules a paper/live runner or a backtest as a task on the running loop
+    (one runner per kind, strategy and symbol; starting a running one restarts it),
+    stop() cancels it. Every change is published as an event dict ("started",
+    "finished" with the summary of the runner's result, "failed", "stopped") to the queues handed out
+    by subscribe().
+    """
+
+    def __init__(self):
+        self.runners = {}
+        self._subscribers = set()
+        self._simulation = None
+        self._live = None
+
+    def _runner_coroutine(self, runner: _Runner):
+        if runner.kind == "paper":
+            if self._simulation is None:
+                self._simulation = TradeManagerSimulation()
+            return self._simulation.paper_trade(runner.strategy, runner.symbol, runner.interval, mode=runner.params.get("mode", "paper"))
+        if runner.kind == "live":
+            if self._live is None:
+                self._live = TradeManagerLive()
+            return self._live.start_live_trading(runner.strategy, runner.symbol, runner.interval)
+        return run_backtest(runner.strategy, runner.symbol, period=runner.params.get("period", 8760), interval=runner.interval)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _publish(self, event: str, runner: _Runner, **data) -> None:
+        message = {"event": event, "runner": runner.info(), **data}
+        for queue in list(self._subscribers):
+            queue.put_nowait(message)
+
+    async def start(self, kind: str, strategy: str, symbol: str, interval: str = "1h", **params) -> dict:
+        """Starts a runner; kind is "paper", "live" or "backtest"."""
+        if kind not in RUNNER_KINDS:
+            raise ValueError(f"Unknown runner kind {kind}, expected one of {RUNNER_KINDS}")
+        key = runner_key(kind, strategy, symbol)
+        if key in self.runners and self.runners[key].status == "running":
+            await self.stop(key)
+        runner = _Runner(key, kind, strategy, symbol, interval, params)
+        self.runners[key] = runner
+        runner.task = asyncio.get_running_loop().create_task(self._run(runner))
+        runner.status = "running"
+        self._publish("started", runner)
+        logging.info(f"Engine started {key} ({interval})")
+        return runner.info()
+
+    def _finish(self, runner: _Runner, status: str, error: str = None, **data) -> None:
+        runner.status = status
+        runner.error = error
+        runner.finished_at = datetime.now(tz=ZoneInfo("Europe/Warsaw")).isoformat()
+        self._publish(status, runner, **data)
+
+    async def _run(self, runner: _Runner) -> None:
+        try:
+            result = await self._runner_coroutine(runner)
+        except asyncio.CancelledError:
+            self._finish(runner, "stopped")
+            raise
+        except Exception as e:
+            logging.error(f"Engine runner {runner.key} failed: {str(e)}")
+            self._finish(runner, "failed", str(e))
+        else:
+            self._finish(runner, "finished", result=result_summary(result))
+
+    async def stop(self, key: str) -> bool:
+        """Cancels a runner and waits until it has released its resources."""
+        runner = self.runners.get(key)
+        if runner is None or runner.task is None or runner.task.done():
+            return False
+        runner.task.cancel()
+        try:
+            await runner.task
+        except asyncio.CancelledError:
+            pass
+        logging.info(f"Engine stopped {key}")
+        return True
+
+    def status(self) -> list:
+        return [runner.info() for runner in self.runners.values()]
+
+    async def shutdown(self) -> None:
+        """Stops every runner and flushes results and pooled clients."""
+        for key in list(self.runners):
+            await self.stop(key)
+        get_results_writer().shutdown()
+        await get_exchange_pool().close_all()
+
+
+class EngineServer:
+    """Serves a TradingEngine to local clients, one JSON object per line.
+
+    Requests: {"id": n, "cmd": "ping" | "status" | "start" | "stop" | "subscribe" |
+    "unsubscribe" | "shutdown", ...params}. Responses: {"id": n, "ok": true, "result": ...}
+    or {"id": n, "ok": false, "error": "..."}. A subscribed connection also receives the
+    engine's events ({"event": ..., "runner": {...}}) as they happen.
+    """
+
+    def __init__(self, engine: TradingEngine, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self._server = None
+        self._stopped = None
+
+    async def start(self) -> int:
+        """Starts listening; returns the bound port (useful with port=0)."""
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Engine listening on {self.host}:{self.port}")
+        return self.port
+
+    async def serve_until_shutdown(self) -> None:
+        await self._stopped.wait()
+        self._server.close()
+        await self._server.wait_closed()
+        await self.engine.shutdown()
+
+    def request_shutdown(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _dispatch(self, request: dict, subscription: dict):
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            return "pong"
+        if cmd == "status":
+            return self.engine.status()
+        if cmd == "start":
+            params = {k: v for k, v in request.items() if k not in ("id", "cmd")}
+            return await self.engine.start(**params)
+        if cmd == "stop":
+            return await self.engine.stop(request.get("key") or runner_key(request["kind"], request["strategy"], request["symbol"]))
+        if cmd == "subscribe":
+            if subscription["queue"] is None:
+                subscription["queue"] = self.engine.subscribe()
+                subscription["task"] = asyncio.get_running_loop().create_task(self._forward(subscription))
+            return True
+        if cmd == "unsubscribe":
+            self._drop_subscription(subscription)
+            return True
+        if cmd == "shutdown":
+            self.request_shutdown()
+            return True
+        raise ValueError(f"Unknown command {cmd}")
+
+    async def _forward(self, subscription: dict) -> None:
+        while True:
+            message = await subscription["queue"].get()
+            async with subscription["lock"]:
+                subscription["writer"].write(encode_message(message))
+                await subscription["writer"].drain()
+
+    def _drop_subscription(self, subscription: dict) -> None:
+        if subscription["queue"] is not None:
+            self.engine.unsubscribe(subscription["queue"])
+            subscription["task"].cancel()
+            subscription["queue"] = subscription["task"] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscription = {"queue": None, "task": None, "writer": writer, "lock": asyncio.Lock()}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    response = {"id": request_id, "ok": True, "result": await self._dispatch(request, subscription)}
+                except Exception as e:
+                    response = {"id": request_id, "ok": False, "error": str(e)}
+                async with subscription["lock"]:
+                    writer.write(encode_message(response))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._drop_subscription(subscription)
+            writer.close()
+
+
+class EngineClient:
+    """Blocking client of the engine for the GUI (no asyncio, no tkinter).
+
+    A reader thread matches responses to pending requests and hands events to the
+    callbacks registered with on_event(); callbacks run on that thread, so GUI code
+    must marshal them onto the Tk thread (e.g. with widget.after).
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sock = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._callbacks = []
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._reader = None
+
+    def connect(self) -> "EngineClient":
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.settimeout(None)
+        self._reader = threading.Thread(target=self._read_loop, name="engine-client", daemon=True)
+        self._reader.start()
+        return self
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def _read_loop(self) -> None:
+        try:
+            for line in self._sock.makefile("rb"):
+                message = json.loads(line)
+                if "event" in message:
+                    for callback in list(self._callbacks):
+                        try:
+                            callback(message)
+                        except Exception as e:
+                            logging.error(f"Engine event callback failed: {str(e)}")
+                    continue
+                with self._lock:
+                    pending = self._pending.pop(message.get("id"), None)
+                if pending is not None:
+                    pending[1] = message
+                    pending[0].set()
+        except (OSError, ValueError) as e:
+            logging.warning(f"Engine connection closed: {str(e)}")
+        finally:
+            self.close()
+            with self._lock:
+                pending, self._pending = list(self._pending.values()), {}
+            for item in pending:
+                item[1] = {"ok": False, "error": "engine connection closed"}
+                item[0].set()
+
+    def request(self, cmd: str, **params):
+        """Sends a command and waits for its result; raises RuntimeError on engine errors."""
+        if self._sock is None:
+            raise RuntimeError("Not connected to the engine")
+        request_id = next(self._ids)
+        pending = [threading.Event(), None]
+        with self._lock:
+            self._pending[request_id] = pending
+        with self._send_lock:
+            self._sock.sendall(encode_message({"id": request_id, "cmd": cmd, **params}))
+        if not pending[0].wait(self.timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise TimeoutError(f"Engine did not answer {cmd} within {self.timeout}s")
+        response = pending[1]
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "engine error"))
+        return response.get("result")
+
+    def on_event(self, callback) -> None:
+        """Calls callback(event) for every engine event (subscribes on first use)."""
+        self._callbacks.append(callback)
+        if len(self._callbacks) == 1:
+            self.request("subscribe")
+
+    def start_runner(self, kind: str, strategy: str, symbol: str, interval: str, **params) -> dict:
+        return self.request("start", kind=kind, strategy=strategy, symbol=symbol, interval=interval, **params)
+
+    def stop_runner(self, kind: str, strategy: str, symbol: str) -> bool:
+        return self.request("stop", kind=kind, strategy=strategy, symbol=symbol)
+
+    def status(self) -> list:
+        return self.request("status")
+
+    def close(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+def ensure_engine(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, spawn: bool = True) -> EngineClient:
+    """Connects to the engine, starting it as a separate process when none is listening."""
+    try:
+        return EngineClient(host, port).connect()
+    except OSError:
+        if not spawn:
+            raise
+    root = Path(__file__).resolve().parents[2]
+    logging.info(f"No engine on {host}:{port}, starting one")
+    subprocess.Popen([sys.executable, "-m", "src.core.engine", "--host", host, "--port", str(port)], cwd=root)
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while True:
+        try:
+            return EngineClient(host, port).connect()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_engine_client() -> EngineClient:
+    """Returns the process-wide connection to the engine (reconnecting/spawning if needed)."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None or not _default_client.connected:
+            _default_client = ensure_engine()
+        return _default_client
+
+
+async def run_engine(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 0) -> None:
+    engine = TradingEngine()
+    if workers > 0:
+        from src.core.shards import ShardedEngine  # shards imports this module
+        engine = ShardedEngine(workers)
+    server = EngineServer(engine, host, port)
+    await server.start()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, server.request_shutdown)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C ends asyncio.run and the "shutdown" command stops the engine cleanly
+    await server.serve_until_shutdown()
+    logging.info("Engine stopped")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Headless trading engine")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes for the runners (0: run them in the engine process)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_engine(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        logging.info("Engine interrupted")
+
+
+if __name__ == "__main__":
+    main()
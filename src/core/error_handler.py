@@ -3,11 +3,13 @@
 
 import logging
 import traceback
-import tkinter as tk
-from tkinter import messagebox
 from pathlib import Path
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tkinter as tk
 
 class ErrorHandler:
     """Centralny moduł do obsługi błędów w aplikacji.
@@ -42,7 +44,7 @@ class ErrorHandler:
         """
         self.logger.error(f"{context}: {message}", exc_info=exc_info)
 
-    def show_gui_error(self, parent: tk.Tk, title: str, message: str, exc_info: bool = False) -> None:
+    def show_gui_error(self, parent: "tk.Tk", title: str, message: str, exc_info: bool = False) -> None:
         """Wyświetla komunikat błędu w GUI i loguje go.
 
         Args:
@@ -53,9 +55,10 @@ class ErrorHandler:
         """
         full_message = f"{message}\nTraceback: {traceback.format_exc()}" if exc_info else message
         self.log_error(title, full_message, exc_info=exc_info)
+        from tkinter import messagebox  # GUI only; the headless engine never imports tkinter
         messagebox.showerror(title, full_message, parent=parent)
 
-    def log_and_show_error(self, parent: tk.Tk, context: str, message: str, exc_info: bool = True) -> None:
+    def log_and_show_error(self, parent: "tk.Tk", context: str, message: str, exc_info: bool = True) -> None:
         """Loguje i wyświetla błąd jednocześnie.
 
         Args:
@@ -65,4 +68,5 @@ class ErrorHandler:
             exc_info (bool): Czy dołączyć traceback.
         """
         self.log_error(context, message, exc_info)
+        from tkinter import messagebox
         messagebox.showerror(context, f"{message}\nTraceback: {traceback.format_exc()}" if exc_info else message, parent=parent)
\ No newline at end of file
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\exchange_health.py
+import asyncio
+import logging
+import threading
+import time
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Weight of the newest sample in the exponentially weighted latency/success averages.
+EWMA_ALPHA = 0.3
+# Latency assumed for an exchange that has never been measured (seconds).
+DEFAULT_LATENCY = 1.0
+# After this many consecutive failures an exchange is skipped for a cooldown that doubles per failure.
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN = 30.0
+MAX_COOLDOWN = 600.0
+# Number of alternatives queried at the same time; the rest start as earlier ones fail.
+DEFAULT_MAX_PARALLEL = 3
+
+
+class HealthRecord:
+    """Latency and success averages of one exchange."""
+
+    __slots__ = ("latency", "success_rate", "consecutive_failures", "cooldown_until", "successes", "failures")
+
+    def __init__(self):
+        self.latency = DEFAULT_LATENCY
+        self.success_rate = 1.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.successes = 0
+        self.failures = 0
+
+    def cost(self) -> float:
+        """Expected time to a valid answer: latency scaled up by the failure rate."""
+        return self.latency / max(self.success_rate, 0.05)
+
+    def to_dict(self) -> dict:
+        return {"latency": self.latency, "success_rate": self.success_rate, "consecutive_failures": self.consecutive_failures,
+                "cooldown_until": self.cooldown_until, "successes": self.successes, "failures": self.failures}
+
+
+class ExchangeHealth:
+    """Scores exchanges by observed latency and failures and races requests across them.
+
+    race() starts the best-ranked candidates concurrently, returns the first result that
+    the attempt accepts and cancels the others, so a failover takes as long as the
+    fastest healthy exchange. Exchanges that keep failing are put on a growing cooldown
+    and only tried when no other candidate is left.
+    """
+
+    def __init__(self, alpha: float = EWMA_ALPHA, failure_threshold: int = FAILURE_THRESHOLD,
+                 base_cooldown: float = BASE_COOLDOWN, max_cooldown: float = MAX_COOLDOWN):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def _record(self, exchange_name: str) -> HealthRecord:
+        return self._records.setdefault(exchange_name.lower(), HealthRecord())
+
+    def record_success(self, exchange_name: str, latency: float) -> None:
+        with self._lock:
+            record = self._record(exchange_name)
+            record.latency += self.alpha * (latency - record.latency)
+            record.success_rate += self.alpha * (1.0 - record.success_rate)
+            record.consecutive_failures = 0
+            record.cooldown_until = 0.0
+            record.successes += 1
+
+    def record_failure(self, exchange_name: str, latency: float = None) -> None:
+        with self._lock:
+            record = self._record(exchange_name)
+            if latency is not None:
+                record.latency += self.alpha * (max(latency, record.latency) - record.latency)
+            record.success_rate -= self.alpha * record.success_rate
+            record.consecutive_failures += 1
+            record.failures += 1
+            if record.consecutive_failures >= self.failure_threshold:
+                cooldown = min(self.base_cooldown * 2 ** (record.consecutive_failures - self.failure_threshold), self.max_cooldown)
+                record.cooldown_until = time.monotonic() + cooldown
+                logging.warning(f"Exchange {exchange_name} failed {record.consecutive_failures} times in a row, cooling down for {cooldown:.0f}s")
+
+    def score(self, exchange_name: str) -> float:
+        """Returns the expected cost (lower is better) of asking exchange_name."""
+        with self._lock:
+            record = self._records.get(exchange_name.lower())
+            return record.cost() if record else DEFAULT_LATENCY
+
+    def is_cooling_down(self, exchange_name: str) -> bool:
+        with self._lock:
+            record = self._records.get(exchange_name.lower())
+            return record is not None and record.cooldown_until > time.monotonic()
+
+    def rank(self, exchange_names: list) -> list:
+        """Orders exchanges best first; exchanges on cooldown go last."""
+        return sorted(exchange_names, key=lambda name: (self.is_cooling_down(name), self.score(name)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: record.to_dict() for name, record in self._records.items()}
+
+    async def race(self, exchange_names: list, attempt, max_parallel: int = DEFAULT_MAX_PARALLEL):
+        """Runs attempt(exchange_name) on several exchanges at once and returns the first valid result.
+
+        Args:
+            exchange_names (list): Candidate exchanges, in any order (they are ranked first).
+            attempt: Coroutine function returning a result, or None / raising when the
+                exchange gave no valid answer.
+            max_parallel (int): Number of attempts in flight at the same time.
+
+        Returns:
+            tuple: (exchange_name, result) of the winner, or (None, None) when all failed.
+        """
+        pending_names = self.rank(list(exchange_names))
+        running = {}
+
+        def launch():
+            while pending_names and len(running) < max_parallel:
+                name = pending_names.pop(0)
+                running[asyncio.ensure_future(attempt(name))] = (name, time.monotonic())
+
+        launch()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name, started = running.pop(task)
+                    latency = time.monotonic() - started
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logging.warning(f"Hedged request to {name} failed after {latency:.2f}s: {str(e)}")
+                        self.record_failure(name, latency)
+                        continue
+                    if result is None:
+                        self.record_failure(name, latency)
+                        continue
+                    self.record_success(name, latency)
+                    logging.info(f"Hedged request won by {name} in {latency:.2f}s, cancelling {len(running)} other requests")
+                    return name, result
+                launch()
+            return None, None
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+
+_default_health = None
+_default_health_lock = threading.Lock()
+
+
+def get_exchange_health() -> ExchangeHealth:
+    """Returns the process-wide exchange health tracker."""
+    global _default_health
+    with _default_health_lock:
+        if _default_health is None:
+            _default_health = ExchangeHealth()
+        return _default_health
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\exchange_pool.py
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+import ccxt.async_support as ccxt
+from src.core.clock import get_clock
+from src.core.mock_exchange import MOCK_EXCHANGE, create_mock_exchange
+from src.core.rate_limiter import get_rate_limiter, install_rate_limiter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+
+def build_client_config(api_key_data: dict) -> dict:
+    """Builds the ccxt constructor config from an api_keys.json entry.
+
+    rate_limit_requests is requests per minute; ccxt's rateLimit is the delay between
+    requests in milliseconds.
+    """
+    return {
+        "apiKey": api_key_data.get("api_key", ""),
+        "secret": api_key_data.get("api_secret", ""),
+        "password": api_key_data.get("passphrase", ""),
+        "rateLimit": 60000 / max(int(api_key_data.get("rate_limit_requests", 1800)), 1),
+        "timeout": api_key_data.get("timeout_seconds", 30) * 1000
+    }
+
+
+class _PoolEntry:
+    __slots__ = ("key", "client", "loop", "refs", "idle_since", "time_offset", "time_synced_at")
+
+    def __init__(self, key, client, loop):
+        self.key = key
+        self.client = client
+        self.loop = loop
+        self.refs = 0
+        self.idle_since = None
+        self.time_offset = None
+        self.time_synced_at = 0.0
+
+
+class ExchangePool:
+    """Process-wide pool of ccxt async clients shared by backtest, paper, live and fallback paths.
+
+    Clients are keyed by exchange, API key and event loop (a ccxt async client and its
+    HTTP session belong to the loop that created them). Each acquire() takes a reference
+    and release() gives it back; clients without references are closed after
+    idle_timeout seconds by a sweeper task running on their loop, and all clients of a
+    loop are closed when that loop shuts down (e.g. at the end of asyncio.run).
+    Markets are loaded lazily by the client on first use and then shared, and the
+    server time offset is cached per client. Request throttling of every client goes
+    through the exchange's shared rate limiter (see rate_limiter.py).
+    """
+
+    def __init__(self, idle_timeout: float = 300.0, sweep_interval: float = 60.0, time_sync_max_age: float = 600.0):
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.time_sync_max_age = time_sync_max_age
+        # Optional (exchange_name, api_key_data) -> client used instead of ccxt (a replay installs mock exchanges).
+        self.client_factory = None
+        self._entries = {}
+        self._by_client = {}
+        self._sweepers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(exchange_name: str, api_key_data: dict, loop) -> tuple:
+        return (exchange_name.lower(), api_key_data.get("api_key", ""), id(loop))
+
+    def _create_client(self, exchange_name: str, api_key_data: dict):
+        if self.client_factory is not None:
+            # Not throttled: the factory's clients are local and may run in virtual time.
+            return self.client_factory(exchange_name, api_key_data)
+        if exchange_name.lower() == MOCK_EXCHANGE:
+            client = create_mock_exchange(api_key_data)
+        else:
+            exchange_class = getattr(ccxt, exchange_name.lower())
+            client = exchange_class(build_client_config(api_key_data))
+        # All clients of an exchange (any API key, any event loop) draw from one token bucket.
+        install_rate_limiter(client, get_rate_limiter(exchange_name, api_key_data.get("rate_limit_requests", 1800)))
+        return client
+
+    def _purge_closed_loops(self) -> None:
+        for key, entry in list(self._entries.items()):
+            if entry.loop.is_closed():
+                logging.warning(f"Dropping {entry.client.id} client bound to a closed event loop")
+                self._entries.pop(key)
+                self._by_client.pop(id(entry.client), None)
+
+    async def acquire(self, exchange_name: str, api_key_data: dict):
+        """Returns a shared client for exchange_name and takes a reference to it.
+
+        Args:
+            exchange_name (str): ccxt exchange id (case-insensitive).
+            api_key_data (dict): Entry from api_keys.json.
+
+        Returns:
+            ccxt.async_support.Exchange: Client bound to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        key = self.make_key(exchange_name, api_key_data, loop)
+        with self._lock:
+            self._purge_closed_loops()
+            entry = self._entries.get(key)
+            if entry is None or entry.loop is not loop:
+                entry = _PoolEntry(key, self._create_client(exchange_name, api_key_data), loop)
+                self._entries[key] = entry
+                self._by_client[id(entry.client)] = entry
+                logging.info(f"Created pooled {exchange_name.lower()} client ({len(self._entries)} clients in pool)")
+            entry.refs += 1
+            entry.idle_since = None
+            if loop not in self._sweepers:
+                self._sweepers[loop] = loop.create_task(self._sweep(loop))
+        return entry.client
+
+    def release(self, client) -> None:
+        """Gives back a reference taken by acquire(); the client stays open for reuse."""
+        with self._lock:
+            entry = self._by_client.get(id(client))
+            if entry is None:
+                logging.debug("Released a client that is not managed by the pool")
+                return
+            entry.refs = max(entry.refs - 1, 0)
+            if entry.refs == 0:
+                entry.idle_since = time.monotonic()
+
+    @asynccontextmanager
+    async def lease(self, exchange_name: str, api_key_data: dict):
+        """Context manager form of acquire()/release()."""
+        client = await self.acquire(exchange_name, api_key_data)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    async def server_time_offset(self, client) -> int:
+        """Returns server time minus local time in ms, fetched at most every time_sync_max_age seconds per client."""
+        entry = self._by_client.get(id(client))
+        if entry is not None and entry.time_offset is not None and time.monotonic() - entry.time_synced_at < self.time_sync_max_age:
+            return entry.time_offset
+        server_time = await client.fetch_time()
+        time_offset = server_time - int(get_clock().time() * 1000)
+        if entry is not None:
+            entry.time_offset = time_offset
+            entry.time_synced_at = time.monotonic()
+        return time_offset
+
+    def stats(self) -> dict:
+        """Returns {exchange: number of open clients} for diagnostics."""
+        with self._lock:
+            counts = {}
+            for entry in self._entries.values():
+                counts[entry.client.id] = counts.get(entry.client.id, 0) + 1
+            return counts
+
+    async def _close_entries(self, entries: list) -> None:
+        for entry in entries:
+            try:
+                await entry.client.close()
+                logging.info(f"Closed pooled {entry.client.id} client")
+            except Exception as e:
+                logging.error(f"Error closing pooled {entry.client.id} client: {str(e)}")
+
+    def _take_entries(self, loop, idle_only: bool) -> list:
+        now = time.monotonic()
+        taken = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.loop is not loop:
+                    continue
+                if idle_only and (entry.refs > 0 or entry.idle_since is None or now - entry.idle_since < self.idle_timeout):
+                    continue
+                self._entries.pop(key)
+                self._by_client.pop(id(entry.client), None)
+                taken.append(entry)
+        return taken
+
+    async def close_idle(self) -> None:
+        """Closes clients of the running loop that have been unused for idle_timeout seconds."""
+        await self._close_entries(self._take_entries(asyncio.get_running_loop(), idle_only=True))
+
+    async def close_all(self) -> None:
+        """Closes every client of the running loop, referenced or not (shutdown)."""
+        await self._close_entries(self._take_entries(asyncio.get_running_loop(), idle_only=False))
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Closes clients on all loops still running in other threads. Call from outside those loops."""
+        with self._lock:
+            loops = {entry.loop for entry in self._entries.values()}
+        for loop in loops:
+            if loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(self.close_all(), loop).result(timeout)
+                except Exception as e:
+                    logging.error(f"Error closing pooled clients: {str(e)}")
+
+    async def _sweep(self, loop) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.sweep_interval)
+                await self.close_idle()
+        except asyncio.CancelledError:
+            # The loop is shutting down: close its sessions while it can still run them.
+            await self.close_all()
+            raise
+        finally:
+            with self._lock:
+                self._sweepers.pop(loop, None)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_exchange_pool() -> ExchangePool:
+    """Returns the process-wide exchange client pool."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ExchangePool()
+        return _default_pool
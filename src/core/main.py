@@ -14,6 +14,8 @@ from src.tabs.api import ApiTab
 from src.tabs.simulation.simulation import SimulationTab
 from src.tabs.live.live_tab import LiveTab
 from src.tabs.czacha_data import CzachaData
+from src.core.exchange_pool import get_exchange_pool
+from src.core.results_writer import get_results_writer
 from pathlib import Path
 
 logging.basicConfig(
@@ -116,6 +118,8 @@ def main():
         logging.info("=== Starting main application loop ===")
         root.mainloop()
         logging.info("=== Closing application ===")
+        get_results_writer().shutdown()
+        get_exchange_pool().shutdown()
         logging.info("=== Application closed ===")
     except Exception as e:
         logging.error(f"Error running application: {str(e)}", exc_info=True)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\market_cache.py
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from utils.normalization import normalize_symbol
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+DEFAULT_TTL_SECONDS = 6 * 3600
+# A symbol missing from a cache older than this triggers one synchronous refresh (new listings).
+MISS_REFRESH_SECONDS = 300
+MARKET_FIELDS = ("id", "symbol", "base", "quote", "type", "active", "precision", "limits")
+
+
+class MarketInfo:
+    """Compact market metadata of one exchange: symbols, timeframes, precision and limits.
+
+    Symbols are indexed by unified symbol (BTC/USDT), exchange id (BTCUSDT, BTC-USDT)
+    and the app's normalized form (BTCUSDT), so every lookup is a dict access.
+    """
+
+    def __init__(self, exchange_id: str, markets: dict, timeframes: list, fetched_at: float):
+        self.exchange_id = exchange_id
+        self.markets = markets
+        self.timeframes = set(timeframes)
+        self.fetched_at = fetched_at
+        self._index = {}
+        for symbol, market in markets.items():
+            for alias in (symbol, market.get("id"), normalize_symbol(symbol)):
+                if alias:
+                    self._index.setdefault(alias, symbol)
+
+    @classmethod
+    def from_exchange(cls, exchange, markets: dict) -> "MarketInfo":
+        compact = {
+            symbol: {field: market.get(field) for field in MARKET_FIELDS}
+            for symbol, market in markets.items()
+        }
+        return cls(exchange.id, compact, list((exchange.timeframes or {}).keys()), time.time())
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MarketInfo":
+        return cls(data["exchange"], data["markets"], data["timeframes"], data["fetched_at"])
+
+    def to_dict(self) -> dict:
+        return {"exchange": self.exchange_id, "fetched_at": self.fetched_at, "timeframes": sorted(self.timeframes), "markets": self.markets}
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def resolve(self, symbol: str):
+        """Returns the unified symbol for any known spelling of symbol, or None."""
+        return self._index.get(symbol) or self._index.get(normalize_symbol(symbol))
+
+    def has_symbol(self, symbol: str) -> bool:
+        return self.resolve(symbol) is not None
+
+    def has_timeframe(self, timeframe: str) -> bool:
+        return timeframe in self.timeframes
+
+    def market(self, symbol: str):
+        """Returns cached metadata (precision, limits, ...) for symbol, or None."""
+        unified = self.resolve(symbol)
+        return self.markets.get(unified) if unified else None
+
+
+class MarketCache:
+    """In-memory and on-disk (data/markets/<exchange>.json) cache of exchange market metadata.
+
+    Fresh entries are served from memory or disk. Entries older than ttl are still
+    served while a background task refreshes them; only an exchange that was never
+    cached waits for a download. Concurrent requests for the same exchange share one
+    download.
+    """
+
+    def __init__(self, base_dir: Path = None, ttl: float = DEFAULT_TTL_SECONDS):
+        self.base_dir = Path(base_dir) if base_dir else Path(__file__).resolve().parents[2] / "data" / "markets"
+        self.ttl = ttl
+        self._memory = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _cache_file(self, exchange_id: str) -> Path:
+        return self.base_dir / f"{exchange_id.lower()}.json"
+
+    def _load_from_disk(self, exchange_id: str):
+        cache_file = self._cache_file(exchange_id)
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return MarketInfo.from_dict(json.load(f))
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable market cache {cache_file}: {str(e)}")
+            return None
+
+    def _save_to_disk(self, info: MarketInfo) -> None:
+        try:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self._cache_file(info.exchange_id)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(info.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logging.error(f"Error saving market cache for {info.exchange_id}: {str(e)}")
+
+    def cached(self, exchange_id: str):
+        """Returns the cached MarketInfo (possibly stale) without any network access, or None."""
+        with self._lock:
+            info = self._memory.get(exchange_id)
+        if info is None:
+            info = self._load_from_disk(exchange_id)
+            if info is not None:
+                with self._lock:
+                    self._memory.setdefault(exchange_id, info)
+        return info
+
+    async def _download(self, exchange) -> MarketInfo:
+        markets = await exchange.load_markets()
+        info = MarketInfo.from_exchange(exchange, markets)
+        with self._lock:
+            self._memory[exchange.id] = info
+        self._save_to_disk(info)
+        logging.info(f"Refreshed market cache for {exchange.id}: {len(info.markets)} markets")
+        return info
+
+    def _refresh_task(self, exchange) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        key = (exchange.id, id(loop))
+        with self._lock:
+            task = self._inflight.get(key)
+            if task is None or task.done():
+                task = loop.create_task(self._download(exchange))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return task
+
+    def _forget(self, key, task) -> None:
+        with self._lock:
+            if self._inflight.get(key) is task:
+                self._inflight.pop(key)
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(f"Market refresh for {key[0]} failed: {str(task.exception())}")
+
+    async def get(self, exchange) -> MarketInfo:
+        """Returns market metadata for a ccxt client, downloading it only when nothing is cached.
+
+        Args:
+            exchange: ccxt async client (ideally from the exchange pool).
+
+        Returns:
+            MarketInfo: Cached or freshly downloaded metadata.
+        """
+        info = self.cached(exchange.id)
+        if info is None:
+            return await self._refresh_task(exchange)
+        if info.age() > self.ttl:
+            logging.debug(f"Market cache for {exchange.id} is {info.age():.0f}s old, refreshing in background")
+            self._refresh_task(exchange)
+        return info
+
+    async def get_for_symbol(self, exchange, symbol: str) -> MarketInfo:
+        """Like get(), but re-downloads once when symbol is unknown and the cache is not brand new."""
+        info = await self.get(exchange)
+        if not info.has_symbol(symbol) and info.age() > MISS_REFRESH_SECONDS:
+            logging.info(f"Symbol {symbol} not in cached markets of {exchange.id}, refreshing")
+            info = await self.refresh(exchange)
+        return info
+
+    async def refresh(self, exchange) -> MarketInfo:
+        """Forces a download, e.g. after a symbol was not found in a stale cache."""
+        return await self._refresh_task(exchange)
+
+    def invalidate(self, exchange_id: str = None) -> None:
+        """Drops cached metadata from memory and disk (all exchanges when exchange_id is None)."""
+        with self._lock:
+            if exchange_id:
+                self._memory.pop(exchange_id, None)
+            else:
+                self._memory.clear()
+        cache_files = [self._cache_file(exchange_id)] if exchange_id else list(self.base_dir.glob("*.json"))
+        for cache_file in cache_files:
+            cache_file.unlink(missing_ok=True)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketCache:
+    """Returns the process-wide market metadata cache rooted at data/markets."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = MarketCache()
+        return _default_cache
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\mock_exchange.py
+"""Local stand-in for a ccxt async exchange, for deterministic tests and offline load tests.
+
+MockExchange implements the subset of the ccxt API the app uses (load_markets,
+fetch_time, fetch_ohlcv, create_order, fetch_balance, close) in process. Candles come
+from a synthetic generator (a pure function of seed, symbol and bar time, so every
+query and every process sees the same market) or are replayed from the local candle
+store. Latency, random network errors and the exchange's own rate limit (answered
+with ccxt.RateLimitExceeded, like an HTTP 429) are configurable.
+
+MockExchangeServer serves one MockExchange to other processes over a local socket
+(JSON lines) and RemoteMockExchange is its client, so many engine processes can hit
+one exchange with one shared rate limit. Run it with:
+
+    python -m src.core.mock_exchange --port 8766 --latency-ms 50 --error-rate 0.01
+
+The exchange pool creates these clients for the exchange name "mock" (see
+create_mock_exchange), configured from the api_keys.json entry.
+"""
+import argparse
+import asyncio
+import collections
+import hashlib
+import itertools
+import json
+import logging
+import random
+import time
+import ccxt.async_support as ccxt
+import numpy as np
+from src.core.candle_store import get_candle_store
+from src.core.clock import get_clock
+from utils.normalization import interval_to_milliseconds, normalize_symbol
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+MOCK_EXCHANGE = "mock"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_SYMBOLS = ("BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT", "ADA/USDT", "DOGE/USDT")
+# Largest number of candles one fetch_ohlcv call returns (like a real exchange's page size).
+DEFAULT_PAGE_LIMIT = 1000
+TIMEFRAMES = ("1m", "3m", "5m", "15m", "30m", "1h", "2h", "4h", "6h", "8h", "12h", "1d", "1w")
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """Counter-based hash: maps uint64 counters to well mixed uint64 values."""
+    with np.errstate(over="ignore"):
+        z = (values + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+        return z ^ (z >> np.uint64(31))
+
+
+def _uniform(counters: np.ndarray, stream: int) -> np.ndarray:
+    """Deterministic uniform [0, 1) values for the given counters."""
+    mixed = _splitmix64(counters.astype(np.uint64) ^ np.uint64(stream))
+    return (mixed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _symbol_seed(seed: int, symbol: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{seed}:{symbol}".encode("utf-8"), digest_size=7).digest(), "little")
+
+
+def synthetic_ohlcv(symbol: str, interval: str, since: int, until: int, seed: int = 0) -> list:
+    """Synthetic candles with since <= timestamp < until (ms) as ccxt OHLCV rows.
+
+    Each candle is a pure function of (seed, symbol, interval, timestamp): overlapping
+    queries agree and no state has to be kept. The close follows a few slow waves plus
+    noise around a symbol-specific base price, so moving-average strategies trade.
+    """
+    step = interval_to_milliseconds(interval)
+    first = -(-since // step)
+    last = -(-until // step)
+    if last <= first:
+        return []
+    bars = np.arange(first - 1, last, dtype=np.int64)
+    stream = _symbol_seed(seed, symbol)
+    base = 10.0 ** (stream % 5) * (1 + (stream >> 8) % 9)
+    phase = (stream >> 16) % 1000 / 1000 * 2 * np.pi
+    minutes = bars * (step / 60_000)
+    close = base * np.exp(
+        0.04 * np.sin(2 * np.pi * minutes / 1440 + phase)
+        + 0.02 * np.sin(2 * np.pi * minutes / 97 + 2 * phase)
+        + 0.004 * (_uniform(bars, stream) - 0.5)
+    )
+    wick = _uniform(bars, stream + 1) * 0.002
+    opens, closes = close[:-1], close[1:]
+    highs = np.maximum(opens, closes) * (1 + wick[1:])
+    lows = np.minimum(opens, closes) * (1 - wick[1:])
+    volume = 10 + 990 * _uniform(bars[1:], stream + 2)
+    timestamps = bars[1:] * step
+    return [[int(t), float(o), float(h), float(l), float(c), float(v)] for t, o, h, l, c, v in zip(timestamps, opens, highs, lows, closes, volume)]
+
+
+class MockExchange:
+    """In-process ccxt-compatible exchange.
+
+    Args:
+        config (dict): Options: symbols, seed, source ("synthetic" or "store"),
+            store_exchange (candle store series replayed by source="store"),
+            latency_ms, latency_jitter_ms, error_rate (probability of ccxt.NetworkError
+            per request), rate_limit_per_minute (requests the "exchange" accepts per
+            rolling minute before answering ccxt.RateLimitExceeded; 0 = unlimited),
+            page_limit, balance (starting quote balances, e.g. {"USDT": 10000}).
+        clock: Time in epoch seconds; candles are served up to clock() (default: the process clock).
+    """
+
+    def __init__(self, config: dict = None, clock=None):
+        config = dict(config or {})
+        self.id = MOCK_EXCHANGE
+        self.symbols = list(config.get("symbols", DEFAULT_SYMBOLS))
+        # Runners pass both "BTC/USDT" and the normalized "BTCUSDT".
+        self._by_id = {normalize_symbol(symbol): symbol for symbol in self.symbols}
+        self.seed = int(config.get("seed", 0))
+        self.source = config.get("source", "synthetic")
+        self.store_exchange = config.get("store_exchange", "kucoin")
+        self.latency = config.get("latency_ms", 0) / 1000
+        self.latency_jitter = config.get("latency_jitter_ms", 0) / 1000
+        self.error_rate = float(config.get("error_rate", 0.0))
+        self.rate_limit_per_minute = int(config.get("rate_limit_per_minute", 0))
+        self.page_limit = int(config.get("page_limit", DEFAULT_PAGE_LIMIT))
+        self.timeframes = {tf: tf for tf in TIMEFRAMES}
+        self.rateLimit = 0
+        self.enableRateLimit = False
+        self.markets = None
+        self.balances = {currency: float(amount) for currency, amount in config.get("balance", {"USDT": 10000.0}).items()}
+        self.orders = []
+        self.calls = collections.Counter()
+        self.errors = collections.Counter()
+        self._clock = clock
+        self._random = random.Random(self.seed)
+        self._window = collections.deque()
+        self._order_ids = itertools.count(1)
+
+    async def throttle(self, cost=None):
+        """Client-side throttling hook; install_rate_limiter() replaces it like on a ccxt client."""
+
+    def _milliseconds(self) -> int:
+        return int((self._clock or get_clock().time)() * 1000)
+
+    async def _request(self, method: str, cost: float = 1) -> None:
+        if self.enableRateLimit:
+            await self.throttle(cost)
+        self.calls[method] += 1
+        if self.latency or self.latency_jitter:
+            await asyncio.sleep(max(self.latency + self._random.uniform(-self.latency_jitter, self.latency_jitter), 0))
+        if self.rate_limit_per_minute:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if len(self._window) >= self.rate_limit_per_minute:
+                self.errors["rate_limit"] += 1
+                raise ccxt.RateLimitExceeded(f"{self.id} 429 Too Many Requests ({self.rate_limit_per_minute} requests/min)")
+            self._window.append(now)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors["network"] += 1
+            raise ccxt.NetworkError(f"{self.id} {method} simulated network error")
+
+    def _market(self, symbol: str) -> str:
+        market = self._by_id.get(normalize_symbol(symbol))
+        if market is None:
+            raise ccxt.BadSymbol(f"{self.id} does not have market symbol {symbol}")
+        return market
+
+    async def load_markets(self, reload: bool = False, params: dict = None) -> dict:
+        await self._request("load_markets")
+        if self.markets is None or reload:
+            self.markets = {}
+            for symbol in self.symbols:
+                base, quote = symbol.split("/")
+                self.markets[symbol] = {
+                    "id": symbol.replace("/", ""), "symbol": symbol, "base": base, "quote": quote, "type": "spot", "spot": True, "active": True,
+                    "precision": {"amount": 1e-8, "price": 1e-8}, "limits": {"amount": {"min": 1e-8, "max": None}, "cost": {"min": 1.0, "max": None}}
+                }
+        return self.markets
+
+    async def fetch_time(self, params: dict = None) -> int:
+        await self._request("fetch_time")
+        return self._milliseconds()
+
+    def _ohlcv(self, symbol: str, timeframe: str, since: int, until: int) -> list:
+        if self.source == "store":
+            candles = get_candle_store().read(self.store_exchange, symbol, timeframe, since=since, until=until)
+            return [list(row) for row in candles.tolist()]
+        return synthetic_ohlcv(symbol, timeframe, since, until, self.seed)
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: int = None, limit: int = None, params: dict = None) -> list:
+        """Candles up to and including the bar in progress, oldest first (ccxt semantics)."""
+        await self._request("fetch_ohlcv")
+        symbol = self._market(symbol)
+        if timeframe not in self.timeframes:
+            raise ccxt.BadRequest(f"{self.id} does not support timeframe {timeframe}")
+        step = interval_to_milliseconds(timeframe)
+        limit = min(limit or self.page_limit, self.page_limit)
+        now = self._milliseconds()
+        until = now - now % step + step
+        if since is None:
+            rows = self._ohlcv(symbol, timeframe, until - limit * step, until)
+        else:
+            rows = self._ohlcv(symbol, timeframe, since, min(since - since % step + (limit + 1) * step, until))[:limit]
+        if rows and rows[-1][0] + step > now:
+            # The bar in progress: close (and range) interpolated to the current time, so a replay
+            # from stored candles does not see the bar's final values before it closes.
+            row = rows[-1]
+            progress = (now - row[0]) / step
+            close = row[1] + (row[4] - row[1]) * progress
+            rows[-1] = [row[0], row[1], max(row[1], close), min(row[1], close), close, row[5] * progress]
+        return rows
+
+    def _last_price(self, symbol: str) -> float:
+        step = interval_to_milliseconds("1m")
+        now = self._milliseconds()
+        rows = self._ohlcv(symbol, "1m", now - 2 * step, now)
+        if not rows:
+            raise ccxt.ExchangeNotAvailable(f"{self.id} has no price for {symbol}")
+        return rows[-1][4]
+
+    async def create_order(self, symbol: str, type: str, side: str, amount: float, price: float = None, params: dict = None) -> dict:
+        """Fills market and limit orders at once at the last price (limit: at price) against the mock balance."""
+        await self._request("create_order")
+        symbol = self._market(symbol)
+        if side not in ("buy", "sell") or amount <= 0:
+            raise ccxt.InvalidOrder(f"{self.id} invalid order {side} {amount} {symbol}")
+        base, quote = symbol.split("/")
+        fill_price = float(price) if type == "limit" and price else self._last_price(symbol)
+        cost = amount * fill_price
+        if side == "buy" and self.balances.get(quote, 0.0) < cost:
+            raise ccxt.InsufficientFunds(f"{self.id} {quote} balance {self.balances.get(quote, 0.0)} < {cost}")
+        if side == "sell" and self.balances.get(base, 0.0) < amount:
+            raise ccxt.InsufficientFunds(f"{self.id} {base} balance {self.balances.get(base, 0.0)} < {amount}")
+        sign = 1 if side == "buy" else -1
+        self.balances[base] = self.balances.get(base, 0.0) + sign * amount
+        self.balances[quote] = self.balances.get(quote, 0.0) - sign * cost
+        timestamp = self._milliseconds()
+        order = {
+            "id": str(next(self._order_ids)), "clientOrderId": (params or {}).get("clientOrderId"), "timestamp": timestamp,
+            "datetime": ccxt.Exchange.iso8601(timestamp), "symbol": symbol, "type": type, "side": side, "amount": amount,
+            "price": fill_price, "average": fill_price, "filled": amount, "remaining": 0.0, "cost": cost, "status": "closed",
+            "fee": {"currency": quote, "cost": 0.0}, "trades": [], "info": {}
+        }
+        self.orders.append(order)
+        return order
+
+    async def fetch_balance(self, params: dict = None) -> dict:
+        await self._request("fetch_balance")
+        balance = {"free": dict(self.balances), "used": {c: 0.0 for c in self.balances}, "total": dict(self.balances), "info": {}}
+        for currency, amount in self.balances.items():
+            balance[currency] = {"free": amount, "used": 0.0, "total": amount}
+        return balance
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"calls": dict(self.calls), "errors": dict(self.errors), "orders": len(self.orders)}
+
+
+# Methods a RemoteMockExchange may call on the server's exchange.
+REMOTE_METHODS = ("load_markets", "fetch_time", "fetch_ohlcv", "create_order", "fetch_balance", "stats")
+
+
+class MockExchangeServer:
+    """Serves one MockExchange to local clients, one JSON object per line.
+
+    Requests {"id": n, "method": ..., "args": [...], "kwargs": {...}} are handled
+    concurrently (so latency overlaps as on a real exchange) and answered with
+    {"id": n, "result": ...} or {"id": n, "error": <ccxt exception class>, "message": ...}.
+    """
+
+    def __init__(self, exchange: MockExchange = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.exchange = exchange or MockExchange()
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self) -> int:
+        """Starts listening; returns the bound port (pass port=0 for a free one)."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=2 ** 24)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Mock exchange listening on {self.host}:{self.port}")
+        return self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _call(self, request: dict, writer) -> None:
+        response = {"id": request.get("id")}
+        try:
+            if request.get("method") not in REMOTE_METHODS:
+                raise ccxt.NotSupported(f"Mock exchange has no method {request.get('method')}")
+            result = getattr(self.exchange, request["method"])(*request.get("args", []), **request.get("kwargs", {}))
+            response["result"] = await result if asyncio.iscoroutine(result) else result
+        except Exception as e:
+            response["error"] = type(e).__name__
+            response["message"] = str(e)
+        writer.write((json.dumps(response) + "\n").encode("utf-8"))
+
+    async def _handle(self, reader, writer) -> None:
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._call(json.loads(line), writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError) as e:
+            logging.warning(f"Mock exchange connection dropped: {str(e)}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+class RemoteMockExchange:
+    """ccxt-compatible client of a MockExchangeServer; one connection per client (event loop).
+
+    Args:
+        address (str): "host:port" of the server.
+    """
+
+    def __init__(self, address: str):
+        host, _, port = address.rpartition(":")
+        self.id = MOCK_EXCHANGE
+        self.host = host or DEFAULT_HOST
+        self.port = int(port)
+        self.timeframes = {tf: tf for tf in TIMEFRAMES}
+        self.rateLimit = 0
+        self.enableRateLimit = False
+        self.markets = None
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = None
+
+    async def throttle(self, cost=None):
+        """Client-side throttling hook; install_rate_limiter() replaces it like on a ccxt client."""
+
+    async def _connect(self) -> None:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=2 ** 24)
+                self._read_task = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(getattr(ccxt, response["error"], ccxt.ExchangeError)(response["message"]))
+                else:
+                    future.set_result(response["result"])
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ccxt.NetworkError(f"Connection to mock exchange {self.host}:{self.port} lost"))
+            self._pending.clear()
+            self._writer = None
+
+    async def _call(self, method: str, *args, **kwargs):
+        if self.enableRateLimit:
+            await self.throttle(1)
+        await self._connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write((json.dumps({"id": request_id, "method": method, "args": args, "kwargs": kwargs}) + "\n").encode("utf-8"))
+        return await future
+
+    async def load_markets(self, reload: bool = False, params: dict = None) -> dict:
+        if self.markets is None or reload:
+            self.markets = await self._call("load_markets", reload)
+        return self.markets
+
+    async def fetch_time(self, params: dict = None) -> int:
+        return await self._call("fetch_time")
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: int = None, limit: int = None, params: dict = None) -> list:
+        return await self._call("fetch_ohlcv", symbol, timeframe, since, limit)
+
+    async def create_order(self, symbol: str, type: str, side: str, amount: float, price: float = None, params: dict = None) -> dict:
+        return await self._call("create_order", symbol, type, side, amount, price, params)
+
+    async def fetch_balance(self, params: dict = None) -> dict:
+        return await self._call("fetch_balance")
+
+    async def stats(self) -> dict:
+        return await self._call("stats")
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        self._writer = None
+
+
+def create_mock_exchange(api_key_data: dict):
+    """Client for exchange "mock" from an api_keys.json entry.
+
+    With "mock_address" ("host:port") the client talks to a MockExchangeServer,
+    otherwise it is an in-process MockExchange configured by the entry's "mock" dict.
+    """
+    if api_key_data.get("mock_address"):
+        return RemoteMockExchange(api_key_data["mock_address"])
+    return MockExchange(api_key_data.get("mock", {}))
+
+
+async def serve(host: str, port: int, config: dict) -> None:
+    server = MockExchangeServer(MockExchange(config), host, port)
+    await server.start()
+    # The bound port on stdout lets a parent process started with --port 0 find the server.
+    print(f"listening {server.host}:{server.port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local mock exchange (ccxt-compatible) server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--symbols", nargs="+", default=list(DEFAULT_SYMBOLS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--source", choices=("synthetic", "store"), default="synthetic")
+    parser.add_argument("--store-exchange", default="kucoin")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per minute accepted before 429 (0: unlimited)")
+    args = parser.parse_args(argv)
+    config = {
+        "symbols": args.symbols, "seed": args.seed, "source": args.source, "store_exchange": args.store_exchange,
+        "latency_ms": args.latency_ms, "latency_jitter_ms": args.latency_jitter_ms, "error_rate": args.error_rate,
+        "rate_limit_per_minute": args.rate_limit
+    }
+    try:
+        asyncio.run(serve(args.host, args.port, config))
+    except KeyboardInterrupt:
+        logging.info("Mock exchange stopped")
+
+
+if __name__ == "__main__":
+    main()
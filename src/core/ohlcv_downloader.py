@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\ohlcv_downloader.py
+import asyncio
+import logging
+import time
+from src.core.candle_store import CandleStore, get_candle_store
+from src.core.rate_limiter import PRIORITY_BACKGROUND, TokenBucket, get_rate_limiter, request_priority
+from utils.normalization import normalize_symbol, normalize_interval, interval_to_milliseconds
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Largest number of candles a single fetch_ohlcv call returns, per exchange.
+PAGE_LIMITS = {
+    "binance": 1000,
+    "bybit": 1000,
+    "kucoin": 1500,
+    "mexc": 1000,
+    "okx": 300
+}
+DEFAULT_PAGE_LIMIT = 500
+
+
+def plan_pages(since: int, until: int, interval_ms: int, page_limit: int) -> list:
+    """Splits [since, until) into consecutive [start, end) windows of at most page_limit candles."""
+    if until <= since:
+        return []
+    step = interval_ms * page_limit
+    return [(start, min(start + step, until)) for start in range(since, until, step)]
+
+
+class OHLCVDownloader:
+    """Downloads long OHLCV histories in exchange-sized pages and writes them to the candle store.
+
+    A [since, until) range is split into pages of at most page_limit candles that are
+    fetched concurrently (up to max_concurrency in flight) through the exchange's shared
+    rate limiter in the background lane, so live and paper requests go first. Pages are
+    committed to the store strictly in time order, so an interrupted job resumes from
+    the last stored candle without leaving holes behind it.
+    """
+
+    def __init__(self, exchange, exchange_name: str, rate_limit_requests: int = 1800, store: CandleStore = None,
+                 page_limit: int = None, max_concurrency: int = 4, max_retries: int = 3, limiter: TokenBucket = None):
+        self.exchange = exchange
+        self.exchange_name = exchange_name.lower()
+        self.store = store or get_candle_store()
+        self.page_limit = page_limit or PAGE_LIMITS.get(self.exchange_name, DEFAULT_PAGE_LIMIT)
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.max_retries = max_retries
+        self.limiter = limiter or get_rate_limiter(self.exchange_name, rate_limit_requests)
+        # Pooled clients already throttle through the shared limiter; other clients are paced here.
+        self._client_throttled = getattr(exchange, "shared_rate_limiter", None) is not None
+
+    def resume_point(self, symbol: str, interval: str, since: int) -> int:
+        """Returns where to continue: the last stored candle (re-fetched, it may have been still forming) or since."""
+        last_ts = self.store.last_timestamp(self.exchange_name, symbol, interval)
+        if last_ts is None or last_ts < since:
+            return since
+        return last_ts
+
+    async def _fetch_page(self, symbol: str, interval: str, start: int, end: int) -> list:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with request_priority(PRIORITY_BACKGROUND):
+                    if not self._client_throttled:
+                        await self.limiter.acquire()
+                    ohlcv = await self.exchange.fetch_ohlcv(symbol, interval, since=start, limit=self.page_limit)
+                return [row for row in ohlcv or [] if start <= row[0] < end]
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                logging.warning(f"Page {start}-{end} for {symbol} {interval} on {self.exchange_name} failed (attempt {attempt}/{self.max_retries}): {str(e)}")
+                await asyncio.sleep(2 ** attempt)
+
+    async def download(self, symbol: str, interval: str, since: int, until: int = None) -> int:
+        """Downloads [since, until) for one symbol into the store, resuming from stored data.
+
+        Args:
+            symbol (str): Trading symbol.
+            interval (str): Time interval.
+            since (int): Start of the range (ms, UTC).
+            until (int): End of the range (ms, UTC), exclusive. Defaults to now.
+
+        Returns:
+            int: Number of new candles written to the store.
+        """
+        interval = normalize_interval(interval)
+        interval_ms = interval_to_milliseconds(interval)
+        until = until if until is not None else int(time.time() * 1000)
+        since = since - since % interval_ms
+        start = self.resume_point(symbol, interval, since)
+        pages = plan_pages(start, until, interval_ms, self.page_limit)
+        if not pages:
+            logging.info(f"OHLCV for {symbol} {interval} on {self.exchange_name} already up to date")
+            return 0
+        logging.info(f"Downloading {len(pages)} pages of {symbol} {interval} from {self.exchange_name} ({start} -> {until})")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        completed = {}
+        next_page = 0
+        added = 0
+
+        async def fetch(index, page_start, page_end):
+            async with semaphore:
+                return index, await self._fetch_page(symbol, interval, page_start, page_end)
+
+        tasks = [asyncio.create_task(fetch(i, page_start, page_end)) for i, (page_start, page_end) in enumerate(pages)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                index, rows = await task
+                completed[index] = rows
+                # Commit only the contiguous prefix so the store never has gaps behind its last candle.
+                while next_page in completed:
+                    rows = completed.pop(next_page)
+                    if rows:
+                        added += self.store.append(self.exchange_name, symbol, interval, rows)
+                    next_page += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logging.info(f"Downloaded {added} new candles of {symbol} {interval} from {self.exchange_name}")
+        return added
+
+    async def download_many(self, symbols: list, interval: str, since: int, until: int = None) -> dict:
+        """Downloads several symbols concurrently under the shared rate limit.
+
+        Returns:
+            dict: {symbol: number of new candles, or the exception raised for that symbol}.
+        """
+        results = await asyncio.gather(*(self.download(symbol, interval, since, until) for symbol in symbols), return_exceptions=True)
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logging.error(f"Download of {symbol} {interval} from {self.exchange_name} failed: {str(result)}")
+        return dict(zip(symbols, results))
+
+    def load(self, symbol: str, interval: str, since: int, until: int = None):
+        """Returns the stored [since, until) range as a DataFrame (None when nothing is stored)."""
+        return self.store.load_dataframe(self.exchange_name, normalize_symbol(symbol), normalize_interval(interval), since=since, until=until)
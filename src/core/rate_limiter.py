@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\rate_limiter.py
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Priority lanes, lower is more urgent: order traffic of live strategies, paper/GUI
+# requests, and bulk work such as backtest downloads.
+PRIORITY_LIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_LANES = 3
+
+DEFAULT_REQUESTS_PER_MINUTE = 1800
+# Longest sleep of a request that is held back only by more urgent waiters (seconds).
+PREEMPT_POLL = 0.05
+
+_request_priority = contextvars.ContextVar("request_priority", default=PRIORITY_NORMAL)
+
+
+def current_priority() -> int:
+    return _request_priority.get()
+
+
+def set_request_priority(priority: int) -> None:
+    """Sets the lane of every request made from the current task (and tasks it creates later)."""
+    _request_priority.set(priority)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Runs the enclosed requests in the given priority lane."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every client of one exchange.
+
+    Tokens refill at requests_per_minute / 60 per second up to burst. A request costs
+    its endpoint weight (ccxt's per-endpoint cost; 1 for plain endpoints) and may
+    overdraw the bucket when the weight exceeds burst. A request never takes tokens
+    while a request of a more urgent lane is waiting, so live order traffic goes ahead
+    of queued backtest pages. Waiting happens with asyncio.sleep outside the lock, so
+    clients on different event loops (GUI threads) share the same budget.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE, burst: float = None):
+        self._lock = threading.Lock()
+        self._waiting = [0] * PRIORITY_LANES
+        self.set_rate(requests_per_minute, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self.granted = 0
+        self.waited = 0.0
+
+    def set_rate(self, requests_per_minute: float, burst: float = None) -> None:
+        with self._lock:
+            self.requests_per_minute = max(float(requests_per_minute), 1.0)
+            self.rate = self.requests_per_minute / 60.0
+            # One second worth of requests by default, at least one request.
+            self.burst = float(burst) if burst else max(self.rate, 1.0)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, cost: float, priority: int):
+        """Takes cost tokens when allowed; otherwise returns the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            preempted = any(self._waiting[:priority])
+            needed = min(cost, self.burst)
+            if not preempted and self._tokens >= needed:
+                self._tokens -= cost
+                self.granted += 1
+                return None
+            if self._tokens >= needed:
+                return PREEMPT_POLL
+            delay = (needed - self._tokens) / self.rate
+            return min(delay, PREEMPT_POLL) if preempted else delay
+
+    async def acquire(self, cost: float = 1, priority: int = None) -> None:
+        """Waits until the request may be sent.
+
+        Args:
+            cost (float): Endpoint weight of the request.
+            priority (int): Lane; defaults to the lane of the current context.
+        """
+        cost = float(cost) if cost else 1.0
+        priority = current_priority() if priority is None else min(max(int(priority), 0), PRIORITY_LANES - 1)
+        delay = self._try_take(cost, priority)
+        if delay is None:
+            return
+        started = time.monotonic()
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while delay is not None:
+                await asyncio.sleep(delay)
+                delay = self._try_take(cost, priority)
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+                self.waited += time.monotonic() - started
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {"requests_per_minute": self.requests_per_minute, "tokens": self._tokens, "granted": self.granted,
+                    "waited_seconds": self.waited, "waiting": list(self._waiting)}
+
+
+class RateLimiterRegistry:
+    """One TokenBucket per exchange, configured from rate_limit_requests in api_keys.json.
+
+    share scales every configured rate: a process that is one of several sharing the
+    same API key (sharded engine workers) sets it so the processes together stay within
+    the exchange's limit.
+    """
+
+    def __init__(self, share: float = 1.0):
+        self.share = share
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, exchange_name: str, requests_per_minute: float = None) -> TokenBucket:
+        """Returns the exchange's bucket, creating it or applying a changed rate_limit_requests."""
+        name = exchange_name.lower()
+        with self._lock:
+            limiter = self._limiters.get(name)
+            if limiter is None:
+                limiter = TokenBucket((requests_per_minute or DEFAULT_REQUESTS_PER_MINUTE) * self.share)
+                self._limiters[name] = limiter
+                logging.info(f"Rate limiter for {name}: {limiter.requests_per_minute:.0f} requests/min")
+                return limiter
+        if requests_per_minute and float(requests_per_minute) * self.share != limiter.requests_per_minute:
+            logging.info(f"Rate limit for {name} changed from {limiter.requests_per_minute:.0f} to {float(requests_per_minute) * self.share:.0f} requests/min")
+            limiter.set_rate(float(requests_per_minute) * self.share)
+        return limiter
+
+    def stats(self) -> dict:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+def install_rate_limiter(client, limiter: TokenBucket) -> None:
+    """Routes a ccxt client's request throttling through a shared bucket.
+
+    ccxt calls throttle(cost) before every REST request (markets, time, OHLCV, orders)
+    with the endpoint's weight, so replacing it covers every call site.
+    """
+    async def throttle(cost=None):
+        await limiter.acquire(cost)
+
+    client.enableRateLimit = True
+    client.throttle = throttle
+    client.shared_rate_limiter = limiter
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """Returns the process-wide registry of exchange rate limiters."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = RateLimiterRegistry()
+        return _default_registry
+
+
+def get_rate_limiter(exchange_name: str, requests_per_minute: float = None) -> TokenBucket:
+    """Shortcut for get_rate_limiter_registry().limiter(...)."""
+    return get_rate_limiter_registry().limiter(exchange_name, requests_per_minute)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\replay.py
+"""Accelerated replay of the paper-trading runtime from stored candles.
+
+ReplaySession runs the real TradeManagerSimulation.paper_trade loop (candle feed, bar
+scheduler, volatility filter, journal, results writer, Auto promotion) against mock
+exchanges serving the candle store, with a VirtualClock as the process clock. Time
+jumps from bar to bar as soon as every runner has finished the previous one, so a
+month of hourly bars replays in seconds and the same inputs always give the same
+journals and results. Run it in its own process (it installs the process clock and
+the exchange pool's client factory):
+
+    python -m src.core.replay --dir replays/auto_30d --start 2025-01-01 --days 30
+
+The replay directory holds its own data/ (strategies.json, czacha.json,
+promotion.json; copied from the app's data/ when missing) and the simulations/ run
+directories the runners write, so a replay never touches the app's paper state.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from src.core.clock import VirtualClock, set_clock
+from src.core.exchange_pool import get_exchange_pool
+from src.core.mock_exchange import MockExchange
+from src.core.trade_journal import TradeJournal
+from src.core.trade_manager_simulation import TradeManagerSimulation
+from utils.normalization import normalize_symbol
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+APP_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+DATA_FILES = ("strategies.json", "czacha.json", "promotion.json")
+REPLAY_MODES = ("Paper", "Auto")
+
+
+def _epoch(value) -> float:
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    return float(value)
+
+
+class ReplaySession:
+    """One replay of the paper runtime in virtual time.
+
+    Args:
+        base_dir: Replay directory (data/ inputs, simulations/ outputs).
+        start: Virtual start time (datetime, naive = UTC, or epoch seconds).
+        end: Virtual end time; runners still running then are stopped.
+        speed (float): Virtual seconds per real second; None = as fast as possible.
+        exchange_config (dict): MockExchange options. By default candles come from the
+            candle store series of each strategy's exchange (source "store");
+            {"source": "synthetic"} replays generated candles instead.
+    """
+
+    def __init__(self, base_dir, start, end, speed: float = None, exchange_config: dict = None):
+        self.base_dir = Path(base_dir)
+        self.data_dir = self.base_dir / "data"
+        self.start = _epoch(start)
+        self.end = _epoch(end)
+        self.speed = speed
+        self.exchange_config = dict(exchange_config or {"source": "store"})
+        self.clock = None
+
+    def prepare(self, strategies: list = None, czacha: dict = None, promotion: dict = None) -> None:
+        """Writes the replay's data files; missing ones are copied from the app's data/."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in zip(DATA_FILES, (strategies, czacha, promotion)):
+            target = self.data_dir / name
+            if content is not None:
+                with open(target, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False, indent=2)
+            elif not target.exists() and (APP_DATA_DIR / name).exists():
+                shutil.copyfile(APP_DATA_DIR / name, target)
+        with open(self.data_dir / "strategies.json", "r", encoding="utf-8-sig") as f:
+            exchanges = sorted({s.get("exchange", "MEXC") for s in json.load(f)})
+        # paper_trade looks up a key for the strategy's exchange; the mock exchanges ignore it.
+        with open(self.data_dir / "api_keys.json", "w", encoding="utf-8") as f:
+            json.dump([{"exchange": exchange, "api_key": "replay", "api_secret": "replay", "passphrase": ""} for exchange in exchanges], f, indent=2)
+
+    def _runners(self) -> list:
+        with open(self.data_dir / "strategies.json", "r", encoding="utf-8-sig") as f:
+            strategies = json.load(f)
+        # Sorted so the runners subscribe, and the sleeps register, in the same order every time.
+        return sorted((s for s in strategies if s.get("mode") in REPLAY_MODES), key=lambda s: (s["name"], s["symbol"]))
+
+    def _create_exchange(self, symbols: list):
+        def create(exchange_name, api_key_data):
+            config = {"store_exchange": exchange_name.lower(), **self.exchange_config, "symbols": symbols}
+            return MockExchange(config, clock=self.clock.time)
+        return create
+
+    async def run(self) -> dict:
+        """Replays from start to end (or until every runner has stopped).
+
+        Returns:
+            dict: {"runners": {"<strategy>:<symbol>": {status, result, error, capital,
+            profit, trades}}, "virtual_days", "wakeups", "elapsed_seconds"}.
+        """
+        runners = self._runners()
+        if not runners:
+            raise ValueError(f"No strategies in Paper or Auto mode in {self.data_dir / 'strategies.json'}")
+        symbols = sorted({s["symbol"] for s in runners})
+        self.clock = VirtualClock(self.start, self.speed)
+        pool = get_exchange_pool()
+        set_clock(self.clock)
+        pool.client_factory = self._create_exchange(symbols)
+        started = time.perf_counter()
+        manager = TradeManagerSimulation()
+        manager.base_dir = self.base_dir
+        manager.czacha_data.data_file = self.data_dir / "czacha.json"
+        tasks = {}
+        try:
+            for strategy in runners:
+                key = f"{strategy['name']}:{strategy['symbol']}"
+                mode = "auto" if strategy["mode"] == "Auto" else "paper"
+                tasks[key] = asyncio.get_running_loop().create_task(manager.paper_trade(strategy["name"], strategy["symbol"], strategy.get("interval", "1m"), mode=mode))
+            await self.clock.run_until(self.end)
+            for task in tasks.values():
+                task.cancel()
+            outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            await pool.close_all()
+            pool.client_factory = None
+            set_clock(None)
+        report = {}
+        for strategy, (key, outcome) in zip(runners, zip(tasks, outcomes)):
+            entry = {"status": "stopped", "result": None, "error": None}
+            if isinstance(outcome, asyncio.CancelledError):
+                entry["status"] = "running"
+            elif isinstance(outcome, BaseException):
+                entry["status"], entry["error"] = "failed", str(outcome)
+            else:
+                entry["result"] = outcome
+                if outcome and outcome.get("promoted"):
+                    entry["status"] = "promoted"
+            state = TradeJournal(self.base_dir / "simulations" / strategy["name"] / normalize_symbol(strategy["symbol"])).recover()
+            entry.update(capital=state.capital, profit=state.profit, trades=len(state.trades))
+            report[key] = entry
+        elapsed = time.perf_counter() - started
+        logging.info(f"Replayed {(self.clock.time() - self.start) / 86400:.1f} days of {len(runners)} runners in {elapsed:.1f}s")
+        return {
+            "runners": report,
+            "virtual_days": (self.clock.time() - self.start) / 86400,
+            "wakeups": self.clock.wakeups,
+            "elapsed_seconds": elapsed
+        }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Replay the paper-trading runtime from stored candles in virtual time")
+    parser.add_argument("--dir", required=True, help="replay directory (data/ inputs, simulations/ outputs)")
+    parser.add_argument("--start", required=True, help="start date/time, ISO format, UTC")
+    parser.add_argument("--days", type=float, default=30.0)
+    parser.add_argument("--speed", type=float, default=None, help="virtual seconds per real second (default: as fast as possible)")
+    parser.add_argument("--source", choices=("store", "synthetic"), default="store")
+    parser.add_argument("--store-exchange", default=None, help="candle store series to replay (default: each strategy's exchange)")
+    args = parser.parse_args(argv)
+    start = _epoch(datetime.fromisoformat(args.start))
+    exchange_config = {"source": args.source}
+    if args.store_exchange:
+        exchange_config["store_exchange"] = args.store_exchange.lower()
+    session = ReplaySession(args.dir, start, start + args.days * 86400, args.speed, exchange_config)
+    session.prepare()
+    report = asyncio.run(session.run())
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
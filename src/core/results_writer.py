@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\results_writer.py
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Summaries and monthly rollups of a running paper/live strategy are rewritten at most this often (seconds).
+DEFAULT_FLUSH_INTERVAL = 60.0
+# simulation_settings.json entry overriding DEFAULT_FLUSH_INTERVAL for the process-wide writer.
+FLUSH_INTERVAL_SETTING = "Zapis wynikow co (s)"
+SETTINGS_FILE = Path(__file__).resolve().parents[2] / "data" / "simulation_settings.json"
+JOURNAL_FILE = "trades.json"
+OPEN_TRADES_FILE = "open_trades.json"
+
+
+def load_flush_interval(settings_file: Path = SETTINGS_FILE) -> float:
+    """Returns the rollup flush interval (seconds) from simulation_settings.json, DEFAULT_FLUSH_INTERVAL if unset."""
+    try:
+        with open(settings_file, "r", encoding="utf-8") as f:
+            value = json.load(f).get(FLUSH_INTERVAL_SETTING)
+        if value is None:
+            return DEFAULT_FLUSH_INTERVAL
+        interval = float(value)
+        if interval <= 0:
+            raise ValueError(f"must be positive, got {value}")
+        return interval
+    except Exception as e:
+        logging.error(f"Invalid results flush interval in {settings_file}: {str(e)}")
+        return DEFAULT_FLUSH_INTERVAL
+
+
+def write_summary(base_dir: Path, summary: dict) -> None:
+    """Writes summary.json of a run directory (used as a rollup by the live loop)."""
+    with open(Path(base_dir) / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+class _RunState:
+    __slots__ = ("base_dir", "journaled", "open_trades", "rollup", "dirty", "last_flush")
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self.journaled = None
+        self.open_trades = None
+        self.rollup = None
+        self.dirty = False
+        self.last_flush = None
+
+    def due(self, now: float, interval: float) -> bool:
+        return self.dirty and (self.last_flush is None or now - self.last_flush >= interval)
+
+
+class ResultsWriter:
+    """Write-behind persistence of paper/live run results.
+
+    record() is called once per tick with the run's full trade list. Trades not yet on
+    disk are appended to trades.json (one JSON object per line) right away; the first
+    record() of a run in this process rewrites the file from the list it is given (the
+    history recovered from the run's TradeJournal). open_trades.json is rewritten only
+    when the open positions change. The rollup callable (summary.json, monthly
+    YYYYMM.json) of the latest tick is kept and run when flush_interval has passed since
+    the last flush, on flush()/close() and on shutdown(), so between flushes a tick
+    costs at most one small append. A background thread calls flush_due() every
+    flush_interval, so the rollup of a run whose ticks stopped is not held until it
+    closes.
+    """
+
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL, clock=time.monotonic):
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._runs = {}
+        self._lock = threading.RLock()
+        self.appended = 0
+        self.flushes = 0
+        self._timer = None
+        self._stop = None
+
+    @staticmethod
+    def _key(base_dir) -> Path:
+        return Path(base_dir).resolve()
+
+    def _write_journal(self, state: _RunState, trades: list) -> None:
+        append = state.journaled is not None and len(trades) >= state.journaled
+        new_trades = trades[state.journaled:] if append else trades
+        if append and not new_trades:
+            return
+        with open(state.base_dir / JOURNAL_FILE, "a" if append else "w", encoding="utf-8") as f:
+            for trade in new_trades:
+                json.dump(trade, f, ensure_ascii=False)
+                f.write("\n")
+        state.journaled = len(trades)
+        self.appended += len(new_trades)
+
+    def record(self, base_dir, trades: list, open_trades: list = None, rollup=None) -> None:
+        """Persists one tick of a run.
+
+        Args:
+            base_dir: Run directory (e.g. simulations/<strategy>/<symbol>).
+            trades (list): All trades of the run so far; only the new tail is written.
+            open_trades (list): Open positions, written to open_trades.json when changed.
+            rollup (callable): No-argument callable regenerating the summaries of this tick. It may run
+                later on the writer's timer thread, so it must hold copies of data the caller keeps mutating.
+        """
+        with self._lock:
+            key = self._key(base_dir)
+            state = self._runs.get(key)
+            if state is None:
+                key.mkdir(parents=True, exist_ok=True)
+                state = self._runs[key] = _RunState(key)
+            self._write_journal(state, trades)
+            if open_trades is not None and open_trades != state.open_trades:
+                with open(key / OPEN_TRADES_FILE, "w", encoding="utf-8") as f:
+                    json.dump({"open_trades": open_trades}, f, indent=4, ensure_ascii=False)
+                state.open_trades = [dict(t) for t in open_trades]
+            if rollup is not None:
+                state.rollup = rollup
+                state.dirty = True
+            if state.due(self._clock(), self.flush_interval):
+                self._flush_state(state)
+            self._start_timer()
+
+    def _start_timer(self) -> None:
+        if self._timer is None:
+            self._stop = threading.Event()
+            self._timer = threading.Thread(target=self._run_timer, args=(self._stop,), name="results-writer", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self, stop: threading.Event) -> None:
+        while not stop.wait(self.flush_interval):
+            self.flush_due()
+
+    def flush_due(self) -> int:
+        """Regenerates the pending summaries whose flush_interval has passed; returns how many were written."""
+        with self._lock:
+            now = self._clock()
+            return sum(1 for state in list(self._runs.values()) if state.due(now, self.flush_interval) and self._flush_state(state))
+
+    def _flush_state(self, state: _RunState) -> bool:
+        if not state.dirty or state.rollup is None:
+            return False
+        try:
+            state.rollup()
+        except Exception as e:
+            logging.error(f"Writing summaries to {state.base_dir} failed: {str(e)}")
+            return False
+        state.dirty = False
+        state.last_flush = self._clock()
+        self.flushes += 1
+        return True
+
+    def flush(self, base_dir=None) -> int:
+        """Regenerates pending summaries of one run (or of all runs); returns how many were written."""
+        with self._lock:
+            if base_dir is not None:
+                state = self._runs.get(self._key(base_dir))
+                states = [state] if state is not None else []
+            else:
+                states = list(self._runs.values())
+            return sum(1 for state in states if self._flush_state(state))
+
+    def close(self, base_dir) -> None:
+        """Flushes a finished run and forgets it, so the next run rewrites trades.json."""
+        with self._lock:
+            self.flush(base_dir)
+            self._runs.pop(self._key(base_dir), None)
+
+    def shutdown(self) -> None:
+        """Flushes every run; called when the application closes."""
+        with self._lock:
+            flushed = self.flush()
+            self._runs.clear()
+            if self._timer is not None:
+                self._stop.set()
+                self._timer = None
+        logging.info(f"Results writer flushed {flushed} runs on shutdown")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "runs": len(self._runs),
+                "pending": sum(1 for state in self._runs.values() if state.dirty),
+                "appended_trades": self.appended,
+                "flushes": self.flushes
+            }
+
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+
+def get_results_writer() -> ResultsWriter:
+    """Returns the process-wide results writer (flush interval from simulation_settings.json)."""
+    global _default_writer
+    with _default_writer_lock:
+        if _default_writer is None:
+            _default_writer = ResultsWriter(flush_interval=load_flush_interval())
+        return _default_writer
+
+
+def set_results_writer(writer) -> None:
+    """Replaces the process-wide results writer; None makes the next get_results_writer() build a new one."""
+    global _default_writer
+    with _default_writer_lock:
+        _default_writer = writer
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\running_stats.py
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+FIELDS = (
+    "initial_capital", "equity", "peak_equity", "max_drawdown", "net_profit", "max_profit", "closed_trades",
+    "winning_trades", "losing_trades", "gross_profit", "gross_loss", "gross_profit_usd", "gross_loss_usd",
+    "total_duration_minutes", "equity_points"
+)
+
+
+class RunningStats:
+    """Performance statistics of a paper/live/backtest run, updated in O(1) per event.
+
+    update_equity() is called once per tick with the current capital and tracks the
+    peak and the deepest drawdown (equity minus running peak, so <= 0). record_trade()
+    is called when a position is closed. Win rate and profit factor use the price move
+    of each trade (exit - entry), as the summaries always have; USD totals are kept
+    alongside. snapshot()/from_snapshot() round-trip the state through a plain dict.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, initial_capital: float = 1000.0):
+        self.initial_capital = float(initial_capital)
+        self.equity = self.initial_capital
+        self.peak_equity = self.initial_capital
+        self.max_drawdown = 0.0
+        self.net_profit = 0.0
+        self.max_profit = 0.0
+        self.closed_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.gross_profit_usd = 0.0
+        self.gross_loss_usd = 0.0
+        self.total_duration_minutes = 0.0
+        self.equity_points = 1
+
+    def update_equity(self, equity: float) -> None:
+        """Adds one point of the equity curve."""
+        self.equity = float(equity)
+        self.equity_points += 1
+        if self.equity > self.peak_equity:
+            self.peak_equity = self.equity
+        drawdown = self.equity - self.peak_equity
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    def record_trade(self, entry_price: float, exit_price: float, profit_usd: float, duration_minutes: float = 0.0) -> None:
+        """Adds a closed trade (buy at entry_price, sell at exit_price)."""
+        self.closed_trades += 1
+        move = exit_price - entry_price
+        if move > 0:
+            self.winning_trades += 1
+            self.gross_profit += move
+        elif move < 0:
+            self.losing_trades += 1
+            self.gross_loss -= move
+        if profit_usd > 0:
+            self.gross_profit_usd += profit_usd
+        else:
+            self.gross_loss_usd -= profit_usd
+        self.net_profit += profit_usd
+        self.max_profit = max(self.max_profit, self.net_profit)
+        self.total_duration_minutes += duration_minutes or 0.0
+
+    @property
+    def winrate_pct(self) -> float:
+        return self.winning_trades / self.closed_trades * 100 if self.closed_trades > 0 else 0
+
+    @property
+    def profit_factor(self):
+        """gross_profit / gross_loss; 0 without trades and "inf" without losing trades."""
+        if self.gross_loss > 0:
+            return self.gross_profit / self.gross_loss
+        return 0 if self.gross_profit == 0 else "inf"
+
+    @property
+    def avg_duration_minutes(self) -> float:
+        return self.total_duration_minutes / self.closed_trades if self.closed_trades else 0.0
+
+    def summary(self) -> dict:
+        """Returns the metrics in the layout of summary.json."""
+        return {
+            "net_profit_usd": self.net_profit,
+            "max_drawdown_usd": self.max_drawdown,
+            "max_profit_usd": self.max_profit,
+            "total_trades": self.closed_trades,
+            "winrate_pct": self.winrate_pct,
+            "profit_factor": self.profit_factor
+        }
+
+    def snapshot(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> "RunningStats":
+        stats = cls(data.get("initial_capital", 1000.0))
+        for field in FIELDS:
+            if field in data:
+                setattr(stats, field, data[field])
+        return stats
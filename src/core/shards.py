@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\shards.py
+"""Sharded engine: (strategy, symbol) runners spread over worker processes.
+
+The supervisor (ShardedEngine, served by EngineServer like TradingEngine) assigns each
+runner to a worker with rendezvous hashing, polls every market once with its own
+CandleFeed and sends the candles to the workers over their pipes. Each worker runs a
+TradingEngine on its own event loop with a RemoteCandleFeed, so a strategy with heavy
+indicator code only delays the runners of its own worker. A worker that dies is
+started again and its runners are restarted; they recover their state from the trade
+journal. A runner its worker cannot start is retried and then reported as failed.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import threading
+from src.core.candle_feed import CandleUpdate, RemoteCandleFeed, get_candle_feed, set_candle_feed
+from src.core.engine import RUNNER_KINDS, TradingEngine, _Runner, runner_key
+from src.core.exchange_pool import get_exchange_pool
+from src.core.rate_limiter import get_rate_limiter_registry
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+# Seconds between liveness checks of the worker processes.
+CHECK_INTERVAL = 1.0
+# Seconds a worker gets to stop its runners on shutdown before it is terminated.
+SHUTDOWN_TIMEOUT = 10.0
+# A runner restarted with its worker this many times is given up (it is likely what kills the worker).
+MAX_RUNNER_RESTARTS = 3
+
+
+def shard_for(key: str, shards: int) -> int:
+    """Rendezvous (highest random weight) assignment of a runner key to one of shards workers.
+
+    The same key always maps to the same worker, and changing the number of workers
+    moves only the keys whose winning worker was added or removed.
+    """
+    if shards < 1:
+        raise ValueError(f"Number of shards must be greater than 0, got {shards}")
+    return max(range(shards), key=lambda shard: hashlib.blake2b(f"{shard}:{key}".encode("utf-8"), digest_size=8).digest())
+
+
+def _worker_main(index: int, conn, engine_factory, rate_share: float) -> None:
+    """Entry point of a worker process."""
+    get_rate_limiter_registry().share = rate_share
+    try:
+        asyncio.run(_worker_loop(index, conn, engine_factory))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _worker_loop(index: int, conn, engine_factory) -> None:
+    loop = asyncio.get_running_loop()
+    feed = RemoteCandleFeed(conn.send)
+    set_candle_feed(feed)
+    engine = engine_factory()
+    events = engine.subscribe()
+    inbox = asyncio.Queue()
+
+    def read_pipe():
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                message = {"type": "shutdown"}
+            loop.call_soon_threadsafe(inbox.put_nowait, message)
+            if message.get("type") == "shutdown":
+                return
+
+    async def forward_events():
+        while True:
+            conn.send({"type": "event", "event": await events.get()})
+
+    threading.Thread(target=read_pipe, name=f"shard-{index}-pipe", daemon=True).start()
+    forwarder = loop.create_task(forward_events())
+    logging.info(f"Engine worker {index} started")
+    try:
+        while True:
+            message = await inbox.get()
+            kind = message.get("type")
+            if kind == "candles":
+                feed.deliver(message["key"], CandleUpdate(message["symbol"], message["interval"], message["candles"], message["new_candles"], message["bar_close"]))
+            elif kind == "feed_error":
+                feed.fail(message["key"], message["error"])
+            elif kind == "start":
+                try:
+                    await engine.start(message["kind"], message["strategy"], message["symbol"], message["interval"], **message.get("params", {}))
+                except Exception as e:
+                    logging.error(f"Engine worker {index} could not start {message}: {str(e)}")
+                    conn.send({"type": "start_failed", "key": runner_key(message["kind"], message["strategy"], message["symbol"]), "error": str(e)})
+            elif kind == "stop":
+                await engine.stop(message["key"])
+            elif kind == "shutdown":
+                break
+    finally:
+        await engine.shutdown()
+        await asyncio.sleep(0)
+        while not events.empty():
+            conn.send({"type": "event", "event": events.get_nowait()})
+        forwarder.cancel()
+        logging.info(f"Engine worker {index} stopped")
+
+
+class _Worker:
+    __slots__ = ("index", "process", "conn", "generation", "feeds")
+
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.generation = 0
+        self.feeds = {}
+
+
+class ShardedEngine:
+    """Supervisor with the interface of TradingEngine that runs runners in worker processes.
+
+    Args:
+        workers (int): Number of worker processes.
+        engine_factory: Callable creating the engine of a worker (TradingEngine).
+        feed: Candle feed polled by the supervisor for the workers (process-wide feed).
+        check_interval (float): Seconds between liveness checks of the workers.
+    """
+
+    def __init__(self, workers: int, engine_factory=TradingEngine, feed=None, check_interval: float = CHECK_INTERVAL):
+        if workers < 1:
+            raise ValueError(f"Number of workers must be greater than 0, got {workers}")
+        self.engine_factory = engine_factory
+        self.feed = feed
+        self.check_interval = check_interval
+        self.runners = {}
+        self.assignment = {}
+        self.restarts = 0
+        self._runner_restarts = {}
+        self._workers = [_Worker(index) for index in range(workers)]
+        self._subscribers = set()
+        # spawn everywhere (as on Windows): forking a process with a running loop and threads is unsafe.
+        self._context = multiprocessing.get_context("spawn")
+        self._loop = None
+        self._monitor = None
+        self._closing = False
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def _ensure_started(self) -> None:
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        # Supervisor and workers share the exchanges' request budget.
+        get_rate_limiter_registry().share = 1.0 / (self.workers + 1)
+        self.feed = self.feed or get_candle_feed()
+        for worker in self._workers:
+            self._spawn(worker)
+        self._monitor = self._loop.create_task(self._watch())
+
+    def _spawn(self, worker: _Worker) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        worker.generation += 1
+        worker.conn = parent_conn
+        worker.process = self._context.Process(
+            target=_worker_main, args=(worker.index, child_conn, self.engine_factory, 1.0 / (self.workers + 1)),
+            name=f"engine-shard-{worker.index}", daemon=True
+        )
+        worker.process.start()
+        child_conn.close()
+        generation = worker.generation
+        threading.Thread(target=self._read_worker, args=(worker, parent_conn, generation), name=f"shard-{worker.index}-reader", daemon=True).start()
+        logging.info(f"Started engine worker {worker.index} (pid {worker.process.pid})")
+
+    def _read_worker(self, worker: _Worker, conn, generation: int) -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            self._loop.call_soon_threadsafe(self._on_message, worker, generation, message)
+
+    def _send(self, worker: _Worker, message: dict) -> None:
+        try:
+            worker.conn.send(message)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not reach engine worker {worker.index}: {str(e)}")
+
+    def _on_message(self, worker: _Worker, generation: int, message: dict) -> None:
+        if generation != worker.generation:
+            return
+        kind = message.get("type")
+        if kind == "event":
+            event = message["event"]
+            info = event["runner"]
+            runner = self.runners.get(info["key"])
+            if runner is not None:
+                runner.status, runner.error, runner.finished_at = info["status"], info["error"], info["finished_at"]
+            event["runner"] = dict(info, shard=worker.index)
+            self._publish(event)
+        elif kind == "feed_subscribe":
+            self._feed_unsubscribe(worker, message["key"])
+            subscription = self.feed.subscribe(message["exchange"], message["api_key_data"], message["symbol"], message["interval"], message["capacity"])
+            task = self._loop.create_task(self._forward_candles(worker, tuple(message["key"]), subscription))
+            worker.feeds[tuple(message["key"])] = (subscription, task)
+        elif kind == "feed_unsubscribe":
+            self._feed_unsubscribe(worker, message["key"])
+        elif kind == "start_failed":
+            runner = self.runners.get(message["key"])
+            if runner is not None and runner.status == "starting":
+                self._retry(worker, runner, f"Worker {worker.index} could not start it {MAX_RUNNER_RESTARTS} times: {message['error']}", self.check_interval)
+
+    def _feed_unsubscribe(self, worker: _Worker, key) -> None:
+        entry = worker.feeds.pop(tuple(key), None)
+        if entry is not None:
+            entry[1].cancel()
+            entry[0].close()
+
+    async def _forward_candles(self, worker: _Worker, key: tuple, subscription) -> None:
+        while True:
+            try:
+                update = await subscription.next()
+            except RuntimeError as e:
+                # The market's poller stopped: the worker's runners get the error from their own next().
+                worker.feeds.pop(key, None)
+                self._send(worker, {"type": "feed_error", "key": key, "error": str(e)})
+                return
+            self._send(worker, {
+                "type": "candles", "key": key, "symbol": update.symbol, "interval": update.interval,
+                "candles": update.candles, "new_candles": update.new_candles, "bar_close": update.bar_close
+            })
+
+    async def _watch(self) -> None:
+        while not self._closing:
+            await asyncio.sleep(self.check_interval)
+            for worker in self._workers:
+                if not self._closing and not worker.process.is_alive():
+                    self._restart(worker)
+
+    def _restart(self, worker: _Worker) -> None:
+        logging.error(f"Engine worker {worker.index} exited with code {worker.process.exitcode}, restarting it")
+        for key in list(worker.feeds):
+            self._feed_unsubscribe(worker, key)
+        worker.conn.close()
+        self._spawn(worker)
+        self.restarts += 1
+        for key, runner in self.runners.items():
+            if self.assignment.get(key) != worker.index or runner.status not in ("starting", "running"):
+                continue
+            self._retry(worker, runner, f"Worker {worker.index} crashed {MAX_RUNNER_RESTARTS} times while running it")
+
+    def _retry(self, worker: _Worker, runner: _Runner, error: str, delay: float = 0.0) -> None:
+        """Starts a runner on its worker again, or fails it with error after MAX_RUNNER_RESTARTS retries."""
+        self._runner_restarts[runner.key] = self._runner_restarts.get(runner.key, 0) + 1
+        if self._runner_restarts[runner.key] > MAX_RUNNER_RESTARTS:
+            runner.status, runner.error = "failed", error
+            logging.error(f"Engine gave up restarting {runner.key}: {runner.error}")
+            self._publish({"event": "failed", "runner": dict(runner.info(), shard=worker.index)})
+            return
+        self._loop.call_later(delay, self._resend, worker, runner)
+
+    def _resend(self, worker: _Worker, runner: _Runner) -> None:
+        # A runner stopped or started anew in the meantime is left alone.
+        if not self._closing and self.runners.get(runner.key) is runner and runner.status in ("starting", "running"):
+            self._send(worker, self._start_message(runner))
+
+    @staticmethod
+    def _start_message(runner: _Runner) -> dict:
+        return {"type": "start", "kind": runner.kind, "strategy": runner.strategy, "symbol": runner.symbol, "interval": runner.interval, "params": runner.params}
+
+    def _publish(self, event: dict) -> None:
+        for queue in list(self._subscribers):
+            queue.put_nowait(event)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def start(self, kind: str, strategy: str, symbol: str, interval: str = "1h", **params) -> dict:
+        """Starts a runner on the worker its key is assigned to."""
+        if kind not in RUNNER_KINDS:
+            raise ValueError(f"Unknown runner kind {kind}, expected one of {RUNNER_KINDS}")
+        self._ensure_started()
+        key = runner_key(kind, strategy, symbol)
+        index = shard_for(key, self.workers)
+        runner = _Runner(key, kind, strategy, symbol, interval, params)
+        self.runners[key] = runner
+        self.assignment[key] = index
+        self._runner_restarts.pop(key, None)
+        self._send(self._workers[index], self._start_message(runner))
+        logging.info(f"Engine assigned {key} to worker {index}")
+        return dict(runner.info(), shard=index)
+
+    async def stop(self, key: str) -> bool:
+        runner = self.runners.get(key)
+        if runner is None or runner.status not in ("starting", "running"):
+            return False
+        self._send(self._workers[self.assignment[key]], {"type": "stop", "key": key})
+        return True
+
+    def status(self) -> list:
+        return [dict(runner.info(), shard=self.assignment.get(key)) for key, runner in self.runners.items()]
+
+    async def shutdown(self) -> None:
+        """Stops the workers (they stop their runners and flush their results)."""
+        if self._loop is None:
+            return
+        self._closing = True
+        self._monitor.cancel()
+        for worker in self._workers:
+            self._send(worker, {"type": "shutdown"})
+        for worker in self._workers:
+            await asyncio.to_thread(worker.process.join, SHUTDOWN_TIMEOUT)
+            if worker.process.is_alive():
+                logging.warning(f"Engine worker {worker.index} did not stop in time, terminating it")
+                worker.process.terminate()
+            for key in list(worker.feeds):
+                self._feed_unsubscribe(worker, key)
+        await get_exchange_pool().close_all()
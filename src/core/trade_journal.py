@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\trade_journal.py
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from src.core.results_writer import JOURNAL_FILE as TRADES_FILE
+from src.core.running_stats import RunningStats
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\app.log", encoding="utf-8"),
+        logging.FileHandler("C:\\Users\\Msi\\Desktop\\investmentapp\\logs\\error.log", encoding="utf-8"),
+        logging.StreamHandler()
+    ]
+)
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+# Appended events are forced to disk at most this often (seconds); close() and snapshots always sync.
+DEFAULT_FSYNC_INTERVAL = 1.0
+# A snapshot of the runner state is written after this many events.
+DEFAULT_SNAPSHOT_EVERY = 200
+
+
+class RunnerState:
+    """State of a paper/live runner that the journal events are applied to.
+
+    buy()/sell()/transition() build an event, apply it and return it for the journal;
+    apply() replays a journaled event, so a live tick and a recovery go through the
+    same code.
+    """
+
+    __slots__ = ("capital", "position", "entry_price", "entry_time", "profit", "trades", "stats", "status")
+
+    def __init__(self, initial_capital: float = 1000.0):
+        self.capital = float(initial_capital)
+        self.position = 0
+        self.entry_price = 0
+        self.entry_time = None
+        self.profit = 0
+        self.trades = []
+        self.stats = RunningStats(initial_capital)
+        self.status = "new"
+
+    def buy(self, price: float, timestamp) -> dict:
+        """Opens a position with the whole capital at price."""
+        event = {"type": "fill", "side": "buy", "price": float(price), "quantity": self.capital / price, "timestamp": timestamp.isoformat()}
+        self.apply(event)
+        return event
+
+    def sell(self, price: float, timestamp) -> dict:
+        """Closes the open position at price."""
+        duration = (timestamp - datetime.fromisoformat(self.entry_time)).total_seconds() / 60
+        event = {
+            "type": "fill", "side": "sell", "price": float(price), "quantity": self.position, "timestamp": timestamp.isoformat(),
+            "profit_usd": self.position * (price - self.entry_price), "duration_minutes": duration
+        }
+        self.apply(event)
+        return event
+
+    def transition(self, kind: str, **details) -> dict:
+        """Marks the runner as started ("start") or stopped ("stop")."""
+        event = {"type": kind, **details}
+        self.apply(event)
+        return event
+
+    def apply(self, event: dict) -> None:
+        kind = event.get("type")
+        if kind == "fill" and event["side"] == "buy":
+            self.position = event["quantity"]
+            self.entry_price = event["price"]
+            self.entry_time = event["timestamp"]
+            self.trades.append({"type": "buy", "price": event["price"], "timestamp": event["timestamp"], "profit_usd": 0, "duration_minutes": 0})
+        elif kind == "fill" and event["side"] == "sell":
+            trade_profit = event["profit_usd"]
+            self.profit += trade_profit
+            self.capital += trade_profit
+            self.stats.record_trade(self.entry_price, event["price"], trade_profit, event["duration_minutes"])
+            self.stats.update_equity(self.capital)
+            self.position = 0
+            self.entry_time = None
+            self.trades.append({"type": "sell", "price": event["price"], "timestamp": event["timestamp"], "profit_usd": trade_profit, "duration_minutes": event["duration_minutes"]})
+        elif kind in ("start", "stop"):
+            self.status = "running" if kind == "start" else "stopped"
+        else:
+            logging.warning(f"Ignoring unknown journal event {event}")
+
+    def open_trades(self) -> list:
+        if self.position == 0:
+            return []
+        return [{"type": "buy", "price": self.entry_price, "timestamp": self.entry_time}]
+
+    def snapshot(self) -> dict:
+        """Returns what a restart needs to resume; the trades themselves are only counted."""
+        return {
+            "capital": self.capital, "position": self.position, "entry_price": self.entry_price, "entry_time": self.entry_time,
+            "profit": self.profit, "trades_count": len(self.trades), "stats": self.stats.snapshot(), "status": self.status
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict, trades: list = None) -> "RunnerState":
+        """Rebuilds a state from snapshot(); trades are the first trades_count trades of the run."""
+        state = cls(data["stats"].get("initial_capital", 1000.0))
+        for field in ("capital", "position", "entry_price", "entry_time", "profit", "status"):
+            setattr(state, field, data[field])
+        # Snapshots written before trades_count carry the full list.
+        state.trades = list(data["trades"] if "trades" in data else trades or [])
+        state.stats = RunningStats.from_snapshot(data["stats"])
+        return state
+
+
+class TradeJournal:
+    """Append-only event journal of one (strategy, symbol) run directory.
+
+    Every fill and state transition is one JSON line in journal.jsonl with a sequence
+    number. Writes are flushed to the OS at once and fsynced in batches (at most every
+    fsync_interval seconds, and always on snapshot/close). Every snapshot_every events
+    the RunnerState (capital, position, counters and the number of trades) is written
+    to snapshot.json together with the journal byte offset it covers, so recover()
+    reads the snapshot, takes the trades it counts from the trades.json the results
+    writer keeps in the same directory and replays only the journal tail after that
+    offset. When trades.json holds fewer trades than the snapshot counts (the writer
+    had not caught up before a crash), the whole journal is replayed instead. A torn
+    last line left by a crash is dropped and truncated away.
+    """
+
+    def __init__(self, base_dir, fsync_interval: float = DEFAULT_FSYNC_INTERVAL, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY, clock=time.monotonic):
+        self.base_dir = Path(base_dir)
+        self.journal_file = self.base_dir / JOURNAL_FILE
+        self.trades_file = self.base_dir / TRADES_FILE
+        self.snapshot_file = self.base_dir / SNAPSHOT_FILE
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self._clock = clock
+        self._file = None
+        self._unsynced = False
+        self._last_sync = clock()
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self.replayed = 0
+
+    def _open(self):
+        if self._file is None:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_file, "ab")
+        return self._file
+
+    def _load_snapshot(self):
+        if not self.snapshot_file.exists():
+            return None
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable journal snapshot {self.snapshot_file}: {str(e)}")
+            return None
+
+    def _load_trades(self, count: int):
+        """Returns the first count trades of trades.json, None when it holds fewer."""
+        trades = []
+        if count and self.trades_file.exists():
+            with open(self.trades_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if len(trades) == count:
+                        break
+                    try:
+                        trades.append(json.loads(line))
+                    except ValueError:
+                        break
+        return trades if len(trades) == count else None
+
+    def recover(self, initial_capital: float = 1000.0) -> RunnerState:
+        """Rebuilds the runner state from the last snapshot plus the journal tail.
+
+        Args:
+            initial_capital (float): Capital of a run without any journal.
+
+        Returns:
+            RunnerState: Recovered state (a fresh one when the directory has no journal).
+        """
+        snapshot = self._load_snapshot()
+        offset = 0
+        state = RunnerState(initial_capital)
+        trades = None
+        if snapshot is not None and "trades" not in snapshot["state"]:
+            trades = self._load_trades(snapshot["state"]["trades_count"])
+            if trades is None:
+                logging.warning(f"{self.trades_file} is behind the journal snapshot, replaying the journal from the start")
+                snapshot = None
+        if snapshot is not None:
+            state = RunnerState.from_snapshot(snapshot["state"], trades)
+            self.seq = snapshot["seq"]
+            offset = snapshot["offset"]
+        self.replayed = 0
+        if self.journal_file.exists():
+            if offset > self.journal_file.stat().st_size:
+                logging.warning(f"Journal {self.journal_file} is shorter than its snapshot, replaying from the start")
+                state, offset, self.seq = RunnerState(initial_capital), 0, 0
+            good_end = offset
+            with open(self.journal_file, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Dropping torn event at offset {good_end} of {self.journal_file}")
+                        break
+                    if event["seq"] > self.seq:
+                        state.apply(event)
+                        self.seq = event["seq"]
+                        self.replayed += 1
+                    good_end += len(line)
+            if good_end < self.journal_file.stat().st_size:
+                with open(self.journal_file, "r+b") as f:
+                    f.truncate(good_end)
+        self.events_since_snapshot = self.replayed
+        if self.replayed or snapshot is not None:
+            logging.info(f"Recovered {self.base_dir}: snapshot seq {snapshot['seq'] if snapshot else 0}, replayed {self.replayed} events")
+        return state
+
+    def append(self, event: dict, state: RunnerState = None) -> dict:
+        """Journals an event (already applied to state) and snapshots state when due."""
+        self.seq += 1
+        event = {"seq": self.seq, **event}
+        f = self._open()
+        f.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+        f.flush()
+        self._unsynced = True
+        self.events_since_snapshot += 1
+        if state is not None and self.events_since_snapshot >= self.snapshot_every:
+            self.snapshot(state)
+        elif self._clock() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        return event
+
+    def sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+        self._last_sync = self._clock()
+
+    def snapshot(self, state: RunnerState) -> None:
+        """Writes snapshot.json covering every event journaled so far."""
+        self.sync()
+        offset = self.journal_file.stat().st_size if self.journal_file.exists() else 0
+        tmp_file = self.snapshot_file.with_suffix(".tmp")
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"seq": self.seq, "offset": offset, "state": state.snapshot()}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        self.events_since_snapshot = 0
+
+    def close(self, state: RunnerState = None) -> None:
+        """Syncs the journal, snapshots state (if given) and closes the file."""
+        if state is not None and self.events_since_snapshot:
+            self.snapshot(state)
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
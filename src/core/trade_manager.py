@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 # Path: C:\Users\Msi\Desktop\investmentapp\src\core\trade_manager.py
 import asyncio
-import ccxt.async_support as ccxt
 import pandas as pd
 import json
 import logging
@@ -18,65 +17,74 @@ import shutil
 import uuid
 from src.core.trade_manager_base import TradeManagerBase
 from src.core.trade_manager_results import TradeManagerResults
+from src.core.candle_store import get_candle_store
+from src.core.candle_gaps import find_gaps, missing_bars
+from src.core.exchange_pool import get_exchange_pool
+from src.core.exchange_health import get_exchange_health
+from src.core.market_cache import get_market_cache
+from utils.normalization import normalize_interval
 from src.tabs.czacha_data import CzachaData
 
 class TradeManager(TradeManagerBase):
     async def fetch_alternative_ohlcv(self, symbol, timeframe, limit, primary_exchange_name):
         try:
             api_keys = self.load_api_keys()
-            alternative_exchanges = [key for key in api_keys if key["exchange"].lower() != primary_exchange_name.lower()]
-            for alt_key in alternative_exchanges:
-                exchange_name = alt_key["exchange"].lower()
-                logging.info(f"Attempting to fetch OHLCV from alternative exchange {exchange_name} for {symbol}")
-                exchange_class = getattr(ccxt, exchange_name)
-                exchange = exchange_class({
-                    "apiKey": alt_key["api_key"],
-                    "secret": alt_key["api_secret"],
-                    "password": alt_key.get("passphrase", ""),
-                    "rateLimit": alt_key.get("rate_limit_requests", 1800),
-                    "timeout": alt_key.get("timeout_seconds", 30) * 1000
-                })
-                try:
+            alternative_keys = {key["exchange"].lower(): key for key in api_keys if key["exchange"].lower() != primary_exchange_name.lower()}
+            if not alternative_keys:
+                logging.warning(f"No alternative exchanges configured for {symbol}")
+                return None
+
+            async def attempt(exchange_name):
+                alt_key = alternative_keys[exchange_name]
+                async with get_exchange_pool().lease(exchange_name, alt_key) as exchange:
                     await self.synchronize_time(exchange, exchange_name)
-                    symbol = await self.validate_symbol_and_interval(exchange, symbol, timeframe)
-                    last_ts = self.last_signal_time.get(f"{symbol}_{timeframe}", 0)
+                    alt_symbol = await self.validate_symbol_and_interval(exchange, symbol, timeframe)
+                    last_ts = getattr(self, "last_signal_time", {}).get(f"{alt_symbol}_{timeframe}", 0)
                     ohlcv = await asyncio.wait_for(
-                        exchange.fetch_ohlcv(symbol, timeframe, since=last_ts + 1, limit=limit),
+                        exchange.fetch_ohlcv(alt_symbol, timeframe, since=last_ts + 1, limit=limit),
                         timeout=alt_key.get("timeout_seconds", 30)
                     )
-                    if ohlcv:
-                        logging.info(f"Successfully fetched {len(ohlcv)} OHLCV candles from {exchange_name} for {symbol} and {timeframe}")
-                        self.save_fallback_ohlcv(symbol, timeframe, ohlcv)
-                        await exchange.close()
-                        return ohlcv
-                    else:
-                        logging.warning(f"No OHLCV data returned from {exchange_name} for {symbol}")
-                except Exception as e:
-                    logging.warning(f"Failed to fetch OHLCV from {exchange_name} for {timeframe}: {str(e)}")
-                finally:
-                    await exchange.close()
-            logging.warning(f"No OHLCV data fetched from alternative exchanges for {symbol}")
-            return None
+                if not ohlcv:
+                    logging.warning(f"No OHLCV data returned from {exchange_name} for {alt_symbol}")
+                    return None
+                self.verify_ohlcv_data(pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]), timeframe)
+                return alt_symbol, ohlcv
+
+            # Alternatives are queried concurrently (best health score first); the first verified answer wins.
+            logging.info(f"Racing alternative exchanges {list(alternative_keys)} for {symbol} {timeframe}")
+            exchange_name, result = await get_exchange_health().race(list(alternative_keys), attempt)
+            if result is None:
+                logging.warning(f"No OHLCV data fetched from alternative exchanges for {symbol}")
+                return None
+            alt_symbol, ohlcv = result
+            logging.info(f"Successfully fetched {len(ohlcv)} OHLCV candles from {exchange_name} for {alt_symbol} and {timeframe}")
+            self.save_fallback_ohlcv(alt_symbol, timeframe, ohlcv, exchange_name)
+            return ohlcv
         except Exception as e:
             logging.error(f"Error fetching alternative OHLCV for {symbol}: {str(e)}")
             return None
 
+    def save_fallback_ohlcv(self, symbol, timeframe, ohlcv, exchange_name="fallback"):
+        try:
+            added = get_candle_store().append(exchange_name, symbol, timeframe, ohlcv)
+            logging.info(f"Saved {added} new OHLCV candles from {exchange_name} for {symbol} and {timeframe} to candle store")
+        except Exception as e:
+            logging.error(f"Error saving fallback OHLCV for {symbol} and {timeframe}: {str(e)}")
+
     async def validate_symbol_and_interval(self, exchange, symbol, timeframe):
         try:
-            symbol, timeframe = self.normalize_symbol_and_interval(symbol, timeframe)
-            available_symbols = await self.fetch_available_symbols(exchange)
-            if symbol == "WBTC/USDT":
-                if "WBTC/USDT" not in available_symbols:
-                    logging.warning(f"WBTC/USDT not found, trying alternative format WBTCUSDT")
-                    symbol = "WBTCUSDT"
-                    if symbol not in available_symbols:
-                        logging.error(f"Symbol {symbol} not found in exchange markets: {available_symbols[:5]}...")
-                        raise ValueError(f"Symbol {symbol} not supported by exchange")
-            elif symbol not in available_symbols:
-                logging.error(f"Symbol {symbol} not found in exchange markets: {available_symbols[:5]}...")
+            timeframe = normalize_interval(timeframe)
+            markets = await get_market_cache().get_for_symbol(exchange, symbol)
+            if symbol == "WBTC/USDT" and not markets.has_symbol(symbol):
+                logging.warning(f"WBTC/USDT not found, trying alternative format WBTCUSDT")
+                symbol = "WBTCUSDT"
+            unified_symbol = markets.resolve(symbol)
+            if unified_symbol is None:
+                logging.error(f"Symbol {symbol} not found in {len(markets.markets)} cached markets of {exchange.id}")
                 raise ValueError(f"Symbol {symbol} not supported by exchange")
-            if timeframe not in exchange.timeframes:
-                logging.error(f"Timeframe {timeframe} not supported by exchange: {list(exchange.timeframes.keys())}")
+            symbol = unified_symbol
+            if not markets.has_timeframe(timeframe):
+                logging.error(f"Timeframe {timeframe} not supported by exchange: {sorted(markets.timeframes)}")
                 raise ValueError(f"Timeframe {timeframe} not supported by exchange")
             logging.info(f"Validated symbol {symbol} and timeframe {timeframe}")
             return symbol
@@ -84,7 +92,7 @@ class TradeManager(TradeManagerBase):
             logging.error(f"Error validating symbol {symbol} and timeframe {timeframe}: {str(e)}")
             raise
 
-    def verify_ohlcv_data(self, df):
+    def verify_ohlcv_data(self, df, interval=None):
         try:
             if df.empty:
                 raise ValueError("OHLCV data is empty")
@@ -99,6 +107,10 @@ class TradeManager(TradeManagerBase):
             if df["timestamp"].duplicated().any():
                 logging.warning(f"Found {df['timestamp'].duplicated().sum()} duplicate timestamps in OHLCV data, removing duplicates")
                 df = df.drop_duplicates(subset="timestamp", keep="last").reset_index(drop=True)
+            if interval:
+                gaps = find_gaps(df["timestamp"].values.astype("datetime64[ms]").astype("int64"), interval)
+                if len(gaps):
+                    logging.warning(f"Found {len(gaps)} gaps ({missing_bars(gaps, interval)} missing {interval} bars) in OHLCV data")
             logging.info("OHLCV data verification passed")
             return df
         except Exception as e:
@@ -7,6 +7,9 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
 import asyncio
+from src.core.bar_scheduler import get_bar_scheduler
+from src.core.exchange_pool import get_exchange_pool
+from src.core.market_cache import get_market_cache
 from utils.normalization import normalize_symbol, normalize_interval
 
 logging.basicConfig(
@@ -22,11 +25,13 @@ logging.basicConfig(
 class TradeManagerBase:
     def __init__(self):
         self.loop = asyncio.get_event_loop()
+        # Root of data/ and of the run directories; a replay points it at its own directory.
+        self.base_dir = Path(__file__).resolve().parents[2]
         logging.info("TradeManagerBase initialized")
 
     def load_api_keys(self):
         try:
-            api_keys_file = Path(__file__).resolve().parents[2] / "data" / "api_keys.json"
+            api_keys_file = self.base_dir / "data" / "api_keys.json"
             if not api_keys_file.exists():
                 logging.warning("No api_keys.json file found, using default settings")
                 return [{"exchange": "mexc", "api_key": "", "api_secret": "", "passphrase": "", "rate_limit_requests": 1800, "timeout_seconds": 30}]
@@ -40,9 +45,8 @@ class TradeManagerBase:
 
     async def synchronize_time(self, exchange, exchange_name, max_time_diff_ms=10000):
         try:
-            server_time = await exchange.fetch_time()
-            local_time = int(datetime.now(tz=ZoneInfo("Europe/Warsaw")).timestamp() * 1000)
-            time_diff = server_time - local_time
+            time_diff = await get_exchange_pool().server_time_offset(exchange)
+            get_bar_scheduler().set_time_offset(exchange_name, time_diff)
             if abs(time_diff) > max_time_diff_ms:
                 logging.error(f"Time difference with {exchange_name} server ({time_diff}ms) exceeds maximum allowed ({max_time_diff_ms}ms)")
                 raise ValueError(f"Time difference with {exchange_name} server ({time_diff}ms) exceeds maximum allowed ({max_time_diff_ms}ms)")
@@ -59,11 +63,11 @@ class TradeManagerBase:
         try:
             normalized_symbol = normalize_symbol(symbol)
             normalized_interval = normalize_interval(interval)
-            markets = await exchange.load_markets()
-            if normalized_symbol not in markets:
+            markets = await get_market_cache().get_for_symbol(exchange, normalized_symbol)
+            if not markets.has_symbol(normalized_symbol):
                 logging.error(f"Symbol {normalized_symbol} not available on {exchange.id}")
                 raise ValueError(f"Symbol {normalized_symbol} not available")
-            if normalized_interval not in exchange.timeframes:
+            if not markets.has_timeframe(normalized_interval):
                 logging.error(f"Interval {normalized_interval} not supported by {exchange.id}")
                 raise ValueError(f"Interval {normalized_interval} not supported")
             logging.info(f"Validated symbol {normalized_symbol} and interval {normalized_interval} on {exchange.id}")
@@ -2,14 +2,21 @@
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\trade_manager_live.py
 import logging
 import json
-import ccxt.async_support as ccxt
-import pandas as pd
-import importlib.util
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
 import asyncio
+import functools
 from src.core.trade_manager_base import TradeManagerBase
+from src.core.candle_buffer import buffer_capacity
+from src.core.candle_feed import get_candle_feed
+from src.core.bar_scheduler import get_bar_scheduler
+from src.core.exchange_pool import get_exchange_pool
+from src.core.trade_journal import TradeJournal
+from src.core.results_writer import get_results_writer, write_summary
+from src.core.rate_limiter import PRIORITY_LIVE, set_request_priority
+from strategies.strategy_contract import IndicatorStream, apply_indicators, supports_streaming_indicators
+from strategies.strategy_registry import get_strategy_registry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,7 +37,9 @@ class TradeManagerLive(TradeManagerBase):
     async def start_live_trading(self, strategy_name, symbol, interval):
         try:
             logging.info(f"Starting live trading for strategy {strategy_name} on {symbol} with interval {interval}")
-            strategies_file = Path(__file__).resolve().parents[2] / "data" / "strategies.json"
+            # Requests of this task (and the candle feed it starts) go ahead of backtest downloads.
+            set_request_priority(PRIORITY_LIVE)
+            strategies_file = self.base_dir / "data" / "strategies.json"
             with open(strategies_file, "r", encoding="utf-8-sig") as f:
                 strategies = json.load(f)
             strategy_data = next((s for s in strategies if s["name"] == strategy_name and s["symbol"] == symbol), None)
@@ -43,46 +52,28 @@ class TradeManagerLive(TradeManagerBase):
                 logging.error(f"No valid file path for strategy {strategy_name}: {file_path}")
                 raise ValueError(f"No valid file path for strategy {strategy_name}")
             
-            spec = importlib.util.spec_from_file_location(strategy_name, file_path)
-            if spec is None:
-                logging.error(f"Invalid file path for strategy {strategy_name}: {file_path}")
-                raise ValueError(f"Invalid file path for strategy {strategy_name}")
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            strategy = getattr(module, "Strategy", None)
-            if not strategy:
-                logging.error(f"No Strategy class in {file_path}")
-                raise ValueError(f"No Strategy class in {file_path}")
-            
-            strategy_instance = strategy()
-            strategy_instance.update_indicators(strategy_data.get("parameters", {}))
+            strategy_handle = get_strategy_registry().handle(file_path, strategy_data.get("parameters", {}))
+            strategy_instance = strategy_handle.instance
             
             api_keys = self.load_api_keys()
             api_key_data = next((key for key in api_keys if key["exchange"].lower() == strategy_data.get("exchange", "MEXC").lower()), None)
             if not api_key_data:
                 raise ValueError(f"No API key found for exchange {strategy_data.get('exchange', 'MEXC')}")
             
-            exchange_class = getattr(ccxt, strategy_data.get("exchange", "MEXC").lower())
-            exchange = exchange_class({
-                "apiKey": api_key_data["api_key"],
-                "secret": api_key_data["api_secret"],
-                "password": api_key_data.get("passphrase", ""),
-                "rateLimit": api_key_data.get("rate_limit_requests", 1800),
-                "timeout": api_key_data.get("timeout_seconds", 30) * 1000
-            })
+            exchange = await get_exchange_pool().acquire(strategy_data.get("exchange", "MEXC"), api_key_data)
             
             await self.synchronize_time(exchange, strategy_data.get("exchange", "MEXC"))
             
             start_time = datetime.now(tz=ZoneInfo("Europe/Warsaw"))
             initial_capital = 1000.0
-            capital = initial_capital
-            position = 0
-            entry_price = 0
-            profit = 0
-            max_dd = 0
-            max_profit = 0
-            equity_curve = [initial_capital]
-            trades = []
+            candle_subscription = get_candle_feed().subscribe(strategy_data.get("exchange", "MEXC"), api_key_data, symbol, interval, buffer_capacity(strategy_instance))
+            live_dir = self.base_dir / "live" / strategy_name / symbol.replace('/', '_')
+            # An open position and the trade history survive a restart: last snapshot plus the journal tail.
+            journal = TradeJournal(live_dir)
+            state = journal.recover(initial_capital)
+            journal.append(state.transition("start", initial_capital=initial_capital, interval=interval), state)
+            trades = state.trades
+            indicator_stream = None
             
             while True:
                 with open(strategies_file, "r", encoding="utf-8-sig") as f:
@@ -92,102 +83,90 @@ class TradeManagerLive(TradeManagerBase):
                     logging.info(f"Stopping live trading for {strategy_name} as mode is {strategy_data.get('mode', 'unknown') if strategy_data else 'not found'}")
                     break
                 
-                ohlcv = await exchange.fetch_ohlcv(symbol, interval, limit=2)
-                if not ohlcv or len(ohlcv) < 2:
+                update = await candle_subscription.next(timeout=60)
+                if update is None:
+                    continue
+                if len(update.candles) < 2:
                     logging.error(f"No sufficient OHLCV data for {symbol} on {interval}")
-                    await asyncio.sleep(60)
                     continue
                 
-                df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-                df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+                df = update.to_dataframe(candle_subscription.capacity)
                 if df.empty:
                     logging.warning(f"Empty OHLCV DataFrame for {symbol} on {interval}")
                     continue
                 
-                indicators = strategy_instance.get_indicators(df)
-                if not indicators or not isinstance(indicators, list) or not indicators[0]:
-                    logging.warning(f"No valid indicators for strategy {strategy_name} on {symbol}")
-                    await asyncio.sleep(60)
+                strategy_instance = strategy_handle.current()
+                try:
+                    if supports_streaming_indicators(strategy_instance):
+                        # Streaming indicators keep their state between bars: only the new candles are processed.
+                        if indicator_stream is None or indicator_stream.strategy_instance is not strategy_instance:
+                            indicator_stream = IndicatorStream(strategy_instance)
+                        last_row, _ = indicator_stream.apply(df, update.candles)
+                    else:
+                        df, _ = apply_indicators(strategy_instance, df)
+                        last_row = df.iloc[[-1]]
+                except Exception as e:
+                    indicator_stream = None
+                    logging.warning(f"No valid indicators for strategy {strategy_name} on {symbol}: {str(e)}")
                     continue
-                
-                for indicator in indicators[0]:
-                    df[indicator] = indicators[0][indicator]
-                
-                signal = strategy_instance.get_signal(df.iloc[[-1]])
+
+                signal = strategy_instance.get_signal(last_row)
                 logging.debug(f"Signal for {strategy_name} on {symbol}: {signal}")
+                get_bar_scheduler().record_latency(strategy_data.get("exchange", "MEXC"), symbol, interval, update.bar_close)
                 
-                if signal == "buy" and position == 0:
-                    position = capital / df["close"].iloc[-1]
-                    entry_price = df["close"].iloc[-1]
-                    trades.append({
-                        "type": "buy",
-                        "price": entry_price,
-                        "timestamp": df["timestamp"].iloc[-1].isoformat(),
-                        "profit_usd": 0,
-                        "duration_minutes": 0
-                    })
-                    logging.info(f"Live buy order placed for {strategy_name} on {symbol} at {entry_price}")
-                elif signal == "sell" and position > 0:
-                    exit_price = df["close"].iloc[-1]
-                    trade_profit = position * (exit_price - entry_price)
-                    profit += trade_profit
-                    capital += trade_profit
-                    position = 0
-                    trades.append({
-                        "type": "sell",
-                        "price": exit_price,
-                        "timestamp": df["timestamp"].iloc[-1].isoformat(),
-                        "profit_usd": trade_profit,
-                        "duration_minutes": (df["timestamp"].iloc[-1] - pd.to_datetime(trades[-1]["timestamp"])).total_seconds() / 60
-                    })
-                    max_profit = max(max_profit, profit)
-                    logging.info(f"Live sell order placed for {strategy_name} on {symbol} at {exit_price}")
-                equity_curve.append(capital)
-                
-                equity_series = pd.Series(equity_curve)
-                rolling_max = equity_series.cummax()
-                drawdown = equity_series - rolling_max
-                max_dd = drawdown.min()
-                
-                total_trades = len(trades) // 2
-                winning_trades = sum(1 for i in range(1, len(trades), 2) if trades[i]["price"] > trades[i-1]["price"])
-                winrate_pct = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-                positive_profits = sum(trades[i]["price"] - trades[i-1]["price"] for i in range(1, len(trades), 2) if trades[i]["price"] > trades[i-1]["price"])
-                negative_profits = abs(sum(trades[i]["price"] - trades[i-1]["price"] for i in range(1, len(trades), 2) if trades[i]["price"] < trades[i-1]["price"]))
-                profit_factor = positive_profits / negative_profits if negative_profits > 0 else (0 if positive_profits == 0 else "inf")
+                if signal == "buy" and state.position == 0:
+                    journal.append(state.buy(df["close"].iloc[-1], df["timestamp"].iloc[-1]), state)
+                    logging.info(f"Live buy order placed for {strategy_name} on {symbol} at {state.entry_price}")
+                elif signal == "sell" and state.position > 0:
+                    journal.append(state.sell(df["close"].iloc[-1], df["timestamp"].iloc[-1]), state)
+                    logging.info(f"Live sell order placed for {strategy_name} on {symbol} at {trades[-1]['price']}")
+                stats = state.stats
+                stats.update_equity(state.capital)
+                max_dd = stats.max_drawdown
+                total_trades = stats.closed_trades
                 
                 result = {
                     "strategy": strategy_name,
                     "symbol": symbol,
                     "days_active": (datetime.now(tz=ZoneInfo("Europe/Warsaw")) - start_time).days,
-                    "net_profit_usd": profit,
+                    "net_profit_usd": state.profit,
                     "max_drawdown_usd": max_dd,
-                    "max_profit_usd": max_profit,
+                    "max_profit_usd": stats.max_profit,
                     "total_trades": total_trades,
                     "total_transactions": len(trades),
-                    "winrate_pct": winrate_pct,
-                    "profit_factor": profit_factor
+                    "winrate_pct": stats.winrate_pct,
+                    "profit_factor": stats.profit_factor
                 }
                 
-                live_dir = Path(__file__).resolve().parents[2] / "live" / strategy_name / symbol.replace('/', '_')
-                live_dir.mkdir(parents=True, exist_ok=True)
-                trades_file = live_dir / "trades.json"
-                with open(trades_file, "a", encoding="utf-8") as f:
-                    for trade in trades:
-                        json.dump(trade, f, ensure_ascii=False)
-                        f.write("\n")
-                
-                summary_file = live_dir / "summary.json"
-                with open(summary_file, "w", encoding="utf-8") as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
-                
-                await asyncio.sleep(60)
+                # New trades are appended to trades.json; summary.json is rewritten every flush interval.
+                get_results_writer().record(live_dir, trades, state.open_trades(), rollup=functools.partial(write_summary, live_dir, result))
             
-            await exchange.close()
+            candle_subscription.close()
+            journal.append(state.transition("stop"))
+            journal.close(state)
+            get_results_writer().close(live_dir)
+            get_exchange_pool().release(exchange)
             logging.info(f"Live trading stopped for {strategy_name} on {symbol}")
             return result
+        except asyncio.CancelledError:
+            logging.info(f"Live trading cancelled for {strategy_name} on {symbol}")
+            if "journal" in locals():
+                journal.close(state)
+            if "live_dir" in locals():
+                get_results_writer().close(live_dir)
+            if "candle_subscription" in locals():
+                candle_subscription.close()
+            if "exchange" in locals():
+                get_exchange_pool().release(exchange)
+            raise
         except Exception as e:
             logging.error(f"Error in live trading for {strategy_name} on {symbol}: {str(e)}", exc_info=True)
+            if "journal" in locals():
+                journal.close(state)
+            if "live_dir" in locals():
+                get_results_writer().close(live_dir)
+            if "candle_subscription" in locals():
+                candle_subscription.close()
             if "exchange" in locals():
-                await exchange.close()
+                get_exchange_pool().release(exchange)
             raise
\ No newline at end of file
@@ -3,10 +3,12 @@
 
 import logging
 import json
+import os
 import pandas as pd
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
+from src.core.clock import get_clock
 from src.core.trade_manager_base import TradeManagerBase
 
 logging.basicConfig(
@@ -19,15 +21,159 @@ logging.basicConfig(
     ]
 )
 
+def _trade_key(trade: dict) -> str:
+    return json.dumps(trade, sort_keys=True, ensure_ascii=False, default=str)
+
+def _as_utc(timestamp) -> pd.Timestamp:
+    """Zwraca timestamp ze strefą czasową; naiwne czasy (świece z feedu) traktuje jako UTC."""
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+def _trades_since(trades: list, start) -> list:
+    """Zwraca transakcje z timestamp (lub entry_time) >= start, parsując daty jednym wywołaniem."""
+    if not trades:
+        return []
+    parsed = pd.to_datetime(pd.Series([t.get("timestamp", t.get("entry_time", "")) for t in trades]), utc=True, errors="coerce", format="ISO8601")
+    start = _as_utc(start)
+    mask = (parsed >= start).to_numpy()
+    return [t for t, keep in zip(trades, mask) if keep]
+
 class TradeManagerResultsHandler(TradeManagerBase):
     """Klasa odpowiedzialna za zapisywanie wyników symulacji i backtestów.
 
     Metody:
         save_simulation_results: Zapisuje wyniki symulacji do plików trades.json, open_trades.json, summary.json i miesięcznych raportów.
+        write_trades: Zapisuje (lub dopisuje) zamknięte transakcje do trades.json.
+        write_open_trades: Zapisuje otwarte transakcje do open_trades.json.
+        write_rollups: Przelicza statystyki i zapisuje raport miesięczny oraz summary.json.
     """
 
+    def write_trades(self, base_dir: Path, trades: list, append: bool = False) -> None:
+        """Zapisuje transakcje do trades.json (jedna transakcja JSON na linię).
+
+        Args:
+            base_dir (Path): Katalog docelowy.
+            trades (list): Transakcje do zapisu.
+            append (bool): Dopisz na końcu pliku zamiast go nadpisywać.
+        """
+        trades_file = base_dir / "trades.json"
+        with open(trades_file, "a" if append else "w", encoding="utf-8") as f:
+            for trade in trades:
+                json.dump(trade, f, ensure_ascii=False)
+                f.write("\n")
+        logging.debug(f"{'Dopisano' if append else 'Zapisano'} {len(trades)} transakcji do {trades_file}")
+
+    def write_open_trades(self, base_dir: Path, open_trades: list) -> None:
+        """Zapisuje otwarte transakcje do open_trades.json."""
+        open_trades_file = base_dir / "open_trades.json"
+        with open(open_trades_file, "w", encoding="utf-8") as f:
+            json.dump({"open_trades": open_trades}, f, indent=4, ensure_ascii=False)
+        logging.debug(f"Zapisano {len(open_trades)} otwartych transakcji do {open_trades_file}")
+
+    def write_rollups(self, base_dir: Path, strategy_name: str, symbol: str, trades: list, open_trades: list, total_trades: int, avg_max_dd: float, initial_capital: float, df: pd.DataFrame) -> None:
+        """Przelicza statystyki z listy transakcji i zapisuje raport miesięczny YYYYMM.json oraz summary.json.
+
+        Args:
+            base_dir (Path): Katalog docelowy dla zapisu wyników.
+            strategy_name (str): Nazwa strategii.
+            symbol (str): Symbol handlowy (np. BTC/USDT).
+            trades (list): Lista zamkniętych transakcji.
+            open_trades (list): Lista otwartych transakcji.
+            total_trades (int): Liczba zamkniętych transakcji.
+            avg_max_dd (float): Średni maksymalny spadek (drawdown).
+            initial_capital (float): Początkowy kapitał.
+            df (pd.DataFrame): DataFrame z danymi OHLCV.
+        """
+        # Obliczanie statystyk
+        total_transactions = len(trades) + len(open_trades)
+        winning_trades = sum(1 for t in trades if t.get("profit_usd", 0) > 0)
+        total_profit = sum(t.get("profit_usd", 0) for t in trades)
+        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+        positive_profits = sum(t["profit_usd"] for t in trades if "profit_usd" in t and t["profit_usd"] > 0)
+        negative_profits = abs(sum(t["profit_usd"] for t in trades if "profit_usd" in t and t["profit_usd"] < 0))
+        profit_factor = positive_profits / negative_profits if negative_profits > 0 else (0 if positive_profits == 0 else float("inf"))
+        avg_profit = (total_profit / total_trades) if total_trades > 0 else 0
+        max_drawdown_usd = min([t["profit_usd"] for t in trades if "profit_usd" in t], default=0)
+        max_profit_usd = max([t["profit_usd"] for t in trades if "profit_usd" in t], default=0)
+        total_duration_minutes = sum(t["duration_minutes"] for t in trades if "duration_minutes" in t)
+        average_duration_minutes = total_duration_minutes / total_trades if total_trades > 0 else 0
+
+        # Obliczanie dni aktywności
+        active_file = base_dir.parent.parent.parent / "data" / "active_strategies.json"
+        if active_file.exists() and trades:
+            with open(active_file, "r", encoding="utf-8") as f:
+                active_data = json.load(f)
+            key = f"{strategy_name}_{symbol}"
+            if key in active_data:
+                start_date = datetime.fromisoformat(active_data[key]["start_date"]).replace(tzinfo=ZoneInfo("Europe/Warsaw"))
+                days = (get_clock().now(tz=ZoneInfo("Europe/Warsaw")).date() - start_date.date()).days
+            else:
+                days = (_as_utc(df["timestamp"].iloc[-1]) - datetime.fromisoformat(trades[0]["timestamp"]).replace(tzinfo=ZoneInfo("Europe/Warsaw"))).days if trades else 0
+        else:
+            days = (_as_utc(df["timestamp"].iloc[-1]) - datetime.fromisoformat(trades[0]["timestamp"]).replace(tzinfo=ZoneInfo("Europe/Warsaw"))).days if trades else 0
+        profit_percentage = (total_profit / initial_capital) * 100 if initial_capital > 0 else 0
+
+        # Zapis wyników miesięcznych (deduplikacja po kluczu transakcji zamiast przeszukiwania listy)
+        timestamp = get_clock().now(tz=ZoneInfo("Europe/Warsaw")).strftime("%Y%m")
+        monthly_file = base_dir / f"{timestamp}.json"
+        month_trades = []
+        if monthly_file.exists():
+            with open(monthly_file, "r", encoding="utf-8") as f:
+                existing_data = json.load(f)
+                month_trades = existing_data.get("trades", [])
+            month_trades = _trades_since(month_trades, df["timestamp"].iloc[0])
+        seen = {_trade_key(t) for t in month_trades}
+        for t in _trades_since(trades, df["timestamp"].iloc[0]):
+            key = _trade_key(t)
+            if key not in seen:
+                seen.add(key)
+                month_trades.append(t)
+
+        monthly_results = {
+            "strategy": strategy_name,
+            "symbol": symbol,
+            "trades": month_trades,
+            "days": days,
+            "total_trades": total_trades,
+            "total_transactions": total_transactions,
+            "win_rate_percentage": win_rate,
+            "avg_profit_percentage": avg_profit / initial_capital * 100 if total_trades > 0 else 0,
+            "avg_max_dd_percentage": avg_max_dd,
+            "profit_factor": float(profit_factor) if profit_factor != float("inf") else "inf",
+            "profit_percentage": profit_percentage,
+            "total_profit": total_profit
+        }
+        with open(monthly_file, "w", encoding="utf-8") as f:
+            json.dump(monthly_results, f, indent=4, ensure_ascii=False)
+        logging.info(f"Zapisano wyniki miesięczne do {monthly_file}")
+
+        # Zapis podsumowania
+        summary_file = base_dir / "summary.json"
+        summary_data = {
+            "strategy": strategy_name,
+            "symbol": symbol,
+            "days_active": days,
+            "total_trades": total_trades,
+            "wins": winning_trades,
+            "losses": total_trades - winning_trades,
+            "winrate_pct": win_rate,
+            "net_profit_usd": total_profit,
+            "max_drawdown_usd": max_drawdown_usd,
+            "max_profit_usd": max_profit_usd,
+            "profit_factor": float(profit_factor) if profit_factor != float("inf") else "inf",
+            "average_duration_minutes": average_duration_minutes,
+            "total_duration_minutes": total_duration_minutes,
+            "last_updated": get_clock().now(tz=ZoneInfo("Europe/Warsaw")).isoformat()
+        }
+        with open(summary_file, "w", encoding="utf-8") as f:
+            json.dump(summary_data, f, indent=4, ensure_ascii=False)
+        logging.info(f"Zapisano podsumowanie do {summary_file}")
+
     def save_simulation_results(self, base_dir: Path, strategy_name: str, symbol: str, trades: list, open_trades: list, total_profit: float, total_trades: int, winning_trades: int, avg_max_dd: float, initial_capital: float, start_time_sim: datetime, df: pd.DataFrame) -> None:
-        """Zapisuje wyniki symulacji do odpowiednich plików.
+        """Zapisuje wszystkie wyniki symulacji naraz (jednorazowo, np. po backteście).
+
+        Pętle paper/live korzystają z src.core.results_writer, który dopisuje transakcje
+        na bieżąco, a podsumowania przelicza co flush_interval.
 
         Args:
             base_dir (Path): Katalog docelowy dla zapisu wyników.
@@ -53,104 +199,13 @@ class TradeManagerResultsHandler(TradeManagerBase):
             with open(test_file, "w", encoding="utf-8") as f:
                 f.write("test")
             os.remove(test_file)
-            
-            # Zapis zamkniętych transakcji
-            trades_file = base_dir / "trades.json"
-            with open(trades_file, "w", encoding="utf-8") as f:
-                for trade in trades:
-                    json.dump(trade, f, ensure_ascii=False)
-                    f.write("\n")
-            logging.info(f"Zapisano {len(trades)} zamkniętych transakcji do {trades_file}")
-            
-            # Zapis otwartych transakcji
-            open_trades_file = base_dir / "open_trades.json"
-            with open(open_trades_file, "w", encoding="utf-8") as f:
-                json.dump({"open_trades": open_trades}, f, indent=4, ensure_ascii=False)
-            logging.info(f"Zapisano {len(open_trades)} otwartych transakcji do {open_trades_file}")
-            
-            # Obliczanie statystyk
-            total_transactions = len(trades) + len(open_trades)
-            winning_trades = sum(1 for t in trades if t.get("profit_usd", 0) > 0)
-            total_profit = sum(t.get("profit_usd", 0) for t in trades)
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-            positive_profits = sum(t["profit_usd"] for t in trades if "profit_usd" in t and t["profit_usd"] > 0)
-            negative_profits = abs(sum(t["profit_usd"] for t in trades if "profit_usd" in t and t["profit_usd"] < 0))
-            profit_factor = positive_profits / negative_profits if negative_profits > 0 else (0 if positive_profits == 0 else float("inf"))
-            avg_profit = (total_profit / total_trades) if total_trades > 0 else 0
-            max_drawdown_usd = min([t["profit_usd"] for t in trades if "profit_usd" in t], default=0)
-            max_profit_usd = max([t["profit_usd"] for t in trades if "profit_usd" in t], default=0)
-            total_duration_minutes = sum(t["duration_minutes"] for t in trades if "duration_minutes" in t)
-            average_duration_minutes = total_duration_minutes / total_trades if total_trades > 0 else 0
-            
-            # Obliczanie dni aktywności
-            active_file = base_dir.parent.parent.parent / "data" / "active_strategies.json"
-            if active_file.exists() and trades:
-                with open(active_file, "r", encoding="utf-8") as f:
-                    active_data = json.load(f)
-                key = f"{strategy_name}_{symbol}"
-                if key in active_data:
-                    start_date = datetime.fromisoformat(active_data[key]["start_date"]).replace(tzinfo=ZoneInfo("Europe/Warsaw"))
-                    days = (datetime.now(tz=ZoneInfo("Europe/Warsaw")).date() - start_date.date()).days
-                else:
-                    days = (df["timestamp"].iloc[-1] - datetime.fromisoformat(trades[0]["timestamp"]).replace(tzinfo=ZoneInfo("Europe/Warsaw"))).days if trades else 0
-            else:
-                days = (df["timestamp"].iloc[-1] - datetime.fromisoformat(trades[0]["timestamp"]).replace(tzinfo=ZoneInfo("Europe/Warsaw"))).days if trades else 0
-            profit_percentage = (total_profit / initial_capital) * 100 if initial_capital > 0 else 0
-            
-            # Zapis wyników miesięcznych
-            timestamp = datetime.now(tz=ZoneInfo("Europe/Warsaw")).strftime("%Y%m")
-            monthly_file = base_dir / f"{timestamp}.json"
-            month_trades = []
-            if monthly_file.exists():
-                with open(monthly_file, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-                    month_trades = existing_data.get("trades", [])
-                month_trades = [t for t in month_trades if pd.to_datetime(t.get("timestamp", t.get("entry_time", ""))) >= df["timestamp"].iloc[0]]
-            
-            month_trades.extend([t for t in trades if t not in month_trades and pd.to_datetime(t.get("timestamp", t.get("entry_time", ""))) >= df["timestamp"].iloc[0]])
-            
-            monthly_results = {
-                "strategy": strategy_name,
-                "symbol": symbol,
-                "trades": month_trades,
-                "days": days,
-                "total_trades": total_trades,
-                "total_transactions": total_transactions,
-                "win_rate_percentage": win_rate,
-                "avg_profit_percentage": avg_profit / initial_capital * 100 if total_trades > 0 else 0,
-                "avg_max_dd_percentage": avg_max_dd,
-                "profit_factor": float(profit_factor) if profit_factor != float("inf") else "inf",
-                "profit_percentage": profit_percentage,
-                "total_profit": total_profit
-            }
-            with open(monthly_file, "w", encoding="utf-8") as f:
-                json.dump(monthly_results, f, indent=4, ensure_ascii=False)
-            logging.info(f"Zapisano wyniki miesięczne do {monthly_file}")
-            
-            # Zapis podsumowania
-            summary_file = base_dir / "summary.json"
-            summary_data = {
-                "strategy": strategy_name,
-                "symbol": symbol,
-                "days_active": days,
-                "total_trades": total_trades,
-                "wins": winning_trades,
-                "losses": total_trades - winning_trades,
-                "winrate_pct": win_rate,
-                "net_profit_usd": total_profit,
-                "max_drawdown_usd": max_drawdown_usd,
-                "max_profit_usd": max_profit_usd,
-                "profit_factor": float(profit_factor) if profit_factor != float("inf") else "inf",
-                "average_duration_minutes": average_duration_minutes,
-                "total_duration_minutes": total_duration_minutes,
-                "last_updated": datetime.now(tz=ZoneInfo("Europe/Warsaw")).isoformat()
-            }
-            with open(summary_file, "w", encoding="utf-8") as f:
-                json.dump(summary_data, f, indent=4, ensure_ascii=False)
-            logging.info(f"Zapisano podsumowanie do {summary_file}")
+
+            self.write_trades(base_dir, trades)
+            self.write_open_trades(base_dir, open_trades)
+            self.write_rollups(base_dir, strategy_name, symbol, trades, open_trades, total_trades, avg_max_dd, initial_capital, df)
         except Exception as e:
             error_file = base_dir / "errors.log"
             with open(error_file, "a", encoding="utf-8") as f:
                 f.write(f"{datetime.now(tz=ZoneInfo('Europe/Warsaw')).isoformat()}: Błąd zapisu wyników symulacji: {str(e)}\n")
             logging.error(f"Błąd zapisu wyników symulacji do {base_dir}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -2,19 +2,29 @@
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\core\trade_manager_simulation.py
 import logging
 import json
-import ccxt.async_support as ccxt
 import pandas as pd
-import importlib.util
-from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
 import asyncio
+import functools
 import threading
 from src.core.trade_manager_base import TradeManagerBase
 from src.core.trade_manager_results_handler import TradeManagerResultsHandler
+from src.core.candle_store import get_candle_store
+from src.core.candle_buffer import buffer_capacity
+from src.core.candle_feed import get_candle_feed
+from src.core.clock import get_clock
+from src.core.auto_promotion import DEFAULT_MIN_VOLATILITY, filter_signal, load_auto_settings, should_promote
+from src.core.bar_scheduler import get_bar_scheduler
+from src.core.exchange_pool import get_exchange_pool
+from src.core.results_writer import get_results_writer
+from src.core.trade_journal import TradeJournal
 from src.core.error_handler import ErrorHandler
 from src.tabs.czacha_data import CzachaData
+from src.tabs.strategies.strategies_data import StrategyData
 from utils.normalization import normalize_symbol, normalize_interval
+from strategies.strategy_contract import IndicatorStream, apply_indicators, supports_streaming_indicators
+from strategies.strategy_registry import get_strategy_registry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,7 +55,7 @@ class TradeManagerSimulation(TradeManagerBase):
             list: List of strategies.
         """
         try:
-            strategies_file = Path(__file__).resolve().parents[2] / "data" / "strategies.json"
+            strategies_file = self.base_dir / "data" / "strategies.json"
             if not strategies_file.exists():
                 logging.warning("No strategies.json file found")
                 return []
@@ -104,21 +114,14 @@ class TradeManagerSimulation(TradeManagerBase):
             normalized_symbol = normalize_symbol(symbol)
             normalized_interval = normalize_interval(interval)
             logging.info(f"Starting paper trading for strategy {strategy_name} on {normalized_symbol} with interval {normalized_interval}")
-            strategies_file = Path(__file__).resolve().parents[2] / "data" / "strategies.json"
-            start_time = datetime.now(tz=ZoneInfo("Europe/Warsaw"))
+            strategies_file = self.base_dir / "data" / "strategies.json"
+            promotion_file = self.base_dir / "data" / "promotion.json"
+            start_time = get_clock().now(tz=ZoneInfo("Europe/Warsaw"))
             
             # Load initial capital from czacha.json
             czacha_data = self.czacha_data.load_data()
             strategy_data = next((s for s in czacha_data["strategies"] if s["name"] == strategy_name and s["symbol"] == normalized_symbol), None)
             initial_capital = strategy_data["start_capital"] if strategy_data else 1000.0
-            capital = initial_capital
-            position = 0
-            entry_price = 0
-            profit = 0
-            max_dd = 0
-            max_profit = 0
-            equity_curve = [initial_capital]
-            trades = []
 
             # Initialize strategy
             with open(strategies_file, "r", encoding="utf-8-sig") as f:
@@ -131,17 +134,9 @@ class TradeManagerSimulation(TradeManagerBase):
             if not file_path or not Path(file_path).exists():
                 raise ValueError(f"No valid file path for strategy {strategy_name}: {file_path}")
 
-            spec = importlib.util.spec_from_file_location(strategy_name, file_path)
-            if spec is None:
-                raise ValueError(f"Invalid file path for strategy {strategy_name}: {file_path}")
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            strategy = getattr(module, "Strategy", None)
-            if not strategy:
-                raise ValueError(f"No Strategy class in {file_path}")
-
-            strategy_instance = strategy()
-            strategy_instance.update_indicators(strategy_data.get("parameters", {}))
+            # Loaded once per file by the registry; the handle picks up edits of the file while running.
+            strategy_handle = get_strategy_registry().handle(file_path, strategy_data.get("parameters", {}))
+            strategy_instance = strategy_handle.instance
 
             # Initialize exchange
             api_keys = self.load_api_keys()
@@ -149,144 +144,162 @@ class TradeManagerSimulation(TradeManagerBase):
             if not api_key_data:
                 raise ValueError(f"No API key found for exchange {strategy_data.get('exchange', 'MEXC')}")
 
-            exchange_class = getattr(ccxt, strategy_data.get("exchange", "MEXC").lower())
-            exchange = exchange_class({
-                "apiKey": api_key_data["api_key"],
-                "secret": api_key_data["api_secret"],
-                "password": api_key_data.get("passphrase", ""),
-                "rateLimit": api_key_data.get("rate_limit_requests", 1800),
-                "timeout": api_key_data.get("timeout_seconds", 30) * 1000
-            })
+            exchange = await get_exchange_pool().acquire(strategy_data.get("exchange", "MEXC"), api_key_data)
 
             # Validate symbol and interval
             normalized_symbol = await self.validate_symbol_and_interval(exchange, normalized_symbol, normalized_interval)
             await self.synchronize_time(exchange, strategy_data.get("exchange", "MEXC"), max_time_diff_ms=10000)
 
+            candle_subscription = get_candle_feed().subscribe(strategy_data.get("exchange", "MEXC"), api_key_data, normalized_symbol, normalized_interval, buffer_capacity(strategy_instance))
+            simulations_dir = self.base_dir / "simulations" / strategy_name / normalized_symbol
+
+            # Position, capital and trades survive a restart: last snapshot plus the journal tail.
+            journal = TradeJournal(simulations_dir)
+            state = journal.recover(initial_capital)
+            journal.append(state.transition("start", initial_capital=initial_capital, interval=normalized_interval), state)
+            trades = state.trades
+            indicator_stream = None
+
             # Main Paper Trading loop
             while True:
                 # Check strategy mode
                 with open(strategies_file, "r", encoding="utf-8-sig") as f:
                     strategies = json.load(f)
                 strategy_data = next((s for s in strategies if s["name"] == strategy_name and s["symbol"] == symbol), None)
-                if not strategy_data or strategy_data["mode"] != "Paper":
+                if not strategy_data or strategy_data["mode"] not in ("Paper", "Auto"):
                     logging.info(f"Stopping paper trading for {strategy_name} as mode is {strategy_data.get('mode', 'unknown') if strategy_data else 'not found'}")
                     break
 
-                # Fetch OHLCV data
-                ohlcv = await exchange.fetch_ohlcv(normalized_symbol, normalized_interval, limit=2)
-                if not ohlcv or len(ohlcv) < 2:
+                # Wait for the next bar from the shared candle feed (re-checking the mode at least every minute)
+                update = await candle_subscription.next(timeout=60)
+                if update is None and candle_subscription.latest is not None:
+                    continue
+                if update is None or len(update.candles) < 2:
                     logging.warning(f"No sufficient OHLCV data for {normalized_symbol} on {normalized_interval}, trying fallback")
                     df = self.load_fallback_ohlcv(normalized_symbol, normalized_interval)
                     if df is None or df.empty:
                         logging.error(f"No sufficient OHLCV data for {normalized_symbol} on {normalized_interval}")
-                        await asyncio.sleep(60)
                         continue
+                    df = df.tail(candle_subscription.capacity).reset_index(drop=True)
                 else:
-                    df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-                    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+                    df = update.to_dataframe(candle_subscription.capacity)
 
                 # Generate indicators and signal
-                indicators = strategy_instance.get_indicators(df)
-                if not indicators or not isinstance(indicators, list) or not indicators[0]:
-                    logging.error(f"No valid indicators for strategy {strategy_name}")
-                    await asyncio.sleep(60)
+                strategy_instance = strategy_handle.current()
+                try:
+                    if update is not None and supports_streaming_indicators(strategy_instance):
+                        # Streaming indicators keep their state between bars: only the new candles are processed.
+                        if indicator_stream is None or indicator_stream.strategy_instance is not strategy_instance:
+                            indicator_stream = IndicatorStream(strategy_instance)
+                        last_row, _ = indicator_stream.apply(df, update.candles)
+                    else:
+                        df, _ = apply_indicators(strategy_instance, df)
+                        last_row = df.iloc[[-1]]
+                except Exception as e:
+                    indicator_stream = None
+                    logging.error(f"No valid indicators for strategy {strategy_name} on {normalized_symbol}: {str(e)}")
                     continue
 
-                for indicator in indicators[0]:
-                    df[indicator] = indicators[0][indicator]
-
-                signal = strategy_instance.get_signal(df.iloc[[-1]])
+                signal = strategy_instance.get_signal(last_row)
+                min_volatility = strategy_data.get("parameters", {}).get("min_volatility", DEFAULT_MIN_VOLATILITY)
+                # The feed's newest row is the bar that just opened; volatility is measured on the bar that closed.
+                closes = df["close"].iloc[-3:-1] if update is not None and update.last_timestamp >= update.bar_close else df["close"].iloc[-2:]
+                signal = filter_signal(signal, closes.iloc[0] if len(closes) > 1 else None, closes.iloc[-1], min_volatility)
                 logging.debug(f"Generated signal for {strategy_name} on {normalized_symbol}: {signal}")
+                if update is not None:
+                    get_bar_scheduler().record_latency(strategy_data.get("exchange", "MEXC"), normalized_symbol, normalized_interval, update.bar_close)
 
                 # Simulate trades
-                if signal == "buy" and position == 0:
-                    position = capital / df["close"].iloc[-1]
-                    entry_price = df["close"].iloc[-1]
-                    trades.append({
-                        "type": "buy",
-                        "price": entry_price,
-                        "timestamp": df["timestamp"].iloc[-1].isoformat(),
-                        "profit_usd": 0,
-                        "duration_minutes": 0
-                    })
-                    logging.info(f"Paper buy trade at {entry_price} for {strategy_name} on {normalized_symbol}")
-                elif signal == "sell" and position > 0:
-                    exit_price = df["close"].iloc[-1]
-                    trade_profit = position * (exit_price - entry_price)
-                    profit += trade_profit
-                    capital += trade_profit
-                    position = 0
-                    trades.append({
-                        "type": "sell",
-                        "price": exit_price,
-                        "timestamp": df["timestamp"].iloc[-1].isoformat(),
-                        "profit_usd": trade_profit,
-                        "duration_minutes": (df["timestamp"].iloc[-1] - pd.to_datetime(trades[-1]["timestamp"])).total_seconds() / 60
-                    })
-                    max_profit = max(max_profit, profit)
-                    logging.info(f"Paper sell trade at {exit_price} for {strategy_name} on {normalized_symbol}")
-                equity_curve.append(capital)
-
-                # Calculate statistics
-                equity_series = pd.Series(equity_curve)
-                rolling_max = equity_series.cummax()
-                drawdown = equity_series - rolling_max
-                max_dd = drawdown.min()
-                total_trades = len(trades) // 2
-                winning_trades = sum(1 for i in range(1, len(trades), 2) if trades[i]["price"] > trades[i-1]["price"])
-                winrate_pct = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-                positive_profits = sum(trades[i]["price"] - trades[i-1]["price"] for i in range(1, len(trades), 2) if trades[i]["price"] > trades[i-1]["price"])
-                negative_profits = abs(sum(trades[i]["price"] - trades[i-1]["price"] for i in range(1, len(trades), 2) if trades[i]["price"] < trades[i-1]["price"]))
-                profit_factor = positive_profits / negative_profits if negative_profits > 0 else (0 if positive_profits == 0 else "inf")
+                if signal == "buy" and state.position == 0:
+                    journal.append(state.buy(df["close"].iloc[-1], df["timestamp"].iloc[-1]), state)
+                    logging.info(f"Paper buy trade at {state.entry_price} for {strategy_name} on {normalized_symbol}")
+                elif signal == "sell" and state.position > 0:
+                    journal.append(state.sell(df["close"].iloc[-1], df["timestamp"].iloc[-1]), state)
+                    logging.info(f"Paper sell trade at {trades[-1]['price']} for {strategy_name} on {normalized_symbol}")
+                stats = state.stats
+                stats.update_equity(state.capital)
+                max_dd = stats.max_drawdown
+                total_trades = stats.closed_trades
 
                 # Save results
                 result = {
                     "strategy": strategy_name,
                     "symbol": normalized_symbol,
-                    "days_active": (datetime.now(tz=ZoneInfo("Europe/Warsaw")) - start_time).days,
-                    "net_profit_usd": profit,
+                    "days_active": (get_clock().now(tz=ZoneInfo("Europe/Warsaw")) - start_time).days,
+                    "net_profit_usd": state.profit,
+                    "profit_percentage": state.profit / initial_capital * 100 if initial_capital else 0.0,
                     "max_drawdown_usd": max_dd,
-                    "max_profit_usd": max_profit,
+                    "max_profit_usd": stats.max_profit,
                     "total_trades": total_trades,
                     "total_transactions": len(trades),
-                    "winrate_pct": winrate_pct,
-                    "profit_factor": profit_factor,
+                    "winrate_pct": stats.winrate_pct,
+                    "profit_factor": stats.profit_factor,
                     "signals": [signal] if signal else [],
-                    "close": [df["close"].iloc[-1]]
+                    "close": [df["close"].iloc[-1]],
+                    "results_dir": str(simulations_dir)
                 }
 
-                simulations_dir = Path(__file__).resolve().parents[2] / "simulations" / strategy_name / normalized_symbol
-                self.results_handler.save_simulation_results(
-                    base_dir=simulations_dir,
-                    strategy_name=strategy_name,
-                    symbol=normalized_symbol,
-                    trades=trades,
-                    open_trades=[] if position == 0 else [{"type": "buy", "price": entry_price, "timestamp": trades[-1]["timestamp"]}],
-                    total_profit=profit,
-                    total_trades=total_trades,
-                    winning_trades=winning_trades,
-                    avg_max_dd=max_dd,
-                    initial_capital=initial_capital,
-                    start_time_sim=start_time,
-                    df=df
+                # Trades are appended right away; summary and monthly rollup are rewritten every flush interval,
+                # on the writer's thread, so the rollup gets copies of the trades and candles this loop keeps changing.
+                open_trades = state.open_trades()
+                get_results_writer().record(
+                    simulations_dir,
+                    trades,
+                    open_trades,
+                    rollup=functools.partial(
+                        self.results_handler.write_rollups,
+                        base_dir=simulations_dir,
+                        strategy_name=strategy_name,
+                        symbol=normalized_symbol,
+                        trades=list(trades),
+                        open_trades=open_trades,
+                        total_trades=total_trades,
+                        avg_max_dd=max_dd,
+                        initial_capital=initial_capital,
+                        df=df.copy()
+                    )
                 )
 
-                # Wait for the next interval
-                await asyncio.sleep(60)
-
-            await exchange.close()
+                # Auto mode: promote to Live once the strategy has run long enough with enough profit.
+                if strategy_data["mode"] == "Auto":
+                    auto_days, required_profit = load_auto_settings(promotion_file)
+                    if should_promote(result["days_active"], result["profit_percentage"], auto_days, required_profit):
+                        logging.info(f"Strategy {strategy_name} on {normalized_symbol} meets Auto mode criteria, transitioning to Live")
+                        strategy_store = StrategyData()
+                        strategy_store.strategies_file = strategies_file
+                        strategy_store.update_strategy_mode(strategy_name, symbol, "Live")
+                        result["promoted"] = True
+                        break
+
+            candle_subscription.close()
+            journal.append(state.transition("stop"))
+            journal.close(state)
+            get_results_writer().close(simulations_dir)
+            get_exchange_pool().release(exchange)
             logging.info(f"Paper trading completed for {strategy_name} on {normalized_symbol}")
             return result
 
         except asyncio.CancelledError:
             logging.info(f"Paper trading cancelled for {strategy_name} on {normalized_symbol}")
+            if "journal" in locals():
+                journal.close(state)
+            if "simulations_dir" in locals():
+                get_results_writer().close(simulations_dir)
+            if "candle_subscription" in locals():
+                candle_subscription.close()
             if "exchange" in locals():
-                await exchange.close()
+                get_exchange_pool().release(exchange)
             raise
         except Exception as e:
             self.error_handler.log_error("Paper trading", f"Error in paper trading for {strategy_name} on {normalized_symbol}: {str(e)}")
+            if "journal" in locals():
+                journal.close(state)
+            if "simulations_dir" in locals():
+                get_results_writer().close(simulations_dir)
+            if "candle_subscription" in locals():
+                candle_subscription.close()
             if "exchange" in locals():
-                await exchange.close()
+                get_exchange_pool().release(exchange)
             raise
 
     def start_simulation(self, strategy_name: str, symbol: str, interval: str, mode: str = "simulations", limit: int = 1000) -> dict:
@@ -315,7 +328,10 @@ class TradeManagerSimulation(TradeManagerBase):
             raise
 
     def load_fallback_ohlcv(self, symbol: str, interval: str) -> pd.DataFrame:
-        """Loads fallback OHLCV data from fallback_ohlcv.json.
+        """Loads fallback OHLCV data from the local candle store.
+
+        The legacy fallback_ohlcv.json is imported into the store once, so later calls
+        only memory-map the partitions of the requested symbol and interval.
 
         Args:
             symbol (str): Trading symbol.
@@ -327,21 +343,12 @@ class TradeManagerSimulation(TradeManagerBase):
         try:
             normalized_symbol = normalize_symbol(symbol)
             normalized_interval = normalize_interval(interval)
-            fallback_file = Path(__file__).resolve().parents[2] / "data" / "fallback_ohlcv.json"
-            if not fallback_file.exists():
-                logging.warning(f"No fallback_ohlcv.json file found for {normalized_symbol} on {normalized_interval}")
-                return None
-            with open(fallback_file, "r", encoding="utf-8") as f:
-                ohlcv_data = json.load(f)
-            symbol_normalized = normalized_symbol.replace('/', '_')
-            ohlcv_symbol_data = ohlcv_data.get(symbol_normalized, {}).get(normalized_interval, [])
-            if not ohlcv_symbol_data:
-                logging.warning(f"No OHLCV data for {normalized_symbol} on {normalized_interval} in fallback_ohlcv.json")
+            df = get_candle_store().load_fallback(normalized_symbol, normalized_interval)
+            if df is None:
+                logging.warning(f"No fallback OHLCV data for {normalized_symbol} on {normalized_interval} in candle store")
                 return None
-            df = pd.DataFrame(ohlcv_symbol_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
             logging.info(f"Loaded fallback OHLCV data for {normalized_symbol} on {normalized_interval}")
             return df
         except Exception as e:
-            self.error_handler.log_error("Loading fallback OHLCV", f"Error loading fallback OHLCV data for {normalized_symbol} on {normalized_interval}: {str(e)}")
-            return None
\ No newline at end of file
+            self.error_handler.log_error("Loading fallback OHLCV", f"Error loading fallback OHLCV data for {symbol} on {interval}: {str(e)}")
+            return None
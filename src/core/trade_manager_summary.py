@@ -7,6 +7,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
 from src.core.trade_manager_base import TradeManagerBase
+from src.core.running_stats import RunningStats
 from src.tabs.czacha_data import CzachaData
 
 logging.basicConfig(
@@ -44,44 +45,27 @@ class TradeManagerSummary(TradeManagerBase):
             strategy_data = next((s for s in czacha_data["strategies"] if s["name"] == strategy_name and s["symbol"] == symbol), None)
             initial_capital = strategy_data["start_capital"] if strategy_data else 1000.0
             capital = initial_capital
-            profit = 0
-            max_dd = 0
-            max_profit = 0
-            equity_curve = [initial_capital]
+            stats = RunningStats(initial_capital)
             
             for i in range(1, len(trades), 2):
-                if i < len(trades):
-                    buy_price = trades[i-1]["price"]
-                    sell_price = trades[i]["price"]
-                    trade_profit = (sell_price - buy_price) * (capital / buy_price)
-                    profit += trade_profit
-                    capital += trade_profit
-                    equity_curve.append(capital)
-                    max_profit = max(max_profit, profit)
-            
-            equity_series = pd.Series(equity_curve)
-            rolling_max = equity_series.cummax()
-            drawdown = equity_series - rolling_max
-            max_dd = drawdown.min()
-            
-            total_trades = len(trades) // 2
-            winning_trades = sum(1 for i in range(1, len(trades), 2) if trades[i]["price"] > trades[i-1]["price"])
-            winrate_pct = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-            positive_profits = sum(trades[i]["price"] - trades[i-1]["price"] for i in range(1, len(trades), 2) if trades[i]["price"] > trades[i-1]["price"])
-            negative_profits = abs(sum(trades[i]["price"] - trades[i-1]["price"] for i in range(1, len(trades), 2) if trades[i]["price"] < trades[i-1]["price"]))
-            profit_factor = positive_profits / negative_profits if negative_profits > 0 else (0 if positive_profits == 0 else "inf")
+                buy_price = trades[i-1]["price"]
+                sell_price = trades[i]["price"]
+                trade_profit = (sell_price - buy_price) * (capital / buy_price)
+                capital += trade_profit
+                stats.record_trade(buy_price, sell_price, trade_profit, trades[i].get("duration_minutes", 0))
+                stats.update_equity(capital)
             
             summary = {
                 "strategy": strategy_name,
                 "symbol": symbol,
                 "days_active": (datetime.now(tz=ZoneInfo("Europe/Warsaw")) - pd.to_datetime(trades[0]["timestamp"])).days if trades else 0,
-                "net_profit_usd": profit,
-                "max_drawdown_usd": max_dd,
-                "max_profit_usd": max_profit,
-                "total_trades": total_trades,
+                "net_profit_usd": stats.net_profit,
+                "max_drawdown_usd": stats.max_drawdown,
+                "max_profit_usd": stats.max_profit,
+                "total_trades": stats.closed_trades,
                 "total_transactions": len(trades),
-                "winrate_pct": winrate_pct,
-                "profit_factor": profit_factor
+                "winrate_pct": stats.winrate_pct,
+                "profit_factor": stats.profit_factor
             }
             
             summary_file = Path(__file__).resolve().parents[2] / mode / strategy_name / symbol.replace('/', '_') / "summary.json"
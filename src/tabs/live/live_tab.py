@@ -11,6 +11,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from src.tabs.strategies.strategies_data import StrategyData
 from src.core.trade_manager_live import TradeManagerLive
+from src.core.candle_store import get_candle_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -176,31 +177,18 @@ class LiveTab:
     def show_price_chart(self, strategy_name, symbol):
         try:
             logging.info(f"Generating price chart for strategy {strategy_name} on {symbol}")
-            fallback_file = Path(__file__).resolve().parents[3] / "data" / "fallback_ohlcv.json"
-            if not fallback_file.exists():
-                logging.warning(f"No fallback_ohlcv.json file found for {strategy_name} on {symbol}")
-                self.show_error("Generating price chart", "Brak danych OHLCV do wyświetlenia wykresu")
-                return
-            
             trades_file = Path(__file__).resolve().parents[3] / "live" / strategy_name / symbol.replace('/', '_') / "trades.json"
             trades = []
             if trades_file.exists():
                 with open(trades_file, "r", encoding="utf-8") as f:
                     trades = [json.loads(line) for line in f if line.strip()]
             
-            with open(fallback_file, "r", encoding="utf-8") as f:
-                ohlcv_data = json.load(f)
-            
-            symbol_normalized = symbol.replace('/', '_')
-            ohlcv_symbol_data = ohlcv_data.get(symbol_normalized, {}).get("1h", [])
-            if not ohlcv_symbol_data:
-                logging.warning(f"No OHLCV data for {symbol} in fallback_ohlcv.json")
+            df = get_candle_store().load_fallback(symbol, "1h")
+            if df is None:
+                logging.warning(f"No OHLCV data for {symbol} in candle store")
                 self.show_error("Generating price chart", f"Brak danych OHLCV dla {symbol}")
                 return
             
-            df = pd.DataFrame(ohlcv_symbol_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            
             plt.figure(figsize=(10, 6))
             plt.plot(df["timestamp"], df["close"], label="Cena zamknięcia", color="blue")
             
@@ -11,6 +11,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from src.tabs.strategies.strategies_data import StrategyData
+from src.core.candle_store import get_candle_store
 import traceback
 
 logging.basicConfig(
@@ -98,32 +99,18 @@ class SimulationCore:
     def show_price_chart(self, strategy_name, symbol):
         try:
             logging.info(f"Generating price chart for strategy {strategy_name} on {symbol}")
-            fallback_file = Path(__file__).resolve().parents[3] / "data" / "fallback_ohlcv.json"
-            if not fallback_file.exists():
-                logging.warning(f"No fallback_ohlcv.json file found for {strategy_name} on {symbol}")
-                tk.messagebox.showwarning("Warning", "Brak danych OHLCV do wyświetlenia wykresu")
-                return
-            
             trades_file = Path(__file__).resolve().parents[3] / "simulations" / strategy_name / symbol.replace('/', '_') / "trades.json"
             trades = []
             if trades_file.exists():
                 with open(trades_file, "r", encoding="utf-8") as f:
                     trades = [json.loads(line) for line in f if line.strip()]
             
-            with open(fallback_file, "r", encoding="utf-8") as f:
-                ohlcv_data = json.load(f)
-            
-            # Poprawka: Upewniamy się, że używamy danych dla odpowiedniego symbolu
-            symbol_normalized = symbol.replace('/', '_')
-            ohlcv_symbol_data = ohlcv_data.get(symbol, {}).get("1h", [])  # Zakładamy domyślny interwał 1h
-            if not ohlcv_symbol_data:
-                logging.warning(f"No OHLCV data for {symbol} in fallback_ohlcv.json")
+            df = get_candle_store().load_fallback(symbol, "1h")  # Zakładamy domyślny interwał 1h
+            if df is None:
+                logging.warning(f"No OHLCV data for {symbol} in candle store")
                 tk.messagebox.showwarning("Warning", f"Brak danych OHLCV dla {symbol}")
                 return
             
-            df = pd.DataFrame(ohlcv_symbol_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            
             plt.figure(figsize=(10, 6))
             plt.plot(df["timestamp"], df["close"], label="Cena zamknięcia", color="blue")
             
@@ -2,17 +2,21 @@
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\tabs\strategies\strategies_backtest.py
 import logging
 import json
-import pandas as pd
-import importlib.util
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
-import ccxt.async_support as ccxt
 from src.core.trade_manager_fallback import TradeManagerFallback
 from src.core.trade_manager_results_handler import TradeManagerResultsHandler
 from src.core.trade_manager_summary import TradeManagerSummary
+from src.core.ohlcv_downloader import OHLCVDownloader
+from src.core.running_stats import RunningStats
+from src.core.candle_resampler import get_candle_resampler
+from src.core.candle_gaps import GapBackfiller, find_gaps, get_gap_scanner
+from src.core.exchange_pool import get_exchange_pool
 from src.tabs.czacha_data import CzachaData
-from utils.normalization import normalize_symbol, normalize_interval
+from utils.normalization import normalize_symbol, normalize_interval, interval_to_milliseconds
+from strategies.strategy_registry import get_strategy_registry
+from strategies.strategy_contract import apply_indicators, generate_signals, supports_batch_signals, supports_indicator_series
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,7 +28,7 @@ logging.basicConfig(
     ]
 )
 
-async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
+async def run_backtest(strategy_name, symbol, period=8760, interval="1h", require_no_gaps=False):
     """Runs a backtest for the specified strategy and symbol.
 
     Args:
@@ -32,6 +36,7 @@ async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
         symbol (str): Trading symbol.
         period (int): Number of candles to fetch (default: 8760).
         interval (str): Time interval (default: '1h').
+        require_no_gaps (bool): Fail instead of running on candles with missing bars.
 
     Returns:
         dict: Backtest results.
@@ -55,19 +60,11 @@ async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
             logging.error(f"File path {file_path} does not exist for strategy {strategy_name}")
             raise ValueError(f"File path {file_path} does not exist")
         
-        spec = importlib.util.spec_from_file_location(strategy_name, file_path)
-        if spec is None:
-            logging.error(f"Invalid file path for strategy {strategy_name}: {file_path}")
-            raise ValueError(f"Invalid file path for strategy {strategy_name}")
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        strategy = getattr(module, "Strategy", None)
-        if not strategy:
-            logging.error(f"No Strategy class in {file_path}")
-            raise ValueError(f"No Strategy class in {file_path}")
-        
-        strategy_instance = strategy()
-        strategy_instance.update_indicators(strategy_data.get("parameters", {}))
+        try:
+            strategy_instance = get_strategy_registry().create(file_path, strategy_data.get("parameters", {}))
+        except ValueError as e:
+            logging.error(f"Invalid strategy file for {strategy_name}: {str(e)}")
+            raise
         
         trade_manager_fallback = TradeManagerFallback()
         trade_manager_results = TradeManagerResultsHandler()
@@ -84,45 +81,65 @@ async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
             logging.error(f"No API key found for exchange {strategy_data.get('exchange', 'MEXC')}")
             raise ValueError(f"No API key found for exchange {strategy_data.get('exchange', 'MEXC')}")
         
-        exchange_class = getattr(ccxt, strategy_data.get("exchange", "MEXC").lower())
-        exchange = exchange_class({
-            "apiKey": api_key_data["api_key"],
-            "secret": api_key_data["api_secret"],
-            "password": api_key_data.get("passphrase", ""),
-            "rateLimit": api_key_data.get("rate_limit_requests", 1800),
-            "timeout": api_key_data.get("timeout_seconds", 30) * 1000
-        })
+        exchange = await get_exchange_pool().acquire(strategy_data.get("exchange", "MEXC"), api_key_data)
         
         normalized_symbol = normalize_symbol(symbol)
         normalized_interval = normalize_interval(interval)
         await trade_manager_fallback.synchronize_time(exchange, strategy_data.get("exchange", "MEXC"))
         
+        # The whole window is downloaded page by page into the candle store (resuming from stored candles).
+        interval_ms = interval_to_milliseconds(normalized_interval)
+        until = int(datetime.now(tz=ZoneInfo("UTC")).timestamp() * 1000)
+        until -= until % interval_ms
+        since = until - period * interval_ms
+        downloader = OHLCVDownloader(exchange, strategy_data.get("exchange", "MEXC"), api_key_data.get("rate_limit_requests", 1800))
+        resampler = get_candle_resampler()
+        gap_scanner = get_gap_scanner()
+        series = None
         try:
-            ohlcv = await exchange.fetch_ohlcv(normalized_symbol, normalized_interval, limit=period)
+            resampled = normalized_interval != resampler.source_interval and resampler.covers(downloader.exchange_name, normalized_symbol, since, until)
+            series_interval = resampler.source_interval if resampled else normalized_interval
+            if not resampled:
+                await downloader.download(normalized_symbol, normalized_interval, since, until)
+            # Holes left by earlier sessions are refetched (only the missing ranges) before the data is used.
+            if gap_scanner.gaps(downloader.exchange_name, normalized_symbol, series_interval, since, until):
+                await GapBackfiller(gap_scanner).backfill(exchange, downloader.exchange_name, normalized_symbol, series_interval, since, until)
+            if resampled:
+                # Stored 1m history spans the window: derive the bars locally instead of downloading them.
+                df = resampler.load_dataframe(downloader.exchange_name, normalized_symbol, normalized_interval, since, until)
+                logging.info(f"Backtest candles for {symbol} on {interval} resampled from stored {resampler.source_interval} candles")
+            else:
+                df = downloader.load(normalized_symbol, normalized_interval, since, until)
+            if df is None:
+                raise ValueError("no candles returned by exchange")
+            series = (downloader.exchange_name, normalized_symbol, series_interval)
         except Exception as e:
             logging.warning(f"Failed to fetch OHLCV data for {symbol} on {interval}: {str(e)}, using fallback data")
             df = trade_manager_fallback.load_fallback_ohlcv(symbol, interval)
             if df is None:
                 logging.error(f"No fallback OHLCV data available for {symbol} on {interval}")
                 raise ValueError(f"No OHLCV data available for {symbol}")
-        else:
-            df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+        if require_no_gaps:
+            if series:
+                gaps = gap_scanner.gaps(*series, since=since, until=until)
+            else:
+                gaps = find_gaps(df["timestamp"].values.astype("datetime64[ms]").astype("int64"), normalized_interval).tolist()
+            if gaps:
+                logging.error(f"Backtest data for {symbol} on {interval} has {len(gaps)} gaps, first at {gaps[0][0]}")
+                raise ValueError(f"OHLCV data for {symbol} on {interval} has {len(gaps)} gaps")
+        if len(df) < period:
+            logging.warning(f"Backtest for {symbol} on {interval} uses {len(df)} of {period} requested candles")
         
-        indicators = strategy_instance.get_indicators(df)
-        if not indicators:
-            logging.error(f"No indicators returned for strategy {strategy_name}")
-            raise ValueError(f"No indicators returned for strategy {strategy_name}")
-        if not isinstance(indicators, list) or not indicators or not isinstance(indicators[0], dict):
-            logging.error(f"Invalid indicators format for strategy {strategy_name}")
-            raise ValueError(f"Invalid indicators format for strategy {strategy_name}")
-        
-        for indicator in indicators[0]:
-            df[indicator] = indicators[0][indicator]
-        signals = []
-        for i in range(len(df)):
-            signal = strategy_instance.get_signal(df.iloc[[i]])
-            signals.append(signal)
+        try:
+            df, indicator_names = apply_indicators(strategy_instance, df)
+        except ValueError as e:
+            logging.error(f"Invalid indicators for strategy {strategy_name}: {str(e)}")
+            raise ValueError(f"Invalid indicators for strategy {strategy_name}: {str(e)}")
+        if not supports_indicator_series(strategy_instance):
+            logging.warning(f"Strategy {strategy_name} has no get_indicator_series, last indicator values are used for every candle")
+        if not supports_batch_signals(strategy_instance):
+            logging.info(f"Strategy {strategy_name} has no get_signals, using per-row get_signal")
+        signals = generate_signals(strategy_instance, df)
         df["signals"] = signals
         
         # Load initial capital from czacha.json
@@ -133,9 +150,7 @@ async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
         position = 0
         entry_price = 0
         profit = 0
-        max_dd = 0
-        max_profit = 0
-        equity_curve = [initial_capital]
+        stats = RunningStats(initial_capital)
         trades = []
         
         for i in range(1, len(df)):
@@ -150,13 +165,10 @@ async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
                 capital += trade_profit
                 position = 0
                 trades.append({"type": "sell", "price": exit_price, "timestamp": df["timestamp"].iloc[i].isoformat()})
-                max_profit = max(max_profit, profit)
-            equity_curve.append(capital)
+                stats.record_trade(entry_price, exit_price, trade_profit)
+            stats.update_equity(capital)
         
-        equity_series = pd.Series(equity_curve)
-        rolling_max = equity_series.cummax()
-        drawdown = equity_series - rolling_max
-        max_dd = drawdown.min()
+        max_dd = stats.max_drawdown
         max_dd_percentage = (max_dd / initial_capital) * 100 if max_dd < 0 else 0.0
         
         result = {
@@ -166,28 +178,29 @@ async def run_backtest(strategy_name, symbol, period=8760, interval="1h"):
             "profit": profit,
             "profit_percentage": (profit / initial_capital) * 100,
             "max_dd_percentage": max_dd_percentage,
-            "total_trades": len(trades) // 2,
+            "total_trades": stats.closed_trades,
             "total_transactions": len(trades),
-            "win_rate_percentage": (sum(1 for i, t in enumerate(trades[1::2]) if t["price"] > trades[i*2]["price"]) / (len(trades) // 2)) * 100 if trades else 0,
-            "avg_profit_percentage": (profit / (len(trades) // 2) / initial_capital) * 100 if trades else 0,
-            "profit_factor": sum(t["price"] - trades[i*2]["price"] for i, t in enumerate(trades[1::2]) if t["price"] > trades[i*2]["price"]) / abs(sum(t["price"] - trades[i*2]["price"] for i, t in enumerate(trades[1::2]) if t["price"] < trades[i*2]["price"])) if any(t["price"] < trades[i*2]["price"] for i, t in enumerate(trades[1::2])) else "inf",
+            "win_rate_percentage": stats.winrate_pct,
+            "avg_profit_percentage": (profit / stats.closed_trades / initial_capital) * 100 if stats.closed_trades else 0,
+            "profit_factor": stats.profit_factor,
             "signals": signals,
             "data": df.to_dict(orient="records"),
-            "indicators": list(indicators[0].keys()) if indicators else [],
+            "indicators": indicator_names,
             "parameters": strategy_data.get("parameters", {}),
             "trades": trades
         }
         
         backtest_dir = Path(__file__).resolve().parents[3] / "backtests" / strategy_name / normalized_symbol
         backtest_dir.mkdir(parents=True, exist_ok=True)
-        trade_manager_results.save_simulation_results(backtest_dir, strategy_name, symbol, trades, [], profit, len(trades) // 2, sum(1 for i, t in enumerate(trades[1::2]) if t["price"] > trades[i*2]["price"]), max_dd_percentage, initial_capital, df["timestamp"].iloc[0], df)
+        result["results_dir"] = str(backtest_dir)
+        trade_manager_results.save_simulation_results(backtest_dir, strategy_name, symbol, trades, [], profit, stats.closed_trades, stats.winning_trades, max_dd_percentage, initial_capital, df["timestamp"].iloc[0], df)
         trade_manager_summary.generate_summary(strategy_name, symbol, trades, mode="backtests")
         
-        await exchange.close()
+        get_exchange_pool().release(exchange)
         logging.info(f"Backtest completed for {strategy_name} on {symbol}, results saved")
         return result
     except Exception as e:
         logging.error(f"Error in backtest for {strategy_name} on {symbol}: {str(e)}", exc_info=True)
         if "exchange" in locals():
-            await exchange.close()
+            get_exchange_pool().release(exchange)
         raise
\ No newline at end of file
@@ -2,10 +2,9 @@
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\src\tabs\strategies\strategies_edit.py
 import tkinter as tk
 from tkinter import ttk
-import importlib.util
-import sys
 import logging
 import pandas as pd
+from strategies.strategy_registry import get_strategy_registry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,15 +20,12 @@ def edit_strategy(tab, strategy_idx):
     """Otwiera okno edycji podwskaźników strategii"""
     try:
         strategy = tab.strategies[strategy_idx]
-        spec = importlib.util.spec_from_file_location(strategy["name"], strategy["file_path"])
-        if spec is None:
-            logging.error(f"Nieprawidłowy plik strategii: {strategy['file_path']}")
+        try:
+            module = get_strategy_registry().load_module(strategy["file_path"])
+        except ValueError as e:
+            logging.error(f"Nieprawidłowy plik strategii: {strategy['file_path']}: {str(e)}")
             tab.progress_label.config(text=f"Błąd: Nieprawidłowy plik strategii {strategy['name']}")
             return
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[strategy["name"]] = module
-        try:
-            spec.loader.exec_module(module)
         except Exception as e:
             logging.error(f"Błąd kompilacji pliku strategii {strategy['file_path']}: {str(e)}")
             tab.progress_label.config(text=f"Błąd: Kompilacja pliku strategii {strategy['name']} nie powiodła się")
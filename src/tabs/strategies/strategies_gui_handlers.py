@@ -8,12 +8,11 @@ import json
 from pathlib import Path
 from src.tabs.strategies.strategies_data import StrategyData
 from src.tabs.strategies.strategies_edit import edit_strategy
-from src.tabs.strategies.strategies_backtest import run_backtest
 from src.core.trade_manager_simulation import TradeManagerSimulation
 from src.core.error_handler import ErrorHandler
+from src.core.exchange_pool import get_exchange_pool
+from src.core.engine import get_engine_client
 import asyncio
-import threading
-import ccxt.async_support as ccxt
 import shutil
 
 logging.basicConfig(
@@ -41,7 +40,8 @@ class StrategiesGuiHandlers:
             self.strategies = self.strategy_data.load_strategies()
             self.loop = asyncio.get_event_loop()
             self.trade_manager = TradeManagerSimulation()
-            self.simulation_tasks = {}
+            self.engine = None
+            self.simulation_tasks = {}  # strategy_key -> paper runner running in the engine (kept current by engine events)
             self.exchanges = self.load_exchanges()
             self.error_handler = ErrorHandler()
             logging.info("StrategiesGuiHandlers initialized")
@@ -134,11 +134,7 @@ class StrategiesGuiHandlers:
                         return
                     for strategy in self.strategies:
                         if strategy["name"] == strategy_name:
-                            strategy_key = f"{strategy['name']}_{strategy['symbol']}"
-                            if strategy_key in self.simulation_tasks:
-                                task = self.simulation_tasks.pop(strategy_key)
-                                task.cancel()
-                                logging.info(f"Cancelled simulation task for strategy {strategy_key}")
+                            self.stop_paper_runner(strategy["name"], strategy["symbol"], "clearing data")
                     for mode in ["paper", "live"]:
                         strategy_dir = Path(__file__).resolve().parents[3] / mode / strategy_name
                         shutil.rmtree(strategy_dir, ignore_errors=True)
@@ -214,22 +210,12 @@ class StrategiesGuiHandlers:
                         if not api_key_data:
                             raise ValueError(f"No API key found for exchange {exchange_name}")
                         
-                        exchange_class = getattr(ccxt, exchange_name)
-                        exchange = exchange_class({
-                            "apiKey": api_key_data["api_key"],
-                            "secret": api_key_data["api_secret"],
-                            "password": api_key_data.get("passphrase", ""),
-                            "rateLimit": api_key_data.get("rate_limit_requests", 1800),
-                            "timeout": api_key_data.get("timeout_seconds", 30) * 1000
-                        })
-                        
                         async def fetch_ohlc():
                             try:
-                                await exchange.fetch_ohlcv(symbol, interval, limit=10)
-                                await exchange.close()
+                                async with get_exchange_pool().lease(exchange_name, api_key_data) as exchange:
+                                    await exchange.fetch_ohlcv(symbol, interval, limit=10)
                                 self.progress_label.config(text=f"Pobrano 10 świec OHLCV dla {symbol} na {interval}")
                             except Exception as error:
-                                await exchange.close()
                                 self.error_handler.log_and_show_error(self.frame, "Checking OHLC data", f"Nie udało się pobrać OHLCV: {str(error)}")
                         
                         asyncio.run_coroutine_threadsafe(fetch_ohlc(), self.loop)
@@ -352,17 +338,12 @@ class StrategiesGuiHandlers:
                             self.error_handler.log_and_show_error(self.frame, "Running backtest", "Okres musi być liczbą większą niż 0")
                             return
                         
-                        if selected_symbol == "Wszystkie":
-                            results = []
-                            for s in active_symbols:
-                                result = asyncio.run(run_backtest(strategy_name, s, period=period, interval=strategy.get("interval", "1m")))
-                                results.append(result)
-                                logging.info(f"Ran backtest for strategy {strategy_name} on symbol {s} with period {period}")
-                            self.progress_label.config(text=f"Backtest dla {strategy_name} na wszystkich symbolach zakończony")
-                        else:
-                            result = asyncio.run(run_backtest(strategy_name, selected_symbol, period=period, interval=strategy.get("interval", "1m")))
-                            logging.info(f"Ran backtest for strategy {strategy_name} on symbol {selected_symbol} with period {period}")
-                            self.progress_label.config(text=f"Backtest dla {strategy_name} na {selected_symbol} zakończony")
+                        # Backtests run in the engine process; completion arrives as an engine event.
+                        selected_symbols = active_symbols if selected_symbol == "Wszystkie" else [selected_symbol]
+                        for s in selected_symbols:
+                            self.get_engine().start_runner("backtest", strategy_name, s, strategy.get("interval", "1m"), period=period)
+                            logging.info(f"Started backtest for strategy {strategy_name} on symbol {s} with period {period}")
+                        self.progress_label.config(text=f"Backtest dla {strategy_name} uruchomiony")
                         edit_window.destroy()
                     except Exception as e:
                         self.error_handler.log_and_show_error(self.frame, "Running backtest", f"Błąd podczas backtestu: {str(e)}")
@@ -386,7 +367,7 @@ class StrategiesGuiHandlers:
                         interval = interval_var.get()
                         self.progress_label.config(text=f"Uruchamianie paper trading dla {strategy_name}...")
                         self.strategy_data.update_strategy_mode(strategy_name, symbol, "Paper")
-                        asyncio.run_coroutine_threadsafe(self.run_simulation(strategy_name, symbol, interval), self.loop)
+                        self.get_engine().start_runner("paper", strategy_name, symbol, interval, mode="paper")
                         edit_window.destroy()
                     except Exception as e:
                         self.error_handler.log_and_show_error(self.frame, "Running paper trading", f"Błąd podczas uruchamiania paper trading: {str(e)}")
@@ -406,25 +387,46 @@ class StrategiesGuiHandlers:
         except Exception as e:
             self.error_handler.log_and_show_error(self.frame, "Editing StrategiesTab table", f"Błąd podczas edycji tabeli: {str(e)}")
 
-    def run_backtest_thread(self, strategy_name: str, symbol: str, interval: str):
-        """Uruchamia backtest w osobnym wątku."""
-        try:
-            result = asyncio.run_coroutine_threadsafe(run_backtest(strategy_name, symbol, interval=interval), self.loop).result()
-            self.progress_label.config(text=f"Backtest zakończony dla {strategy_name}")
-            logging.info(f"Backtest completed for {strategy_name} on {symbol}")
-        except Exception as e:
-            self.error_handler.log_and_show_error(self.frame, "Running backtest", f"Błąd podczas backtestu: {str(e)}")
+    def get_engine(self):
+        """Zwraca polaczenie z silnikiem (uruchamiajac go w razie potrzeby) i subskrybuje jego zdarzenia."""
+        if self.engine is None or not self.engine.connected:
+            self.engine = get_engine_client()
+            self.engine.on_event(lambda event: self.frame.after(0, self._on_engine_event, event))
+            # The engine outlives GUI restarts; pick up paper runners it is already running.
+            for runner in self.engine.status():
+                if runner["kind"] == "paper" and runner["status"] == "running":
+                    self.simulation_tasks[f"{runner['strategy']}_{runner['symbol']}"] = runner
+        return self.engine
 
-    async def run_simulation(self, strategy_name: str, symbol: str, interval: str):
-        """Uruchamia symulację Paper Trading."""
+    def stop_paper_runner(self, strategy_name: str, symbol: str, reason: str):
+        """Zatrzymuje paper trading strategii w silniku, jesli jest uruchomiony."""
+        strategy_key = f"{strategy_name}_{symbol}"
+        if strategy_key in self.simulation_tasks:
+            self.simulation_tasks.pop(strategy_key)
+            self.get_engine().stop_runner("paper", strategy_name, symbol)
+            logging.info(f"Stopped paper trading for strategy {strategy_key} due to {reason}")
+
+    def _on_engine_event(self, event: dict):
+        """Obsluguje zdarzenie silnika w watku Tk."""
         try:
-            logging.info(f"Task scheduled for paper trading: {strategy_name} on {symbol}")
-            result = await self.trade_manager.paper_trade(strategy_name, symbol, interval, mode="paper")
-            self.simulation_tab._refresh_results([result])
-            self.progress_label.config(text=f"Paper trading zakończone dla {strategy_name}")
-            logging.info(f"Paper trading completed for {strategy_name} on {symbol}, task id: {id(asyncio.current_task())}")
+            runner = event["runner"]
+            strategy_key = f"{runner['strategy']}_{runner['symbol']}"
+            if runner["kind"] == "paper":
+                if event["event"] == "started":
+                    self.simulation_tasks[strategy_key] = runner
+                else:
+                    self.simulation_tasks.pop(strategy_key, None)
+                self.update_strategies_display()
+            if event["event"] == "finished":
+                if runner["kind"] == "paper" and event.get("result"):
+                    self.simulation_tab._refresh_results([event["result"]])
+                self.progress_label.config(text=f"{runner['kind'].capitalize()} zakończony dla {runner['strategy']} na {runner['symbol']}")
+                logging.info(f"Engine runner {runner['key']} finished")
+            elif event["event"] == "failed":
+                self.progress_label.config(text="")
+                self.error_handler.log_and_show_error(self.frame, f"Running {runner['kind']}", f"{runner['kind']} nieudany dla {runner['strategy']} na {runner['symbol']}: {runner['error']}", exc_info=False)
         except Exception as e:
-            self.error_handler.log_and_show_error(self.frame, "Running paper trading", f"Błąd paper trading: {str(e)}")
+            self.error_handler.log_error("Handling engine event", f"Error handling engine event {event}: {str(e)}")
 
     def import_strategy(self):
         """Importuje nową strategię z pliku Python."""
@@ -513,46 +515,16 @@ class StrategiesGuiHandlers:
             self.strategies = self.strategy_data.load_strategies()
             self.update_strategies_display()
             
-            strategy_key = f"{strategy_name}_{symbol}"
             if new_mode in ["Paper", "Auto"]:
                 interval = strategy.get("interval", "1m")
                 mode = "paper" if new_mode == "Paper" else "auto"
                 self.progress_label.config(text=f"Aktywowano {new_mode} dla {strategy_name} na {symbol}")
                 
-                if not self.loop.is_running():
-                    loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
-                    loop_thread.start()
-                    logging.info("Started asyncio event loop in separate thread")
-                
-                if strategy_key in self.simulation_tasks:
-                    task = self.simulation_tasks.pop(strategy_key)
-                    task.cancel()
-                    logging.info(f"Cancelled existing paper trading task for strategy {strategy_key}")
-                
-                coro = self.run_simulation(strategy_name, symbol, interval)
-                future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-                self.simulation_tasks[strategy_key] = future
-                self.loop.call_soon_threadsafe(
-                    lambda: logging.info(f"Task scheduled for {new_mode} paper trading: {strategy_name} on {symbol}, task id: {id(future)}")
-                )
-                
-                def check_task():
-                    if future.done():
-                        try:
-                            future.result()
-                            self.progress_label.config(text="")
-                            logging.info(f"Task completed successfully for {new_mode} paper trading: {strategy_name} on {symbol}")
-                        except Exception as error:
-                            self.progress_label.config(text="")
-                            self.error_handler.log_and_show_error(self.frame, f"Running {new_mode} paper trading", f"Paper trading nieudane dla {strategy_name} na {symbol}: {str(error)}")
-                    else:
-                        self.frame.after(1000, check_task)
-                self.frame.after(0, check_task)  # Natychmiastowe uruchomienie sprawdzania
+                # Starting a runner that is already running restarts it in the engine.
+                self.get_engine().start_runner("paper", strategy_name, symbol, interval, mode=mode)
+                logging.info(f"Requested {new_mode} paper trading for {strategy_name} on {symbol}")
             elif new_mode == "Wylaczona":
-                if strategy_key in self.simulation_tasks:
-                    task = self.simulation_tasks.pop(strategy_key)
-                    task.cancel()
-                    logging.info(f"Cancelled paper trading task for strategy {strategy_key} due to mode change to {new_mode}")
+                self.stop_paper_runner(strategy_name, symbol, f"mode change to {new_mode}")
                 self.progress_label.config(text=f"Dezaktywowano strategię {strategy_name}")
                 self.simulation_tab.update_strategies_display()
             
@@ -585,11 +557,7 @@ class StrategiesGuiHandlers:
             
             if strategy.get("mode") in ["Paper", "Auto"]:
                 logging.info(f"Disabling strategy {strategy_name} due to symbol change")
-                strategy_key = f"{strategy_name}_{old_symbol}"
-                if strategy_key in self.simulation_tasks:
-                    task = self.simulation_tasks.pop(strategy_key)
-                    task.cancel()
-                    logging.info(f"Cancelled paper trading task for strategy {strategy_key} due to symbol change")
+                self.stop_paper_runner(strategy_name, old_symbol, "symbol change")
                 self.strategy_data.update_strategy_mode(strategy_name, old_symbol, "Wylaczona")
                 self.progress_label.config(text=f"Dezaktywowano strategię {strategy_name}")
             
@@ -638,11 +606,7 @@ class StrategiesGuiHandlers:
                 return
             if strategy.get("mode") in ["Paper", "Auto"]:
                 logging.info(f"Disabling strategy {strategy_name} due to exchange change")
-                strategy_key = f"{strategy_name}_{strategy.get('symbol', '')}"
-                if strategy_key in self.simulation_tasks:
-                    task = self.simulation_tasks.pop(strategy_key)
-                    task.cancel()
-                    logging.info(f"Cancelled paper trading task for strategy {strategy_key} due to exchange change")
+                self.stop_paper_runner(strategy_name, strategy.get("symbol", ""), "exchange change")
                 self.strategy_data.update_strategy_mode(strategy_name, strategy.get("symbol", ""), "Wylaczona")
                 self.progress_label.config(text=f"Dezaktywowano strategię {strategy_name}")
             self.strategy_data.update_strategy_exchange(strategy_name, new_exchange)
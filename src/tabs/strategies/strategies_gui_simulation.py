@@ -6,8 +6,6 @@ from tkinter import ttk, messagebox
 import logging
 import asyncio
 import threading
-import ccxt.async_support as ccxt
-from datetime import datetime
 from zoneinfo import ZoneInfo
 from src.core.trade_manager_simulation import TradeManagerSimulation
 from src.tabs.symbols import SymbolsTab
@@ -15,6 +13,11 @@ from src.tabs.strategies.strategies_data import StrategyData
 from pathlib import Path
 import json
 from src.core.error_handler import ErrorHandler
+from src.core.exchange_pool import get_exchange_pool
+from src.core.bar_scheduler import get_bar_scheduler
+from src.core.engine import get_engine_client
+from src.core.clock import get_clock
+from src.core.auto_promotion import DEFAULT_MIN_VOLATILITY, filter_signals_by_volatility, load_auto_settings, should_promote
 
 logging.basicConfig(
     level=logging.INFO,
@@ -97,8 +100,8 @@ class StrategiesTabSimulation:
                     
                     strategies_tab = self.frame.master.children['!notebook'].children['!frame2'].children['!strategiestab']
                     strategies_tab.progress_label.config(text=f"Starting historical simulation for {strategy_name}...")
-                    result = self.trade_manager.start_simulation(strategy_name, symbol, interval, mode="history", limit=period)
-                    self.simulation_tab._refresh_results([result])
+                    # Replays the last `period` candles as a backtest in the engine process; completion arrives as an engine event.
+                    get_engine_client().start_runner("backtest", strategy_name, symbol, interval, period=period)
                     strategies_tab.progress_label.config(text="")
                     tk.messagebox.showinfo("Success", f"Started historical simulation for {strategy_name} on {symbol}")
                     window.destroy()
@@ -149,7 +152,7 @@ class StrategiesTabSimulation:
             if not strategy:
                 self.error_handler.log_error("Starting simulation", f"Strategy {strategy_name} with symbol {symbol} not found")
                 raise ValueError(f"Strategy {strategy_name} with symbol {symbol} not found")
-            min_volatility = strategy.get("parameters", {}).get("min_volatility", 0.1)
+            min_volatility = strategy.get("parameters", {}).get("min_volatility", DEFAULT_MIN_VOLATILITY)
             logging.info(f"Using min_volatility={min_volatility} for strategy {strategy_name}")
             
             # Validate symbol and interval
@@ -163,23 +166,15 @@ class StrategiesTabSimulation:
                 self.error_handler.log_error("Starting simulation", f"Invalid API key or secret for exchange {exchange_name}")
                 raise ValueError(f"Invalid API key or secret for exchange {exchange_name}")
             
-            exchange_class = getattr(ccxt, exchange_name)
-            exchange = exchange_class({
-                "apiKey": api_key_data["api_key"],
-                "secret": api_key_data["api_secret"],
-                "password": api_key_data.get("passphrase", ""),
-                "rateLimit": api_key_data.get("rate_limit_requests", 1800),
-                "timeout": api_key_data.get("timeout_seconds", 30) * 1000
-            })
+            exchange = await get_exchange_pool().acquire(exchange_name, api_key_data)
             try:
                 symbol = await self.trade_manager.validate_symbol_and_interval(exchange, symbol, interval)
                 logging.info(f"Symbol {symbol} and interval {interval} validated successfully for {exchange_name}")
             except Exception as e:
                 self.error_handler.log_error("Validating symbol", f"Symbol {symbol} or interval {interval} validation failed: {str(e)}")
-                await exchange.close()
                 raise
             
-            start_time = datetime.now(tz=ZoneInfo("Europe/Warsaw"))
+            start_time = get_clock().now(tz=ZoneInfo("Europe/Warsaw"))
             while True:
                 # Check current mode
                 with open(strategies_file, "r", encoding="utf-8") as f:
@@ -199,26 +194,12 @@ class StrategiesTabSimulation:
                     logging.info(f"Paper trading iteration completed for {strategy_name} on {symbol}, signals: {result.get('signals', [])}")
                 except Exception as e:
                     self.error_handler.log_and_show_error(self.frame, "Running paper trading", f"Paper trading failed for {strategy_name} on {symbol}: {str(e)}")
-                    await asyncio.sleep(60)
+                    await get_clock().sleep(60)
                     continue
                 
                 # Apply volatility filter to signals
                 if result["signals"] and result["close"]:
-                    filtered_signals = []
-                    prev_price = None
-                    for i, signal in enumerate(result["signals"]):
-                        current_price = result["close"][i]
-                        if prev_price is not None:
-                            volatility = abs((current_price - prev_price) / prev_price * 100)
-                            if volatility < min_volatility and signal in ["buy", "sell"]:
-                                logging.info(f"Filtered signal for {strategy_name} on {symbol} at index {i}: volatility {volatility:.2f}% < {min_volatility}%")
-                                filtered_signals.append(None)
-                            else:
-                                filtered_signals.append(signal)
-                        else:
-                            filtered_signals.append(signal)
-                        prev_price = current_price
-                    result["signals"] = filtered_signals
+                    result["signals"] = filter_signals_by_volatility(result["signals"], result["close"], min_volatility)
                     logging.info(f"Applied volatility filter to signals for {strategy_name} on {symbol}: {result['signals']}")
                 
                 # Update SimulationTab results
@@ -229,20 +210,10 @@ class StrategiesTabSimulation:
                     self.error_handler.log_error("Updating SimulationTab", f"Error updating SimulationTab for {strategy_name} on {symbol}: {str(e)}")
                 
                 if mode == "auto":
-                    # Load promotion settings
-                    try:
-                        with open(promotion_file, "r", encoding="utf-8") as f:
-                            promotion_data = json.load(f)
-                        auto_days = promotion_data.get("auto_settings", {}).get("auto_days", 30.0)
-                        required_profit = promotion_data.get("auto_settings", {}).get("required_profit", 20.0)
-                    except Exception as e:
-                        self.error_handler.log_error("Loading promotion settings", f"Error loading promotion.json: {str(e)}")
-                        auto_days, required_profit = 30.0, 20.0
-                        logging.info(f"Using default auto settings: auto_days={auto_days}, required_profit={required_profit}")
-                    
                     # Check if Auto mode should transition to Live
-                    days_elapsed = (datetime.now(tz=ZoneInfo("Europe/Warsaw")) - start_time).days
-                    if days_elapsed >= auto_days and result["profit_percentage"] >= required_profit:
+                    auto_days, required_profit = load_auto_settings(promotion_file)
+                    days_elapsed = (get_clock().now(tz=ZoneInfo("Europe/Warsaw")) - start_time).days
+                    if should_promote(days_elapsed, result["profit_percentage"], auto_days, required_profit):
                         logging.info(f"Strategy {strategy_name} meets Auto mode criteria, transitioning to Live")
                         self.strategy_data.update_strategy_mode(strategy_name, symbol, "Live")
                         strategies_tab = self.frame.master.children['!notebook'].children['!frame2'].children['!strategiestab']
@@ -251,8 +222,8 @@ class StrategiesTabSimulation:
                         strategies_tab.progress_label.config(text=f"Aktywowano Live dla {strategy_name} na {symbol}")
                         break
                 
-                # Wait 1 minute before next iteration
-                await asyncio.sleep(60)
+                # Wait for the next bar close of the strategy's interval
+                await get_bar_scheduler().wait_for_bar_close(interval, exchange_name)
         except asyncio.CancelledError:
             logging.info(f"Paper trading task cancelled for strategy {strategy_name}")
             raise
@@ -266,4 +237,4 @@ class StrategiesTabSimulation:
                 strategies_tab.handlers.update_strategies_display()
                 self.simulation_tab.update_strategies_display()
             if "exchange" in locals():
-                await exchange.close()
\ No newline at end of file
+                get_exchange_pool().release(exchange)
\ No newline at end of file
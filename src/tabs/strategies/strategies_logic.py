@@ -4,9 +4,9 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import logging
 import json
-import importlib.util
 from pathlib import Path
 import traceback
+from strategies.strategy_registry import get_strategy_registry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -34,9 +34,7 @@ def import_strategy(strategies_tab):
         logging.info(f"Selected strategy file: {file_path}, strategy name: {strategy_name}")
         
         # Validate strategy file
-        spec = importlib.util.spec_from_file_location(strategy_name, file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        module = get_strategy_registry().load_module(file_path)
         
         if not hasattr(module, "Strategy"):
             logging.error(f"Strategy file {file_path} does not contain a 'Strategy' class")
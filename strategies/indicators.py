@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 # Path: C:\Users\Msi\Desktop\investmentapp\strategies\indicators.py
-import importlib.util
 import logging
 import os
 import traceback
+from strategies.strategy_registry import get_strategy_registry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,12 +32,7 @@ def get_strategy_indicators(strategy_name, file_path=None):
             logging.warning(f"Strategy name {strategy_name} does not match file base name {base_name}, using file base name")
             strategy_name = base_name
         
-        spec = importlib.util.spec_from_file_location(strategy_name, file_path)
-        if spec is None:
-            logging.error(f"Failed to create spec for strategy file {file_path}", exc_info=True)
-            return {}
-        strategy_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(strategy_module)
+        strategy_module = get_strategy_registry().load_module(file_path)
         
         # Sprawdź, czy strategia zawiera klasę Strategy
         if not hasattr(strategy_module, "Strategy"):
@@ -1,28 +1,18 @@
 # -*- coding: utf-8 -*-
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\signals_ma.py
-import pandas as pd
-import numpy as np
 import logging
+from strategies.utils.crossovers import BUY, SELL, crossover_signals, to_labels
 
 def calculate_ma_signals(data, fast_ma_period, slow_ma_period):
+    """Zwraca sygnaly przeciecia srednich: 'buy' gdy szybka przebija wolna od dolu
+    (bez otwartej pozycji), 'sell' gdy od gory (z otwarta pozycja), inaczej 'hold'."""
     try:
-        df = data.copy()
-        df['fast_ma'] = df['close'].rolling(window=int(fast_ma_period)).mean()
-        df['slow_ma'] = df['close'].rolling(window=int(slow_ma_period)).mean()
-        signals = ['hold'] * len(df)
-        position_open = False
-        
-        for i in range(1, len(df)):
-            if df['fast_ma'].iloc[i] > df['slow_ma'].iloc[i] and df['fast_ma'].iloc[i-1] <= df['slow_ma'].iloc[i-1] and not position_open:
-                signals[i] = 'buy'
-                position_open = True
-                logging.debug(f"Sygnał buy na indeksie {i}: fast_ma={df['fast_ma'].iloc[i]}, slow_ma={df['slow_ma'].iloc[i]}")
-            elif df['fast_ma'].iloc[i] < df['slow_ma'].iloc[i] and df['fast_ma'].iloc[i-1] >= df['slow_ma'].iloc[i-1] and position_open:
-                signals[i] = 'sell'
-                position_open = False
-                logging.debug(f"Sygnał sell na indeksie {i}: fast_ma={df['fast_ma'].iloc[i]}, slow_ma={df['slow_ma'].iloc[i]}")
-        
-        return signals
+        close = data['close']
+        fast_ma = close.rolling(window=int(fast_ma_period)).mean().to_numpy()
+        slow_ma = close.rolling(window=int(slow_ma_period)).mean().to_numpy()
+        signals = crossover_signals(fast_ma, slow_ma)
+        logging.debug(f"Sygnały MA: {int((signals == BUY).sum())} buy, {int((signals == SELL).sum())} sell dla {len(signals)} świec")
+        return to_labels(signals).tolist()
     except Exception as e:
         logging.error(f"Błąd generowania sygnałów MA: {str(e)}")
-        return ['hold'] * len(data)
\ No newline at end of file
+        return ['hold'] * len(data)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\strategy_contract.py
+import logging
+import numpy as np
+import pandas as pd
+
+
+def supports_batch_signals(strategy_instance):
+    """Checks whether the strategy implements the optional get_signals(df) batch contract."""
+    return callable(getattr(strategy_instance, "get_signals", None))
+
+
+def supports_indicator_series(strategy_instance):
+    """Checks whether the strategy implements the optional get_indicator_series(df) contract."""
+    return callable(getattr(strategy_instance, "get_indicator_series", None))
+
+
+def supports_streaming_indicators(strategy_instance):
+    """Checks whether the strategy implements the optional get_streaming_indicators() contract."""
+    return callable(getattr(strategy_instance, "get_streaming_indicators", None))
+
+
+def get_lookback(strategy_instance, default: int = 2) -> int:
+    """Returns the number of candles the strategy's indicators need.
+
+    Uses the optional get_lookback() method; otherwise the largest integer
+    parameter in strategy_instance.indicators (thresholds excluded) is taken as
+    the longest indicator window.
+    """
+    if callable(getattr(strategy_instance, "get_lookback", None)):
+        try:
+            return max(int(strategy_instance.get_lookback()), default)
+        except Exception as e:
+            logging.error(f"Error in get_lookback, estimating from parameters: {str(e)}")
+    windows = [
+        int(value) for name, value in getattr(strategy_instance, "indicators", {}).items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and "threshold" not in name
+    ]
+    return max(windows + [default])
+
+
+def apply_indicators(strategy_instance, df: pd.DataFrame):
+    """Adds the strategy's indicator columns to a copy of df.
+
+    Strategies exposing get_indicator_series(df) return full columns aligned with df,
+    computed in one pass over the whole history. Legacy strategies only provide
+    get_indicators(df) with the values of the last candle, which are broadcast to
+    every row as before.
+
+    Args:
+        strategy_instance: Instance of a strategy's Strategy class.
+        df (pd.DataFrame): DataFrame with OHLCV data.
+
+    Returns:
+        tuple: (DataFrame with indicator columns, list of indicator names).
+
+    Raises:
+        ValueError: If the strategy returns no indicators or an invalid format.
+    """
+    if supports_indicator_series(strategy_instance):
+        series = strategy_instance.get_indicator_series(df)
+        if series is not None:
+            if not isinstance(series, pd.DataFrame):
+                series = pd.DataFrame(series, index=df.index)
+            if len(series) != len(df):
+                raise ValueError(f"get_indicator_series returned {len(series)} rows for {len(df)} candles")
+            df = df.copy()
+            for name in series.columns:
+                df[name] = np.asarray(series[name])
+            return df, list(series.columns)
+
+    indicators = strategy_instance.get_indicators(df)
+    if not indicators or not isinstance(indicators, list) or not isinstance(indicators[0], dict) or not indicators[0]:
+        raise ValueError("Invalid indicators format returned by get_indicators")
+    logging.debug("Strategy has no get_indicator_series, broadcasting last indicator values to all rows")
+    df = df.copy()
+    for name, value in indicators[0].items():
+        df[name] = value
+    return df, list(indicators[0].keys())
+
+
+class IndicatorStream:
+    """A strategy's streaming indicators carried across the bars of one market.
+
+    get_streaming_indicators() returns {column: StreamingIndicator} with the same values
+    as the columns of get_indicator_series. Each update feeds only the candles from the
+    newest one already fed onwards (that bar may have been forming and is replaced), so
+    the indicator cost of a bar does not depend on the length of the history.
+
+    Args:
+        strategy_instance: Instance of a strategy's Strategy class.
+    """
+
+    def __init__(self, strategy_instance):
+        self.strategy_instance = strategy_instance
+        self.indicators = strategy_instance.get_streaming_indicators()
+        for indicator in self.indicators.values():
+            indicator.set_history(1)
+        self.last_timestamp = None
+
+    def update(self, candles: np.ndarray) -> dict:
+        """Feeds new candles (candle store structured array, oldest first) and returns the newest values."""
+        timestamps = candles["timestamp"]
+        start = len(candles)
+        while start > 0 and (self.last_timestamp is None or timestamps[start - 1] >= self.last_timestamp):
+            start -= 1
+        for candle in candles[start:]:
+            for indicator in self.indicators.values():
+                indicator.update(candle)
+        if len(candles):
+            self.last_timestamp = timestamps[-1]
+        return {name: indicator.value for name, indicator in self.indicators.items()}
+
+    def apply(self, df: pd.DataFrame, candles: np.ndarray):
+        """Streaming counterpart of apply_indicators for the newest candle only.
+
+        Returns:
+            tuple: (last row of df with the indicator columns, list of indicator names).
+        """
+        values = self.update(candles)
+        row = df.iloc[[-1]].copy()
+        for name, value in values.items():
+            row[name] = value
+        return row, list(values)
+
+
+def generate_signals(strategy_instance, df: pd.DataFrame) -> list:
+    """Generates one signal per row of df.
+
+    Strategies exposing get_signals(df) are evaluated in a single vectorized call.
+    Legacy strategies (only get_signal) fall back to one get_signal call per row.
+
+    Args:
+        strategy_instance: Instance of a strategy's Strategy class.
+        df (pd.DataFrame): DataFrame with OHLCV data and indicator columns.
+
+    Returns:
+        list: Signals ("buy", "sell" or None), aligned with the rows of df.
+    """
+    if supports_batch_signals(strategy_instance):
+        try:
+            signals = strategy_instance.get_signals(df)
+            if signals is not None and len(signals) == len(df):
+                return [str(signal) if isinstance(signal, str) else None for signal in np.asarray(signals, dtype=object)]
+            logging.warning(f"get_signals returned {0 if signals is None else len(signals)} signals for {len(df)} rows, falling back to per-row get_signal")
+        except Exception as e:
+            logging.error(f"Error in get_signals, falling back to per-row get_signal: {str(e)}", exc_info=True)
+    return [strategy_instance.get_signal(df.iloc[[i]]) for i in range(len(df))]
@@ -2,8 +2,11 @@
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\strategy_dual_ma.py
 
 import logging
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
+from strategies.utils.indicator_cache import cached_sma
+from strategies.utils.streaming import StreamingSMA
 
 logging.basicConfig(
     level=logging.INFO,
@@ -54,8 +57,55 @@ class Strategy:
             logging.error(f"Błąd aktualizacji wskaźników: {str(e)}", exc_info=True)
             raise
 
+    def get_lookback(self) -> int:
+        """Zwraca liczbę świec potrzebnych do obliczenia wszystkich wskaźników.
+
+        Returns:
+            int: Najdłuższe okno średniej (max z ma_short i ma_long).
+        """
+        return max(int(self.indicators["ma_short"]), int(self.indicators["ma_long"]))
+
+    def get_indicator_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Oblicza pełne serie wskaźników dla całego DataFrame w jednym przebiegu.
+
+        Args:
+            df (pd.DataFrame): DataFrame z danymi OHLCV.
+
+        Returns:
+            pd.DataFrame: Kolumny ma_short i ma_long wyrównane z indeksem df
+            (NaN dla świec przed pełnym oknem średniej).
+
+        Example:
+            >>> df = pd.DataFrame({"close": [100, 101, 102]})
+            >>> strategy = Strategy()
+            >>> strategy.indicators = {"ma_short": 2, "ma_long": 3}
+            >>> strategy.get_indicator_series(df)["ma_short"].tolist()
+            [nan, 100.5, 101.5]
+        """
+        if df.empty:
+            return pd.DataFrame({"ma_short": [], "ma_long": []}, index=df.index, dtype=float)
+        # Średnie pobierane przez wspólny cache: inne strategie na tych samych świecach ich nie przeliczają.
+        return pd.DataFrame({
+            "ma_short": cached_sma(df, self.indicators["ma_short"]),
+            "ma_long": cached_sma(df, self.indicators["ma_long"])
+        }, index=df.index)
+
+    def get_streaming_indicators(self) -> Dict[str, StreamingSMA]:
+        """Zwraca strumieniowe odpowiedniki kolumn get_indicator_series.
+
+        Każda średnia przechowuje sumę okna, więc nowa świeca kosztuje O(1)
+        niezależnie od długości historii, a wartości są identyczne z rolling().mean().
+
+        Returns:
+            Dict[str, StreamingSMA]: Wskaźniki ma_short i ma_long.
+        """
+        return {
+            "ma_short": StreamingSMA(self.indicators["ma_short"]),
+            "ma_long": StreamingSMA(self.indicators["ma_long"])
+        }
+
     def get_indicators(self, df: pd.DataFrame) -> List[Dict[str, float]]:
-        """Oblicza wskaźniki dla podanego DataFrame.
+        """Oblicza wskaźniki dla ostatniej świecy podanego DataFrame.
 
         Args:
             df (pd.DataFrame): DataFrame z danymi OHLCV.
@@ -74,12 +124,9 @@ class Strategy:
                 logging.warning("Pusty DataFrame przekazany do get_indicators")
                 return [{"ma_short": 0.0, "ma_long": 0.0}]
             
-            df = df.copy()
-            df["ma_short"] = df["close"].rolling(window=self.indicators["ma_short"]).mean()
-            df["ma_long"] = df["close"].rolling(window=self.indicators["ma_long"]).mean()
-            
-            logging.debug(f"Obliczono wskaźniki dla DataFrame: {list(df.columns)}")
-            return [df[["ma_short", "ma_long"]].to_dict(orient="records")[-1]]
+            series = self.get_indicator_series(df)
+            logging.debug(f"Obliczono wskaźniki dla DataFrame: {list(series.columns)}")
+            return [series.iloc[-1].to_dict()]
         except Exception as e:
             logging.error(f"Błąd obliczania wskaźników: {str(e)}", exc_info=True)
             return [{"ma_short": 0.0, "ma_long": 0.0}]
@@ -121,4 +168,38 @@ class Strategy:
                 return None
         except Exception as e:
             logging.error(f"Błąd generowania sygnału: {str(e)}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+
+    def get_signals(self, df: pd.DataFrame) -> np.ndarray:
+        """Generuje sygnały handlowe dla wszystkich wierszy DataFrame w jednym przebiegu.
+
+        Wersja wektorowa metody get_signal: wynik dla wiersza i jest identyczny
+        z get_signal(df.iloc[[i]]).
+
+        Args:
+            df (pd.DataFrame): DataFrame z danymi OHLCV i wskaźnikami.
+
+        Returns:
+            np.ndarray: Tablica (dtype=object) z sygnałami "buy", "sell" lub None.
+
+        Example:
+            >>> df = pd.DataFrame({"ma_short": [101, 99, 100], "ma_long": [100, 100, 100]})
+            >>> Strategy().get_signals(df).tolist()
+            ["buy", "sell", None]
+        """
+        signals = np.full(len(df), None, dtype=object)
+        try:
+            if df.empty:
+                logging.warning("Pusty DataFrame przekazany do get_signals")
+                return signals
+            
+            ma_short = df["ma_short"].to_numpy(dtype=float) if "ma_short" in df.columns else np.zeros(len(df))
+            ma_long = df["ma_long"].to_numpy(dtype=float) if "ma_long" in df.columns else np.zeros(len(df))
+            
+            signals[ma_short > ma_long] = "buy"
+            signals[ma_short < ma_long] = "sell"
+            logging.debug(f"Wygenerowano {int((signals != None).sum())} sygnałów dla {len(df)} świec")
+            return signals
+        except Exception as e:
+            logging.error(f"Błąd generowania sygnałów: {str(e)}", exc_info=True)
+            return np.full(len(df), None, dtype=object)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\strategy_registry.py
+import hashlib
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Running strategies look at the file at most this often (seconds) when asking for the current code.
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+class _LoadedModule:
+    __slots__ = ("path", "module", "version", "mtime_ns", "size", "digest", "checked_at")
+
+    def __init__(self, path, module, mtime_ns, size, digest):
+        self.path = path
+        self.module = module
+        self.version = 1
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.checked_at = time.monotonic()
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class StrategyRegistry:
+    """Loads every strategy file once and reloads it only when its content changes.
+
+    Modules are cached by resolved file path. A lookup compares the file's mtime and
+    size with the cached ones; only when they differ is the file hashed, and only a
+    different hash re-executes the module. Listeners registered with subscribe() are
+    called with (path, module) after a reload, and StrategyHandle swaps the instance of
+    a running strategy for one built from the new class. A reload that fails (e.g. a
+    syntax error while the file is being edited) keeps the previous module.
+    """
+
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._modules = {}
+        self._listeners = {}
+        self._lock = threading.RLock()
+        self.executions = 0
+
+    @staticmethod
+    def _key(file_path) -> Path:
+        return Path(file_path).resolve()
+
+    def _execute(self, path: Path, module_name: str):
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec is None:
+            raise ValueError(f"Invalid strategy file: {path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.executions += 1
+        sys.modules[module_name] = module
+        return module
+
+    def load_module(self, file_path, module_name: str = None, force_check: bool = True):
+        """Returns the strategy module of file_path, executing it only when needed.
+
+        Args:
+            file_path: Path of the strategy file.
+            module_name (str): Module name (default: file stem).
+            force_check (bool): Check the file now instead of at most every check_interval.
+
+        Returns:
+            module: Loaded strategy module.
+        """
+        path = self._key(file_path)
+        module_name = module_name or path.stem
+        changed = None
+        with self._lock:
+            loaded = self._modules.get(path)
+            if loaded is not None and not force_check and time.monotonic() - loaded.checked_at < self.check_interval:
+                return loaded.module
+            if not path.exists():
+                if loaded is not None:
+                    logging.warning(f"Strategy file {path} disappeared, keeping the loaded version")
+                    return loaded.module
+                raise ValueError(f"Strategy file {path} does not exist")
+            stat = path.stat()
+            if loaded is None:
+                module = self._execute(path, module_name)
+                self._modules[path] = _LoadedModule(path, module, stat.st_mtime_ns, stat.st_size, _file_digest(path))
+                logging.info(f"Loaded strategy module {module_name} from {path}")
+                return module
+            loaded.checked_at = time.monotonic()
+            if stat.st_mtime_ns == loaded.mtime_ns and stat.st_size == loaded.size:
+                return loaded.module
+            digest = _file_digest(path)
+            loaded.mtime_ns, loaded.size = stat.st_mtime_ns, stat.st_size
+            if digest == loaded.digest:
+                return loaded.module
+            try:
+                module = self._execute(path, module_name)
+            except Exception as e:
+                logging.error(f"Reloading strategy {path} failed, keeping version {loaded.version}: {str(e)}")
+                return loaded.module
+            loaded.module, loaded.digest = module, digest
+            loaded.version += 1
+            logging.info(f"Reloaded strategy module {module_name} from {path} (version {loaded.version})")
+            changed = (module, list(self._listeners.get(path, [])))
+        module, listeners = changed
+        for listener in listeners:
+            try:
+                listener(path, module)
+            except Exception as e:
+                logging.error(f"Strategy reload listener for {path} failed: {str(e)}")
+        return module
+
+    def get_class(self, file_path, module_name: str = None, force_check: bool = True):
+        """Returns the Strategy class of a strategy file."""
+        strategy_class = getattr(self.load_module(file_path, module_name, force_check), "Strategy", None)
+        if strategy_class is None:
+            raise ValueError(f"No Strategy class in {file_path}")
+        return strategy_class
+
+    def create(self, file_path, parameters: dict = None, module_name: str = None):
+        """Instantiates the file's Strategy and applies parameters (update_indicators)."""
+        strategy_instance = self.get_class(file_path, module_name, force_check=False)()
+        if parameters is not None:
+            strategy_instance.update_indicators(parameters)
+        return strategy_instance
+
+    def version(self, file_path) -> int:
+        """Version of the loaded module (1 after the first load, +1 per reload), 0 if not loaded."""
+        with self._lock:
+            loaded = self._modules.get(self._key(file_path))
+            return loaded.version if loaded else 0
+
+    def subscribe(self, file_path, listener) -> None:
+        """Calls listener(path, module) whenever file_path is reloaded."""
+        with self._lock:
+            self._listeners.setdefault(self._key(file_path), []).append(listener)
+
+    def unsubscribe(self, file_path, listener) -> None:
+        with self._lock:
+            listeners = self._listeners.get(self._key(file_path), [])
+            if listener in listeners:
+                listeners.remove(listener)
+
+    def handle(self, file_path, parameters: dict = None, module_name: str = None) -> "StrategyHandle":
+        return StrategyHandle(self, file_path, parameters, module_name)
+
+
+class StrategyHandle:
+    """A running strategy's instance that follows reloads of its file.
+
+    current() returns the same instance until the file's code changes; then it builds
+    a new instance from the reloaded class with the same parameters.
+    """
+
+    def __init__(self, registry: StrategyRegistry, file_path, parameters: dict = None, module_name: str = None):
+        self.registry = registry
+        self.file_path = file_path
+        self.parameters = dict(parameters or {})
+        self.module_name = module_name
+        self.instance = registry.create(file_path, self.parameters, module_name)
+        self.version = registry.version(file_path)
+
+    def current(self):
+        self.registry.load_module(self.file_path, self.module_name, force_check=False)
+        version = self.registry.version(self.file_path)
+        if version != self.version:
+            try:
+                self.instance = self.registry.create(self.file_path, self.parameters, self.module_name)
+                logging.info(f"Strategy {self.file_path} switched to reloaded code (version {version})")
+            except Exception as e:
+                logging.error(f"Could not instantiate reloaded strategy {self.file_path}, keeping the running instance: {str(e)}")
+            self.version = version
+        return self.instance
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_strategy_registry() -> StrategyRegistry:
+    """Returns the process-wide strategy registry."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = StrategyRegistry()
+        return _default_registry
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 # Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\strategy_test.py
 import logging
+import numpy as np
 import pandas as pd
+from strategies.utils.indicator_cache import cached_ema, get_indicator_cache
+from strategies.utils.streaming import StreamingEMA, candle_field
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +16,12 @@ logging.basicConfig(
     ]
 )
 
+ADX_SPAN = 14
+
+def _range_pct(candle):
+    """High-low range in % of the close, the input of the adx column."""
+    return 100 * abs((candle_field(candle, "high") - candle_field(candle, "low")) / candle_field(candle, "close"))
+
 class Strategy:
     def __init__(self):
         self.indicators = {
@@ -30,21 +39,43 @@ class Strategy:
             logging.error(f"Error updating indicators: {str(e)}", exc_info=True)
             raise
 
+    def get_lookback(self):
+        """Returns the number of candles the indicators need (longest EMA span or the ADX span)."""
+        return max(int(self.indicators["ema_short"]), int(self.indicators["ema_long"]), ADX_SPAN)
+
+    def get_indicator_series(self, df):
+        """Returns full ema_short/ema_long/adx columns aligned with df.index."""
+        if df.empty:
+            return pd.DataFrame({"ema_short": [], "ema_long": [], "adx": []}, index=df.index, dtype=float)
+        # Through the shared cache: other strategies and runs over the same candles reuse the series.
+        adx = get_indicator_cache().get(
+            df, "range_pct_ema", {"span": ADX_SPAN},
+            lambda: (100 * ((df["high"] - df["low"]) / df["close"]).abs()).ewm(span=ADX_SPAN, adjust=False).mean(),
+            ("high", "low", "close")
+        )
+        return pd.DataFrame({
+            "ema_short": cached_ema(df, self.indicators["ema_short"]),
+            "ema_long": cached_ema(df, self.indicators["ema_long"]),
+            "adx": adx
+        }, index=df.index)
+
+    def get_streaming_indicators(self):
+        """Returns streaming counterparts of the get_indicator_series columns (O(1) per candle)."""
+        return {
+            "ema_short": StreamingEMA(self.indicators["ema_short"]),
+            "ema_long": StreamingEMA(self.indicators["ema_long"]),
+            "adx": StreamingEMA(ADX_SPAN, source=_range_pct)
+        }
+
     def get_indicators(self, df):
         try:
             if df.empty:
                 logging.warning("Empty DataFrame provided to get_indicators")
                 return [{"ema_short": 0, "ema_long": 0, "adx": 0}]
             
-            df = df.copy()
-            df["ema_short"] = df["close"].ewm(span=self.indicators["ema_short"], adjust=False).mean()
-            df["ema_long"] = df["close"].ewm(span=self.indicators["ema_long"], adjust=False).mean()
-            
-            dx = 100 * ((df["high"] - df["low"]) / df["close"]).abs()
-            df["adx"] = dx.ewm(span=14, adjust=False).mean()
-            
-            logging.debug(f"Calculated indicators for DataFrame: {list(df.columns)}")
-            return [df[["ema_short", "ema_long", "adx"]].to_dict(orient="records")[-1]]
+            series = self.get_indicator_series(df)
+            logging.debug(f"Calculated indicators for DataFrame: {list(series.columns)}")
+            return [series.iloc[-1].to_dict()]
         except Exception as e:
             logging.error(f"Error calculating indicators: {str(e)}", exc_info=True)
             return [{"ema_short": 0, "ema_long": 0, "adx": 0}]
@@ -73,4 +104,28 @@ class Strategy:
                 return None
         except Exception as e:
             logging.error(f"Error generating signal: {str(e)}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+
+    def get_signals(self, df):
+        """Vectorized counterpart of get_signal: returns one signal per row of df.
+
+        The value at position i equals get_signal(df.iloc[[i]]).
+        """
+        signals = np.full(len(df), None, dtype=object)
+        try:
+            if df.empty:
+                logging.warning("Empty DataFrame provided to get_signals")
+                return signals
+            
+            ema_short = df["ema_short"].to_numpy(dtype=float) if "ema_short" in df.columns else np.zeros(len(df))
+            ema_long = df["ema_long"].to_numpy(dtype=float) if "ema_long" in df.columns else np.zeros(len(df))
+            adx = df["adx"].to_numpy(dtype=float) if "adx" in df.columns else np.zeros(len(df))
+            trending = adx > self.indicators["adx_threshold"]
+            
+            signals[(ema_short > ema_long) & trending] = "buy"
+            signals[(ema_short < ema_long) & trending] = "sell"
+            logging.debug(f"Generated {int((signals != None).sum())} signals for {len(df)} candles")
+            return signals
+        except Exception as e:
+            logging.error(f"Error generating signals: {str(e)}", exc_info=True)
+            return np.full(len(df), None, dtype=object)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\utils\crossovers.py
+"""Vectorized crossover primitives for signal generation.
+
+All functions take array-likes (NumPy arrays, pandas Series, lists) of equal length
+and work on whole columns at once. Comparisons involving NaN are False, so warm-up
+rows of rolling indicators never produce a cross.
+"""
+import numpy as np
+
+BUY = 1
+SELL = -1
+HOLD = 0
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def cross_above(fast, slow) -> np.ndarray:
+    """True where fast moves above slow: fast[i] > slow[i] and fast[i-1] <= slow[i-1]."""
+    fast, slow = _as_float(fast), _as_float(slow)
+    crossed = np.zeros(len(fast), dtype=bool)
+    crossed[1:] = (fast[1:] > slow[1:]) & (fast[:-1] <= slow[:-1])
+    return crossed
+
+
+def cross_below(fast, slow) -> np.ndarray:
+    """True where fast moves below slow: fast[i] < slow[i] and fast[i-1] >= slow[i-1]."""
+    fast, slow = _as_float(fast), _as_float(slow)
+    crossed = np.zeros(len(fast), dtype=bool)
+    crossed[1:] = (fast[1:] < slow[1:]) & (fast[:-1] >= slow[:-1])
+    return crossed
+
+
+def latch(enter, exit, position_open: bool = False) -> np.ndarray:
+    """Position-state latch: BUY on enter while flat, SELL on exit while in a position.
+
+    Equivalent to walking the rows with a position_open flag (entries while open and
+    exits while flat are ignored), so the result alternates BUY, SELL, BUY, ... Where
+    enter and exit are both set, enter wins while flat and exit while open.
+
+    Args:
+        enter: Boolean array of entry conditions.
+        exit: Boolean array of exit conditions.
+        position_open (bool): Whether a position is open before the first row.
+
+    Returns:
+        np.ndarray: int8 array with BUY (1), SELL (-1) or HOLD (0) per row.
+    """
+    enter = np.asarray(enter, dtype=bool)
+    exit = np.asarray(exit, dtype=bool)
+    events = np.zeros(len(enter), dtype=np.int8)
+    events[exit] = SELL
+    events[enter] = BUY
+    both = np.flatnonzero(enter & exit)
+    rows = np.flatnonzero(events)
+    if len(both):
+        # Rows with both conditions resolve against the state; fall back to a walk over the events only.
+        state = BUY if position_open else SELL
+        signals = np.zeros(len(enter), dtype=np.int8)
+        for row in rows:
+            wanted = SELL if state == BUY else BUY
+            if (wanted == BUY and enter[row]) or (wanted == SELL and exit[row]):
+                signals[row] = state = wanted
+        return signals
+    # The state before an event is the type of the previous event (accepted or not), so an
+    # event is taken exactly when it differs from the one before it.
+    kinds = events[rows]
+    previous = np.empty_like(kinds)
+    previous[:1] = BUY if position_open else SELL
+    previous[1:] = kinds[:-1]
+    signals = np.zeros(len(enter), dtype=np.int8)
+    signals[rows[kinds != previous]] = kinds[kinds != previous]
+    return signals
+
+
+def crossover_signals(fast, slow, position_open: bool = False) -> np.ndarray:
+    """Latched crossover signals: BUY when fast crosses above slow while flat, SELL when it crosses below while in a position."""
+    return latch(cross_above(fast, slow), cross_below(fast, slow), position_open)
+
+
+def to_labels(signals, buy="buy", sell="sell", hold="hold") -> np.ndarray:
+    """Maps BUY/SELL/HOLD codes to labels (object array)."""
+    # Indexed by the code itself: 0 -> hold, 1 -> buy, -1 (the last entry) -> sell.
+    table = np.array([hold, buy, sell], dtype=object)
+    return table[np.asarray(signals, dtype=np.intp)]
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\utils\indicator_cache.py
+"""Process-wide cache of computed indicator series.
+
+Strategies request indicators through cached_ema/cached_sma/cached_adx (or
+IndicatorCache.get for their own formulas) instead of computing them directly, so
+strategies running on the same market, and a parameter sweep re-running the same
+indicator, compute each identical series once.
+
+Entries are keyed by (market, interval, indicator name, parameters, data version).
+Market and interval come from df.attrs when the frame's producer set them (the candle
+feed does); the data version is a checksum of the input columns, so a new or revised
+bar, a different window or an edited frame never hits a stale entry. Least recently
+used entries are evicted once the cached arrays exceed the memory budget.
+"""
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from strategies.utils.signals_adx import calculate_adx
+
+# Bytes of cached indicator arrays kept before least recently used entries are evicted.
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# Approximate per-entry overhead (key, bookkeeping) counted against the budget.
+ENTRY_OVERHEAD = 256
+
+
+def data_version(df: pd.DataFrame, columns) -> tuple:
+    """Identifies the contents of df's columns: (rows, (crc32, adler32) per column)."""
+    version = [len(df)]
+    for column in columns:
+        values = np.ascontiguousarray(df[column].to_numpy(dtype=np.float64))
+        version.append((zlib.crc32(values), zlib.adler32(values)))
+    return tuple(version)
+
+
+class IndicatorCache:
+    """LRU cache of indicator arrays bounded by memory.
+
+    Args:
+        memory_budget (int): Bytes of cached arrays kept before evicting.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(df: pd.DataFrame, name: str, params: dict, columns) -> tuple:
+        attrs = df.attrs
+        return (attrs.get("market"), attrs.get("interval"), name, tuple(sorted(params.items())), tuple(columns), data_version(df, columns))
+
+    def get(self, df: pd.DataFrame, name: str, params: dict, compute, columns=("close",)) -> pd.Series:
+        """Returns the indicator series for df, computing it only on a cache miss.
+
+        Args:
+            df (pd.DataFrame): Candles the indicator is computed from.
+            name (str): Indicator name (e.g. "ema").
+            params (dict): Parameters that change the result (span, period, ...).
+            compute: Callable returning the series (or array) for df; called on a miss.
+            columns: Input columns of df the result depends on.
+
+        Returns:
+            pd.Series: Float values aligned with df.index (read-only, shared between callers).
+        """
+        key = self.make_key(df, name, params, columns)
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if values is None:
+            values = np.array(compute(), dtype=np.float64)
+            if len(values) != len(df):
+                raise ValueError(f"Indicator {name} returned {len(values)} values for {len(df)} candles")
+            values.setflags(write=False)
+            self._store(key, values)
+        return pd.Series(values, index=df.index, name=name, copy=False)
+
+    def _store(self, key: tuple, values: np.ndarray) -> None:
+        size = values.nbytes + ENTRY_OVERHEAD
+        with self._lock:
+            if size > self.memory_budget or key in self._entries:
+                return
+            self._entries[key] = values
+            self._bytes += size
+            while self._bytes > self.memory_budget:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes + ENTRY_OVERHEAD
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Returns {entries, bytes, hits, misses, evictions}."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self._hits, "misses": self._misses, "evictions": self._evictions}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Returns the process-wide indicator cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = IndicatorCache()
+        return _default_cache
+
+
+def cached_ema(df: pd.DataFrame, span, column: str = "close") -> pd.Series:
+    """df[column].ewm(span=span, adjust=False).mean() through the indicator cache."""
+    return get_indicator_cache().get(df, "ema", {"span": span}, lambda: df[column].ewm(span=span, adjust=False).mean(), (column,))
+
+
+def cached_sma(df: pd.DataFrame, period, column: str = "close") -> pd.Series:
+    """df[column].rolling(window=period).mean() through the indicator cache."""
+    return get_indicator_cache().get(df, "sma", {"period": period}, lambda: df[column].rolling(window=period).mean(), (column,))
+
+
+def cached_adx(df: pd.DataFrame, period) -> pd.Series:
+    """signals_adx.calculate_adx on df's high/low/close through the indicator cache."""
+    return get_indicator_cache().get(df, "adx", {"period": period}, lambda: calculate_adx(df["high"], df["low"], df["close"], period), ("high", "low", "close"))
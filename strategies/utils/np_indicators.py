@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\utils\np_indicators.py
+"""NumPy indicator kernels for whole columns.
+
+Every function takes array-likes (NumPy arrays, pandas Series, lists) and returns NumPy
+arrays of the same length. float32 input gives float32 output; everything else is
+returned as float64. Internally the kernels always compute in float64.
+
+Each indicator reproduces a pandas expression (given in its docstring and checked by
+tests/test_np_indicators.py), including the warm-up: rows before the indicator has
+enough data are NaN, e.g. the first period - 1 rows of sma(). A NaN inside a window
+makes that window NaN for the rolling indicators. The recursive averages (ema and the
+Wilder smoothing of rsi/atr/adx) skip NaN inputs like ewm(ignore_na=False) does: they
+keep the last value and give the previous average the weight of the elapsed bars.
+
+Rolling sums are computed with cumulative sums restarted every few hundred rows around
+a per-block offset, and recursive averages with a blocked closed form, so the cost is
+O(n) independent of the period and the results agree with pandas to rounding error.
+"""
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Minimum rows per block of the rolling-sum kernel (at least 4 periods); bounds the rounding error of its cumulative sums.
+_BLOCK = 128
+# Decay range (natural log) covered by one block of the recursive kernel, keeps w**-k below ~1e150.
+_EXP_RANGE = 345.0
+
+
+def _as_input(values) -> tuple:
+    """Returns (float64 array, dtype of the result) for an input column."""
+    array = np.asarray(values)
+    dtype = np.float32 if array.dtype == np.float32 else np.float64
+    return np.asarray(array, dtype=np.float64), dtype
+
+
+def _window_rows(x: np.ndarray, period: int) -> tuple:
+    """Overlapping blocks of x: row b holds the period values before block b and the block itself.
+
+    NaN are replaced by 0 and the padding repeats the edge values, so every row is centred
+    on its own data; windows touching NaN or the padding are masked by the caller.
+    """
+    block = max(_BLOCK, 4 * period)
+    blocks = max(-(-len(x) // block), 1)
+    padded = np.empty(period + blocks * block)
+    padded[period:period + len(x)] = np.where(np.isnan(x), 0.0, x)
+    padded[:period] = padded[period] if len(x) else 0.0
+    padded[period + len(x):] = padded[period + len(x) - 1]
+    return sliding_window_view(padded, block + period)[::block], block
+
+
+def _incomplete(x: np.ndarray, period: int) -> np.ndarray:
+    """True where the window ending at a row is shorter than period or contains NaN."""
+    missing = np.concatenate((np.zeros(period, dtype=np.int64), np.cumsum(np.isnan(x))))
+    incomplete = (missing[period:] - missing[:-period]) > 0
+    incomplete[:period - 1] = True
+    return incomplete
+
+
+def _rolling_moments(x: np.ndarray, period: int, squares: bool = False) -> tuple:
+    """Rolling mean (and sum of squared deviations) over complete windows without NaN."""
+    n = len(x)
+    rows, block = _window_rows(x, period)
+    offset = rows.mean(axis=1)
+    deviations = rows - offset[:, None]
+    sums = np.cumsum(deviations, axis=1)
+    s1 = sums[:, period:] - sums[:, :block]
+    mean = (offset[:, None] + s1 / period).ravel()[:n]
+    incomplete = _incomplete(x, period)
+    mean[incomplete] = np.nan
+    if not squares:
+        return mean, None
+    np.square(deviations, out=deviations)
+    np.cumsum(deviations, axis=1, out=sums)
+    m2 = np.maximum(sums[:, period:] - sums[:, :block] - s1 * s1 / period, 0.0).ravel()[:n]
+    # A constant window has no spread at all (as in pandas), not the rounding residue of the sums.
+    changes = np.concatenate((np.zeros(period, dtype=np.int64), np.cumsum(x[1:] != x[:-1])))
+    m2[changes[period - 1:] == changes[:n]] = 0.0
+    m2[incomplete] = np.nan
+    return mean, m2
+
+
+def _rolling_extreme(x: np.ndarray, period: int, maximum: bool) -> np.ndarray:
+    """Rolling max/min over complete windows without NaN (van Herk/Gil-Werman, O(n))."""
+    n = len(x)
+    result = np.full(n, np.nan)
+    if n < period:
+        return result
+    accumulate = np.maximum.accumulate if maximum else np.minimum.accumulate
+    fill = -np.inf if maximum else np.inf
+    blocks = -(-n // period)
+    padded = np.full(blocks * period, fill)
+    padded[:n] = np.where(np.isnan(x), fill, x)
+    padded = padded.reshape(blocks, period)
+    prefix = accumulate(padded, axis=1).ravel()
+    suffix = accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    pick = np.maximum if maximum else np.minimum
+    result[period - 1:] = pick(suffix[:n - period + 1], prefix[period - 1:n])
+    result[_incomplete(x, period)] = np.nan
+    return result
+
+
+def _ema_run(x: np.ndarray, alpha: float, start: float) -> np.ndarray:
+    """y[i] = (1 - alpha) * y[i-1] + alpha * x[i] with y[-1] = start, for x without NaN."""
+    n = len(x)
+    decay = 1.0 - alpha
+    if n == 0 or decay == 0.0:
+        return x.copy()
+    # Within a block y[j] = decay**j * (alpha * cumsum(x[k] * decay**-k) + decay * carry).
+    length = int(min(n, max(1.0, _EXP_RANGE / -math.log(decay))))
+    blocks = -(-n // length)
+    padded = np.zeros(blocks * length)
+    padded[:n] = x
+    powers = decay ** np.arange(length)
+    sums = padded.reshape(blocks, length)
+    np.divide(sums, powers, out=sums)
+    np.cumsum(sums, axis=1, out=sums)
+    sums *= alpha
+    carries = np.empty(blocks)
+    carry = start
+    decay_block = decay ** length
+    last = powers[-1]
+    for b in range(blocks):
+        carries[b] = carry
+        carry = decay_block * carry + last * sums[b, -1]
+    sums += decay * carries[:, None]
+    sums *= powers
+    return sums.ravel()[:n]
+
+
+def _ewm(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """x.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean() on a float64 array."""
+    result = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if not len(valid):
+        return result
+    decay = 1.0 - alpha
+    breaks = np.flatnonzero(np.diff(valid) > 1) + 1
+    previous = None
+    for first, last in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(valid)]))):
+        begin, end = valid[first], valid[last - 1] + 1
+        if previous is None:
+            value = x[begin]
+        else:
+            # After a NaN gap pandas weighs the old average by decay**(bars since the last observation).
+            result[valid[first - 1] + 1:begin] = previous
+            old_weight = decay ** (begin - valid[first - 1])
+            new_weight = 1.0 - old_weight if alpha == 0.5 else alpha
+            value = (old_weight * previous + new_weight * x[begin]) / (old_weight + new_weight)
+        result[begin] = value
+        result[begin + 1:end] = _ema_run(x[begin + 1:end], alpha, value)
+        previous = result[end - 1]
+    result[valid[-1] + 1:] = previous
+    observations = np.cumsum(~np.isnan(x))
+    result[observations < max(min_periods, 1)] = np.nan
+    return result
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    ranges = np.stack([high - low, np.abs(high - previous_close), np.abs(low - previous_close)])
+    # Row-wise max skipping NaN (the first row has no previous close), NaN only if all are NaN.
+    filled = np.where(np.isnan(ranges), -np.inf, ranges).max(axis=0)
+    return np.where(np.isinf(filled) & (filled < 0), np.nan, filled)
+
+
+def _check_period(period) -> int:
+    if int(period) != period or period < 1:
+        raise ValueError(f"Indicator period must be a positive integer, got {period}")
+    return int(period)
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average: values.rolling(window=period).mean()."""
+    period = _check_period(period)
+    x, dtype = _as_input(values)
+    return _rolling_moments(x, period)[0].astype(dtype, copy=False)
+
+
+def ema(values, span: float, min_periods: int = 0) -> np.ndarray:
+    """Exponential moving average: values.ewm(span=span, adjust=False, min_periods=min_periods).mean().
+
+    As signals_ema.calculate_ema (no warm-up by default: the first value seeds the average).
+    """
+    if span < 1:
+        raise ValueError(f"EMA span must be at least 1, got {span}")
+    x, dtype = _as_input(values)
+    return _ewm(x, 2.0 / (span + 1.0), min_periods).astype(dtype, copy=False)
+
+
+def wma(values, period: int) -> np.ndarray:
+    """Linearly weighted moving average, weights 1..period (newest heaviest).
+
+    values.rolling(window=period).apply(lambda w: (w * np.arange(1, period + 1)).sum() / (period * (period + 1) / 2))
+    """
+    period = _check_period(period)
+    x, dtype = _as_input(values)
+    result = np.full(len(x), np.nan)
+    if len(x) >= period:
+        # np.convolve flips the kernel, so the newest value of each window meets weight period.
+        weights = np.arange(period, 0, -1, dtype=np.float64) / (period * (period + 1) / 2)
+        result[period - 1:] = np.convolve(x, weights, mode="valid")
+    return result.astype(dtype, copy=False)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative strength index with Wilder smoothing (alpha = 1 / period).
+
+    delta = close.diff(); gain = delta.clip(lower=0); loss = -delta.clip(upper=0)
+    rs = gain.ewm(alpha=1/period, adjust=False, min_periods=period).mean() / (same for loss)
+    rsi = 100 - 100 / (1 + rs)          # first value at row period
+    """
+    period = _check_period(period)
+    x, dtype = _as_input(close)
+    delta = np.concatenate(([np.nan], np.diff(x)))
+    gain = _ewm(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), 1.0 / period, period)
+    loss = _ewm(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), 1.0 / period, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 100.0 - 100.0 / (1.0 + gain / loss)
+    return result.astype(dtype, copy=False)
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average true range with Wilder smoothing.
+
+    tr = max(high - low, |high - close.shift()|, |low - close.shift()|)   (NaN terms skipped)
+    atr = tr.ewm(alpha=1/period, adjust=False, min_periods=period).mean()   # first value at row period - 1
+    """
+    period = _check_period(period)
+    high, dtype = _as_input(high)
+    low, _ = _as_input(low)
+    close, _ = _as_input(close)
+    return _ewm(_true_range(high, low, close), 1.0 / period, period).astype(dtype, copy=False)
+
+
+def adx(high, low, close, period: int = 14) -> tuple:
+    """Wilder's average directional index and directional indicators.
+
+    Unlike signals_adx.calculate_adx (span-based EMAs, +DM/-DM not compared with each
+    other) this is the textbook definition:
+
+        up = high.diff(); down = -low.diff()
+        plus_dm = up where up > down and up > 0, else 0 (NaN on the first row); minus_dm likewise
+        plus_di = 100 * wilder(plus_dm) / atr(high, low, close, period)
+        dx = 100 * |plus_di - minus_di| / (plus_di + minus_di)
+        adx = wilder(dx)                     # first value at row 2 * period - 1
+
+    where wilder(s) = s.ewm(alpha=1/period, adjust=False, min_periods=period).mean().
+
+    Returns:
+        tuple: (adx, plus_di, minus_di) arrays.
+    """
+    period = _check_period(period)
+    high, dtype = _as_input(high)
+    low, _ = _as_input(low)
+    close, _ = _as_input(close)
+    alpha = 1.0 / period
+    up = np.concatenate(([np.nan], np.diff(high)))
+    down = np.concatenate(([np.nan], -np.diff(low)))
+    first = np.isnan(up) | np.isnan(down)
+    plus_dm = np.where(first, np.nan, np.where((up > down) & (up > 0), up, 0.0))
+    minus_dm = np.where(first, np.nan, np.where((down > up) & (down > 0), down, 0.0))
+    range_smooth = _ewm(_true_range(high, low, close), alpha, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100.0 * _ewm(plus_dm, alpha, period) / range_smooth
+        minus_di = 100.0 * _ewm(minus_dm, alpha, period) / range_smooth
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return tuple(a.astype(dtype, copy=False) for a in (_ewm(dx, alpha, period), plus_di, minus_di))
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """Moving average convergence/divergence.
+
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False, min_periods=slow).mean()
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+
+    Returns:
+        tuple: (line, signal_line, histogram) arrays; the line starts at row slow - 1,
+        the signal line and histogram at row slow + signal - 2.
+    """
+    x, dtype = _as_input(close)
+    line = _ewm(x, 2.0 / (fast + 1.0)) - _ewm(x, 2.0 / (slow + 1.0), slow)
+    signal_line = _ewm(line, 2.0 / (signal + 1.0), signal)
+    return tuple(a.astype(dtype, copy=False) for a in (line, signal_line, line - signal_line))
+
+
+def bollinger(close, period: int = 20, width: float = 2.0, ddof: int = 0) -> tuple:
+    """Bollinger bands around the simple moving average.
+
+    middle = close.rolling(window=period).mean()
+    upper/lower = middle +/- width * close.rolling(window=period).std(ddof=ddof)
+
+    Returns:
+        tuple: (upper, middle, lower) arrays.
+    """
+    period = _check_period(period)
+    x, dtype = _as_input(close)
+    middle, m2 = _rolling_moments(x, period, squares=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = width * np.sqrt(m2 / (period - ddof))
+    return tuple(a.astype(dtype, copy=False) for a in (middle + deviation, middle, middle - deviation))
+
+
+def donchian(high, low, period: int = 20) -> tuple:
+    """Donchian channel: high.rolling(window=period).max(), low.rolling(window=period).min() and their midpoint.
+
+    Returns:
+        tuple: (upper, middle, lower) arrays.
+    """
+    period = _check_period(period)
+    high, dtype = _as_input(high)
+    low, _ = _as_input(low)
+    upper = _rolling_extreme(high, period, maximum=True)
+    lower = _rolling_extreme(low, period, maximum=False)
+    return tuple(a.astype(dtype, copy=False) for a in (upper, (upper + lower) / 2.0, lower))
+
+
+def vwap(high, low, close, volume, period: int = None) -> np.ndarray:
+    """Volume-weighted average of the typical price (high + low + close) / 3.
+
+    period=None anchors at the first row: (typical * volume).cumsum() / volume.cumsum()
+    (rows with a NaN input stay NaN and are left out of the sums). With a period it is
+    rolling: (typical * volume).rolling(period).sum() / volume.rolling(period).sum().
+    """
+    high, dtype = _as_input(high)
+    low, _ = _as_input(low)
+    close, _ = _as_input(close)
+    volume, _ = _as_input(volume)
+    typical = (high + low + close) / 3.0
+    weighted = typical * volume
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if period is None:
+            missing = np.isnan(weighted) | np.isnan(volume)
+            result = np.nancumsum(np.where(missing, np.nan, weighted)) / np.nancumsum(np.where(missing, np.nan, volume))
+            result[missing] = np.nan
+        else:
+            period = _check_period(period)
+            result = _rolling_moments(weighted, period)[0] / _rolling_moments(volume, period)[0]
+    return result.astype(dtype, copy=False)
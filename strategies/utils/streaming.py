@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\strategies\utils\streaming.py
+"""Stateful indicators updated one candle at a time.
+
+Each indicator carries the state of the batch pandas computation it replaces, so
+update() costs O(1) regardless of how much history came before, and values() is
+bit-for-bit what the batch call returns for the same candles:
+
+    StreamingSMA(n)  == close.rolling(window=n).mean()      (Kahan running sum, as pandas)
+    StreamingEMA(n)  == close.ewm(span=n, adjust=False).mean()
+    StreamingADX(n)  == signals_adx.calculate_adx(high, low, close, n)
+
+A candle is a ccxt row [timestamp, open, high, low, close, volume], anything indexable
+by column name (a record of the candle store's structured array, a DataFrame row, a
+dict) or, for SMA/EMA, a bare number. A candle with the same timestamp as the previous
+one replaces it, so the bar still forming can be fed again as it changes.
+"""
+import math
+import numbers
+from collections import deque
+import numpy as np
+
+OHLCV_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+def candle_field(candle, name: str):
+    """Returns one OHLCV field of a candle (ccxt row or anything indexable by name)."""
+    if isinstance(candle, (list, tuple)):
+        return candle[OHLCV_FIELDS.index(name)]
+    return candle[name]
+
+
+def _timestamp(candle):
+    if isinstance(candle, numbers.Real):
+        return None
+    try:
+        return candle_field(candle, "timestamp")
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def _divide(a: float, b: float) -> float:
+    """a / b with IEEE results (inf, nan) instead of ZeroDivisionError, as in pandas."""
+    if b == 0:
+        if a != a or a == 0:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class StreamingIndicator:
+    """Base class: update(candle) returns the newest value, values() all kept values.
+
+    Args:
+        source: Column read from each candle ("close" by default) or a callable
+            candle -> float.
+        history (int): Number of values kept for values(); None keeps all.
+    """
+
+    def __init__(self, source="close", history: int = None):
+        self.source = source
+        self._values = deque(maxlen=history)
+        self._last_timestamp = None
+        self._saved = None
+
+    @property
+    def value(self) -> float:
+        """Value for the newest candle (NaN before the first one)."""
+        return self._values[-1] if self._values else math.nan
+
+    def values(self) -> np.ndarray:
+        return np.fromiter(self._values, dtype=float, count=len(self._values))
+
+    def set_history(self, history: int) -> None:
+        """Changes how many values values() keeps (at least 1; None keeps all)."""
+        self._values = deque(self._values, maxlen=None if history is None else max(int(history), 1))
+
+    def read(self, candle) -> float:
+        if callable(self.source):
+            return float(self.source(candle))
+        if isinstance(candle, numbers.Real):
+            return float(candle)
+        return float(candle_field(candle, self.source))
+
+    def update(self, candle) -> float:
+        """Adds a candle, or replaces the newest one when the timestamp repeats; returns the new value."""
+        timestamp = _timestamp(candle)
+        if timestamp is not None and self._values and timestamp == self._last_timestamp:
+            self._restore(self._saved)
+            self._values.pop()
+        else:
+            self._saved = self._save()
+        self._last_timestamp = timestamp
+        value = self._step(candle)
+        self._values.append(value)
+        return value
+
+    def _step(self, candle) -> float:
+        raise NotImplementedError
+
+    def _save(self):
+        raise NotImplementedError
+
+    def _restore(self, state) -> None:
+        raise NotImplementedError
+
+
+class StreamingSMA(StreamingIndicator):
+    """Simple moving average over a ring buffer with pandas' compensated running sum.
+
+    Mirrors pandas roll_mean: Kahan summation with separate compensation for added and
+    removed values, the constant-window and sign fix-ups, and NaN until the window holds
+    period valid values.
+    """
+
+    def __init__(self, period: int, source="close", history: int = None):
+        super().__init__(source, history)
+        self.period = int(period)
+        if self.period < 1:
+            raise ValueError(f"SMA period must be at least 1, got {period}")
+        self._window = deque()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._nobs = 0
+        self._sum = 0.0
+        self._neg_ct = 0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._same_count = 0
+        self._prev_value = None
+
+    def _add(self, x: float) -> None:
+        if self._prev_value is None:
+            self._prev_value = x
+        if x != x:
+            return
+        self._nobs += 1
+        y = x - self._compensation_add
+        t = self._sum + y
+        self._compensation_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct += 1
+        # Consecutive equal values: the mean of a constant window is the value itself, without rounding residue.
+        if x == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = x
+
+    def _remove(self, x: float) -> None:
+        if x != x:
+            return
+        self._nobs -= 1
+        y = -x - self._compensation_remove
+        t = self._sum + y
+        self._compensation_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct -= 1
+
+    def _step(self, candle) -> float:
+        x = self.read(candle)
+        if self.period == 1:
+            # pandas restarts the sum whenever the window does not overlap the previous one.
+            self._reset()
+            self._window.clear()
+        elif len(self._window) == self.period:
+            self._remove(self._window.popleft())
+        self._window.append(x)
+        self._add(x)
+        if self._nobs < self.period or self._nobs == 0:
+            return math.nan
+        result = self._sum / self._nobs
+        if self._same_count >= self._nobs:
+            result = self._prev_value
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+    def _save(self):
+        # Enough to undo one _step: the scalars plus the value the window is about to evict.
+        full = len(self._window) == self.period
+        return (self._nobs, self._sum, self._neg_ct, self._compensation_add, self._compensation_remove,
+                self._same_count, self._prev_value, full, self._window[0] if full else None)
+
+    def _restore(self, state) -> None:
+        (self._nobs, self._sum, self._neg_ct, self._compensation_add, self._compensation_remove,
+         self._same_count, self._prev_value, full, evicted) = state
+        self._window.pop()
+        if full:
+            self._window.appendleft(evicted)
+
+
+class StreamingEMA(StreamingIndicator):
+    """Exponential moving average, ewm(span=span, adjust=False).mean().
+
+    Uses pandas' normalized recursion: the first valid value seeds the average, NaN
+    inputs keep the previous value and decay its weight (ignore_na=False).
+    """
+
+    def __init__(self, span: float, source="close", history: int = None):
+        super().__init__(source, history)
+        if span < 1:
+            raise ValueError(f"EMA span must be at least 1, got {span}")
+        self.span = span
+        self._com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + self._com)
+        self._old_wt_factor = 1.0 - self.alpha
+        self._weighted = math.nan
+        self._old_wt = 1.0
+        self._new_wt = self.alpha
+        self._nobs = 0
+        self._started = False
+
+    def step_value(self, x: float) -> float:
+        """Advances the average by one raw value (no timestamp handling, nothing kept)."""
+        is_observation = x == x
+        if not self._started:
+            self._started = True
+            self._weighted = x
+            self._nobs = int(is_observation)
+            self._old_wt = 1.0
+        else:
+            self._nobs += is_observation
+            if self._weighted == self._weighted:
+                self._old_wt *= self._old_wt_factor
+                if self._com == 1:
+                    # pandas special-cases com == 1 (span 3): the new value gets the weight the old one lost.
+                    self._new_wt = 1.0 - self._old_wt
+                if is_observation:
+                    if self._weighted != x:
+                        self._weighted = (self._old_wt * self._weighted + self._new_wt * x) / (self._old_wt + self._new_wt)
+                    self._old_wt = 1.0
+            elif is_observation:
+                self._weighted = x
+        return self._weighted if self._nobs >= 1 else math.nan
+
+    def _step(self, candle) -> float:
+        return self.step_value(self.read(candle))
+
+    def _save(self):
+        return (self._weighted, self._old_wt, self._new_wt, self._nobs, self._started)
+
+    def _restore(self, state) -> None:
+        self._weighted, self._old_wt, self._new_wt, self._nobs, self._started = state
+
+
+class StreamingADX(StreamingIndicator):
+    """ADX as computed by signals_adx.calculate_adx, one candle at a time.
+
+    True range and +DM/-DM are smoothed with EMAs of span period (carried state), DX
+    is derived from the smoothed directional indicators and ADX is its EMA.
+    """
+
+    def __init__(self, period: int, history: int = None):
+        super().__init__("close", history)
+        self.period = period
+        self._tr = StreamingEMA(period)
+        self._plus_dm = StreamingEMA(period)
+        self._minus_dm = StreamingEMA(period)
+        self._adx = StreamingEMA(period)
+        self._prev = None
+
+    def _step(self, candle) -> float:
+        high = float(candle_field(candle, "high"))
+        low = float(candle_field(candle, "low"))
+        close = float(candle_field(candle, "close"))
+        if self._prev is None:
+            ranges = [high - low]
+            plus_dm = minus_dm = math.nan
+        else:
+            prev_high, prev_low, prev_close = self._prev
+            ranges = [high - low, abs(high - prev_close), abs(low - prev_close)]
+            plus_dm = high - prev_high
+            minus_dm = prev_low - low
+            plus_dm = 0.0 if plus_dm < 0 else plus_dm
+            minus_dm = 0.0 if minus_dm < 0 else minus_dm
+        ranges = [r for r in ranges if r == r]
+        tr = max(ranges) if ranges else math.nan
+        self._prev = (high, low, close)
+        tr_smooth = self._tr.step_value(tr)
+        plus_di = _divide(self._plus_dm.step_value(plus_dm), tr_smooth) * 100
+        minus_di = _divide(self._minus_dm.step_value(minus_dm), tr_smooth) * 100
+        dx = _divide(abs(plus_di - minus_di), plus_di + minus_di) * 100
+        return self._adx.step_value(dx)
+
+    def _save(self):
+        return (self._prev, self._tr._save(), self._plus_dm._save(), self._minus_dm._save(), self._adx._save())
+
+    def _restore(self, state) -> None:
+        self._prev, tr, plus_dm, minus_dm, adx = state
+        self._tr._restore(tr)
+        self._plus_dm._restore(plus_dm)
+        self._minus_dm._restore(minus_dm)
+        self._adx._restore(adx)
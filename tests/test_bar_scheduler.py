@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_bar_scheduler.py
+
+import asyncio
+import pytest
+from src.core.bar_scheduler import BarScheduler
+
+HOUR = 3_600_000
+DAY = 24 * HOUR
+JAN_2025 = 1735689600000  # 2025-01-01 00:00 UTC
+
+def test_bar_boundaries():
+    """Testuje wyznaczanie zamkniecia biezacej i poprzedniej swiecy."""
+    now = JAN_2025 + 5 * HOUR + 123
+    assert BarScheduler.next_bar_close("4h", now) == JAN_2025 + 8 * HOUR
+    assert BarScheduler.last_bar_close("4h", now) == JAN_2025 + 4 * HOUR
+    assert BarScheduler.next_bar_close("1m", JAN_2025) == JAN_2025 + 60_000
+
+def test_weekly_and_monthly_boundaries():
+    """Testuje swiece tygodniowe od poniedzialku i miesieczne wedlug kalendarza."""
+    # 2025-01-01 is a Wednesday: the week opened on Monday 2024-12-30.
+    now = JAN_2025 + 10 * HOUR
+    assert BarScheduler.last_bar_close("1w", now) == JAN_2025 - 2 * DAY
+    assert BarScheduler.next_bar_close("1w", now) == JAN_2025 + 5 * DAY
+    assert BarScheduler.next_bar_close("1w", JAN_2025 - 2 * DAY) == JAN_2025 + 5 * DAY
+    feb_15 = JAN_2025 + 45 * DAY
+    assert BarScheduler.last_bar_close("1mo", feb_15) == JAN_2025 + 31 * DAY
+    assert BarScheduler.next_bar_close("1mo", feb_15) == JAN_2025 + 59 * DAY
+    assert BarScheduler.next_bar_close("1mo", JAN_2025) == JAN_2025 + 31 * DAY
+
+def test_server_offset_and_grace(monkeypatch):
+    """Testuje uwzglednienie roznicy czasu serwera i opoznienia po zamknieciu swiecy."""
+    scheduler = BarScheduler(grace_delay=2.0)
+    monkeypatch.setattr("src.core.clock.time.time", lambda: (JAN_2025 + HOUR - 10_000) / 1000)
+    assert scheduler.seconds_until_next_bar("1h") == pytest.approx(12.0)
+    scheduler.set_time_offset("MEXC", 4_000)
+    assert scheduler.seconds_until_next_bar("1h", "mexc") == pytest.approx(8.0)
+
+def test_wait_for_bar_close(monkeypatch):
+    """Testuje, ze petla spi do zamkniecia swiecy zamiast stalych 60 s."""
+    scheduler = BarScheduler(grace_delay=1.0)
+    monkeypatch.setattr("src.core.clock.time.time", lambda: (JAN_2025 + 3 * HOUR) / 1000)
+    delays = []
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr("src.core.clock.asyncio.sleep", fake_sleep)
+    bar_close = asyncio.run(scheduler.wait_for_bar_close("4h"))
+    assert bar_close == JAN_2025 + 4 * HOUR
+    assert delays == [pytest.approx(3601.0)]
+
+def test_latency_stats(monkeypatch):
+    """Testuje pomiar opoznienia sygnalu od zamkniecia swiecy."""
+    scheduler = BarScheduler(latency_bound=1.0)
+    monkeypatch.setattr("src.core.clock.time.time", lambda: (JAN_2025 + 2_500) / 1000)
+    assert scheduler.record_latency("mexc", "ETHUSDT", "1m", JAN_2025) == 2500.0
+    scheduler.record_latency("mexc", "ETHUSDT", "1m", JAN_2025 + 1_500)
+    stats = scheduler.latency_stats()[("mexc", "ETHUSDT", "1m")]
+    assert stats == {"count": 2, "mean_ms": 1750.0, "max_ms": 2500.0, "last_ms": 1000.0}
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_candle_buffer.py
+
+import asyncio
+import pytest
+from src.core.candle_buffer import CandleRingBuffer, buffer_capacity
+from strategies.strategy_dual_ma import Strategy as DualMaStrategy
+from strategies.strategy_test import Strategy as TestStrategy
+
+MINUTE = 60_000
+START = 1735689600000  # 2025-01-01 00:00 UTC
+
+def make_rows(first, count, price=100.0):
+    return [[START + (first + i) * MINUTE, price + first + i, price + first + i + 1, price + first + i - 1, price + first + i, 1.0] for i in range(count)]
+
+class FakeExchange:
+    """Gielda zwracajaca swiece z zadanego zakresu i zapamietujaca parametry zapytan."""
+
+    def __init__(self, total):
+        self.rows = make_rows(0, total)
+        self.calls = []
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append({"since": since, "limit": limit})
+        rows = [row for row in self.rows if since is None or row[0] >= since]
+        return rows[-limit:] if limit else rows
+
+def test_extend_wraps_around():
+    """Testuje nadpisywanie najstarszych swiec po zapelnieniu bufora."""
+    buffer = CandleRingBuffer(5)
+    assert buffer.extend(make_rows(0, 3)) == 3
+    assert buffer.extend(make_rows(3, 4)) == 4
+    assert len(buffer) == 5
+    df = buffer.to_dataframe()
+    assert df["close"].tolist() == [102.0, 103.0, 104.0, 105.0, 106.0]
+    assert buffer.last_timestamp == START + 6 * MINUTE
+
+def test_extend_replaces_forming_candle():
+    """Testuje aktualizacje ostatniej swiecy i ignorowanie starszych swiec."""
+    buffer = CandleRingBuffer(10)
+    buffer.extend(make_rows(0, 5))
+    assert buffer.extend(make_rows(2, 4, price=200.0)) == 1
+    closes = buffer.to_dataframe()["close"].tolist()
+    assert closes == [100.0, 101.0, 102.0, 103.0, 204.0, 205.0]
+
+def test_sync_warms_then_fetches_incrementally():
+    """Testuje jednorazowe rozgrzanie bufora i pobieranie tylko nowych swiec."""
+    exchange = FakeExchange(100)
+    buffer = CandleRingBuffer(60)
+    assert asyncio.run(buffer.sync(exchange, "BTC/USDT", "1m")) == 60
+    exchange.rows += make_rows(100, 2)
+    assert asyncio.run(buffer.sync(exchange, "BTC/USDT", "1m")) == 2
+    assert exchange.calls == [{"since": None, "limit": 60}, {"since": START + 99 * MINUTE, "limit": None}]
+    assert len(buffer) == 60
+    assert buffer.last_timestamp == START + 101 * MINUTE
+
+def test_buffer_capacity_from_lookback():
+    """Testuje dobor rozmiaru bufora do najdluzszego okna wskaznikow strategii."""
+    strategy = DualMaStrategy()
+    strategy.update_indicators({"ma_long": 200})
+    assert strategy.get_lookback() == 200
+    assert buffer_capacity(strategy) == 600
+    assert TestStrategy().get_lookback() == 20
+    with pytest.raises(ValueError):
+        CandleRingBuffer(0)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_candle_feed.py
+
+import asyncio
+import time
+import pytest
+from src.core.candle_feed import CandleFeed, Subscription
+from src.core.clock import VirtualClock, set_clock
+
+MINUTE = 60_000
+START = 1735689600000  # 2025-01-01 00:00 UTC
+
+class FakeExchange:
+    """Gielda dopisujaca nowa swiece przy kazdym zapytaniu."""
+
+    id = "mexc"
+
+    def __init__(self):
+        self.rows = [[START + i * MINUTE, 1.0, 2.0, 0.5, 1.0 + i, 1.0] for i in range(100)]
+        self.calls = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+        if since is not None:
+            self.rows.append([self.rows[-1][0] + MINUTE, 1.0, 2.0, 0.5, 1.0, 1.0])
+            return [row for row in self.rows if row[0] >= since]
+        return self.rows[-limit:]
+
+class FakePool:
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.released = 0
+
+    async def acquire(self, exchange_name, api_key_data):
+        return self.exchange
+
+    def release(self, client):
+        self.released += 1
+
+class FakeScheduler:
+    """Harmonogram z barem zamykanym co 50 ms."""
+
+    def server_now_ms(self, exchange_name=None):
+        return 0
+
+    def last_bar_close(self, interval, now_ms):
+        return 0
+
+    async def wait_for_bar_close(self, interval, exchange_name=None):
+        await asyncio.sleep(0.05)
+        return 0
+
+@pytest.fixture
+def feed(monkeypatch):
+    """Zwraca feed swiec z falszywa pula i szybkim harmonogramem barow."""
+    exchange = FakeExchange()
+    pool = FakePool(exchange)
+    monkeypatch.setattr("src.core.candle_feed.get_exchange_pool", lambda: pool)
+    feed = CandleFeed(scheduler=FakeScheduler(), retry_delay=0.0)
+    return feed, exchange, pool
+
+KEY = {"api_key": "a"}
+
+def test_subscribers_share_one_poller(feed):
+    """Testuje, ze strategie na tym samym rynku korzystaja z jednego zapytania na bar."""
+    feed, exchange, pool = feed
+    async def scenario():
+        first = feed.subscribe("MEXC", KEY, "ETH/USDT", "1m", capacity=50)
+        second = feed.subscribe("mexc", KEY, "ETHUSDT", "1m", capacity=80)
+        other = feed.subscribe("mexc", KEY, "BTC/USDT", "1m", capacity=50)
+        assert len(feed.stats()) == 2
+        updates = []
+        for _ in range(3):
+            updates.append((await first.next(timeout=1), await second.next(timeout=1)))
+        for subscription in (first, second, other):
+            subscription.close()
+        await asyncio.sleep(0.05)
+        return updates
+    updates = asyncio.run(scenario())
+    assert feed.stats() == {}
+    assert pool.released == 2
+    for update_a, update_b in updates:
+        assert update_b.last_timestamp >= update_a.last_timestamp
+    last = updates[-1][0]
+    assert len(last.to_dataframe(50)) == 50
+    assert len(last.to_dataframe(80)) == 80
+
+def test_late_subscriber_gets_latest_window(feed):
+    """Testuje natychmiastowe dostarczenie ostatniego okna nowemu subskrybentowi."""
+    feed, exchange, pool = feed
+    async def scenario():
+        first = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=50)
+        await first.next(timeout=1)
+        late = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=50)
+        update = await late.next(timeout=0.001)
+        first.close()
+        late.close()
+        return update
+    assert asyncio.run(scenario()) is not None
+
+def test_larger_subscriber_rewarms_buffer(feed, monkeypatch):
+    """Testuje pobranie pelnego okna, gdy dolacza strategia potrzebujaca dluzszej historii."""
+    feed, exchange, pool = feed
+    limits = []
+    fetch = exchange.fetch_ohlcv
+    async def recording_fetch(symbol, timeframe, since=None, limit=None):
+        limits.append(limit)
+        return await fetch(symbol, timeframe, since=since, limit=limit)
+    monkeypatch.setattr(exchange, "fetch_ohlcv", recording_fetch)
+    async def scenario():
+        small = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=20)
+        await small.next(timeout=1)
+        large = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=90)
+        assert await large.next(timeout=0.001) is None
+        update = await large.next(timeout=1)
+        small.close()
+        large.close()
+        return update
+    update = asyncio.run(scenario())
+    assert limits[:2] == [20, 90]
+    assert len(update.candles) == 90
+
+def test_rewarm_keeps_fetched_forming_bar(feed):
+    """Testuje, ze po ponownym rozgrzaniu bufora ostatnia swieca pochodzi z nowego pobrania, a nie ze starej kopii."""
+    feed, exchange, pool = feed
+    async def scenario():
+        small = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=20)
+        stale = await small.next(timeout=1)
+        # The forming bar moved on the exchange since the last poll.
+        exchange.rows[-1] = exchange.rows[-1][:4] + [999.0, exchange.rows[-1][5]]
+        large = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=90)
+        update = await large.next(timeout=1)
+        small.close()
+        large.close()
+        return stale, update
+    stale, update = asyncio.run(scenario())
+    assert stale.candles["close"][-1] != 999.0
+    candles = update.candles
+    assert candles["timestamp"][-1] == stale.candles["timestamp"][-1]
+    assert candles["close"][-1] == 999.0
+    assert len(candles) == 90 and (candles["timestamp"][1:] - candles["timestamp"][:-1] == MINUTE).all()
+
+def test_poller_failure_reaches_subscribers(feed, monkeypatch):
+    """Testuje, ze brak klienta gieldy konczy feed bledem u subskrybentow zamiast cichego zawieszenia."""
+    feed, exchange, pool = feed
+    async def failing_acquire(exchange_name, api_key_data):
+        raise ConnectionError("no route to exchange")
+    monkeypatch.setattr(pool, "acquire", failing_acquire)
+    async def scenario():
+        subscription = feed.subscribe("mexc", KEY, "ETH/USDT", "1m", capacity=20)
+        with pytest.raises(RuntimeError, match="no route to exchange"):
+            await subscription.next(timeout=1)
+        subscription.close()
+    asyncio.run(scenario())
+    assert feed.stats() == {}
+    assert pool.released == 0
+
+def test_next_timeout_runs_on_process_clock():
+    """Testuje, ze limit czasu next() w powtorce uplywa w czasie wirtualnym, a nie rzeczywistym."""
+    async def scenario():
+        clock = VirtualClock(START / 1000)
+        set_clock(clock)
+        try:
+            subscription = Subscription(None, ("mexc",), capacity=10)
+            waiter = asyncio.ensure_future(subscription.next(timeout=60))
+            started = time.monotonic()
+            await clock.run_until(START / 1000 + 3600)
+            return await waiter, clock.time() - START / 1000, time.monotonic() - started
+        finally:
+            set_clock(None)
+    update, virtual_elapsed, real_elapsed = asyncio.run(scenario())
+    assert update is None
+    assert virtual_elapsed == 60
+    assert real_elapsed < 5
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_candle_gaps.py
+
+import asyncio
+import json
+import pytest
+import numpy as np
+from src.core.candle_store import CandleStore
+from src.core.candle_gaps import GapBackfiller, GapScanner, find_gaps, missing_bars
+
+HOUR = 3_600_000
+JAN_2025 = 1735689600000  # 2025-01-01 00:00 UTC
+
+def make_rows(hours):
+    return [[JAN_2025 + h * HOUR, 100.0, 101.0, 99.0, 100.5, 10.0] for h in hours]
+
+class FakeExchange:
+    """Gielda zwracajaca swiece z pelnej historii poza wskazanymi godzinami."""
+
+    def __init__(self, available_hours):
+        self.available = make_rows(available_hours)
+        self.calls = []
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append(since)
+        rows = [row for row in self.available if row[0] >= since]
+        return rows[:limit]
+
+@pytest.fixture
+def store(tmp_path):
+    """Zwraca magazyn swiec w katalogu tymczasowym."""
+    return CandleStore(tmp_path / "candles")
+
+def test_find_gaps_vectorized():
+    """Testuje wykrywanie brakujacych swiec na podstawie kroku interwalu."""
+    timestamps = np.array([JAN_2025 + h * HOUR for h in (0, 1, 2, 5, 6, 10)], dtype=np.int64)
+    gaps = find_gaps(timestamps, "1h")
+    assert gaps.tolist() == [[JAN_2025 + 3 * HOUR, JAN_2025 + 5 * HOUR], [JAN_2025 + 7 * HOUR, JAN_2025 + 10 * HOUR]]
+    assert missing_bars(gaps, "1h") == 5
+    assert find_gaps(timestamps[:3], "1h").shape == (0, 2)
+
+def test_monthly_bars_are_not_gaps():
+    """Testuje, ze rozne dlugosci miesiecy nie sa traktowane jako luki."""
+    months = np.array(["2025-01", "2025-02", "2025-03", "2025-05"], dtype="datetime64[M]").astype("datetime64[ms]").astype(np.int64)
+    assert len(find_gaps(months, "1mo")) == 1
+
+def test_scan_is_incremental(store):
+    """Testuje zapis znacznika i skanowanie tylko nowych swiec."""
+    store.append("kucoin", "BTC/USDT", "1h", make_rows([0, 1, 2, 5, 6]))
+    scanner = GapScanner(store)
+    meta = scanner.scan("kucoin", "BTC/USDT", "1h")
+    assert meta["gaps"] == [[JAN_2025 + 3 * HOUR, JAN_2025 + 5 * HOUR]]
+    assert meta["verified_until"] == JAN_2025 + 6 * HOUR
+    store.append("kucoin", "BTC/USDT", "1h", make_rows([9, 10]))
+    meta = scanner.scan("kucoin", "BTC/USDT", "1h")
+    assert meta["gaps"][-1] == [JAN_2025 + 7 * HOUR, JAN_2025 + 9 * HOUR]
+    assert len(meta["gaps"]) == 2
+    saved = json.loads((store.series_dir("kucoin", "BTC/USDT", "1h") / "gaps.json").read_text(encoding="utf-8"))
+    assert saved["verified_until"] == JAN_2025 + 10 * HOUR
+
+def test_scan_detects_out_of_band_fill(store):
+    """Testuje ponowne skanowanie po dopisaniu starszych swiec."""
+    store.append("kucoin", "BTC/USDT", "1h", make_rows([0, 1, 4, 5]))
+    scanner = GapScanner(store)
+    assert len(scanner.gaps("kucoin", "BTC/USDT", "1h")) == 1
+    store.append("kucoin", "BTC/USDT", "1h", make_rows([2, 3]))
+    assert scanner.gaps("kucoin", "BTC/USDT", "1h") == []
+
+def test_backfill_fills_only_missing_ranges(store):
+    """Testuje pobieranie wylacznie brakujacych zakresow i oznaczanie luk niemozliwych do uzupelnienia."""
+    store.append("kucoin", "BTC/USDT", "1h", make_rows([0, 1, 5, 6, 9, 10]))
+    exchange = FakeExchange([h for h in range(11) if h not in (7, 8)])
+    backfiller = GapBackfiller(GapScanner(store))
+    result = asyncio.run(backfiller.backfill(exchange, "kucoin", "BTC/USDT", "1h"))
+    assert result == {"gaps": 2, "filled": 3, "unfillable": 1}
+    assert exchange.calls == [JAN_2025 + 2 * HOUR, JAN_2025 + 7 * HOUR]
+    assert store.read("kucoin", "BTC/USDT", "1h")["timestamp"].tolist() == [JAN_2025 + h * HOUR for h in range(11) if h not in (7, 8)]
+    assert backfiller.scanner.gaps("kucoin", "BTC/USDT", "1h") == []
+    assert backfiller.scanner.gaps("kucoin", "BTC/USDT", "1h", include_unfillable=True) == [[JAN_2025 + 7 * HOUR, JAN_2025 + 9 * HOUR]]
+    again = asyncio.run(backfiller.backfill(exchange, "kucoin", "BTC/USDT", "1h"))
+    assert again["gaps"] == 0
+
+def test_report_lists_series(store):
+    """Testuje raport liczby luk dla kazdej serii."""
+    store.append("kucoin", "BTC/USDT", "1h", make_rows([0, 3]))
+    store.append("kucoin", "ETH/USDT", "1h", make_rows([0, 1]))
+    report = GapScanner(store).report()
+    assert [(row["symbol"], row["gaps"], row["missing_bars"]) for row in report] == [("BTCUSDT", 1, 2), ("ETHUSDT", 0, 0)]
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_candle_resampler.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.core.candle_store import CandleStore, to_candle_array
+from src.core.candle_resampler import CandleResampler, bucket_starts, resample_candles
+
+MINUTE = 60_000
+HOUR = 3_600_000
+DAY = 86_400_000
+JAN_2025 = 1735689600000  # 2025-01-01 00:00 UTC (sroda)
+
+def make_minutes(start, count):
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    rows = []
+    for i in range(count):
+        rows.append([start + i * MINUTE, close[i] - 0.5, close[i] + 1.0 + rng.random(), close[i] - 1.0 - rng.random(), close[i], float(rng.integers(1, 50))])
+    return rows
+
+@pytest.fixture
+def store(tmp_path):
+    """Zwraca magazyn swiec w katalogu tymczasowym."""
+    return CandleStore(tmp_path / "candles")
+
+def pandas_resample(rows, rule):
+    df = pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close", "volume"])
+    df.index = pd.to_datetime(df["timestamp"], unit="ms")
+    agg = df.resample(rule, label="left", closed="left").agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+    return agg.dropna()
+
+@pytest.mark.parametrize("interval,rule", [("5m", "5min"), ("15m", "15min"), ("1h", "1h"), ("4h", "4h")])
+def test_resample_matches_pandas(interval, rule):
+    """Testuje zgodnosc agregacji first/max/min/last/sum z pandas."""
+    rows = make_minutes(JAN_2025, 8 * 60)
+    bars = resample_candles(to_candle_array(rows), interval)
+    expected = pandas_resample(rows, rule)
+    assert len(bars) == len(expected)
+    for column in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(bars[column], expected[column].to_numpy())
+
+def test_partial_bars_dropped_unless_requested():
+    """Testuje pomijanie niepelnej pierwszej i ostatniej swiecy."""
+    rows = make_minutes(JAN_2025 + 10 * MINUTE, 2 * 60)  # 00:10 -> 02:09
+    candles = to_candle_array(rows)
+    bars = resample_candles(candles, "1h")
+    assert bars["timestamp"].tolist() == [JAN_2025 + HOUR]
+    with_partial = resample_candles(candles, "1h", include_partial=True)
+    assert with_partial["timestamp"].tolist() == [JAN_2025, JAN_2025 + HOUR, JAN_2025 + 2 * HOUR]
+    assert with_partial["open"][0] == rows[0][1]
+
+def test_weekly_and_monthly_alignment():
+    """Testuje wyrownanie swiec tygodniowych do poniedzialku i miesiecznych do poczatku miesiaca."""
+    timestamps = np.array([JAN_2025, JAN_2025 + 5 * DAY, JAN_2025 + 40 * DAY], dtype=np.int64)
+    weeks = bucket_starts(timestamps, "1w")
+    assert pd.to_datetime(weeks, unit="ms").dayofweek.tolist() == [0, 0, 0]
+    assert weeks[0] == JAN_2025 - 2 * DAY  # poniedzialek 2024-12-30
+    months = bucket_starts(timestamps, "1mo")
+    assert months.tolist() == [JAN_2025, JAN_2025, JAN_2025 + 31 * DAY]
+
+def test_offset_shifts_daily_boundaries():
+    """Testuje przesuniecie granic swiec dziennych dla gieldy z inna godzina otwarcia."""
+    timestamps = np.array([JAN_2025 + 7 * HOUR, JAN_2025 + 9 * HOUR], dtype=np.int64)
+    starts = bucket_starts(timestamps, "1d", offset_ms=8 * HOUR)
+    assert starts.tolist() == [JAN_2025 - 16 * HOUR, JAN_2025 + 8 * HOUR]
+
+def test_resampler_serves_range_from_store(store):
+    """Testuje budowanie swiec 1h z magazynu 1m w zadanym zakresie."""
+    store.append("kucoin", "BTC/USDT", "1m", make_minutes(JAN_2025, 6 * 60))
+    resampler = CandleResampler(store)
+    assert resampler.covers("kucoin", "BTC/USDT", JAN_2025, JAN_2025 + 6 * HOUR)
+    assert not resampler.covers("kucoin", "BTC/USDT", JAN_2025, JAN_2025 + 7 * HOUR)
+    bars = resampler.resample("kucoin", "BTC/USDT", "1h", since=JAN_2025 + HOUR, until=JAN_2025 + 4 * HOUR)
+    assert bars["timestamp"].tolist() == [JAN_2025 + i * HOUR for i in (1, 2, 3)]
+    df = resampler.load_dataframe("kucoin", "BTC/USDT", "1h")
+    assert len(df) == 6
+
+def test_resampler_cache_extends_incrementally(store):
+    """Testuje dopisywanie nowych swiec do zapamietanego widoku bez przeliczania historii."""
+    rows = make_minutes(JAN_2025, 5 * 60 + 30)
+    store.append("kucoin", "BTC/USDT", "1m", rows[:3 * 60 + 30])
+    resampler = CandleResampler(store)
+    first = resampler.resample("kucoin", "BTC/USDT", "1h")
+    assert len(first) == 3
+    partial = resampler.resample("kucoin", "BTC/USDT", "1h", include_partial=True)
+    assert len(partial) == 4 and partial["volume"][-1] == sum(row[5] for row in rows[180:210])
+    store.append("kucoin", "BTC/USDT", "1m", rows[3 * 60 + 30:])
+    second = resampler.resample("kucoin", "BTC/USDT", "1h")
+    np.testing.assert_array_equal(second, resample_candles(to_candle_array(rows), "1h"))
+    assert len(second) == 5
+
+def test_resampler_rebuilds_after_backfill(store):
+    """Testuje przebudowe widoku po uzupelnieniu starszych swiec."""
+    rows = make_minutes(JAN_2025, 4 * 60)
+    store.append("kucoin", "BTC/USDT", "1m", rows[:60] + rows[120:])
+    resampler = CandleResampler(store)
+    gapped = resampler.resample("kucoin", "BTC/USDT", "1h")
+    store.append("kucoin", "BTC/USDT", "1m", rows[60:120])
+    filled = resampler.resample("kucoin", "BTC/USDT", "1h")
+    assert len(gapped) == 3 and len(filled) == 4
+    np.testing.assert_array_equal(filled, resample_candles(to_candle_array(rows), "1h"))
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_crossovers.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from strategies.signals_ma import calculate_ma_signals
+from strategies.utils.crossovers import BUY, HOLD, SELL, cross_above, cross_below, latch
+
+def _loop_signals(data, fast_ma_period, slow_ma_period):
+    """Poprzednia implementacja calculate_ma_signals (petla po wierszach) jako wzorzec."""
+    df = data.copy()
+    df['fast_ma'] = df['close'].rolling(window=int(fast_ma_period)).mean()
+    df['slow_ma'] = df['close'].rolling(window=int(slow_ma_period)).mean()
+    signals = ['hold'] * len(df)
+    position_open = False
+    for i in range(1, len(df)):
+        if df['fast_ma'].iloc[i] > df['slow_ma'].iloc[i] and df['fast_ma'].iloc[i-1] <= df['slow_ma'].iloc[i-1] and not position_open:
+            signals[i] = 'buy'
+            position_open = True
+        elif df['fast_ma'].iloc[i] < df['slow_ma'].iloc[i] and df['fast_ma'].iloc[i-1] >= df['slow_ma'].iloc[i-1] and position_open:
+            signals[i] = 'sell'
+            position_open = False
+    return signals
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("periods", [(1, 2), (3, 7), (10, 20), (20, 10)])
+def test_ma_signals_match_loop(seed, periods):
+    """Testuje identycznosc sygnalow wektorowych z dotychczasowa petla (takze przy rownych srednich i NaN)."""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, 600)))
+    close[300:320] = np.nan
+    df = pd.DataFrame({"close": close})
+    assert calculate_ma_signals(df, *periods) == _loop_signals(df, *periods)
+
+def test_crosses_and_latch():
+    """Testuje przeciecia od dolu i od gory oraz naprzemienny zatrzask pozycji."""
+    fast = np.array([1.0, 2.0, 3.0, 2.0, 1.0, 2.5, np.nan, 3.0, 1.0])
+    slow = np.full(9, 2.0)
+    assert np.flatnonzero(cross_above(fast, slow)).tolist() == [2, 5]
+    assert np.flatnonzero(cross_below(fast, slow)).tolist() == [4, 8]
+    enter = np.array([1, 1, 0, 0, 1, 0, 1], dtype=bool)
+    exit = np.array([1, 0, 1, 1, 0, 1, 1], dtype=bool)
+    assert latch(enter, exit).tolist() == [BUY, HOLD, SELL, HOLD, BUY, SELL, BUY]
+    assert latch(enter, exit, position_open=True).tolist() == [SELL, BUY, SELL, HOLD, BUY, SELL, BUY]
+    assert latch(enter & ~exit, exit & ~enter, position_open=True).tolist() == [HOLD, HOLD, SELL, HOLD, BUY, SELL, HOLD]
+    assert latch([], []).tolist() == []
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_engine.py
+
+import asyncio
+import queue
+import threading
+import pytest
+from src.core.engine import TradingEngine, EngineServer, EngineClient
+
+class FakeEngine(TradingEngine):
+    """Silnik z runnerami zastapionymi krotkimi korutynami."""
+
+    def _runner_coroutine(self, runner):
+        async def run():
+            if runner.strategy == "forever":
+                await asyncio.Event().wait()
+            if runner.strategy == "broken":
+                raise ValueError("boom")
+            return {"strategy": runner.strategy, "symbol": runner.symbol, "profit": 1.5, "results_dir": "backtests/x", "data": [{"close": 1.0}] * 1000, "parameters": {}}
+        return run()
+
+    async def shutdown(self):
+        for key in list(self.runners):
+            await self.stop(key)
+
+@pytest.fixture
+def engine_server():
+    """Uruchamia serwer silnika na wolnym porcie w osobnym watku."""
+    loop = asyncio.new_event_loop()
+    server = EngineServer(FakeEngine(), port=0)
+    port = loop.run_until_complete(server.start())
+    done = threading.Event()
+
+    def serve():
+        loop.run_until_complete(server.serve_until_shutdown())
+        done.set()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server, port
+    loop.call_soon_threadsafe(server.request_shutdown)
+    done.wait(5)
+
+def test_start_runner_and_receive_result_event(engine_server):
+    """Testuje uruchomienie runnera przez IPC i odbior zdarzenia z wynikiem."""
+    _, port = engine_server
+    client = EngineClient(port=port, timeout=5).connect()
+    events = queue.Queue()
+    client.on_event(events.put)
+    assert client.request("ping") == "pong"
+    info = client.start_runner("backtest", "strategy_test", "ETH/USDT", "1h", period=10)
+    assert info["key"] == "backtest:strategy_test:ETH/USDT"
+    received = [events.get(timeout=5), events.get(timeout=5)]
+    assert [e["event"] for e in received] == ["started", "finished"]
+    assert received[1]["result"] == {"strategy": "strategy_test", "symbol": "ETH/USDT", "profit": 1.5, "results_dir": "backtests/x"}
+    assert client.status()[0]["status"] == "finished"
+    client.close()
+
+def test_stop_and_failure_events(engine_server):
+    """Testuje zatrzymanie runnera i zgloszenie bledu runnera."""
+    _, port = engine_server
+    client = EngineClient(port=port, timeout=5).connect()
+    events = queue.Queue()
+    client.on_event(events.put)
+    client.start_runner("paper", "forever", "BTC/USDT", "1m")
+    assert events.get(timeout=5)["event"] == "started"
+    assert client.stop_runner("paper", "forever", "BTC/USDT") is True
+    assert events.get(timeout=5)["event"] == "stopped"
+    client.start_runner("paper", "broken", "BTC/USDT", "1m")
+    events.get(timeout=5)
+    failed = events.get(timeout=5)
+    assert failed["event"] == "failed" and failed["runner"]["error"] == "boom"
+    client.close()
+
+def test_unknown_command_and_kind_are_errors(engine_server):
+    """Testuje odpowiedz bledem na nieznane polecenie i rodzaj runnera."""
+    _, port = engine_server
+    client = EngineClient(port=port, timeout=5).connect()
+    with pytest.raises(RuntimeError):
+        client.request("explode")
+    with pytest.raises(RuntimeError):
+        client.start_runner("futures", "strategy_test", "ETH/USDT", "1h")
+    client.close()
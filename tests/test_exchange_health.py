@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_exchange_health.py
+
+import asyncio
+import time
+import pytest
+from src.core.exchange_health import ExchangeHealth
+
+@pytest.fixture
+def health():
+    """Zwraca nowy rejestr stanu gield."""
+    return ExchangeHealth(base_cooldown=60.0)
+
+def make_attempt(delays, results, cancelled):
+    async def attempt(name):
+        try:
+            await asyncio.sleep(delays[name])
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        result = results[name]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return attempt
+
+def test_race_returns_fastest_and_cancels_others(health):
+    """Testuje zwrot najszybszej odpowiedzi i anulowanie pozostalych zapytan."""
+    cancelled = []
+    attempt = make_attempt({"kucoin": 0.01, "bybit": 2.0, "okx": 2.0}, {"kucoin": [1], "bybit": [2], "okx": [3]}, cancelled)
+    started = time.monotonic()
+    name, result = asyncio.run(health.race(["bybit", "okx", "kucoin"], attempt))
+    assert (name, result) == ("kucoin", [1])
+    assert time.monotonic() - started < 1.0
+    assert sorted(cancelled) == ["bybit", "okx"]
+    assert health.stats()["kucoin"]["successes"] == 1
+
+def test_race_skips_invalid_and_failed(health):
+    """Testuje pominiecie bledow i pustych odpowiedzi oraz uruchomienie kolejnej gieldy."""
+    cancelled = []
+    attempt = make_attempt({"a": 0.01, "b": 0.02, "c": 0.03}, {"a": RuntimeError("down"), "b": None, "c": [3]}, cancelled)
+    name, result = asyncio.run(health.race(["a", "b", "c"], attempt, max_parallel=1))
+    assert (name, result) == ("c", [3])
+    assert health.stats()["a"]["failures"] == 1 and health.stats()["b"]["failures"] == 1
+    assert health.score("c") < health.score("a")
+
+def test_race_all_failed(health):
+    """Testuje wynik, gdy zadna gielda nie odpowiedziala poprawnie."""
+    attempt = make_attempt({"a": 0.0, "b": 0.0}, {"a": None, "b": ValueError("bad")}, [])
+    assert asyncio.run(health.race(["a", "b"], attempt)) == (None, None)
+
+def test_rank_prefers_healthy_and_cools_down_failing(health):
+    """Testuje kolejnosc gield wedlug wyniku i wstrzymanie gieldy po serii bledow."""
+    health.record_success("fast", 0.1)
+    health.record_success("slow", 3.0)
+    for _ in range(3):
+        health.record_failure("broken", 0.5)
+    assert health.is_cooling_down("broken")
+    assert health.rank(["broken", "slow", "fast"]) == ["fast", "slow", "broken"]
+    health.record_success("broken", 0.1)
+    assert not health.is_cooling_down("broken")
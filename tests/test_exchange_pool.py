@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_exchange_pool.py
+
+import asyncio
+import pytest
+from src.core.exchange_pool import ExchangePool, build_client_config
+
+class FakeClient:
+    """Klient gieldy liczacy wywolania fetch_time i close."""
+
+    def __init__(self, exchange_name, config):
+        self.id = exchange_name
+        self.config = config
+        self.time_calls = 0
+        self.closed = False
+
+    async def fetch_time(self):
+        self.time_calls += 1
+        return 0
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Zwraca pule z falszywymi klientami zamiast ccxt."""
+    pool = ExchangePool(idle_timeout=0.0, sweep_interval=3600)
+    monkeypatch.setattr(pool, "_create_client", lambda name, key: FakeClient(name.lower(), build_client_config(key)))
+    return pool
+
+KEY_A = {"exchange": "MEXC", "api_key": "a", "api_secret": "s", "rate_limit_requests": 600}
+KEY_B = {"exchange": "MEXC", "api_key": "b", "api_secret": "s"}
+
+def test_clients_shared_by_exchange_and_key(pool):
+    """Testuje wspoldzielenie klienta dla tej samej gieldy i klucza API."""
+    async def scenario():
+        clients = await asyncio.gather(*(pool.acquire("MEXC", KEY_A) for _ in range(30)))
+        other = await pool.acquire("mexc", KEY_B)
+        assert len({id(client) for client in clients}) == 1
+        assert other is not clients[0]
+        assert pool.stats() == {"mexc": 2}
+        assert clients[0].config["rateLimit"] == 100
+        for client in clients:
+            pool.release(client)
+        pool.release(other)
+        await pool.close_idle()
+        return clients[0], other
+    client, other = asyncio.run(scenario())
+    assert client.closed and other.closed
+    assert pool.stats() == {}
+
+def test_referenced_client_not_closed_when_idle(pool):
+    """Testuje, ze klient z aktywna referencja nie jest zamykany."""
+    async def scenario():
+        async with pool.lease("kucoin", KEY_A) as client:
+            await pool.close_idle()
+            assert not client.closed
+        await pool.close_idle()
+        return client
+    assert asyncio.run(scenario()).closed
+
+def test_clients_closed_when_loop_ends(pool):
+    """Testuje zamkniecie klientow przy zakonczeniu petli zdarzen (asyncio.run)."""
+    async def scenario():
+        return await pool.acquire("mexc", KEY_A)
+    client = asyncio.run(scenario())
+    assert client.closed
+    assert pool.stats() == {}
+
+def test_server_time_offset_cached(pool):
+    """Testuje buforowanie roznicy czasu serwera dla klienta z puli."""
+    async def scenario():
+        client = await pool.acquire("mexc", KEY_A)
+        await pool.server_time_offset(client)
+        await pool.server_time_offset(client)
+        pool.release(client)
+        return client
+    assert asyncio.run(scenario()).time_calls == 1
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_indicator_cache.py
+
+import pytest
+import numpy as np
+import pandas as pd
+import strategies.utils.indicator_cache as indicator_cache
+from strategies.strategy_test import Strategy as TestStrategy
+from strategies.utils.indicator_cache import IndicatorCache, cached_ema, cached_sma
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Podmienia wspolny cache wskaznikow na pusty."""
+    fresh = IndicatorCache()
+    monkeypatch.setattr(indicator_cache, "_default_cache", fresh)
+    return fresh
+
+@pytest.fixture
+def candles():
+    """Zwraca losowe swiece OHLC."""
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 1, 500))
+    return pd.DataFrame({"high": close + 1, "low": close - 1, "close": close})
+
+def test_strategies_share_series(cache, candles):
+    """Testuje, ze identyczne serie wskaznikow sa liczone raz dla wszystkich strategii."""
+    first, second = TestStrategy(), TestStrategy()
+    second.update_indicators({"ema_short": 20, "ema_long": 50})
+    series = first.get_indicator_series(candles)
+    assert cache.stats()["misses"] == 3
+    second.get_indicator_series(candles.copy())
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 4
+    np.testing.assert_array_equal(series["ema_long"], candles["close"].ewm(span=20, adjust=False).mean())
+
+def test_new_data_version_misses(cache, candles):
+    """Testuje, ze zmieniony ostatni bar lub inne okno nie trafiaja w stary wpis."""
+    cached_sma(candles, 10)
+    revised = candles.copy()
+    revised.loc[499, "close"] += 1
+    np.testing.assert_array_equal(cached_sma(revised, 10), revised["close"].rolling(window=10).mean())
+    cached_sma(candles.tail(100), 10)
+    cached_sma(candles.assign(high=0.0), 10)
+    assert cache.stats()["misses"] == 3 and cache.stats()["hits"] == 1
+    shared = cached_sma(candles, 10)
+    with pytest.raises(ValueError):
+        shared.iloc[0] = 1.0
+
+def test_lru_eviction_by_memory(candles):
+    """Testuje usuwanie najdawniej uzywanych wpisow po przekroczeniu budzetu pamieci."""
+    cache = IndicatorCache(memory_budget=2 * (500 * 8 + indicator_cache.ENTRY_OVERHEAD))
+    for span in (5, 10):
+        cache.get(candles, "ema", {"span": span}, lambda: candles["close"].ewm(span=span).mean())
+    cache.get(candles, "ema", {"span": 5}, lambda: pytest.fail("expected a cache hit"))
+    cache.get(candles, "ema", {"span": 15}, lambda: candles["close"].ewm(span=15).mean())
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+    cache.get(candles, "ema", {"span": 5}, lambda: pytest.fail("expected a cache hit"))
+    assert cache.stats()["bytes"] <= cache.memory_budget
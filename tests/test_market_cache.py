@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_market_cache.py
+
+import asyncio
+import time
+import pytest
+from src.core.market_cache import MarketCache
+
+class FakeExchange:
+    """Gielda liczaca wywolania load_markets."""
+
+    id = "kucoin"
+    timeframes = {"1m": "1min", "1h": "1hour"}
+
+    def __init__(self):
+        self.calls = 0
+
+    async def load_markets(self, reload=False):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"BTC/USDT": {"id": "BTC-USDT", "symbol": "BTC/USDT", "base": "BTC", "quote": "USDT", "active": True,
+                             "precision": {"amount": 1e-8}, "limits": {"amount": {"min": 1e-5}}, "info": {"large": "payload"}}}
+
+@pytest.fixture
+def cache(tmp_path):
+    """Zwraca cache rynkow w katalogu tymczasowym."""
+    return MarketCache(tmp_path / "markets", ttl=3600)
+
+def test_concurrent_get_downloads_once(cache):
+    """Testuje, ze rownoczesne zapytania wspoldziela jedno pobranie rynkow."""
+    exchange = FakeExchange()
+    async def scenario():
+        return await asyncio.gather(*(cache.get(exchange) for _ in range(50)))
+    results = asyncio.run(scenario())
+    assert exchange.calls == 1
+    info = results[0]
+    assert all(result is info for result in results)
+    assert info.resolve("BTCUSDT") == "BTC/USDT"
+    assert info.resolve("BTC-USDT") == "BTC/USDT"
+    assert info.has_timeframe("1h") and not info.has_timeframe("4h")
+    assert info.market("BTC/USDT")["limits"]["amount"]["min"] == 1e-5
+    assert "info" not in info.market("BTC/USDT")
+
+def test_disk_cache_survives_restart(cache, tmp_path):
+    """Testuje odczyt rynkow z dysku bez ponownego pobierania."""
+    asyncio.run(cache.get(FakeExchange()))
+    exchange = FakeExchange()
+    info = asyncio.run(MarketCache(tmp_path / "markets", ttl=3600).get(exchange))
+    assert exchange.calls == 0
+    assert info.has_symbol("BTC/USDT")
+
+def test_stale_cache_served_and_refreshed(cache):
+    """Testuje zwrot przeterminowanych danych i odswiezenie w tle."""
+    asyncio.run(cache.get(FakeExchange()))
+    cache.cached("kucoin").fetched_at = time.time() - 7200
+    exchange = FakeExchange()
+    async def scenario():
+        info = await cache.get(exchange)
+        assert info.age() > 3600
+        await asyncio.sleep(0.05)
+    asyncio.run(scenario())
+    assert exchange.calls == 1
+    assert cache.cached("kucoin").age() < 60
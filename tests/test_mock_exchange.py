@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_mock_exchange.py
+
+import asyncio
+import ccxt.async_support as ccxt
+import pytest
+from src.core.exchange_pool import ExchangePool
+from src.core.mock_exchange import MockExchange, MockExchangeServer, RemoteMockExchange, synthetic_ohlcv
+
+NOW = 1735689600.0 + 30  # 2025-01-01 00:00:30 UTC, w trakcie baru
+MINUTE = 60_000
+
+def test_synthetic_candles_are_deterministic_and_consistent():
+    """Testuje, ze nakladajace sie zakresy swiec syntetycznych daja te same wartosci."""
+    start = int(NOW * 1000) - 500 * MINUTE
+    full = synthetic_ohlcv("BTC/USDT", "1m", start, start + 300 * MINUTE, seed=1)
+    part = synthetic_ohlcv("BTC/USDT", "1m", start + 100 * MINUTE, start + 200 * MINUTE, seed=1)
+    assert len(full) == 300 and part == full[100:200]
+    assert all(row[1] == prev[4] for prev, row in zip(full, full[1:]))
+    assert all(row[3] <= min(row[1], row[4]) and row[2] >= max(row[1], row[4]) for row in full)
+    assert synthetic_ohlcv("ETH/USDT", "1m", start, start + 10 * MINUTE, seed=1) != full[:10]
+
+def test_fetch_ohlcv_pages_and_bar_in_progress():
+    """Testuje okno z biezacym barem i pobieranie od znacznika czasu."""
+    async def scenario():
+        exchange = MockExchange({"page_limit": 50}, clock=lambda: NOW)
+        window = await exchange.fetch_ohlcv("BTCUSDT", "1m", limit=100)
+        assert len(window) == 50
+        assert window[-1][0] == int(NOW * 1000) - 30_000
+        assert window[-1][5] == pytest.approx(synthetic_ohlcv("BTC/USDT", "1m", window[-1][0], window[-1][0] + 1)[0][5] / 2)
+        tail = await exchange.fetch_ohlcv("BTC/USDT", "1m", since=window[-10][0])
+        assert tail == window[-10:]
+        with pytest.raises(ccxt.BadSymbol):
+            await exchange.fetch_ohlcv("NOPE/USDT", "1m")
+    asyncio.run(scenario())
+
+def test_orders_and_balance():
+    """Testuje zlecenia rynkowe, saldo i brak srodkow."""
+    async def scenario():
+        exchange = MockExchange({"balance": {"USDT": 100.0}}, clock=lambda: NOW)
+        order = await exchange.create_order("ETH/USDT", "market", "buy", 0.5)
+        assert order["status"] == "closed" and order["filled"] == 0.5
+        balance = await exchange.fetch_balance()
+        assert balance["ETH"]["free"] == 0.5
+        assert balance["USDT"]["total"] == pytest.approx(100.0 - order["cost"])
+        with pytest.raises(ccxt.InsufficientFunds):
+            await exchange.create_order("ETH/USDT", "market", "sell", 1.0)
+    asyncio.run(scenario())
+
+def test_rate_limit_and_errors():
+    """Testuje odpowiedz 429 po przekroczeniu limitu i losowe bledy sieci."""
+    async def scenario():
+        exchange = MockExchange({"rate_limit_per_minute": 3}, clock=lambda: NOW)
+        for _ in range(3):
+            await exchange.fetch_time()
+        with pytest.raises(ccxt.RateLimitExceeded):
+            await exchange.fetch_time()
+        flaky = MockExchange({"error_rate": 1.0})
+        with pytest.raises(ccxt.NetworkError):
+            await flaky.load_markets()
+        assert exchange.stats()["errors"] == {"rate_limit": 1}
+    asyncio.run(scenario())
+
+def test_remote_exchange_through_pool():
+    """Testuje klienta zdalnej gieldy tworzonego przez pule dla gieldy "mock"."""
+    async def scenario():
+        server = MockExchangeServer(MockExchange({"rate_limit_per_minute": 3}, clock=lambda: NOW), port=0)
+        port = await server.start()
+        pool = ExchangePool()
+        client = await pool.acquire("MOCK", {"api_key": "", "mock_address": f"127.0.0.1:{port}"})
+        assert isinstance(client, RemoteMockExchange)
+        assert "BTC/USDT" in await client.load_markets()
+        window = await client.fetch_ohlcv("BTC/USDT", "1m", limit=5)
+        assert window == await server.exchange.fetch_ohlcv("BTC/USDT", "1m", limit=5)
+        with pytest.raises(ccxt.RateLimitExceeded):
+            await client.fetch_time()
+        pool.release(client)
+        await pool.close_all()
+        await server.close()
+    asyncio.run(scenario())
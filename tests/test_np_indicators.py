@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_np_indicators.py
+
+import pytest
+import numpy as np
+from strategies.utils import np_indicators
+from benchmarks.indicator_reference import PANDAS_REFERENCE, build_candles
+
+def _assert_close(actual, expected, dtype):
+    actual = actual if isinstance(actual, tuple) else (actual,)
+    expected = expected if isinstance(expected, tuple) else (expected,)
+    for a, e in zip(actual, expected, strict=True):
+        assert a.dtype == dtype
+        e = e.to_numpy(dtype=np.float64)
+        np.testing.assert_array_equal(np.isnan(a), np.isnan(e))
+        rtol, atol = (1e-5, 1e-3) if dtype == np.float32 else (1e-10, 1e-8)
+        np.testing.assert_allclose(a, e, rtol=rtol, atol=atol)
+
+@pytest.mark.parametrize("name", PANDAS_REFERENCE)
+@pytest.mark.parametrize("period", [1, 2, 3, 14, 50])
+@pytest.mark.parametrize("gaps", [False, True])
+def test_matches_pandas(name, period, gaps):
+    """Testuje zgodnosc wskaznikow NumPy z wzorcowymi wyrazeniami pandas (takze rozgrzewka i NaN)."""
+    if period == 1 and name in ("macd", "bollinger"):
+        pytest.skip("period 1 is degenerate for this indicator")
+    df = build_candles(3000, seed=period, gaps=gaps)
+    numpy_call, reference = PANDAS_REFERENCE[name]
+    _assert_close(numpy_call(df, period), reference(df, period), np.float64)
+
+@pytest.mark.parametrize("name", PANDAS_REFERENCE)
+def test_float32(name):
+    """Testuje, ze wejscie float32 daje wynik float32 zgodny z pandas liczonym w float64."""
+    df = build_candles(2000, seed=1, dtype=np.float32)
+    numpy_call, reference = PANDAS_REFERENCE[name]
+    _assert_close(numpy_call(df, 14), reference(df.astype(np.float64), 14), np.float32)
+
+def test_warmup_lengths():
+    """Testuje liczbe poczatkowych NaN kazdego wskaznika."""
+    df = build_candles(500)
+    leading = lambda values: int(np.argmax(~np.isnan(values)))
+    assert leading(np_indicators.sma(df["close"], 20)) == 19
+    assert leading(np_indicators.wma(df["close"], 20)) == 19
+    assert leading(np_indicators.ema(df["close"], 20)) == 0
+    assert leading(np_indicators.ema(df["close"], 20, min_periods=20)) == 19
+    assert leading(np_indicators.rsi(df["close"], 14)) == 14
+    assert leading(np_indicators.atr(df["high"], df["low"], df["close"], 14)) == 13
+    assert leading(np_indicators.adx(df["high"], df["low"], df["close"], 14)[0]) == 27
+    assert [leading(a) for a in np_indicators.macd(df["close"])] == [25, 33, 33]
+
+def test_long_series_precision():
+    """Testuje, ze blokowe sumy i wygladzanie nie gubia dokladnosci na milionie swiec."""
+    df = build_candles(1_000_000, seed=3)
+    np.testing.assert_allclose(np_indicators.sma(df["close"], 200), df["close"].rolling(200).mean(), rtol=1e-12)
+    np.testing.assert_allclose(np_indicators.ema(df["close"], 200), df["close"].ewm(span=200, adjust=False).mean(), rtol=1e-12)
+
+def test_short_input_and_invalid_period():
+    """Testuje wejscie krotsze od okresu i niepoprawne okresy."""
+    assert np.isnan(np_indicators.sma([1.0, 2.0], 5)).all()
+    assert np.isnan(np_indicators.donchian([1.0], [0.5], 3)[0]).all()
+    assert len(np_indicators.ema([], 10)) == 0
+    with pytest.raises(ValueError):
+        np_indicators.sma([1.0, 2.0], 0)
+    with pytest.raises(ValueError):
+        np_indicators.wma([1.0, 2.0], 2.5)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_ohlcv_downloader.py
+
+import asyncio
+import pytest
+from src.core.candle_store import CandleStore
+from src.core.ohlcv_downloader import OHLCVDownloader, plan_pages
+
+MINUTE = 60_000
+START = 1735689600000  # 2025-01-01 00:00 UTC
+
+class FakeExchange:
+    """Gielda zwracajaca swiece 1m z limitem na jedno zapytanie."""
+
+    def __init__(self, max_limit=100, fail_once=False):
+        self.max_limit = max_limit
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_once = fail_once
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append(since)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if self.fail_once:
+                self.fail_once = False
+                raise ConnectionError("temporary failure")
+            count = min(limit, self.max_limit)
+            return [[since + i * MINUTE, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(count)]
+        finally:
+            self.in_flight -= 1
+
+@pytest.fixture
+def store(tmp_path):
+    """Zwraca magazyn swiec w katalogu tymczasowym."""
+    return CandleStore(tmp_path / "candles")
+
+def test_plan_pages():
+    """Testuje podzial zakresu na strony o rozmiarze limitu gieldy."""
+    pages = plan_pages(0, 250 * MINUTE, MINUTE, 100)
+    assert pages == [(0, 100 * MINUTE), (100 * MINUTE, 200 * MINUTE), (200 * MINUTE, 250 * MINUTE)]
+    assert plan_pages(10, 10, MINUTE, 100) == []
+
+def test_download_concurrent_pages(store):
+    """Testuje pobranie calego zakresu wieloma rownoleglymi zapytaniami."""
+    exchange = FakeExchange()
+    downloader = OHLCVDownloader(exchange, "binance", rate_limit_requests=60000, store=store, page_limit=100, max_concurrency=4)
+    added = asyncio.run(downloader.download("BTC/USDT", "1m", START, START + 1000 * MINUTE))
+    assert added == 1000
+    assert len(exchange.calls) == 10
+    assert 1 < exchange.max_in_flight <= 4
+    timestamps = store.read("binance", "BTC/USDT", "1m")["timestamp"]
+    assert timestamps.tolist() == [START + i * MINUTE for i in range(1000)]
+
+def test_download_resumes_from_store(store):
+    """Testuje wznowienie pobierania od ostatniej zapisanej swiecy."""
+    store.append("binance", "BTC/USDT", "1m", [[START + i * MINUTE, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(500)])
+    exchange = FakeExchange()
+    downloader = OHLCVDownloader(exchange, "binance", rate_limit_requests=60000, store=store, page_limit=100)
+    added = asyncio.run(downloader.download("BTC/USDT", "1m", START, START + 1000 * MINUTE))
+    assert added == 500
+    assert min(exchange.calls) == START + 499 * MINUTE
+    df = downloader.load("BTC/USDT", "1m", START, START + 1000 * MINUTE)
+    assert len(df) == 1000
+
+def test_download_retries_failed_page(store, monkeypatch):
+    """Testuje ponowienie strony po bledzie sieci."""
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: real_sleep(0))
+    exchange = FakeExchange(fail_once=True)
+    downloader = OHLCVDownloader(exchange, "binance", rate_limit_requests=60000, store=store, page_limit=100)
+    assert asyncio.run(downloader.download("BTC/USDT", "1m", START, START + 300 * MINUTE)) == 300
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_rate_limiter.py
+
+import asyncio
+import threading
+import time
+from src.core.rate_limiter import (PRIORITY_BACKGROUND, PRIORITY_LIVE, RateLimiterRegistry, TokenBucket,
+                                   install_rate_limiter, request_priority)
+
+def test_bucket_caps_request_rate():
+    """Testuje ograniczenie liczby zapytan do zadanego limitu na minute."""
+    bucket = TokenBucket(requests_per_minute=1200, burst=1)  # 20 zapytan/s
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(11)))
+        return time.monotonic() - started
+    elapsed = asyncio.run(scenario())
+    assert elapsed >= 0.45
+    assert bucket.stats()["granted"] == 11
+
+def test_endpoint_weight_consumes_more_tokens():
+    """Testuje, ze ciezszy endpoint zuzywa wiecej tokenow."""
+    bucket = TokenBucket(requests_per_minute=600, burst=10)  # 10 zapytan/s
+    async def scenario():
+        await bucket.acquire(cost=10)
+        started = time.monotonic()
+        await bucket.acquire(cost=5)
+        return time.monotonic() - started
+    assert asyncio.run(scenario()) >= 0.45
+
+def test_live_lane_preempts_background():
+    """Testuje pierwszenstwo zapytan live przed pobieraniem danych do backtestu."""
+    bucket = TokenBucket(requests_per_minute=1200, burst=1)
+    order = []
+    async def request(name, priority):
+        await bucket.acquire(priority=priority)
+        order.append(name)
+    async def scenario():
+        await bucket.acquire()
+        background = [asyncio.create_task(request(f"bg{i}", PRIORITY_BACKGROUND)) for i in range(4)]
+        await asyncio.sleep(0.01)
+        with request_priority(PRIORITY_LIVE):
+            live = asyncio.create_task(request("live", None))
+        await asyncio.gather(*background, live)
+    asyncio.run(scenario())
+    assert order.index("live") <= 1
+
+def test_bucket_shared_across_event_loops():
+    """Testuje wspolny limit dla klientow dzialajacych w roznych watkach."""
+    bucket = TokenBucket(requests_per_minute=1200, burst=1)
+    def worker():
+        async def run():
+            for _ in range(5):
+                await bucket.acquire()
+        asyncio.run(run())
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started >= 0.4
+    assert bucket.granted == 10
+
+def test_registry_and_install():
+    """Testuje jeden limiter na gielde i podpiecie go pod throttle klienta."""
+    registry = RateLimiterRegistry()
+    limiter = registry.limiter("MEXC", 600)
+    assert registry.limiter("mexc") is limiter
+    registry.limiter("mexc", 1200)
+    assert limiter.requests_per_minute == 1200
+
+    class Client:
+        enableRateLimit = False
+    client = Client()
+    install_rate_limiter(client, limiter)
+    asyncio.run(client.throttle(2))
+    assert client.enableRateLimit and client.shared_rate_limiter is limiter
+    assert limiter.granted == 1
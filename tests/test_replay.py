@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_replay.py
+
+import asyncio
+import json
+from pathlib import Path
+import src.core.market_cache as market_cache
+from src.core.clock import VirtualClock, WallClock, get_clock
+from src.core.replay import ReplaySession
+
+STRATEGY_FILE = str(Path(__file__).resolve().parents[1] / "strategies" / "strategy_test.py")
+START = 1735689600.0  # 2025-01-01 00:00:00 UTC
+DAY = 86400
+
+def test_virtual_clock_wakes_sleepers_in_order():
+    """Testuje kolejnosc budzenia i przesuwanie czasu wirtualnego."""
+    async def scenario():
+        clock = VirtualClock(START)
+        woken = []
+        async def sleeper(name, delay):
+            await clock.sleep(delay)
+            woken.append((name, clock.time() - START))
+        tasks = [asyncio.get_running_loop().create_task(sleeper(name, delay)) for name, delay in (("a", 60), ("b", 30), ("c", 60), ("d", 500))]
+        await clock.run_until(START + 100)
+        assert woken == [("b", 30), ("a", 60), ("c", 60)]
+        assert clock.time() == START + 100 and clock.pending == 1
+        tasks[-1].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    asyncio.run(scenario())
+
+def test_replay_promotes_auto_strategy(tmp_path, monkeypatch):
+    """Testuje powtarzalny przebieg trybu Auto na swiecach godzinowych z awansem do Live."""
+    monkeypatch.setattr(market_cache, "_default_cache", market_cache.MarketCache(tmp_path / "cache"))
+    strategies = [
+        {"name": "strategy_test", "symbol": "ETH/USDT", "mode": "Auto", "interval": "1h", "exchange": "KUCOIN", "parameters": {"adx_threshold": 1}, "file_path": STRATEGY_FILE},
+        {"name": "strategy_test", "symbol": "BTC/USDT", "mode": "Paper", "interval": "1h", "exchange": "KUCOIN", "parameters": {}, "file_path": STRATEGY_FILE}
+    ]
+    reports = []
+    for run in ("a", "b"):
+        session = ReplaySession(tmp_path / run, START, START + 5 * DAY, exchange_config={"source": "synthetic", "seed": 7})
+        session.prepare(strategies, {"strategies": []}, {"auto_settings": {"auto_days": 3, "required_profit": -100.0}})
+        reports.append(asyncio.run(session.run()))
+    report = reports[0]
+    auto, paper = report["runners"]["strategy_test:ETH/USDT"], report["runners"]["strategy_test:BTC/USDT"]
+    assert auto["status"] == "promoted" and auto["result"]["days_active"] == 3 and auto["trades"] > 0
+    assert (tmp_path / "a" / "simulations" / "strategy_test" / "ETHUSDT" / "202501.json").exists()
+    assert paper["status"] == "running" and paper["error"] is None
+    with open(tmp_path / "a" / "data" / "strategies.json", "r", encoding="utf-8") as f:
+        assert [s["mode"] for s in json.load(f)] == ["Live", "Paper"]
+    assert report["virtual_days"] == 5 and report["wakeups"] > 5 * 24
+    assert [(r["capital"], r["trades"]) for r in reports[1]["runners"].values()] == [(r["capital"], r["trades"]) for r in report["runners"].values()]
+    assert isinstance(get_clock(), WallClock)
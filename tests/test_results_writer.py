@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_results_writer.py
+
+import asyncio
+import json
+import pytest
+import pandas as pd
+from src.core.results_writer import FLUSH_INTERVAL_SETTING, DEFAULT_FLUSH_INTERVAL, ResultsWriter, load_flush_interval
+from src.core.trade_manager_results_handler import TradeManagerResultsHandler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_trade(i):
+    return {"type": "buy" if i % 2 == 0 else "sell", "price": 100.0 + i, "timestamp": f"2025-01-01T00:{i:02d}:00+01:00", "profit_usd": i % 2, "duration_minutes": 1}
+
+def read_journal(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+def test_journal_appends_only_new_trades(tmp_path):
+    """Testuje dopisywanie do dziennika tylko nowych transakcji."""
+    (tmp_path / "trades.json").write_text('{"type": "old"}\n', encoding="utf-8")
+    writer = ResultsWriter()
+    trades = []
+    for i in range(5):
+        trades.append(make_trade(i))
+        writer.record(tmp_path, trades)
+        writer.record(tmp_path, trades)
+    assert read_journal(tmp_path / "trades.json") == trades
+    assert writer.stats()["appended_trades"] == 5
+
+def test_rollups_coalesced_until_interval_or_close(tmp_path):
+    """Testuje przeliczanie podsumowan co flush_interval oraz przy zamknieciu."""
+    clock = FakeClock()
+    writer = ResultsWriter(flush_interval=60.0, clock=clock)
+    calls = []
+    for i in range(10):
+        clock.now = i
+        writer.record(tmp_path, [], [], rollup=lambda i=i: calls.append(i))
+    assert calls == [0]
+    clock.now = 61
+    writer.record(tmp_path, [], [], rollup=lambda: calls.append(61))
+    assert calls == [0, 61]
+    writer.record(tmp_path, [], [], rollup=lambda: calls.append(62))
+    writer.close(tmp_path)
+    assert calls == [0, 61, 62]
+    assert writer.stats()["runs"] == 0
+
+def test_open_trades_written_only_on_change(tmp_path):
+    """Testuje zapis open_trades.json tylko po zmianie otwartych pozycji."""
+    writer = ResultsWriter()
+    open_trades = [{"type": "buy", "price": 1.0, "timestamp": "2025-01-01T00:00:00+01:00"}]
+    writer.record(tmp_path, [], open_trades)
+    open_file = tmp_path / "open_trades.json"
+    open_file.write_text("marker", encoding="utf-8")
+    writer.record(tmp_path, [], list(open_trades))
+    assert open_file.read_text(encoding="utf-8") == "marker"
+    writer.record(tmp_path, [], [])
+    assert json.loads(open_file.read_text(encoding="utf-8")) == {"open_trades": []}
+
+@pytest.fixture
+def event_loop_set():
+    """Ustawia swieza petle zdarzen (TradeManagerBase pobiera ja w konstruktorze), niezaleznie od wczesniejszych testow."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+def test_idle_run_flushed_by_flush_due(tmp_path):
+    """Testuje zapis podsumowan biegu bez nowych tickow po uplywie flush_interval."""
+    clock = FakeClock()
+    writer = ResultsWriter(flush_interval=60.0, clock=clock)
+    calls = []
+    writer.record(tmp_path, [], [], rollup=lambda: calls.append(0))
+    writer.record(tmp_path, [], [], rollup=lambda: calls.append(1))
+    assert writer.flush_due() == 0
+    clock.now = 60
+    assert writer.flush_due() == 1
+    assert calls == [0, 1]
+    writer.shutdown()
+
+def test_flush_interval_from_settings(tmp_path):
+    """Testuje odczyt interwalu zapisu z simulation_settings.json z wartoscia domyslna."""
+    settings = tmp_path / "simulation_settings.json"
+    settings.write_text(json.dumps({FLUSH_INTERVAL_SETTING: "15"}), encoding="utf-8")
+    assert load_flush_interval(settings) == 15.0
+    settings.write_text(json.dumps({FLUSH_INTERVAL_SETTING: "-1"}), encoding="utf-8")
+    assert load_flush_interval(settings) == DEFAULT_FLUSH_INTERVAL
+    settings.write_text("{}", encoding="utf-8")
+    assert load_flush_interval(settings) == DEFAULT_FLUSH_INTERVAL
+
+def test_write_rollups_deduplicates_monthly_trades(tmp_path, event_loop_set):
+    """Testuje brak duplikatow w raporcie miesiecznym po wielokrotnym zapisie."""
+    base_dir = tmp_path / "simulations" / "strategy_test" / "ETH_USDT"
+    base_dir.mkdir(parents=True)
+    df = pd.DataFrame({"timestamp": pd.to_datetime(["2025-01-01T00:00:00+01:00", "2025-01-01T01:00:00+01:00"])})
+    trades = [make_trade(i) for i in range(4)]
+    handler = TradeManagerResultsHandler()
+    handler.write_rollups(base_dir, "strategy_test", "ETH/USDT", trades[:2], [], 1, 0.0, 1000.0, df)
+    handler.write_rollups(base_dir, "strategy_test", "ETH/USDT", trades, [], 2, 0.0, 1000.0, df)
+    monthly = [p for p in base_dir.glob("*.json") if p.name != "summary.json"]
+    data = json.loads(monthly[0].read_text(encoding="utf-8"))
+    assert data["trades"] == trades
+    summary = json.loads((base_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["total_trades"] == 2 and summary["wins"] == 2
+
+def test_write_rollups_accepts_feed_timestamps(tmp_path, event_loop_set):
+    """Testuje zapis podsumowan dla swiec z feedu (naiwne czasy UTC) zamiast cichego bledu."""
+    base_dir = tmp_path / "simulations" / "strategy_test" / "ETH_USDT"
+    base_dir.mkdir(parents=True)
+    df = pd.DataFrame({"timestamp": pd.to_datetime([1735689600000, 1735862400000], unit="ms")})
+    TradeManagerResultsHandler().write_rollups(base_dir, "strategy_test", "ETH/USDT", [make_trade(0), make_trade(1)], [], 1, 0.0, 1000.0, df)
+    summary = json.loads((base_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["days_active"] == 2
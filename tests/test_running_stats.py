@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_running_stats.py
+
+import numpy as np
+import pandas as pd
+from src.core.running_stats import RunningStats
+
+def test_drawdown_matches_full_recomputation():
+    """Testuje zgodnosc przyrostowego drawdownu z przeliczeniem cummax na calej krzywej."""
+    rng = np.random.default_rng(3)
+    equity = 1000 + np.cumsum(rng.normal(0, 5, 500))
+    stats = RunningStats(1000.0)
+    for value in equity:
+        stats.update_equity(value)
+    curve = pd.Series([1000.0] + equity.tolist())
+    assert stats.max_drawdown == (curve - curve.cummax()).min()
+    assert stats.peak_equity == curve.max()
+    assert stats.equity_points == len(curve)
+
+def test_trade_metrics():
+    """Testuje winrate, profit factor, zyski i czasy trwania transakcji."""
+    stats = RunningStats(1000.0)
+    stats.record_trade(100.0, 110.0, 100.0, 30)
+    stats.record_trade(110.0, 105.0, -50.0, 10)
+    stats.record_trade(105.0, 125.0, 200.0, 20)
+    assert stats.closed_trades == 3 and stats.winning_trades == 2 and stats.losing_trades == 1
+    assert stats.winrate_pct == 2 / 3 * 100
+    assert stats.profit_factor == 30.0 / 5.0
+    assert stats.net_profit == 250.0 and stats.max_profit == 250.0
+    assert stats.gross_profit_usd == 300.0 and stats.gross_loss_usd == 50.0
+    assert stats.avg_duration_minutes == 20.0
+
+def test_profit_factor_edge_cases():
+    """Testuje profit factor bez transakcji i bez strat."""
+    stats = RunningStats()
+    assert stats.profit_factor == 0 and stats.winrate_pct == 0
+    stats.record_trade(100.0, 101.0, 10.0)
+    assert stats.profit_factor == "inf"
+
+def test_snapshot_round_trip():
+    """Testuje zapis stanu do slownika i odtworzenie."""
+    stats = RunningStats(500.0)
+    stats.update_equity(520.0)
+    stats.update_equity(480.0)
+    stats.record_trade(10.0, 9.0, -20.0, 5)
+    restored = RunningStats.from_snapshot(stats.snapshot())
+    assert restored.snapshot() == stats.snapshot()
+    assert restored.summary() == stats.summary()
+    assert restored.max_drawdown == -40.0
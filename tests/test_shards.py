@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_shards.py
+
+import asyncio
+import os
+import numpy as np
+from src.core.candle_feed import CandleUpdate, Subscription, get_candle_feed
+from src.core.engine import TradingEngine
+from src.core.shards import MAX_RUNNER_RESTARTS, ShardedEngine, shard_for
+
+CANDLE_DTYPE = [("timestamp", "i8"), ("close", "f8")]
+
+class WorkerEngine(TradingEngine):
+    """Silnik workera: runner "feed" czeka na swiece z feedu, "crash" raz zabija proces, "broken" nie daje sie uruchomic."""
+
+    async def start(self, kind, strategy, symbol, interval="1h", **params):
+        if strategy == "broken":
+            with open(params["attempts"], "a") as f:
+                f.write("x")
+            raise ImportError("No module named 'strategies.broken'")
+        return await super().start(kind, strategy, symbol, interval, **params)
+
+    def _runner_coroutine(self, runner):
+        async def run():
+            if runner.strategy == "crash" and not os.path.exists(runner.params["marker"]):
+                open(runner.params["marker"], "w").close()
+                os._exit(3)
+            if runner.strategy == "feed":
+                subscription = get_candle_feed().subscribe("MEXC", {}, runner.symbol, runner.interval, 10)
+                update = await subscription.next()
+                subscription.close()
+                return {"pid": os.getpid(), "candles": len(update.candles)}
+            if runner.strategy == "forever":
+                await asyncio.Event().wait()
+            return {"pid": os.getpid()}
+        return run()
+
+    async def shutdown(self):
+        for key in list(self.runners):
+            await self.stop(key)
+
+class SupervisorFeed:
+    """Feed nadzorcy dostarczajacy od razu jedna aktualizacje kazdemu subskrybentowi."""
+
+    def __init__(self):
+        self.subscribed = []
+        self.closed = 0
+
+    def subscribe(self, exchange_name, api_key_data, symbol, interval, capacity):
+        self.subscribed.append((symbol, interval, capacity))
+        subscription = Subscription(self, (exchange_name, symbol), capacity)
+        candles = np.array([(i, 1.0 + i) for i in range(5)], dtype=CANDLE_DTYPE)
+        subscription._deliver(CandleUpdate(symbol, interval, candles, 5, 4))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.closed += 1
+
+async def wait_for_event(queue, key, event):
+    while True:
+        message = await asyncio.wait_for(queue.get(), 30)
+        if message["runner"]["key"] == key and message["event"] == event:
+            return message
+
+def test_shard_for_is_stable_and_moves_few_keys():
+    """Testuje staly przydzial kluczy i przeniesienie tylko czesci kluczy po dodaniu shardu."""
+    keys = [f"paper:strategy_{i}:BTC/USDT" for i in range(400)]
+    before = [shard_for(key, 4) for key in keys]
+    assert before == [shard_for(key, 4) for key in keys]
+    assert set(before) == {0, 1, 2, 3}
+    after = [shard_for(key, 5) for key in keys]
+    moved = [(old, new) for old, new in zip(before, after) if old != new]
+    assert all(new == 4 for _, new in moved)
+    assert 40 < len(moved) < 130
+
+def test_sharded_engine_runs_runners_in_workers_with_shared_feed():
+    """Testuje uruchomienie runnerow w procesach workerow i dostarczenie swiec przez nadzorce."""
+    async def scenario():
+        feed = SupervisorFeed()
+        engine = ShardedEngine(2, engine_factory=WorkerEngine, feed=feed, check_interval=0.1)
+        events = engine.subscribe()
+        try:
+            info = await engine.start("paper", "feed", "ETH/USDT", "1h")
+            assert info["shard"] == shard_for("paper:feed:ETH/USDT", 2)
+            finished = await wait_for_event(events, info["key"], "finished")
+            assert finished["result"]["candles"] == 5
+            assert finished["result"]["pid"] != os.getpid()
+            assert finished["runner"]["shard"] == info["shard"]
+            assert feed.subscribed == [("ETH/USDT", "1h", 10)]
+            assert engine.status()[0]["status"] == "finished"
+        finally:
+            await engine.shutdown()
+        assert feed.closed == 1
+    asyncio.run(scenario())
+
+def test_sharded_engine_restarts_crashed_worker(tmp_path):
+    """Testuje ponowne uruchomienie workera po awarii i jego dzialajacych runnerow."""
+    async def scenario():
+        engine = ShardedEngine(1, engine_factory=WorkerEngine, feed=SupervisorFeed(), check_interval=0.1)
+        events = engine.subscribe()
+        try:
+            info = await engine.start("paper", "forever", "BTC/USDT", "1h")
+            await wait_for_event(events, info["key"], "started")
+            await engine.start("paper", "crash", "BTC/USDT", "1h", marker=str(tmp_path / "crashed"))
+            first_pid = engine._workers[0].process.pid
+            restarted = await wait_for_event(events, info["key"], "started")
+            assert engine.restarts == 1
+            assert engine._workers[0].process.pid != first_pid
+            assert restarted["runner"]["status"] == "running"
+            assert await engine.stop(info["key"])
+            await wait_for_event(events, info["key"], "stopped")
+        finally:
+            await engine.shutdown()
+    asyncio.run(scenario())
+
+def test_runner_that_fails_to_start_is_retried_then_failed(tmp_path):
+    """Testuje ponawianie uruchomienia runnera, ktorego worker nie moze wystartowac, i zgloszenie bledu."""
+    attempts = tmp_path / "attempts"
+    async def scenario():
+        engine = ShardedEngine(1, engine_factory=WorkerEngine, feed=SupervisorFeed(), check_interval=0.05)
+        events = engine.subscribe()
+        try:
+            info = await engine.start("paper", "broken", "BTC/USDT", "1h", attempts=str(attempts))
+            failed = await wait_for_event(events, info["key"], "failed")
+            assert "strategies.broken" in failed["runner"]["error"]
+            assert engine.status()[0]["status"] == "failed"
+            assert engine.restarts == 0
+        finally:
+            await engine.shutdown()
+    asyncio.run(scenario())
+    assert len(attempts.read_text()) == MAX_RUNNER_RESTARTS + 1
@@ -78,4 +78,15 @@ def test_get_signal_empty_df(strategy):
     """Testuje generowanie sygnału dla pustego DataFrame."""
     empty_df = pd.DataFrame()
     signal = strategy.get_signal(empty_df)
-    assert signal is None
\ No newline at end of file
+    assert signal is None
+
+def test_get_indicator_series_full_history(strategy, sample_df):
+    """Testuje, ze get_indicator_series zwraca pelne serie wyrownane z DataFrame."""
+    strategy.indicators = {"ma_short": 2, "ma_long": 3}
+    series = strategy.get_indicator_series(sample_df)
+    assert list(series.columns) == ["ma_short", "ma_long"]
+    assert series.index.equals(sample_df.index)
+    assert pd.isna(series["ma_short"].iloc[0])
+    assert series["ma_short"].iloc[1:].tolist() == [100.5, 101.5]
+    assert series["ma_long"].iloc[-1] == 101.0
+    assert strategy.get_indicators(sample_df) == [series.iloc[-1].to_dict()]
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_strategy_registry.py
+
+import os
+import pytest
+from strategies.strategy_registry import StrategyRegistry
+
+STRATEGY_CODE = '''
+class Strategy:
+    def __init__(self):
+        self.indicators = {{"period": 5}}
+
+    def update_indicators(self, parameters):
+        self.indicators.update(parameters)
+
+    def get_signal(self, df):
+        return "{signal}"
+'''
+
+def write_strategy(path, signal, bump_mtime=True):
+    path.write_text(STRATEGY_CODE.format(signal=signal), encoding="utf-8")
+    if bump_mtime:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+@pytest.fixture
+def strategy_file(tmp_path):
+    """Zwraca plik strategii w katalogu tymczasowym."""
+    path = tmp_path / "strategy_reg_sample.py"
+    write_strategy(path, "buy", bump_mtime=False)
+    return path
+
+def test_module_executed_once_for_many_instances(strategy_file):
+    """Testuje jednokrotne wykonanie modulu przy tworzeniu wielu instancji."""
+    registry = StrategyRegistry()
+    instances = [registry.create(strategy_file, {"period": i}) for i in range(100)]
+    assert registry.executions == 1
+    assert instances[42].indicators["period"] == 42
+    assert type(instances[0]) is type(instances[99])
+
+def test_reload_only_when_content_changes(strategy_file):
+    """Testuje przeladowanie tylko po zmianie zawartosci pliku."""
+    registry = StrategyRegistry()
+    registry.get_class(strategy_file)
+    stat = strategy_file.stat()
+    os.utime(strategy_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    registry.get_class(strategy_file)
+    assert registry.executions == 1 and registry.version(strategy_file) == 1
+    write_strategy(strategy_file, "sell")
+    assert registry.get_class(strategy_file)().get_signal(None) == "sell"
+    assert registry.executions == 2 and registry.version(strategy_file) == 2
+
+def test_handle_and_listener_follow_reload(strategy_file):
+    """Testuje powiadomienie dzialajacej strategii o nowym kodzie."""
+    registry = StrategyRegistry(check_interval=0.0)
+    reloaded = []
+    registry.subscribe(strategy_file, lambda path, module: reloaded.append(path))
+    handle = registry.handle(strategy_file, {"period": 9})
+    first = handle.current()
+    assert handle.current() is first
+    write_strategy(strategy_file, "sell")
+    second = handle.current()
+    assert second is not first
+    assert second.get_signal(None) == "sell" and second.indicators["period"] == 9
+    assert reloaded == [strategy_file.resolve()]
+
+def test_broken_edit_keeps_previous_version(strategy_file):
+    """Testuje zachowanie poprzedniej wersji, gdy nowy kod sie nie kompiluje."""
+    registry = StrategyRegistry()
+    registry.get_class(strategy_file)
+    strategy_file.write_text("class Strategy(:\n", encoding="utf-8")
+    stat = strategy_file.stat()
+    os.utime(strategy_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert registry.get_class(strategy_file)().get_signal(None) == "buy"
+    assert registry.version(strategy_file) == 1
+
+def test_missing_strategy_class(tmp_path):
+    """Testuje blad dla pliku bez klasy Strategy."""
+    path = tmp_path / "strategy_reg_empty.py"
+    path.write_text("VALUE = 1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        StrategyRegistry().get_class(path)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_strategy_signals.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from strategies.strategy_dual_ma import Strategy as DualMaStrategy
+from strategies.strategy_test import Strategy as TestStrategy
+from strategies.strategy_contract import apply_indicators, generate_signals, supports_batch_signals
+
+@pytest.fixture
+def random_df():
+    """Zwraca losowy DataFrame OHLCV z kolumnami wskaznikow dla obu strategii."""
+    rng = np.random.default_rng(42)
+    close = 100 + np.cumsum(rng.normal(0, 1, 500))
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2025-07-01", periods=500, freq="min"),
+        "open": close,
+        "high": close + rng.uniform(0, 2, 500),
+        "low": close - rng.uniform(0, 2, 500),
+        "close": close,
+        "volume": rng.uniform(1, 100, 500)
+    })
+    df["ma_short"] = df["close"].rolling(window=10).mean()
+    df["ma_long"] = df["close"].rolling(window=20).mean()
+    df["ema_short"] = df["close"].ewm(span=10, adjust=False).mean()
+    df["ema_long"] = df["close"].ewm(span=20, adjust=False).mean()
+    df["adx"] = rng.uniform(0, 50, 500)
+    df.loc[100:110, "ma_short"] = df.loc[100:110, "ma_long"]
+    return df
+
+class LegacyStrategy:
+    """Strategia bez metod get_signals i get_indicator_series."""
+
+    def get_indicators(self, df):
+        return [{"last_close": df["close"].iloc[-1]}]
+
+    def get_signal(self, df):
+        return "buy" if df["close"].iloc[-1] > 100 else None
+
+@pytest.mark.parametrize("strategy_class", [DualMaStrategy, TestStrategy])
+def test_batch_signals_match_per_row(strategy_class, random_df):
+    """Testuje zgodnosc get_signals z wywolaniami get_signal dla kazdego wiersza."""
+    strategy = strategy_class()
+    per_row = [strategy.get_signal(random_df.iloc[[i]]) for i in range(len(random_df))]
+    batch = strategy.get_signals(random_df)
+    assert isinstance(batch, np.ndarray)
+    assert batch.tolist() == per_row
+    assert {"buy", "sell"} <= set(per_row)
+
+def test_batch_signals_missing_columns():
+    """Testuje get_signals dla DataFrame bez kolumn wskaznikow."""
+    df = pd.DataFrame({"close": [100.0, 101.0]})
+    assert DualMaStrategy().get_signals(df).tolist() == [None, None]
+    assert DualMaStrategy().get_signals(pd.DataFrame()).tolist() == []
+
+def test_generate_signals_uses_batch(random_df):
+    """Testuje, ze generate_signals korzysta z get_signals, gdy jest dostepna."""
+    strategy = DualMaStrategy()
+    strategy.get_signal = lambda df: pytest.fail("get_signal should not be called")
+    assert supports_batch_signals(strategy)
+    signals = generate_signals(strategy, random_df)
+    assert signals == strategy.get_signals(random_df).tolist()
+
+def test_generate_signals_legacy_fallback(random_df):
+    """Testuje sciezke per-row dla strategii bez get_signals."""
+    strategy = LegacyStrategy()
+    assert not supports_batch_signals(strategy)
+    signals = generate_signals(strategy, random_df)
+    assert signals == ["buy" if c > 100 else None for c in random_df["close"]]
+
+def test_apply_indicators_full_series(random_df):
+    """Testuje, ze kazda swieca dostaje wlasna wartosc wskaznika."""
+    ohlcv = random_df[["timestamp", "open", "high", "low", "close", "volume"]]
+    df, names = apply_indicators(DualMaStrategy(), ohlcv)
+    assert names == ["ma_short", "ma_long"]
+    assert "ma_short" not in ohlcv.columns
+    np.testing.assert_allclose(df["ma_long"].to_numpy(), random_df["ma_long"].to_numpy())
+    assert df["ma_short"].dropna().nunique() > 1
+
+def test_apply_indicators_legacy_broadcast(random_df):
+    """Testuje zachowanie dla strategii zwracajacej tylko ostatnia wartosc."""
+    df, names = apply_indicators(LegacyStrategy(), random_df)
+    assert names == ["last_close"]
+    assert (df["last_close"] == random_df["close"].iloc[-1]).all()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_streaming_indicators.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.core.candle_store import candles_to_dataframe, to_candle_array
+from strategies.strategy_contract import IndicatorStream, apply_indicators
+from strategies.strategy_dual_ma import Strategy as DualMaStrategy
+from strategies.strategy_test import Strategy as TestStrategy
+from strategies.utils.signals_adx import calculate_adx
+from strategies.utils.streaming import StreamingADX, StreamingEMA, StreamingSMA
+
+@pytest.fixture
+def ohlcv():
+    """Zwraca losowe swiece z brakami danych, stalym odcinkiem i ujemnymi cenami."""
+    rng = np.random.default_rng(7)
+    close = np.cumsum(rng.normal(0, 1, 400)) + 5
+    close[[3, 50, 51, 52, 200]] = np.nan
+    close[100:130] = close[100]
+    return pd.DataFrame({
+        "timestamp": np.arange(400) * 60_000,
+        "high": close + rng.uniform(0, 2, 400),
+        "low": close - rng.uniform(0, 2, 400),
+        "close": close
+    })
+
+def _stream(indicator, df, revise=False):
+    for i, candle in enumerate(df.to_dict("records")):
+        if revise and i % 3 == 0:
+            indicator.update({**candle, "close": candle["close"] + 1, "high": candle["high"] + 2})
+        indicator.update(candle)
+    return indicator.values()
+
+@pytest.mark.parametrize("period", [1, 2, 3, 10, 14, 50])
+@pytest.mark.parametrize("revise", [False, True])
+def test_streaming_matches_pandas_bit_for_bit(ohlcv, period, revise):
+    """Testuje identycznosc SMA, EMA i ADX ze stanem z wynikami wsadowymi pandas (takze z poprawkami biezacego baru)."""
+    np.testing.assert_array_equal(_stream(StreamingSMA(period), ohlcv, revise), ohlcv["close"].rolling(window=period).mean().to_numpy())
+    np.testing.assert_array_equal(_stream(StreamingEMA(period), ohlcv, revise), ohlcv["close"].ewm(span=period, adjust=False).mean().to_numpy())
+    np.testing.assert_array_equal(_stream(StreamingADX(period), ohlcv, revise), calculate_adx(ohlcv["high"], ohlcv["low"], ohlcv["close"], period).to_numpy())
+
+def test_history_is_bounded():
+    """Testuje ograniczenie przechowywanej historii wartosci."""
+    sma = StreamingSMA(3, history=5)
+    for value in range(100):
+        sma.update(float(value))
+    assert sma.values().tolist() == [94.0, 95.0, 96.0, 97.0, 98.0]
+    assert sma.value == 98.0
+
+@pytest.mark.parametrize("strategy_class", [DualMaStrategy, TestStrategy])
+def test_indicator_stream_matches_apply_indicators(strategy_class):
+    """Testuje, ze strumien wskaznikow karmiony kolejnymi oknami bufora daje ostatni wiersz jak apply_indicators na calej historii."""
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    rows = [[i * 60_000, c, c + 1, c - 1, c, 10.0] for i, c in enumerate(close)]
+    strategy = strategy_class()
+    stream = IndicatorStream(strategy)
+    for end in range(60, 301, 7):
+        window = to_candle_array(rows[max(0, end - 60):end])
+        # The newest bar is still forming: it is delivered first with another close, then final.
+        forming = window.copy()
+        forming["close"][-1] += 3
+        stream.apply(candles_to_dataframe(forming), forming)
+        row, names = stream.apply(candles_to_dataframe(window), window)
+        full, _ = apply_indicators(strategy, candles_to_dataframe(to_candle_array(rows[:end])))
+        for name in names:
+            assert row[name].iloc[0] == full[name].iloc[-1]
+        assert strategy.get_signal(row) == strategy.get_signal(full.iloc[[-1]])
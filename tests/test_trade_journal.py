@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Ścieżka: C:\Users\Msi\Desktop\investmentapp\tests\test_trade_journal.py
+
+import json
+import pandas as pd
+from src.core.results_writer import ResultsWriter
+from src.core.trade_journal import TradeJournal, RunnerState
+
+def run_trades(journal, state, count, start="2025-01-01T00:00:00+01:00"):
+    timestamp = pd.Timestamp(start)
+    for i in range(count):
+        timestamp += pd.Timedelta(minutes=5)
+        if state.position == 0:
+            journal.append(state.buy(100.0 + i % 7, timestamp), state)
+        else:
+            journal.append(state.sell(100.0 + i % 5, timestamp), state)
+
+def record_trades(base_dir, state):
+    """Zapisuje transakcje do trades.json tak jak petla paper/live przez ResultsWriter."""
+    writer = ResultsWriter()
+    writer.record(base_dir, state.trades)
+    writer.shutdown()
+
+def test_recovery_restores_open_position(tmp_path):
+    """Testuje odtworzenie otwartej pozycji i kapitalu po restarcie bez zamkniecia."""
+    journal = TradeJournal(tmp_path)
+    state = journal.recover(1000.0)
+    journal.append(state.transition("start"), state)
+    run_trades(journal, state, 5)
+    journal.sync()
+    recovered = TradeJournal(tmp_path).recover(1000.0)
+    assert recovered.position == state.position and recovered.position > 0
+    assert recovered.capital == state.capital
+    assert recovered.trades == state.trades
+    assert recovered.stats.snapshot() == state.stats.snapshot()
+
+def test_recovery_replays_only_tail_after_snapshot(tmp_path):
+    """Testuje, ze odtwarzanie obejmuje tylko zdarzenia po ostatnim snapshocie."""
+    journal = TradeJournal(tmp_path, snapshot_every=50)
+    state = journal.recover(1000.0)
+    run_trades(journal, state, 123)
+    journal.sync()
+    record_trades(tmp_path, state)
+    recovering = TradeJournal(tmp_path, snapshot_every=50)
+    recovered = recovering.recover(1000.0)
+    assert recovering.replayed == 23
+    assert recovering.seq == 123
+    assert recovered.snapshot() == state.snapshot()
+    assert recovered.trades == state.trades
+
+def test_torn_last_line_is_dropped(tmp_path):
+    """Testuje pominiecie i obciecie niepelnej ostatniej linii dziennika."""
+    journal = TradeJournal(tmp_path)
+    state = journal.recover(1000.0)
+    run_trades(journal, state, 3)
+    journal.close()
+    with open(tmp_path / "journal.jsonl", "ab") as f:
+        f.write(b'{"seq": 4, "type": "fi')
+    recovering = TradeJournal(tmp_path)
+    recovered = recovering.recover(1000.0)
+    assert len(recovered.trades) == 3 and recovering.seq == 3
+    recovering.append(recovered.transition("stop"), recovered)
+    recovering.close(recovered)
+    assert TradeJournal(tmp_path).recover(1000.0).status == "stopped"
+
+def test_close_writes_snapshot(tmp_path):
+    """Testuje zapis snapshotu przy zamknieciu, tak by kolejny start nie odtwarzal zdarzen."""
+    journal = TradeJournal(tmp_path)
+    state = journal.recover(500.0)
+    run_trades(journal, state, 4)
+    journal.close(state)
+    record_trades(tmp_path, state)
+    recovering = TradeJournal(tmp_path)
+    recovered = recovering.recover(500.0)
+    assert recovering.replayed == 0
+    assert recovered.capital == state.capital and recovered.position == 0
+
+def test_snapshot_counts_trades_and_replays_when_trades_file_lags(tmp_path):
+    """Testuje, ze snapshot nie zawiera historii transakcji, a przy zaleglym trades.json dziennik jest odtwarzany od poczatku."""
+    journal = TradeJournal(tmp_path, snapshot_every=50)
+    state = journal.recover(1000.0)
+    run_trades(journal, state, 100)
+    journal.sync()
+    with open(tmp_path / "snapshot.json", "r", encoding="utf-8") as f:
+        snapshot = json.load(f)["state"]
+    assert "trades" not in snapshot and snapshot["trades_count"] == 100
+    lagging = RunnerState(1000.0)
+    lagging.trades = state.trades[:60]
+    record_trades(tmp_path, lagging)
+    recovering = TradeJournal(tmp_path, snapshot_every=50)
+    recovered = recovering.recover(1000.0)
+    assert recovering.replayed == 100
+    assert recovered.trades == state.trades and recovered.capital == state.capital
@@ -32,4 +32,15 @@ def normalize_interval(interval):
         return normalized
     except Exception as e:
         logging.error(f"Blad normalizacji interwalu {interval}: {str(e)}")
-        return interval
\ No newline at end of file
+        return interval
+
+INTERVAL_UNITS_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000, "mo": 2_592_000_000}
+
+def interval_to_milliseconds(interval):
+    """Zwraca dlugosc interwalu w milisekundach, np. 1m -> 60000, 4h -> 14400000 (1mo liczony jako 30 dni)"""
+    normalized = normalize_interval(interval)
+    unit = "mo" if normalized.endswith("mo") else normalized[-1:]
+    amount = normalized[:-len(unit)]
+    if unit not in INTERVAL_UNITS_MS or not amount.isdigit() or int(amount) < 1:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(amount) * INTERVAL_UNITS_MS[unit]